@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Async Persistence Benchmark
+ScrollVerse Genesis Protocol - Persistence Benchmarks
+
+Compares OmnitechPersistence (one thread per concurrent writer) with
+AsyncOmnitechPersistence (one task per concurrent writer) for save_node
+calls, and the sequential bulk upsert with the pipelined one, at
+concurrency 1 to 256. Both adapters run against local stand-in drivers
+that simulate the same Neo4j round-trip latency, blocking or awaiting.
+
+Usage:
+    python -m benchmarks.bench_async_persistence [writes]
+"""
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import omnitech_async_persistence
+import omnitech_persistence
+from omnitech_async_persistence import AsyncOmnitechPersistence
+from omnitech_persistence import OmnitechPersistence
+from tests.neo4j_stub import AsyncStubDriver, StubDriver
+
+# Simulated latencies (seconds)
+ROUND_TRIP = 0.002
+PER_ROW = 0.000002
+
+CONCURRENCY = (1, 4, 16, 64, 256)
+CHUNK_SIZE = 100
+
+
+def latency(params) -> float:
+    rows = params.get('rows')
+    return ROUND_TRIP + PER_ROW * (len(rows) if rows else 1)
+
+
+def respond(query, params):
+    rows = params.get('rows')
+    return [{'written': len(rows)}] if rows is not None else []
+
+
+class LatencyDriver(StubDriver):
+    """Stand-in driver that blocks for the simulated latency."""
+
+    def _run(self, query, params):
+        time.sleep(latency(params))
+        return super()._run(query, params)
+
+
+class AsyncLatencyDriver(AsyncStubDriver):
+    """Stand-in driver that awaits the simulated latency."""
+
+    async def _run_async(self, query, params):
+        await asyncio.sleep(latency(params))
+        return await super()._run_async(query, params)
+
+
+def sync_writes(writes: int, concurrency: int) -> float:
+    """Seconds for the sync adapter to save writes nodes from concurrency threads."""
+    driver = LatencyDriver(respond)
+    omnitech_persistence.GraphDatabase.driver = lambda *args, **kwargs: driver
+    persist = OmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub', health_interval=0)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(lambda i: persist.save_node(f'webhook_{i}', {}), range(writes)))
+        return time.perf_counter() - started
+    finally:
+        persist.close()
+
+
+def sync_bulk(nodes) -> float:
+    """Seconds for the sync adapter's sequential bulk upsert."""
+    driver = LatencyDriver(respond)
+    omnitech_persistence.GraphDatabase.driver = lambda *args, **kwargs: driver
+    persist = OmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub', health_interval=0)
+    try:
+        started = time.perf_counter()
+        persist.save_nodes_bulk(nodes, CHUNK_SIZE)
+        return time.perf_counter() - started
+    finally:
+        persist.close()
+
+
+async def async_run(writes: int, concurrency: int, nodes):
+    """Seconds for the async adapter's save_node calls and pipelined bulk upsert."""
+    driver = AsyncLatencyDriver(respond)
+    omnitech_async_persistence.AsyncGraphDatabase.driver = lambda *args, **kwargs: driver
+    async with AsyncOmnitechPersistence(
+        'bolt://stub:7687', 'neo4j', 'stub', health_interval=0, concurrency=concurrency
+    ) as persist:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def save(i):
+            async with limit:
+                await persist.save_node(f'webhook_{i}', {})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(save(i) for i in range(writes)))
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await persist.save_nodes_bulk(nodes, CHUNK_SIZE)
+        bulk = time.perf_counter() - started
+    return single, bulk
+
+
+def run(writes: int) -> None:
+    """Run both adapters at each concurrency level and print throughput."""
+    nodes = [{'id': f'webhook_{i}', 'event_type': 'push'} for i in range(writes * 10)]
+    bulk = sync_bulk(nodes)
+
+    print(f"save_node writes: {writes}, bulk rows: {len(nodes)} (chunks of {CHUNK_SIZE})")
+    print(f"sync bulk upsert: {len(nodes) / bulk:,.0f} rows/s")
+    print(f"{'concurrency':>11}  {'sync writes/s':>13}  {'async writes/s':>14}  {'async bulk rows/s':>17}")
+    for concurrency in CONCURRENCY:
+        sync_single = sync_writes(writes, concurrency)
+        async_single, async_bulk = asyncio.run(async_run(writes, concurrency, nodes))
+        print(
+            f"{concurrency:>11}  {writes / sync_single:>13,.0f}  {writes / async_single:>14,.0f}"
+            f"  {len(nodes) / async_bulk:>17,.0f}"
+        )
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Bulk Upsert Benchmark
+ScrollVerse Genesis Protocol - Persistence Benchmarks
+
+Compares per-row save_node calls with save_nodes_bulk against a local
+stand-in driver that simulates Neo4j round-trip and session-open latency.
+
+Usage:
+    python -m benchmarks.bench_bulk_upsert [rows]
+"""
+
+import sys
+import time
+
+import omnitech_persistence
+from omnitech_persistence import OmnitechPersistence
+from tests.neo4j_stub import StubDriver
+
+# Simulated latencies (seconds)
+ROUND_TRIP = 0.0005
+SESSION_OPEN = 0.0002
+PER_ROW = 0.000002
+
+
+class LatencyDriver(StubDriver):
+    """Stand-in driver that sleeps to model network and server cost."""
+
+    def __init__(self):
+        super().__init__(self._respond)
+
+    def _respond(self, query, params):
+        rows = params.get('rows')
+        time.sleep(ROUND_TRIP + PER_ROW * (len(rows) if rows else 1))
+        return [{'written': len(rows)}] if rows is not None else []
+
+    def session(self, **kwargs):
+        time.sleep(SESSION_OPEN)
+        return super().session(**kwargs)
+
+
+def run(rows: int) -> None:
+    """Run both write paths and print throughput."""
+    driver = LatencyDriver()
+    omnitech_persistence.GraphDatabase.driver = lambda *args, **kwargs: driver
+    persist = OmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub')
+
+    nodes = [{'id': f'webhook_{i}', 'event_type': 'push'} for i in range(rows)]
+
+    started = time.perf_counter()
+    for node in nodes:
+        persist.save_node(node['id'], {'event_type': node['event_type']})
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    written = sum(persist.save_nodes_bulk(nodes))
+    bulk = time.perf_counter() - started
+
+    print(f"rows:        {rows}")
+    print(f"save_node:   {single:.3f}s ({rows / single:,.0f} rows/s)")
+    print(f"bulk upsert: {bulk:.3f}s ({written / bulk:,.0f} rows/s)")
+    print(f"speedup:     {single / bulk:.1f}x")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
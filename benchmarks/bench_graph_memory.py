@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Memory Benchmark
+ScrollVerse Genesis Protocol - Graph Backend Benchmarks
+
+Compares the memory held by networkx.DiGraph and CompactDiGraph for a
+webhook-shaped graph: one node per delivery, linked to a small set of
+repository and user nodes, with the attributes the server stores.
+
+Allocations are traced with tracemalloc, which slows both builds down
+considerably: sizes of 10^6 and above take minutes per backend.
+
+Usage:
+    python -m benchmarks.bench_graph_memory [nodes ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import networkx as nx
+
+from omnitech_graph_store import CompactDiGraph
+
+EVENT_TYPES = ('push', 'pull_request', 'issues', 'workflow_run', 'star')
+REPOSITORIES = 1000
+USERS = 5000
+
+
+def build(graph, nodes: int) -> None:
+    """Add webhook nodes and their edges to a graph."""
+    for i in range(nodes):
+        node_id = f'webhook_{i}'
+        repo = f'repo:omnitech/project-{i % REPOSITORIES}'
+        user = f'user:dev-{i % USERS}'
+        graph.add_node(
+            node_id,
+            event_type=EVENT_TYPES[i % len(EVENT_TYPES)],
+            timestamp=f'2024-01-01T00:{(i // 60) % 60:02d}:{i % 60:02d}+00:00',
+            delivery_id=f'{i:08x}-0000-4000-8000-000000000000'
+        )
+        graph.add_edge(node_id, repo, relation='about')
+        graph.add_edge(user, node_id, relation='sent')
+
+
+def measure(factory, nodes: int) -> int:
+    """Build a graph and return the bytes it holds."""
+    gc.collect()
+    tracemalloc.start()
+    graph = factory()
+    build(graph, nodes)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return size
+
+
+def run(nodes: int) -> None:
+    """Measure both backends and print the results."""
+    digraph = measure(nx.DiGraph, nodes)
+    compact = measure(CompactDiGraph, nodes)
+
+    print(f"webhook nodes:  {nodes}")
+    print(f"nx.DiGraph:     {digraph / 2**20:,.1f} MiB")
+    print(f"CompactDiGraph: {compact / 2**20:,.1f} MiB")
+    print(f"reduction:      {digraph / compact:.1f}x")
+
+
+if __name__ == '__main__':
+    for size in (sys.argv[1:] or ['100000']):
+        run(int(float(size)))
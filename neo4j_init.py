@@ -20,7 +20,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def init_neo4j(uri: str, user: str, password: str) -> bool:
+def init_neo4j(uri: str, user: str, password: str, delivery_constraint: bool = False) -> bool:
     """
     Initialize Neo4j database with required schema.
 
@@ -28,6 +28,8 @@ def init_neo4j(uri: str, user: str, password: str) -> bool:
         uri: Neo4j connection URI
         user: Neo4j username
         password: Neo4j password
+        delivery_constraint: Also make OmniNode.delivery_id unique, so a
+            webhook delivery can only ever be recorded once
 
     Returns:
         True if initialization was successful
@@ -63,6 +65,40 @@ def init_neo4j(uri: str, user: str, password: str) -> bool:
                 ON (n.timestamp)
             """)
 
+            # Create indexes for the delta export's updated_at watermark
+            logger.info("Creating indexes on OmniNode.updated_at and CONNECTED.updated_at...")
+            session.run("""
+                CREATE INDEX omninode_updated_at IF NOT EXISTS
+                FOR (n:OmniNode)
+                ON (n.updated_at)
+            """)
+            session.run("""
+                CREATE INDEX connected_updated_at IF NOT EXISTS
+                FOR ()-[r:CONNECTED]-()
+                ON (r.updated_at)
+            """)
+
+            # Stamp records written before updated_at existed, so the
+            # delta export includes them
+            logger.info("Backfilling updated_at...")
+            session.run("""
+                MATCH (n:OmniNode) WHERE n.updated_at IS NULL
+                CALL { WITH n SET n.updated_at = timestamp() } IN TRANSACTIONS
+            """)
+            session.run("""
+                MATCH ()-[r:CONNECTED]->() WHERE r.updated_at IS NULL
+                CALL { WITH r SET r.updated_at = timestamp() } IN TRANSACTIONS
+            """)
+
+            if delivery_constraint:
+                # Create constraint for unique webhook deliveries
+                logger.info("Creating uniqueness constraint on OmniNode.delivery_id...")
+                session.run("""
+                    CREATE CONSTRAINT omninode_delivery_id_unique IF NOT EXISTS
+                    FOR (n:OmniNode)
+                    REQUIRE n.delivery_id IS UNIQUE
+                """)
+
             logger.info("Neo4j initialization complete")
             return True
 
@@ -87,7 +123,9 @@ def main():
         logger.error("NEO4J_PASSWORD environment variable is required")
         sys.exit(1)
 
-    success = init_neo4j(uri, user, password)
+    delivery_constraint = os.environ.get('OMNITECH_DEDUP_NEO4J', 'false').lower() == 'true'
+
+    success = init_neo4j(uri, user, password, delivery_constraint)
     sys.exit(0 if success else 1)
 
 
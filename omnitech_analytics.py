@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Analytics
+ScrollVerse Genesis Protocol - Cached Graph Metrics
+
+This module answers the /admin/analytics endpoints without recomputing
+over the whole graph on every request. Degrees (bucketed by value, so the
+hubs are read off the top buckets) and weakly connected components
+(union-find) are maintained incrementally from the mutation path.
+PageRank, and the component rebuild needed after node removals, run in a
+worker pool: requests are answered from the last result, marked stale,
+while a refresh is computed in the background. Under eventlet the pool's
+threads are green, so the computation itself is handed to a real OS
+thread (eventlet.tpool) and does not stall the server.
+"""
+
+import bisect
+import heapq
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# PageRank parameters (same defaults as networkx.pagerank)
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOL = 1.0e-6
+
+
+def pagerank(
+    nodes: List[Any],
+    edges: Iterable[Tuple[Any, Any]],
+    alpha: float = PAGERANK_ALPHA,
+    max_iter: int = PAGERANK_MAX_ITER,
+    tol: float = PAGERANK_TOL
+) -> Dict[Any, float]:
+    """
+    Unweighted PageRank by power iteration.
+
+    Dangling nodes distribute their rank uniformly, as in networkx.
+
+    Args:
+        nodes: Node ids
+        edges: (source, target) pairs between those nodes
+
+    Returns:
+        node id -> score (the scores sum to 1)
+    """
+    n = len(nodes)
+    if n == 0:
+        return {}
+    position = {node: i for i, node in enumerate(nodes)}
+    successors: List[List[int]] = [[] for _ in range(n)]
+    for u, v in edges:
+        successors[position[u]].append(position[v])
+    dangling = [i for i in range(n) if not successors[i]]
+
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        last = x
+        base = (alpha * sum(last[i] for i in dangling) + 1.0 - alpha) / n
+        x = [base] * n
+        for i, targets in enumerate(successors):
+            if targets:
+                share = alpha * last[i] / len(targets)
+                for j in targets:
+                    x[j] += share
+        if sum(abs(a - b) for a, b in zip(x, last)) < n * tol:
+            break
+    return dict(zip(nodes, x))
+
+
+def _offload(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run CPU-bound work in a real OS thread if eventlet has patched threading."""
+    # Only look at eventlet if the process already imported it
+    patcher = sys.modules.get('eventlet.patcher')
+    if patcher is not None and patcher.is_monkey_patched('thread'):
+        from eventlet import tpool
+        return tpool.execute(fn, *args)
+    return fn(*args)
+
+
+class _UnionFind:
+    """Disjoint sets of node ids (union by size, path halving)."""
+
+    def __init__(self):
+        self.parent: Dict[Any, Any] = {}
+        self.size: Dict[Any, int] = {}
+
+    def add(self, node: Any) -> None:
+        if node not in self.parent:
+            self.parent[node] = node
+            self.size[node] = 1
+
+    def find(self, node: Any) -> Any:
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: Any, b: Any) -> None:
+        self.add(a)
+        self.add(b)
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+
+    @classmethod
+    def build(cls, nodes: Iterable[Any], edges: Iterable[Tuple[Any, Any]]) -> '_UnionFind':
+        sets = cls()
+        for node in nodes:
+            sets.add(node)
+        for u, v in edges:
+            sets.union(u, v)
+        return sets
+
+
+class GraphAnalytics:
+    """
+    Incrementally maintained graph metrics.
+
+    The mutation path reports every new node, new edge and removal; hubs,
+    degree centrality and components are then answered from counters,
+    while PageRank is cached per graph version and refreshed in the pool.
+
+    Args:
+        graph_getter: Returns the graph snapshots are taken from
+        max_workers: Worker threads for background recomputation
+        clock: Function returning the current Unix time
+    """
+
+    def __init__(
+        self,
+        graph_getter: Callable[[], Any],
+        max_workers: int = 1,
+        clock: Callable[[], float] = time.time
+    ):
+        self._graph_getter = graph_getter
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='omnitech-analytics')
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Incremented on every structural change
+        self.version = 0
+        self._in: Dict[Any, int] = {}
+        self._out: Dict[Any, int] = {}
+        # degree (in plus out) -> nodes with that degree, in arrival order
+        self._buckets: Dict[int, Dict[Any, None]] = {}
+        # Degrees with a non-empty bucket, ascending
+        self._degrees: List[int] = []
+        self._components = _UnionFind()
+        # Set by removals until the union-find has been rebuilt
+        self._components_stale = False
+        self._removals = 0
+        # Edges added while the union-find is rebuilt, replayed onto the result
+        self._pending_edges: Optional[List[Tuple[Any, Any]]] = None
+        self._ranks: Optional[Dict[str, Any]] = None
+        self._refreshing: Dict[str, Future] = {}
+        self.refreshes = 0
+
+    def add_node(self, node_id: Any) -> None:
+        """Record a node (no-op if it is already known)."""
+        with self._lock:
+            if node_id in self._in:
+                return
+            self._in[node_id] = self._out[node_id] = 0
+            self._place(node_id, 0)
+            self._components.add(node_id)
+            self.version += 1
+
+    def add_edge(self, source: Any, target: Any) -> None:
+        """Record a new edge (its endpoints must have been added)."""
+        with self._lock:
+            if source == target:
+                self._shift(source, 2)
+            else:
+                self._shift(source, 1)
+                self._shift(target, 1)
+            self._out[source] += 1
+            self._in[target] += 1
+            self._components.union(source, target)
+            if self._pending_edges is not None:
+                self._pending_edges.append((source, target))
+            self.version += 1
+
+    def remove_node(self, node_id: Any, successors: Iterable[Any], predecessors: Iterable[Any]) -> None:
+        """
+        Record a node removal.
+
+        Args:
+            node_id: Removed node
+            successors: Targets of its outgoing edges
+            predecessors: Sources of its incoming edges
+        """
+        with self._lock:
+            if node_id not in self._in:
+                return
+            for neighbor in successors:
+                if neighbor != node_id and neighbor in self._in:
+                    self._shift(neighbor, -1)
+                    self._in[neighbor] -= 1
+            for neighbor in predecessors:
+                if neighbor != node_id and neighbor in self._out:
+                    self._shift(neighbor, -1)
+                    self._out[neighbor] -= 1
+            self._unplace(node_id, self._in[node_id] + self._out[node_id])
+            del self._in[node_id]
+            del self._out[node_id]
+            # Union-find cannot split a set - rebuild in the background
+            self._components_stale = True
+            self._removals += 1
+            self.version += 1
+
+    def rebuild(self, graph: Any) -> None:
+        """Recompute everything from a graph (after hydration)."""
+        nodes = list(graph.nodes())
+        edges = list(graph.edges())
+        with self._lock:
+            self._in = {node: graph.in_degree(node) for node in nodes}
+            self._out = {node: graph.out_degree(node) for node in nodes}
+            self._buckets, self._degrees = {}, []
+            for node in nodes:
+                self._place(node, self._in[node] + self._out[node])
+            self._components = _UnionFind.build(nodes, edges)
+            self._components_stale = False
+            self.version += 1
+
+    def _place(self, node: Any, degree: int) -> None:
+        bucket = self._buckets.get(degree)
+        if bucket is None:
+            bucket = self._buckets[degree] = {}
+            bisect.insort(self._degrees, degree)
+        bucket[node] = None
+
+    def _unplace(self, node: Any, degree: int) -> None:
+        bucket = self._buckets[degree]
+        del bucket[node]
+        if not bucket:
+            del self._buckets[degree]
+            del self._degrees[bisect.bisect_left(self._degrees, degree)]
+
+    def _shift(self, node: Any, delta: int) -> None:
+        """Move a node to the bucket of its degree plus delta (before _in/_out change)."""
+        degree = self._in[node] + self._out[node]
+        self._unplace(node, degree)
+        self._place(node, degree + delta)
+
+    def _snapshot(self) -> Tuple[int, List[Any], List[Tuple[Any, Any]]]:
+        """Copy the graph structure (retried if it changes while copied)."""
+        graph = self._graph_getter()
+        while True:
+            version = self.version
+            try:
+                return version, list(graph.nodes()), list(graph.edges())
+            except RuntimeError:
+                continue
+
+    def _refresh(self, name: str, task: Callable[[], None]) -> Future:
+        """Start a background task unless one with this name is running."""
+        with self._lock:
+            future = self._refreshing.get(name)
+            if future is None or future.done():
+                future = self._refreshing[name] = self._executor.submit(self._run, name, task)
+            return future
+
+    def _run(self, name: str, task: Callable[[], None]) -> None:
+        started = self._clock()
+        try:
+            task()
+            self.refreshes += 1
+        except Exception as e:
+            logger.error(f"Analytics refresh '{name}' failed: {e}")
+            raise
+        logger.debug(f"Analytics refresh '{name}' took {self._clock() - started:.3f}s")
+
+    def _compute_ranks(self) -> None:
+        version, nodes, edges = self._snapshot()
+        scores = _offload(pagerank, nodes, edges)
+        with self._lock:
+            self._ranks = {'version': version, 'computed_at': self._clock(), 'scores': scores}
+
+    def _rebuild_components(self) -> None:
+        with self._lock:
+            self._pending_edges = []
+            removals = self._removals
+        try:
+            _, nodes, edges = self._snapshot()
+            components = _offload(_UnionFind.build, nodes, edges)
+        except Exception:
+            with self._lock:
+                self._pending_edges = None
+            raise
+        with self._lock:
+            for u, v in self._pending_edges:
+                components.union(u, v)
+            for node in self._in:
+                components.add(node)
+            self._pending_edges = None
+            self._components = components
+            # A removal during the rebuild may have split a set again
+            self._components_stale = self._removals != removals
+
+    def hubs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """The nodes with the most edges (in plus out), ties in the order they reached that degree."""
+        with self._lock:
+            ranked: List[Any] = []
+            # Walk the buckets from the highest degree down
+            for degree in reversed(self._degrees):
+                for node in self._buckets[degree]:
+                    if len(ranked) == limit:
+                        break
+                    ranked.append(node)
+                if len(ranked) == limit:
+                    break
+            return [
+                {
+                    'id': node,
+                    'degree': self._in[node] + self._out[node],
+                    'in_degree': self._in[node],
+                    'out_degree': self._out[node]
+                }
+                for node in ranked
+            ]
+
+    def degree_centrality(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top nodes by degree centrality (degree / (n - 1), as in networkx)."""
+        with self._lock:
+            n = len(self._in)
+        scale = 1.0 / (n - 1) if n > 1 else 1.0
+        return [{'id': hub['id'], 'centrality': hub['degree'] * scale} for hub in self.hubs(limit)]
+
+    def components(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Weakly connected components, largest first.
+
+        After node removals the current sets are returned as stale while
+        they are rebuilt in the background.
+        """
+        with self._lock:
+            stale = self._components_stale
+        if stale:
+            self._refresh('components', self._rebuild_components)
+        with self._lock:
+            sets = self._components
+            if not stale:
+                sizes = sets.size
+            else:
+                # Skip removed nodes (their sets may still be merged)
+                sizes = {}
+                for node in self._in:
+                    root = sets.find(node)
+                    sizes[root] = sizes.get(root, 0) + 1
+            largest = heapq.nlargest(limit, sizes.items(), key=lambda item: item[1])
+            return {
+                'version': self.version,
+                'stale': stale,
+                'count': len(sizes),
+                'components': [{'node': root, 'size': size} for root, size in largest]
+            }
+
+    def pagerank(self, limit: int = 10, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Top nodes by PageRank (stale-while-revalidate).
+
+        The first request waits for a result (up to timeout); later
+        requests get the cached scores immediately, marked stale and
+        refreshed in the background if the graph changed since.
+
+        Raises:
+            concurrent.futures.TimeoutError: If no result is available
+                within timeout
+        """
+        with self._lock:
+            ranks, version = self._ranks, self.version
+        if ranks is None or ranks['version'] != version:
+            future = self._refresh('pagerank', self._compute_ranks)
+            if ranks is None:
+                future.result(timeout)
+                with self._lock:
+                    ranks = self._ranks
+        top = heapq.nlargest(limit, ranks['scores'].items(), key=lambda item: item[1])
+        return {
+            'version': ranks['version'],
+            'stale': ranks['version'] != self.version,
+            'computed_at': ranks['computed_at'],
+            'scores': [{'id': node, 'pagerank': score} for node, score in top]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get analytics statistics."""
+        with self._lock:
+            return {
+                'version': self.version,
+                'nodes': len(self._in),
+                'pagerank_version': self._ranks['version'] if self._ranks else None,
+                'components_stale': self._components_stale,
+                'refreshing': sorted(name for name, f in self._refreshing.items() if not f.done()),
+                'refreshes': self.refreshes
+            }
@@ -0,0 +1,919 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Async Neo4j Persistence Layer
+ScrollVerse Genesis Protocol - Asyncio Graph Storage
+
+This module is the asyncio counterpart of omnitech_persistence. It wraps
+neo4j.AsyncGraphDatabase with the same method surface as
+OmnitechPersistence, so asyncio services can persist graph data without
+blocking the event loop. Bulk writes are pipelined: their chunks run as
+concurrent transactions, bounded by the adapter's concurrency limit.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, List, Iterable, AsyncIterator, Awaitable, Callable, Sequence, Tuple, Union
+
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ServiceUnavailable, AuthError, SessionExpired
+
+from omnitech_circuit import CircuitBreaker
+from omnitech_codec import decode_properties, encode_attributes
+from omnitech_persistence import (
+    DEFAULT_BULK_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    RETRYABLE_ERRORS,
+    CircuitOpenError,
+    _ALL_EDGES,
+    _ALL_NODES,
+    _CLEAR_ALL,
+    _CLEAR_EDGE_PROPERTIES,
+    _CLEAR_NODE_PROPERTIES,
+    _COMPACT_NODES,
+    _DELETE_EXPIRED,
+    _DELETE_NODES,
+    _EDGES_SINCE,
+    _MERGE_COUNTER_NODES,
+    _NODE_BY_DELIVERY,
+    _NODES_SINCE,
+    _PAGE_EDGES,
+    _PAGE_NODES,
+    _PROPERTY_NAME,
+    _SAVE_EDGE,
+    _SAVE_NODE,
+    _SET_COUNTERS,
+    _UPSERT_EDGES,
+    _UPSERT_NODES,
+    _chunked,
+    _cleared_rows,
+    _counter_rows,
+    _counter_updates,
+    _delta_properties,
+    _delta_query,
+    _edge_rows,
+    _merge_increments,
+    _merge_records,
+    _node_rows,
+    _watermark,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transactions a bulk call keeps in flight at once
+DEFAULT_CONCURRENCY = 8
+
+
+async def _upsert_in_tx(tx: Any, query: str, clear_query: Optional[str], rows: List[Dict[str, Any]]) -> int:
+    """Run a bulk upsert and clear the stale properties it reports; returns rows written."""
+    record = await (await tx.run(query, rows=rows)).single()
+    if record is None:
+        return 0
+    stale = record.get('stale')
+    if stale and clear_query is not None:
+        await (await tx.run(clear_query, rows=_cleared_rows(stale))).consume()
+    return record['written']
+
+
+async def _increment_in_tx(tx: Any, rows: List[Dict[str, Any]]) -> int:
+    """Add counter increments to nodes inside an open transaction (see omnitech_persistence)."""
+    records = await (await tx.run(_MERGE_COUNTER_NODES, rows=_counter_rows(rows))).data()
+    updates = _counter_updates(rows, records)
+    await (await tx.run(_SET_COUNTERS, rows=updates)).consume()
+    return len(updates)
+
+
+class AsyncOmnitechPersistence:
+    """
+    Asyncio Neo4j persistence adapter for OmniTech1 graph data.
+
+    Create it, then `await connect()` (or use `async with`). Every method
+    of OmnitechPersistence is available as a coroutine, and iter_nodes /
+    iter_edges are async generators. Unlike the sync adapter, each
+    transaction runs in its own session, so any number of calls may be in
+    flight at once from different tasks.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        max_pool_size: Optional[int] = None,
+        acquisition_timeout: Optional[float] = None,
+        connection_lifetime: Optional[float] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        health_interval: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 1.0,
+        max_reset_timeout: float = 60.0,
+        fail_fast: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        Configure the adapter (no connection is made until connect).
+
+        Args:
+            uri: Neo4j connection URI (e.g., 'bolt://localhost:7687')
+            user: Neo4j username
+            password: Neo4j password
+            max_pool_size: Maximum pooled connections (driver default if
+                None); should be at least concurrency
+            acquisition_timeout: Seconds to wait for a pooled connection
+                (driver default if None)
+            connection_lifetime: Seconds after which pooled connections are
+                replaced (driver default if None)
+            max_retries: Retries of a transaction after a transient error
+            retry_backoff: Seconds before the first retry (doubled each time)
+            health_interval: Seconds between background connectivity
+                probes (0 checks on every is_connected call instead)
+            failure_threshold: Consecutive failed transactions that open
+                the circuit
+            reset_timeout: Seconds before the first reconnect attempt once
+                the circuit is open (doubled after each failed attempt)
+            max_reset_timeout: Upper bound for the reconnect backoff
+            fail_fast: Raise if the first connection attempt fails; if
+                False the circuit opens and the connection is retried in
+                the background
+            concurrency: Transactions a bulk call keeps in flight at once
+        """
+        self._uri = uri
+        self._user = user
+        self._password = password
+        self._pool_config = {
+            key: value
+            for key, value in (
+                ('max_connection_pool_size', max_pool_size),
+                ('connection_acquisition_timeout', acquisition_timeout),
+                ('max_connection_lifetime', connection_lifetime)
+            )
+            if value is not None
+        }
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.health_interval = health_interval
+        self.concurrency = max(1, concurrency)
+        self._driver = None
+        self._healthy = False
+        self._checked_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._retries = 0
+        self.fail_fast = fail_fast
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, max_reset_timeout)
+        self._probe_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """
+        Establish the connection to Neo4j.
+
+        Raises:
+            neo4j.exceptions.AuthError: If the credentials are rejected
+            neo4j.exceptions.ServiceUnavailable: If Neo4j is unreachable
+                and fail_fast is set
+        """
+        try:
+            await self._open_driver()
+        except ServiceUnavailable:
+            if self.fail_fast:
+                raise
+            logger.warning("Neo4j unavailable - reconnecting in the background")
+            self.breaker.trip()
+        if self.health_interval > 0 and self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop(), name='omnitech-neo4j-health')
+
+    async def _open_driver(self) -> None:
+        """Create the driver and verify connectivity."""
+        driver = AsyncGraphDatabase.driver(
+            self._uri,
+            auth=(self._user, self._password),
+            # Retries are handled by _transact, with its own backoff
+            max_transaction_retry_time=0,
+            **self._pool_config
+        )
+        try:
+            await driver.verify_connectivity()
+        except (ServiceUnavailable, AuthError) as e:
+            logger.error(f"Failed to connect to Neo4j: {e}")
+            self._set_health(False, e)
+            await driver.close()
+            raise
+        self._driver = driver
+        self._set_health(True)
+        self.breaker.record_success()
+        logger.info(f"Connected to Neo4j at {self._uri} (asyncio)")
+
+    def _set_health(self, healthy: bool, error: Optional[Exception] = None) -> None:
+        self._healthy = healthy
+        self._checked_at = time.time()
+        if error is not None:
+            self._last_error = str(error)
+
+    async def _probe(self) -> bool:
+        """Check connectivity (reconnecting if needed); see OmnitechPersistence._probe."""
+        if not self.breaker.allow():
+            return False
+        try:
+            if self._driver is None:
+                await self._open_driver()
+            else:
+                await self._driver.verify_connectivity()
+        except Exception as e:
+            if self._healthy:
+                logger.warning(f"Neo4j health probe failed: {e}")
+            self._set_health(False, e)
+            self.breaker.record_failure()
+            return False
+        self._set_health(True)
+        self.breaker.record_success()
+        return True
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._probe_delay())
+            await self._probe()
+
+    def _probe_delay(self) -> float:
+        """Seconds until the next probe (sooner while reconnecting)."""
+        if self.breaker.closed:
+            return self.health_interval
+        retry_in = self.breaker.stats()['retry_in'] or 0.0
+        return min(self.health_interval, max(retry_in, 0.05))
+
+    def available(self) -> bool:
+        """Whether writes are currently sent to Neo4j (circuit closed)."""
+        return self._driver is not None and self.breaker.closed
+
+    async def is_connected(self) -> bool:
+        """
+        Check if the Neo4j connection is active.
+
+        Answered from the cached health state; without a probe interval
+        the connection is checked with a round-trip.
+        """
+        if self.health_interval <= 0:
+            return await self._probe()
+        return self._driver is not None and self._healthy
+
+    def health(self) -> Dict[str, Any]:
+        """Get the cached health state."""
+        return {
+            'connected': self._driver is not None and self._healthy,
+            'checked_at': self._checked_at,
+            'last_error': self._last_error,
+            'retries': self._retries,
+            'circuit': self.breaker.stats(),
+            'pool': dict(self._pool_config),
+            'concurrency': self.concurrency
+        }
+
+    async def close(self) -> None:
+        """Close the Neo4j connection."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._driver:
+            await self._driver.close()
+            self._driver = None
+            self._set_health(False)
+            logger.info("Neo4j connection closed")
+
+    async def _transact(
+        self,
+        write: bool,
+        work: Callable[..., Awaitable[Any]],
+        args: tuple,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Run a transaction function, retrying transient failures (see OmnitechPersistence._transact)."""
+        if not self.breaker.allow():
+            raise CircuitOpenError('Neo4j circuit open - transaction not attempted')
+        if not self._driver:
+            raise ServiceUnavailable('No Neo4j connection')
+        attempt = 0
+        while True:
+            try:
+                async with self._driver.session() as session:
+                    execute = session.execute_write if write else session.execute_read
+                    result = await execute(work, *args, **kwargs)
+                if not self._healthy:
+                    self._set_health(True)
+                self.breaker.record_success()
+                return result
+            except RETRYABLE_ERRORS as e:
+                lost = isinstance(e, (ServiceUnavailable, SessionExpired))
+                if lost:
+                    self._set_health(False, e)
+                # A half-open trial is not retried
+                if attempt >= self.max_retries or (lost and not self.breaker.closed):
+                    if lost:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                attempt += 1
+                self._retries += 1
+                logger.warning(f"Transient Neo4j error, retry {attempt}/{self.max_retries} in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+            except Exception:
+                # Neo4j answered - the query failed, not the connection
+                self.breaker.record_success()
+                raise
+
+    async def execute_write(self, work: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run `await work(tx, *args, **kwargs)` in a managed write transaction.
+
+        The transaction is committed when work returns and retried (with
+        exponential backoff) after transient errors and lost connections,
+        so work must not have side effects outside the transaction.
+
+        Returns:
+            The value returned by work
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            neo4j.exceptions.ServiceUnavailable: If there is no connection
+            Exception: The last error once the retries are exhausted, or
+                any non-transient error
+        """
+        return await self._transact(True, work, args, kwargs)
+
+    async def execute_read(self, work: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Run `await work(tx, *args, **kwargs)` in a managed read transaction (see execute_write)."""
+        return await self._transact(False, work, args, kwargs)
+
+    async def save_node(self, node_id: str, attributes: Dict[str, Any]) -> bool:
+        """
+        Save a node to Neo4j.
+
+        Args:
+            node_id: Unique identifier for the node
+            attributes: Dictionary of node attributes
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._driver:
+            logger.warning("No Neo4j connection - node not persisted")
+            return False
+
+        safe_attrs = encode_attributes(attributes)
+        roots = [str(key) for key in attributes]
+
+        async def write(tx: Any) -> None:
+            record = await (await tx.run(_SAVE_NODE, node_id=node_id, attributes=safe_attrs, roots=roots)).single()
+            if record and record.get('stale'):
+                rows = _cleared_rows([{'id': node_id, 'stale': record['stale']}])
+                await (await tx.run(_CLEAR_NODE_PROPERTIES, rows=rows)).consume()
+
+        try:
+            await self.execute_write(write)
+            logger.debug(f"Saved node: {node_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save node {node_id}: {e}")
+            return False
+
+    async def save_edge(self, source: str, target: str, attributes: Dict[str, Any]) -> bool:
+        """
+        Save an edge to Neo4j.
+
+        Args:
+            source: Source node ID
+            target: Target node ID
+            attributes: Dictionary of edge attributes
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._driver:
+            logger.warning("No Neo4j connection - edge not persisted")
+            return False
+
+        safe_attrs = encode_attributes(attributes)
+        roots = [str(key) for key in attributes]
+
+        async def write(tx: Any) -> None:
+            record = await (await tx.run(
+                _SAVE_EDGE, source=source, target=target, attributes=safe_attrs, roots=roots
+            )).single()
+            if record and record.get('stale'):
+                rows = _cleared_rows([{'source': source, 'target': target, 'stale': record['stale']}])
+                await (await tx.run(_CLEAR_EDGE_PROPERTIES, rows=rows)).consume()
+
+        try:
+            await self.execute_write(write)
+            logger.debug(f"Saved edge: {source} -> {target}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save edge {source} -> {target}: {e}")
+            return False
+
+    async def save_nodes_bulk(
+        self,
+        nodes: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Save many nodes using concurrent chunked UNWIND transactions.
+
+        Nodes with the same id are merged first (later attributes win, as
+        with the sequential chunks of the sync adapter), since concurrent
+        chunks would otherwise commit them in no particular order.
+
+        Args:
+            nodes: Node dictionaries with 'id' and attributes
+            chunk_size: Number of nodes written per transaction
+
+        Returns:
+            Number of distinct nodes written by each chunk, in input order
+            (0 for a failed chunk)
+        """
+        rows = _node_rows(_merge_records(nodes, ('id',)))
+        return await self._run_bulk(_UPSERT_NODES, rows, chunk_size, 'nodes', _CLEAR_NODE_PROPERTIES)
+
+    async def save_edges_bulk(
+        self,
+        edges: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Save many edges using concurrent chunked UNWIND transactions.
+
+        Edges whose endpoints do not exist are skipped, as with save_edge;
+        save their nodes (and await the call) first. Edges with the same
+        endpoints are merged first, as in save_nodes_bulk.
+
+        Args:
+            edges: Edge dictionaries with 'source', 'target' and attributes
+            chunk_size: Number of edges written per transaction
+
+        Returns:
+            Number of distinct edges written by each chunk, in input order
+            (0 for a failed chunk)
+        """
+        rows = _edge_rows(_merge_records(edges, ('source', 'target')))
+        return await self._run_bulk(_UPSERT_EDGES, rows, chunk_size, 'edges', _CLEAR_EDGE_PROPERTIES)
+
+    async def save_subgraph(
+        self,
+        nodes: Iterable[Dict[str, Any]],
+        edges: Iterable[Dict[str, Any]]
+    ) -> bool:
+        """
+        Save nodes and the edges between them in a single transaction.
+
+        Args:
+            nodes: Node dictionaries with 'id' and attributes
+            edges: Edge dictionaries with 'source', 'target' and attributes
+
+        Returns:
+            True if the transaction committed
+        """
+        node_rows = _node_rows(nodes)
+        edge_rows = _edge_rows(edges)
+        if not node_rows and not edge_rows:
+            return True
+
+        if not self._driver:
+            logger.warning(
+                f"No Neo4j connection - subgraph of {len(node_rows)} nodes and "
+                f"{len(edge_rows)} edges not persisted"
+            )
+            return False
+
+        async def write(tx: Any) -> None:
+            if node_rows:
+                await _upsert_in_tx(tx, _UPSERT_NODES, _CLEAR_NODE_PROPERTIES, node_rows)
+            if edge_rows:
+                await _upsert_in_tx(tx, _UPSERT_EDGES, _CLEAR_EDGE_PROPERTIES, edge_rows)
+
+        try:
+            await self.execute_write(write)
+            logger.debug(f"Saved subgraph of {len(node_rows)} nodes and {len(edge_rows)} edges")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save subgraph: {e}")
+            return False
+
+    async def delete_nodes_bulk(
+        self,
+        node_ids: Iterable[str],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Delete many nodes (and their relationships) from Neo4j.
+
+        Returns:
+            Number of nodes deleted by each chunk (0 for a failed chunk)
+        """
+        rows = [{'id': node_id} for node_id in node_ids]
+        return await self._run_bulk(_DELETE_NODES, rows, chunk_size, 'node deletions')
+
+    async def increment_counters_bulk(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Add to counter properties of many nodes, creating them if needed.
+
+        Increments for the same node are merged first, so concurrent
+        chunks never touch the same node.
+
+        Args:
+            rows: Dictionaries with 'id', 'attributes' (set as-is) and
+                'counts' (property name -> amount to add)
+            chunk_size: Number of nodes updated per transaction
+
+        Returns:
+            Number of nodes updated by each chunk (0 for a failed chunk)
+        """
+        merged = _merge_increments(rows)
+        if not merged:
+            return []
+
+        chunks = list(_chunked(merged, max(1, chunk_size)))
+        if not self._driver:
+            logger.warning(f"No Neo4j connection - {len(merged)} counter updates not persisted")
+            return [0] * len(chunks)
+
+        async def write(chunk: List[Dict[str, Any]]) -> int:
+            try:
+                return await self.execute_write(_increment_in_tx, chunk)
+            except Exception as e:
+                logger.error(f"Failed to update {len(chunk)} counters: {e}")
+                return 0
+
+        return await self._pipeline(write, chunks)
+
+    async def compact_nodes(
+        self,
+        id_prefix: str,
+        cutoff: str,
+        rollup: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        batch_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> int:
+        """
+        Delete old nodes and roll their counts up into aggregate nodes.
+
+        Batches run one after another, as each one selects the oldest
+        remaining nodes (see OmnitechPersistence.compact_nodes).
+
+        Returns:
+            Total number of nodes compacted
+        """
+        if not self._driver:
+            return 0
+
+        async def compact_batch(tx: Any) -> int:
+            result = await tx.run(_COMPACT_NODES, cutoff=cutoff, prefix=id_prefix, limit=batch_size)
+            groups = await result.data()
+            if groups:
+                await _increment_in_tx(tx, _merge_increments(rollup(groups)))
+            return sum(group['count'] for group in groups)
+
+        total = 0
+        try:
+            while True:
+                compacted = await self.execute_write(compact_batch)
+                total += compacted
+                if compacted < batch_size:
+                    break
+        except Exception as e:
+            logger.error(f"Failed to compact {id_prefix}* nodes: {e}")
+
+        if total:
+            logger.info(f"Compacted {total} {id_prefix}* nodes older than {cutoff}")
+        return total
+
+    async def delete_expired_nodes(self, id_prefix: str, cutoff: str, time_property: str) -> int:
+        """
+        Delete nodes whose id starts with id_prefix and time_property < cutoff.
+
+        Returns:
+            Number of nodes deleted
+        """
+        if not self._driver:
+            return 0
+        if not _PROPERTY_NAME.match(time_property):
+            raise ValueError(f"Invalid property name: {time_property}")
+
+        query = _DELETE_EXPIRED.format(time_property=time_property)
+
+        async def delete(tx: Any) -> Optional[Dict[str, Any]]:
+            return await (await tx.run(query, prefix=id_prefix, cutoff=cutoff)).single()
+
+        try:
+            record = await self.execute_write(delete)
+            return record['deleted'] if record else 0
+        except Exception as e:
+            logger.error(f"Failed to delete expired {id_prefix}* nodes: {e}")
+            return 0
+
+    async def _pipeline(
+        self,
+        write: Callable[[List[Dict[str, Any]]], Awaitable[int]],
+        chunks: List[List[Dict[str, Any]]]
+    ) -> List[int]:
+        """Run write over chunks with at most `concurrency` in flight, keeping order."""
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(chunk: List[Dict[str, Any]]) -> int:
+            async with limit:
+                return await write(chunk)
+
+        return list(await asyncio.gather(*(bounded(chunk) for chunk in chunks)))
+
+    async def _run_bulk(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: int,
+        label: str,
+        clear_query: Optional[str] = None
+    ) -> List[int]:
+        """
+        Run an UNWIND query over rows, one transaction per chunk, with up
+        to `concurrency` chunks in flight.
+
+        A failed chunk is rolled back and reported as 0 without aborting
+        the remaining chunks. Stale properties reported by an upsert are
+        cleared with clear_query in the same transaction.
+        """
+        if not rows:
+            return []
+
+        chunks = list(_chunked(rows, max(1, chunk_size)))
+        if not self._driver:
+            logger.warning(f"No Neo4j connection - {len(rows)} {label} not persisted")
+            return [0] * len(chunks)
+
+        async def write(chunk: List[Dict[str, Any]]) -> int:
+            try:
+                return await self.execute_write(_upsert_in_tx, query, clear_query, chunk)
+            except Exception as e:
+                logger.error(f"Failed to save chunk of {len(chunk)} {label}: {e}")
+                return 0
+
+        counts = await self._pipeline(write, chunks)
+        logger.debug(f"Bulk saved {sum(counts)}/{len(rows)} {label}")
+        return counts
+
+    async def get_all_nodes(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve all nodes from Neo4j.
+
+        Returns:
+            List of node dictionaries with 'id' and attributes
+        """
+        if not self._driver:
+            return []
+
+        async def read(tx: Any) -> List[Dict[str, Any]]:
+            return [decode_properties(dict(record['n'])) async for record in await tx.run(_ALL_NODES)]
+
+        try:
+            return await self.execute_read(read)
+        except Exception as e:
+            logger.error(f"Failed to get nodes: {e}")
+            return []
+
+    async def find_node_by_delivery(self, delivery_id: str) -> Optional[str]:
+        """
+        Find the node recorded for a webhook delivery.
+
+        Returns:
+            The node id, or None if the delivery is unknown (or on error)
+        """
+        if not self._driver:
+            return None
+
+        async def read(tx: Any) -> Optional[Dict[str, Any]]:
+            return await (await tx.run(_NODE_BY_DELIVERY, delivery_id=delivery_id)).single()
+
+        try:
+            record = await self.execute_read(read)
+            return record['id'] if record else None
+        except Exception as e:
+            logger.error(f"Failed to look up delivery {delivery_id}: {e}")
+            return None
+
+    async def get_all_edges(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve all edges from Neo4j.
+
+        Returns:
+            List of edge dictionaries with 'source', 'target', and attributes
+        """
+        if not self._driver:
+            return []
+
+        async def read(tx: Any) -> List[Dict[str, Any]]:
+            return [
+                {'source': record['source'], 'target': record['target'], **decode_properties(record['attrs'])}
+                async for record in await tx.run(_ALL_EDGES)
+            ]
+
+        try:
+            return await self.execute_read(read)
+        except Exception as e:
+            logger.error(f"Failed to get edges: {e}")
+            return []
+
+    async def iter_nodes(self, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all nodes from Neo4j in keyset-paginated pages.
+
+        Args:
+            page_size: Number of nodes fetched per query
+
+        Yields:
+            Node dictionaries with 'id' and attributes
+        """
+        if not self._driver:
+            return
+
+        async def read(tx: Any, after: str) -> List[Dict[str, Any]]:
+            return await (await tx.run(_PAGE_NODES, after=after, limit=page_size)).data()
+
+        after = ''
+        while True:
+            try:
+                page = await self.execute_read(read, after)
+            except Exception as e:
+                logger.error(f"Failed to page nodes after {after!r}: {e}")
+                raise
+
+            for record in page:
+                yield {**decode_properties(record['props']), 'id': record['id']}
+
+            if len(page) < page_size:
+                return
+            after = page[-1]['id']
+
+    async def iter_edges(self, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all edges from Neo4j in keyset-paginated pages.
+
+        Args:
+            page_size: Number of edges fetched per query
+
+        Yields:
+            Edge dictionaries with 'source', 'target', and attributes
+        """
+        if not self._driver:
+            return
+
+        async def read(tx: Any, after_source: str, after_target: str) -> List[Dict[str, Any]]:
+            result = await tx.run(
+                _PAGE_EDGES,
+                after_source=after_source,
+                after_target=after_target,
+                limit=page_size
+            )
+            return await result.data()
+
+        after_source, after_target = '', ''
+        while True:
+            try:
+                page = await self.execute_read(read, after_source, after_target)
+            except Exception as e:
+                logger.error(f"Failed to page edges after {after_source!r} -> {after_target!r}: {e}")
+                raise
+
+            for record in page:
+                attrs = decode_properties(record['attrs'])
+                yield {**attrs, 'source': record['source'], 'target': record['target']}
+
+            if len(page) < page_size:
+                return
+            after_source, after_target = page[-1]['source'], page[-1]['target']
+
+    async def iter_nodes_since(
+        self,
+        watermark: Optional[Union[int, str, Sequence[Any]]] = None,
+        properties: Optional[Iterable[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Stream the nodes written at or after a watermark.
+
+        See OmnitechPersistence.iter_nodes_since.
+
+        Yields:
+            (cursor, node) pairs
+        """
+        after_updated_at, after_id = _watermark(watermark, 2)
+        if not self._driver:
+            return
+
+        query, params = _delta_query(_NODES_SINCE, 'n', properties)
+
+        async def read(tx: Any, after_updated_at: int, after_id: str) -> List[Dict[str, Any]]:
+            result = await tx.run(
+                query,
+                params,
+                after_updated_at=after_updated_at,
+                after_id=after_id,
+                limit=page_size
+            )
+            return await result.data()
+
+        while True:
+            try:
+                page = await self.execute_read(read, after_updated_at, after_id)
+            except Exception as e:
+                logger.error(f"Failed to export nodes after {after_updated_at!r}/{after_id!r}: {e}")
+                raise
+
+            for record in page:
+                cursor = [record['updated_at'], record['id']]
+                yield cursor, {**_delta_properties(record['props']), 'id': record['id']}
+
+            if len(page) < page_size:
+                return
+            after_updated_at, after_id = page[-1]['updated_at'], page[-1]['id']
+
+    async def iter_edges_since(
+        self,
+        watermark: Optional[Union[int, str, Sequence[Any]]] = None,
+        properties: Optional[Iterable[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Stream the edges written at or after a watermark.
+
+        See OmnitechPersistence.iter_edges_since.
+
+        Yields:
+            (cursor, edge) pairs
+        """
+        after = _watermark(watermark, 3)
+        if not self._driver:
+            return
+
+        query, params = _delta_query(_EDGES_SINCE, 'r', properties)
+
+        async def read(tx: Any, after_updated_at: int, after_source: str, after_target: str) -> List[Dict[str, Any]]:
+            result = await tx.run(
+                query,
+                params,
+                after_updated_at=after_updated_at,
+                after_source=after_source,
+                after_target=after_target,
+                limit=page_size
+            )
+            return await result.data()
+
+        while True:
+            try:
+                page = await self.execute_read(read, *after)
+            except Exception as e:
+                logger.error(f"Failed to export edges after {after[0]!r}/{after[1]!r}: {e}")
+                raise
+
+            for record in page:
+                cursor = [record['updated_at'], record['source'], record['target']]
+                attrs = _delta_properties(record['attrs'])
+                yield cursor, {**attrs, 'source': record['source'], 'target': record['target']}
+
+            if len(page) < page_size:
+                return
+            after = [page[-1]['updated_at'], page[-1]['source'], page[-1]['target']]
+
+    async def clear_all(self) -> bool:
+        """
+        Clear all OmniNode data from Neo4j.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._driver:
+            return False
+
+        async def clear(tx: Any) -> None:
+            await (await tx.run(_CLEAR_ALL)).consume()
+
+        try:
+            await self.execute_write(clear)
+            logger.info("Cleared all OmniNode data")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to clear data: {e}")
+            return False
+
+    async def __aenter__(self):
+        """Async context manager entry (connects)."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
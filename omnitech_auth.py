@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Admin Authentication
+ScrollVerse Genesis Protocol - JWT Verification Cache
+
+This module verifies admin bearer tokens. Signing keys are selected by
+the token's `kid` header (falling back to the default key for tokens
+without a kid or with one not in the key set), and tokens that have already been verified are
+remembered (by hash, until they expire) so polling dashboards do not pay
+for a signature check on every request.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import jwt
+
+logger = logging.getLogger(__name__)
+
+# Algorithms accepted for admin tokens
+ALGORITHMS = ['HS256']
+
+
+def parse_keyset(value: Optional[str], strict: bool = True) -> Dict[str, str]:
+    """
+    Parse a JWT key set of the form 'kid1:key1,kid2:key2'.
+
+    Args:
+        value: Key set string
+        strict: Raise on a malformed entry instead of logging and skipping it
+
+    Raises:
+        ValueError: If strict and an entry has no kid or no key
+    """
+    keys = {}
+    for position, entry in enumerate((value or '').split(',')):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kid, sep, key = entry.partition(':')
+        if not sep or not kid or not key:
+            if strict:
+                raise ValueError("JWT_KEYS entries must look like 'kid:key'")
+            # Never log the entry itself - it may be a key
+            logger.error(f"Ignoring malformed JWT_KEYS entry #{position + 1} (expected 'kid:key')")
+            continue
+        keys[kid] = key
+    return keys
+
+
+class JWTVerifier:
+    """
+    HS256 token verifier with a key set and a verified-token cache.
+
+    Args:
+        default_key: Key for tokens without a kid header, or whose kid is
+            not in keys (may be None)
+        keys: Keys by kid
+        capacity: Maximum number of verified tokens remembered
+        max_ttl: Maximum seconds a verified token is remembered (tokens
+            without an exp claim are re-verified after this)
+        clock: Function returning the current Unix time
+    """
+
+    def __init__(
+        self,
+        default_key: Optional[str] = None,
+        keys: Optional[Dict[str, str]] = None,
+        capacity: int = 1024,
+        max_ttl: float = 300,
+        clock: Callable[[], float] = time.time
+    ):
+        self._default_key = default_key
+        self._keys = dict(keys or {})
+        self.capacity = max(1, capacity)
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # sha256(token) -> expires at (Unix time)
+        self._verified: 'OrderedDict[bytes, float]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any signing key is configured."""
+        return bool(self._default_key or self._keys)
+
+    def _key_for(self, token: str) -> Optional[str]:
+        """Select the signing key from the token's kid header."""
+        kid = jwt.get_unverified_header(token).get('kid')
+        # Many issuers add a kid by default: an unknown one means the default key
+        return self._keys.get(kid, self._default_key) if kid is not None else self._default_key
+
+    def verify(self, token: str) -> bool:
+        """
+        Check a bearer token.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or no key applies
+        """
+        digest = hashlib.sha256(token.encode('utf-8')).digest()
+        now = self._clock()
+        with self._lock:
+            expires = self._verified.get(digest)
+            if expires is not None:
+                if expires > now:
+                    self._verified.move_to_end(digest)
+                    self.hits += 1
+                    return True
+                del self._verified[digest]
+            self.misses += 1
+
+        key = self._key_for(token)
+        if key is None:
+            raise jwt.InvalidTokenError('Unknown signing key')
+        claims = jwt.decode(token, key, algorithms=ALGORITHMS)
+
+        expires = now + self.max_ttl
+        if isinstance(claims.get('exp'), (int, float)):
+            expires = min(expires, claims['exp'])
+        with self._lock:
+            self._verified[digest] = expires
+            while len(self._verified) > self.capacity:
+                self._verified.popitem(last=False)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'cached_tokens': len(self._verified),
+                'keys': len(self._keys) + (1 if self._default_key else 0),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+class AdminAuthConfig:
+    """
+    Snapshot of the admin authentication settings.
+
+    Args:
+        admin_token: Static admin token (X-Admin-Token)
+        jwt_secret: Key for bearer tokens without a kid
+        jwt_keys: Key set string for bearer tokens with a kid (malformed
+            entries are logged and ignored; validate with parse_keyset at
+            startup)
+    """
+
+    def __init__(self, admin_token: Optional[str], jwt_secret: Optional[str], jwt_keys: Optional[str] = None):
+        self.admin_token = admin_token
+        self.jwt = JWTVerifier(jwt_secret, parse_keyset(jwt_keys, strict=False))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any authentication method is configured."""
+        return bool(self.admin_token) or self.jwt.enabled
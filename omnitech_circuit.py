@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Circuit Breaker
+ScrollVerse Genesis Protocol - Failure Isolation
+
+This module stops callers from waiting on a dependency that is down. After
+a run of consecutive failures the circuit opens and calls are refused
+immediately. Once the reset timeout has passed a single trial call is let
+through (half-open): success closes the circuit, failure opens it again
+with the timeout doubled, up to a maximum.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Circuit states
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with exponential backoff.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open the first time
+        max_reset_timeout: Upper bound for the doubled reset timeout
+        clock: Monotonic clock
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 1.0,
+        max_reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._timeout = reset_timeout
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go ahead.
+
+        In the open state this is False until the reset timeout has
+        passed; then one caller at a time is let through as the trial.
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            now = self._clock()
+            if self.state == STATE_OPEN and now - self._opened_at >= self._timeout:
+                self.state = STATE_HALF_OPEN
+                self._trial_started = None
+            if self.state == STATE_HALF_OPEN:
+                # A trial that never reported back must not block forever
+                if self._trial_started is None or now - self._trial_started >= self._timeout:
+                    self._trial_started = now
+                    return True
+            self.rejected += 1
+            return False
+
+    @property
+    def closed(self) -> bool:
+        """Whether calls are flowing normally."""
+        return self.state == STATE_CLOSED
+
+    def record_success(self) -> None:
+        """Report a successful call (closes the circuit)."""
+        with self._lock:
+            self.state = STATE_CLOSED
+            self._failures = 0
+            self._timeout = self.reset_timeout
+            self._trial_started = None
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+                self._open()
+                return
+            self._failures += 1
+            if self.state == STATE_CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self) -> None:
+        """Open the circuit immediately (e.g. when a connection attempt fails)."""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            self._open()
+
+    def _open(self) -> None:
+        if self.state != STATE_OPEN:
+            self.opened += 1
+        self.state = STATE_OPEN
+        self._opened_at = self._clock()
+        self._trial_started = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics."""
+        with self._lock:
+            retry_in = None
+            if self.state == STATE_OPEN:
+                retry_in = max(0.0, round(self._opened_at + self._timeout - self._clock(), 3))
+            return {
+                'state': self.state,
+                'consecutive_failures': self._failures,
+                'reset_timeout': self._timeout,
+                'retry_in': retry_in,
+                'opened': self.opened,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Cluster Bus
+ScrollVerse Genesis Protocol - Multi-Worker Graph Fan-Out
+
+This module lets several server processes share one logical graph. Every
+worker publishes the graph deltas it applies (together with the Socket.IO
+event that announced them) to a message queue; the other workers replay
+the deltas into their own graph and notify their own clients. Each worker
+keeps its own revision log, so dashboards pinned to a worker see a
+gap-free delta stream. If a worker loses its subscription it reconnects
+with backoff and then asks its dashboards to resync, since changes
+published in the meantime were missed.
+
+Brokers:
+    local://          In-process broker (single worker, tests)
+    redis://host/db   Redis pub/sub (requires the optional redis package)
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel carrying graph changes
+CHANNEL = 'omnitech:graph'
+
+# Seconds before re-subscribing after a lost connection (doubled up to the maximum)
+RECONNECT_BACKOFF = 0.5
+MAX_RECONNECT_BACKOFF = 30.0
+
+MessageHandler = Callable[[Dict[str, Any]], None]
+
+
+class LocalBroker:
+    """
+    In-process broker.
+
+    Messages are delivered synchronously to every subscriber, so several
+    MutationBus instances sharing one LocalBroker behave like workers
+    sharing a message queue.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[MessageHandler]] = {}
+        # lease name -> (owner, expires at)
+        self._leases: Dict[str, tuple] = {}
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Deliver a message to every subscriber of a channel."""
+        with self._lock:
+            handlers = list(self._subscribers.get(channel, ()))
+        # Round-trip through JSON so local delivery matches a real broker
+        payload = json.dumps(message, default=str)
+        for handler in handlers:
+            handler(json.loads(payload))
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: MessageHandler,
+        on_reconnect: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Register a handler for messages on a channel (never disconnects)."""
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(handler)
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease; True if owner now holds it."""
+        now = time.monotonic()
+        with self._lock:
+            holder = self._leases.get(name)
+            if holder is None or holder[0] == owner or holder[1] <= now:
+                self._leases[name] = (owner, now + ttl)
+                return True
+            return False
+
+    def close(self) -> None:
+        """Drop all subscribers."""
+        with self._lock:
+            self._subscribers.clear()
+
+
+class RedisBroker:
+    """
+    Redis pub/sub broker.
+
+    Args:
+        url: Redis URL (redis://host:port/db)
+    """
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("The redis package is required for a redis:// message queue")
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.reconnects = 0
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Publish a message to a channel."""
+        self._client.publish(channel, json.dumps(message, default=str))
+
+    def _open_pubsub(self, channel: str) -> Any:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+        self._pubsub = pubsub
+        return pubsub
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: MessageHandler,
+        on_reconnect: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Deliver messages on a channel to handler from a listener thread.
+
+        A lost connection is logged and the channel re-subscribed with
+        exponential backoff.
+
+        Args:
+            channel: Channel name
+            handler: Called with each decoded message
+            on_reconnect: Called after re-subscribing (messages published
+                while disconnected are lost)
+        """
+        pubsub = self._open_pubsub(channel)
+
+        def listen():
+            nonlocal pubsub
+            delay = RECONNECT_BACKOFF
+            while not self._closed:
+                try:
+                    if pubsub is None:
+                        pubsub = self._open_pubsub(channel)
+                        self.reconnects += 1
+                        delay = RECONNECT_BACKOFF
+                        logger.info(f"Re-subscribed to cluster channel {channel}")
+                        if on_reconnect is not None:
+                            on_reconnect()
+                    for item in pubsub.listen():
+                        try:
+                            handler(json.loads(item['data']))
+                        except Exception as e:
+                            logger.error(f"Failed to handle cluster message: {e}")
+                    if self._closed:
+                        break
+                    raise ConnectionError('subscription ended')
+                except Exception as e:
+                    if self._closed:
+                        break
+                    logger.error(f"Cluster subscription lost: {e} - reconnecting in {delay:.1f}s")
+                    if pubsub is not None:
+                        try:
+                            pubsub.close()
+                        except Exception:
+                            pass
+                        pubsub = None
+                    time.sleep(delay)
+                    delay = min(delay * 2, MAX_RECONNECT_BACKOFF)
+
+        self._thread = threading.Thread(target=listen, name='omnitech-cluster', daemon=True)
+        self._thread.start()
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease; True if owner now holds it."""
+        key = f"omnitech:lease:{name}"
+        ttl_ms = max(1, int(ttl * 1000))
+        if self._client.set(key, owner, nx=True, px=ttl_ms):
+            return True
+        holder = self._client.get(key)
+        if holder is not None and holder.decode('utf-8') == owner:
+            self._client.pexpire(key, ttl_ms)
+            return True
+        return False
+
+    def close(self) -> None:
+        """Stop listening and close the connection."""
+        self._closed = True
+        if self._pubsub is not None:
+            self._pubsub.close()
+        self._client.close()
+
+
+def create_broker(url: Optional[str]) -> Any:
+    """
+    Create a broker from a message queue URL.
+
+    Args:
+        url: local:// or redis:// URL (None or empty uses a local broker)
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url.startswith('local://'):
+        return LocalBroker()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported message queue URL: {url}")
+
+
+class MutationBus:
+    """
+    Publishes local graph changes and delivers remote ones.
+
+    A change is a Socket.IO event name, its payload without revision
+    fields, and the deltas it applied (also without revisions - each
+    worker assigns its own).
+
+    Args:
+        broker: LocalBroker, RedisBroker or compatible object
+        origin: Identifier of this worker (random if omitted)
+    """
+
+    def __init__(self, broker: Any, origin: Optional[str] = None):
+        self._broker = broker
+        self.origin = origin or uuid.uuid4().hex
+        self._started = False
+        self.published = 0
+        self.received = 0
+        self.failed = 0
+        self.resyncs = 0
+
+    def start(self, handler: MessageHandler, on_resync: Optional[Callable[[], None]] = None) -> None:
+        """
+        Subscribe to changes from other workers.
+
+        Args:
+            handler: Called with each remote change ({'event', 'data', 'deltas'})
+            on_resync: Called when the subscription was re-established after
+                a disconnect, i.e. remote changes may have been missed
+        """
+        if self._started:
+            return
+
+        def deliver(message: Dict[str, Any]) -> None:
+            if message.get('origin') == self.origin:
+                return
+            self.received += 1
+            try:
+                handler(message)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Failed to apply cluster change: {e}")
+
+        def resync() -> None:
+            self.resyncs += 1
+            if on_resync is not None:
+                on_resync()
+
+        self._broker.subscribe(CHANNEL, deliver, resync)
+        self._started = True
+
+    def publish(self, event: str, data: Dict[str, Any], deltas: List[Dict[str, Any]]) -> None:
+        """Publish a local change to the other workers."""
+        message = {
+            'origin': self.origin,
+            'event': event,
+            'data': data,
+            'deltas': [
+                {k: v for k, v in delta.items() if k != 'revision'}
+                for delta in deltas
+            ]
+        }
+        try:
+            self._broker.publish(CHANNEL, message)
+            self.published += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Failed to publish cluster change: {e}")
+
+    def acquire_lease(self, name: str, ttl: float) -> bool:
+        """Check whether this worker holds (or now takes) a named lease."""
+        try:
+            return self._broker.acquire_lease(name, self.origin, ttl)
+        except Exception as e:
+            logger.error(f"Failed to acquire lease {name}: {e}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get bus statistics."""
+        return {
+            'origin': self.origin,
+            'broker': type(self._broker).__name__,
+            'published': self.published,
+            'received': self.received,
+            'failed': self.failed,
+            'resyncs': self.resyncs
+        }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Attribute Codec
+ScrollVerse Genesis Protocol - Typed Neo4j Properties
+
+This module maps graph attributes to Neo4j property values and back.
+Primitives are stored as-is, homogeneous lists become native arrays,
+datetimes become native temporal values, and nested dictionaries are
+flattened into dotted property keys, so all of these stay queryable in
+Cypher (e.g. n.`repository.name`). Values Neo4j cannot store natively
+(None, mixed lists, lists of dictionaries, ...) are stored as compact JSON
+under the attribute name plus JSON_SUFFIX. decode_properties reverses the
+mapping. Since one attribute can map to several properties, the
+persistence layer removes the properties left over from an attribute's
+previous encoding whenever it rewrites that attribute.
+
+Attribute names should not contain '.' or end with JSON_SUFFIX, and
+UPDATED_AT is reserved for the write stamp the persistence layer adds (it
+is dropped on decode). Properties written before this codec existed (repr
+strings) are read back unchanged.
+"""
+
+import datetime
+import json
+from typing import Any, Dict
+
+from neo4j.time import Date, DateTime, Time
+
+# Separator of flattened dictionary keys
+KEY_SEPARATOR = '.'
+
+# Suffix of properties holding a JSON-encoded value
+JSON_SUFFIX = '__json'
+
+# Property stamped on every node and relationship write (epoch milliseconds)
+UPDATED_AT = 'updated_at'
+
+# Neo4j integers are signed 64-bit
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+_PRIMITIVES = (str, bool, int, float)
+_TEMPORALS = (datetime.datetime, datetime.date, datetime.time)
+_NEO4J_TEMPORALS = (DateTime, Date, Time)
+
+
+def _native(value: Any) -> bool:
+    """Whether Neo4j can store value as a property as-is."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return _INT_MIN <= value <= _INT_MAX
+    return isinstance(value, _PRIMITIVES + _TEMPORALS)
+
+
+def _native_list(value: Any) -> bool:
+    """Whether value can be stored as a native array (a single element type)."""
+    if not isinstance(value, (list, tuple)):
+        return False
+    if not value:
+        return True
+    kind = type(value[0])
+    return all(type(item) is kind and _native(item) for item in value)
+
+
+def _flattenable(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(
+            isinstance(key, str) and KEY_SEPARATOR not in key and not key.endswith(JSON_SUFFIX)
+            for key in value
+        )
+    )
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def _encode(key: str, value: Any, out: Dict[str, Any]) -> None:
+    if _native(value):
+        out[key] = value
+    elif _native_list(value):
+        out[key] = list(value)
+    elif _flattenable(value):
+        for sub_key, sub_value in value.items():
+            _encode(f'{key}{KEY_SEPARATOR}{sub_key}', sub_value, out)
+    else:
+        out[key + JSON_SUFFIX] = _to_json(value)
+
+
+def encode_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode graph attributes as Neo4j properties.
+
+    Args:
+        attributes: Attribute name -> value
+
+    Returns:
+        Property name -> value Neo4j can store
+    """
+    out: Dict[str, Any] = {}
+    for key, value in attributes.items():
+        _encode(str(key), value, out)
+    return out
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, _NEO4J_TEMPORALS):
+        return value.to_native()
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def decode_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode Neo4j properties written by encode_attributes.
+
+    Args:
+        properties: Property name -> value as returned by the driver
+
+    Returns:
+        Attribute name -> value
+    """
+    out: Dict[str, Any] = {}
+    # Shallow keys first, so a scalar always wins over a clashing nested key
+    for key, value in sorted(properties.items(), key=lambda item: item[0].count(KEY_SEPARATOR)):
+        if key == UPDATED_AT:
+            continue
+        if key.endswith(JSON_SUFFIX) and isinstance(value, str):
+            key = key[:-len(JSON_SUFFIX)]
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        else:
+            value = _decode_value(value)
+
+        *parents, leaf = key.split(KEY_SEPARATOR)
+        target = out
+        for parent in parents:
+            child = target.setdefault(parent, {})
+            if not isinstance(child, dict):
+                # A scalar was stored under the same name: keep the key flat
+                target, leaf = out, key
+                break
+            target = child
+        target[leaf] = value
+    return out
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Delivery Deduplication
+ScrollVerse Genesis Protocol - Idempotent Webhook Ingestion
+
+This module remembers recently processed webhook deliveries by their
+X-GitHub-Delivery id. A retried delivery is answered from the cache
+without touching the graph, persistence or Socket.IO subscribers. A
+delivery is claimed before it is processed, so a retry that arrives while
+the original is still in flight is not processed twice.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class DeliveryCache:
+    """
+    Bounded LRU cache of processed deliveries with a time-to-live.
+
+    Args:
+        capacity: Maximum number of deliveries remembered
+        ttl: Seconds a delivery is remembered (0 keeps it until evicted)
+        clock: Function returning a monotonic time in seconds
+    """
+
+    def __init__(self, capacity: int = 10000, ttl: float = 86400, clock: Callable[[], float] = time.monotonic):
+        self.capacity = max(1, capacity)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # delivery id -> (expires at, cached response or None while claimed)
+        self._entries: 'OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response of a processed delivery.
+
+        Returns:
+            The response stored by remember(), or None if the delivery is
+            unknown, expired or still being processed
+        """
+        with self._lock:
+            entry = self._lookup(delivery_id)
+            if entry is None or entry[1] is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def claim(self, delivery_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Atomically claim a delivery for processing.
+
+        The claimer must remember() the delivery once it is processed, or
+        release() it if processing fails.
+
+        Returns:
+            (True, None) if the caller now owns the delivery, (False,
+            response) if it was already processed, or (False, None) if
+            another request is processing it
+        """
+        with self._lock:
+            entry = self._lookup(delivery_id)
+            if entry is not None:
+                if entry[1] is not None:
+                    self.hits += 1
+                return False, entry[1]
+            self.misses += 1
+            self._store(delivery_id, None)
+            return True, None
+
+    def release(self, delivery_id: str) -> None:
+        """Drop an unfinished claim, so a retry of the delivery is processed."""
+        with self._lock:
+            entry = self._entries.get(delivery_id)
+            if entry is not None and entry[1] is None:
+                del self._entries[delivery_id]
+
+    def remember(self, delivery_id: str, response: Dict[str, Any]) -> None:
+        """Record the response of a successfully processed delivery."""
+        with self._lock:
+            self._store(delivery_id, response)
+
+    def _lookup(self, delivery_id: str) -> Optional[Tuple[float, Optional[Dict[str, Any]]]]:
+        """Get the live entry of a delivery, dropping it if expired (lock held)."""
+        entry = self._entries.get(delivery_id)
+        if entry is None:
+            return None
+        if self.ttl > 0 and entry[0] <= self._clock():
+            del self._entries[delivery_id]
+            return None
+        self._entries.move_to_end(delivery_id)
+        return entry
+
+    def _store(self, delivery_id: str, response: Optional[Dict[str, Any]]) -> None:
+        """Insert or refresh an entry and evict the oldest past capacity (lock held)."""
+        self._entries[delivery_id] = (self._clock() + self.ttl, response)
+        self._entries.move_to_end(delivery_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'pending': sum(1 for _, response in self._entries.values() if response is None),
+                'capacity': self.capacity,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Emit Coalescer
+ScrollVerse Genesis Protocol - Batched Graph Broadcasts
+
+This module batches graph broadcasts. Instead of one Socket.IO message per
+mutation, subscribed clients receive one 'graph_updated_batch' per tick
+holding every delta recorded since the previous tick plus the events that
+announced them. Clients that subscribed with a filter share a room per
+filter and only receive the matching part of each batch. Clients
+acknowledge the revisions they have applied; a client that falls too far
+behind is taken off the broadcast and told to reload a snapshot. Clients
+that never subscribed keep receiving every event as it happens (in
+DIRECT_ROOM), as they did before coalescing existed.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from omnitech_subscriptions import FULL_GRAPH_ROOM, SubscriptionFilter
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = '/'
+
+# Room of connected clients that have not joined the coalesced broadcast
+DIRECT_ROOM = 'graph-events'
+
+
+class EmitCoalescer:
+    """
+    Collects graph events and broadcasts them once per tick.
+
+    Args:
+        socketio: Flask-SocketIO instance
+        changes_getter: Returns the GraphChangeLog deltas are read from
+        graph_getter: Returns the graph filtered subscriptions are matched
+            against
+        interval: Seconds between broadcasts (0 disables coalescing)
+        max_lag: Maximum unacknowledged deltas before a client is
+            dropped to a snapshot
+    """
+
+    def __init__(
+        self,
+        socketio: Any,
+        changes_getter: Callable[[], Any],
+        graph_getter: Callable[[], Any] = lambda: None,
+        interval: float = 0.1,
+        max_lag: int = 5000
+    ):
+        self._socketio = socketio
+        self._changes_getter = changes_getter
+        self._graph_getter = graph_getter
+        self.interval = interval
+        self.max_lag = max_lag
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        # sid -> last revision the client acknowledged
+        self._acked: Dict[str, int] = {}
+        # sid -> revision of the last batch sent to the client
+        self._owed: Dict[str, int] = {}
+        # sid -> room, and room -> filter (None for the full graph)
+        self._rooms: Dict[str, str] = {}
+        self._filters: Dict[str, Optional[SubscriptionFilter]] = {}
+        # Connected clients outside the broadcast (in DIRECT_ROOM)
+        self._direct: Set[str] = set()
+        self._epoch: Optional[str] = None
+        self._sent = 0
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.coalesced_events = 0
+        self.dropped_clients = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether broadcasts are coalesced."""
+        return self.interval > 0
+
+    @property
+    def direct_clients(self) -> int:
+        """Number of connected clients that receive events individually."""
+        with self._lock:
+            return len(self._direct)
+
+    def connect(self, sid: str) -> None:
+        """Send a newly connected client every event until it joins the broadcast."""
+        with self._lock:
+            self._direct.add(sid)
+        self._socketio.server.enter_room(sid, DIRECT_ROOM, namespace=NAMESPACE)
+
+    def join(self, sid: str, revision: int, subscription: Optional[SubscriptionFilter] = None) -> None:
+        """
+        Add a client to the broadcast.
+
+        Args:
+            sid: Socket.IO session id
+            revision: Revision of the state the client was sent
+            subscription: Part of the graph the client follows (None for all)
+        """
+        room = subscription.room if subscription is not None else FULL_GRAPH_ROOM
+        with self._lock:
+            direct = sid in self._direct
+            previous = self._forget(sid)
+            self._rooms[sid] = room
+            self._filters[room] = subscription
+            self._acked[sid] = self._owed[sid] = revision
+        if direct:
+            self._socketio.server.leave_room(sid, DIRECT_ROOM, namespace=NAMESPACE)
+        if previous is not None and previous != room:
+            self._socketio.server.leave_room(sid, previous, namespace=NAMESPACE)
+        self._socketio.server.enter_room(sid, room, namespace=NAMESPACE)
+
+    def leave(self, sid: str) -> None:
+        """Forget a client (on disconnect)."""
+        with self._lock:
+            self._forget(sid)
+
+    def _forget(self, sid: str) -> Optional[str]:
+        """Drop a client's state (caller holds the lock) and return its room."""
+        self._direct.discard(sid)
+        self._acked.pop(sid, None)
+        self._owed.pop(sid, None)
+        room = self._rooms.pop(sid, None)
+        if room is not None and room not in self._rooms.values():
+            self._filters.pop(room, None)
+        return room
+
+    def ack(self, sid: str, revision: int) -> None:
+        """Record the revision a client has applied."""
+        with self._lock:
+            if sid in self._acked and revision > self._acked[sid]:
+                self._acked[sid] = revision
+
+    def submit(self, event: str, data: Dict[str, Any]) -> None:
+        """
+        Queue an event for the next broadcast.
+
+        The deltas themselves are read from the change log at flush time,
+        so a batch always covers a gap-free revision range.
+        """
+        with self._lock:
+            if event != 'graph_delta':
+                self._events.append({'event': event, **data})
+            self.coalesced_events += 1
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        """Start the broadcast thread on first use (caller holds the lock)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='omnitech-emitter', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Broadcast loop."""
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Graph broadcast failed: {e}")
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Broadcast everything recorded since the last batch.
+
+        Returns:
+            The full-graph batch, or None if there was nothing to send
+        """
+        with self._flush_lock:
+            changes = self._changes_getter()
+            with self._lock:
+                events, self._events = self._events, []
+                if self._epoch is None:
+                    self._epoch = changes.epoch
+                filters = dict(self._filters)
+
+            deltas = changes.since(self._sent, self._epoch)
+            if deltas is None:
+                # Hydrated, replaced or overrun - every subscriber reloads
+                self._epoch, self._sent = changes.epoch, changes.revision
+                for room in filters:
+                    self._socketio.emit('graph_resync', {'reason': 'reset'}, to=room, namespace=NAMESPACE)
+                return None
+            if not deltas and not events:
+                return None
+
+            revision = deltas[-1]['revision'] if deltas else self._sent
+            batch = {
+                'epoch': self._epoch,
+                'from_revision': self._sent,
+                'revision': revision,
+                'deltas': deltas,
+                'events': events
+            }
+            self._sent = revision
+
+            # Filter once per room; rooms with nothing relevant are skipped
+            outgoing = {}
+            graph = self._graph_getter()
+            for room, subscription in filters.items():
+                if subscription is None:
+                    outgoing[room] = batch
+                    continue
+                room_deltas, room_events = subscription.select(graph, deltas, events)
+                if room_deltas or room_events:
+                    outgoing[room] = {**batch, 'deltas': room_deltas, 'events': room_events, 'filtered': True}
+
+            self._drop_lagging(revision, outgoing)
+            for room, payload in outgoing.items():
+                self._socketio.emit('graph_updated_batch', payload, to=room, namespace=NAMESPACE)
+            self.batches += 1
+            return batch
+
+    def _drop_lagging(self, revision: int, outgoing: Dict[str, Any]) -> None:
+        """
+        Take clients that are too far behind off the broadcast.
+
+        A client lags when it has not acknowledged the batches it was sent;
+        filtered clients that were sent nothing are up to date.
+        """
+        with self._lock:
+            lagging = []
+            for sid, room in self._rooms.items():
+                if room in outgoing:
+                    self._owed[sid] = revision
+                acked = self._acked[sid]
+                if acked >= self._owed[sid]:
+                    self._acked[sid] = self._owed[sid] = revision
+                elif revision - acked > self.max_lag:
+                    lagging.append(sid)
+            rooms = [(sid, self._forget(sid)) for sid in lagging]
+        for sid, room in rooms:
+            self._socketio.server.leave_room(sid, room, namespace=NAMESPACE)
+            self._socketio.emit('graph_resync', {'reason': 'lagging'}, to=sid, namespace=NAMESPACE)
+            self.dropped_clients += 1
+            logger.info(f"Client {sid} fell behind by more than {self.max_lag} deltas - resyncing")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get broadcast statistics."""
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'max_lag': self.max_lag,
+                'subscribers': len(self._acked),
+                'direct_clients': len(self._direct),
+                'rooms': len(self._filters),
+                'pending_events': len(self._events),
+                'last_revision': self._sent,
+                'batches': self.batches,
+                'coalesced_events': self.coalesced_events,
+                'dropped_clients': self.dropped_clients
+            }
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Event Extractors
+ScrollVerse Genesis Protocol - Webhook to Graph Pipeline
+
+This module turns webhook payloads into graph structure. Every webhook
+node is linked to its repository and sender, and per-event-type
+extractors add the entities the event is about (commits, pull requests,
+issues, workflow runs). The result is one GraphBatch that the server
+applies and persists as a single mutation.
+
+Node ids:
+    repo:<owner/name>            user:<login>
+    commit:<sha>                 pr:<owner/name>#<number>
+    issue:<owner/name>#<number>  workflow_run:<id>
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from omnitech_payload import WebhookPayload
+
+# Edge relations
+REL_ABOUT = 'about'
+REL_SENT_BY = 'sent_by'
+REL_BELONGS_TO = 'belongs_to'
+REL_AUTHORED = 'authored'
+REL_RAN_ON = 'ran_on'
+
+Extractor = Callable[[WebhookPayload, str, 'GraphBatch'], None]
+
+# event type -> extractor
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+class GraphBatch:
+    """
+    Nodes and edges produced by one webhook, merged by key.
+
+    Attributes:
+        nodes: node id -> attributes
+        edges: (source, target) -> attributes
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add_node(self, node_id: str, **attributes: Any) -> str:
+        """Add a node (None attributes are skipped) and return its id."""
+        target = self.nodes.setdefault(node_id, {})
+        target.update({k: v for k, v in attributes.items() if v is not None})
+        return node_id
+
+    def add_edge(self, source: str, target: str, **attributes: Any) -> None:
+        """Add an edge between two nodes of the batch."""
+        self.edges.setdefault((source, target), {}).update(attributes)
+
+    def node_rows(self) -> List[Dict[str, Any]]:
+        """Nodes in the bulk persistence format."""
+        return [{**attributes, 'id': node_id} for node_id, attributes in self.nodes.items()]
+
+    def edge_rows(self) -> List[Dict[str, Any]]:
+        """Edges in the bulk persistence format."""
+        return [
+            {**attributes, 'source': source, 'target': target}
+            for (source, target), attributes in self.edges.items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.edges)
+
+
+def register(*event_types: str) -> Callable[[Extractor], Extractor]:
+    """Register an extractor for one or more event types."""
+    def decorator(extractor: Extractor) -> Extractor:
+        for event_type in event_types:
+            EXTRACTORS[event_type] = extractor
+        return extractor
+    return decorator
+
+
+def _dict(data: Any, key: str) -> Dict[str, Any]:
+    """Get a nested object, or an empty dict if it is missing."""
+    value = data.get(key) if isinstance(data, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def _user(batch: GraphBatch, user: Dict[str, Any]) -> Optional[str]:
+    """Add a user node from a GitHub user object."""
+    login = user.get('login') or user.get('username')
+    if not login:
+        return None
+    return batch.add_node(f"user:{login}", kind='user', login=login)
+
+
+def extract(payload: WebhookPayload, webhook_node_id: str, webhook_attributes: Dict[str, Any]) -> GraphBatch:
+    """
+    Build the graph batch for a webhook.
+
+    Args:
+        payload: The webhook payload
+        webhook_node_id: Id of the node recording the delivery
+        webhook_attributes: Attributes of that node
+
+    Returns:
+        The webhook node plus everything extracted from the payload
+    """
+    batch = GraphBatch()
+    batch.add_node(webhook_node_id, **webhook_attributes)
+
+    repo = webhook_attributes.get('repo')
+    if repo:
+        batch.add_node(f"repo:{repo}", kind='repository', full_name=repo)
+        batch.add_edge(webhook_node_id, f"repo:{repo}", relation=REL_ABOUT)
+
+    sender = _user(batch, _dict(payload.data, 'sender'))
+    if sender:
+        batch.add_edge(webhook_node_id, sender, relation=REL_SENT_BY)
+
+    extractor = EXTRACTORS.get(payload.event_type)
+    if extractor is not None and repo:
+        extractor(payload, webhook_node_id, batch)
+    return batch
+
+
+@register('push')
+def extract_push(payload: WebhookPayload, webhook_node_id: str, batch: GraphBatch) -> None:
+    """Commits of a push, linked to the repository and their authors."""
+    data = payload.data
+    repo_id = f"repo:{data['repository']['full_name']}"
+    for commit in data.get('commits') or []:
+        sha = commit.get('id') if isinstance(commit, dict) else None
+        if not sha:
+            continue
+        commit_id = batch.add_node(
+            f"commit:{sha}",
+            kind='commit',
+            sha=sha,
+            message=(commit.get('message') or '').split('\n', 1)[0],
+            committed_at=commit.get('timestamp'),
+            ref=data.get('ref')
+        )
+        batch.add_edge(commit_id, repo_id, relation=REL_BELONGS_TO)
+        batch.add_edge(webhook_node_id, commit_id, relation=REL_ABOUT)
+        author = _user(batch, _dict(commit, 'author'))
+        if author:
+            batch.add_edge(author, commit_id, relation=REL_AUTHORED)
+
+
+@register('pull_request')
+def extract_pull_request(payload: WebhookPayload, webhook_node_id: str, batch: GraphBatch) -> None:
+    """The pull request, its author and head commit."""
+    data = payload.data
+    pr = _dict(data, 'pull_request')
+    repo = data['repository']['full_name']
+    number = pr.get('number', data.get('number'))
+    if number is None:
+        return
+    pr_id = batch.add_node(
+        f"pr:{repo}#{number}",
+        kind='pull_request',
+        number=number,
+        title=pr.get('title'),
+        state=pr.get('state'),
+        merged=pr.get('merged'),
+        head_ref=_dict(pr, 'head').get('ref'),
+        base_ref=_dict(pr, 'base').get('ref')
+    )
+    batch.add_edge(pr_id, f"repo:{repo}", relation=REL_BELONGS_TO)
+    batch.add_edge(webhook_node_id, pr_id, relation=REL_ABOUT)
+    author = _user(batch, _dict(pr, 'user'))
+    if author:
+        batch.add_edge(author, pr_id, relation=REL_AUTHORED)
+    head_sha = _dict(pr, 'head').get('sha')
+    if head_sha:
+        batch.add_node(f"commit:{head_sha}", kind='commit', sha=head_sha)
+        batch.add_edge(pr_id, f"commit:{head_sha}", relation=REL_RAN_ON)
+
+
+@register('issues')
+def extract_issue(payload: WebhookPayload, webhook_node_id: str, batch: GraphBatch) -> None:
+    """The issue and its author."""
+    data = payload.data
+    issue = _dict(data, 'issue')
+    repo = data['repository']['full_name']
+    number = issue.get('number')
+    if number is None:
+        return
+    issue_id = batch.add_node(
+        f"issue:{repo}#{number}",
+        kind='issue',
+        number=number,
+        title=issue.get('title'),
+        state=issue.get('state'),
+        labels=[label.get('name') for label in issue.get('labels') or [] if isinstance(label, dict)]
+    )
+    batch.add_edge(issue_id, f"repo:{repo}", relation=REL_BELONGS_TO)
+    batch.add_edge(webhook_node_id, issue_id, relation=REL_ABOUT)
+    author = _user(batch, _dict(issue, 'user'))
+    if author:
+        batch.add_edge(author, issue_id, relation=REL_AUTHORED)
+
+
+@register('workflow_run')
+def extract_workflow_run(payload: WebhookPayload, webhook_node_id: str, batch: GraphBatch) -> None:
+    """The workflow run and the commit it ran on."""
+    data = payload.data
+    run = _dict(data, 'workflow_run')
+    repo = data['repository']['full_name']
+    run_id = run.get('id')
+    if run_id is None:
+        return
+    node_id = batch.add_node(
+        f"workflow_run:{run_id}",
+        kind='workflow_run',
+        name=run.get('name'),
+        status=run.get('status'),
+        conclusion=run.get('conclusion'),
+        head_branch=run.get('head_branch'),
+        run_number=run.get('run_number')
+    )
+    batch.add_edge(node_id, f"repo:{repo}", relation=REL_BELONGS_TO)
+    batch.add_edge(webhook_node_id, node_id, relation=REL_ABOUT)
+    head_sha = run.get('head_sha')
+    if head_sha:
+        batch.add_node(f"commit:{head_sha}", kind='commit', sha=head_sha)
+        batch.add_edge(node_id, f"commit:{head_sha}", relation=REL_RAN_ON)
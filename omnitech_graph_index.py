@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Index
+ScrollVerse Genesis Protocol - Secondary Attribute Indexes
+
+This module keeps secondary indexes over node attributes of the in-memory
+graph: a hash index on event_type and sorted indexes on timestamp (global
+and per event type). Equality and time-range lookups then run in
+O(log n + k) instead of scanning every node.
+"""
+
+import bisect
+import heapq
+import itertools
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# (timestamp, str(node_id), node_id) - the string key keeps mixed id types sortable
+TimeEntry = Tuple[str, str, Any]
+
+
+def _index_key(attributes: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """The indexed (event_type, timestamp) of a node (None unless a string)."""
+    event_type = attributes.get('event_type')
+    timestamp = attributes.get('timestamp')
+    return (
+        event_type if isinstance(event_type, str) else None,
+        timestamp if isinstance(timestamp, str) else None
+    )
+
+
+def _insert_sorted(entries: List[TimeEntry], entry: TimeEntry) -> None:
+    """Insert an entry into a sorted list (appending if it sorts last)."""
+    # Live webhooks arrive in timestamp order, so the append is the common case
+    if not entries or entries[-1] <= entry:
+        entries.append(entry)
+    else:
+        bisect.insort(entries, entry)
+
+
+def _remove_sorted(entries: List[TimeEntry], entry: TimeEntry) -> None:
+    """Remove an entry from a sorted list if present."""
+    i = bisect.bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
+
+
+class GraphIndex:
+    """
+    Secondary indexes over node event_type and timestamp attributes.
+
+    Timestamps are compared as ISO-8601 UTC strings, which sort
+    chronologically. Nodes without a string timestamp are only present in
+    the event_type indexes (they sort after all timestamped nodes).
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self._lock = threading.Lock()
+        # node id -> (event_type, timestamp) as currently indexed
+        self._indexed: Dict[Any, Tuple[Optional[str], Optional[str]]] = {}
+        self._by_type: Dict[str, Set[Any]] = {}
+        self._by_time: List[TimeEntry] = []
+        self._by_type_time: Dict[str, List[TimeEntry]] = {}
+        # event type -> ids of its nodes without a timestamp
+        self._by_type_untimed: Dict[str, Set[Any]] = {}
+
+    def index_node(self, node_id: Any, attributes: Dict[str, Any]) -> None:
+        """
+        Add or update a node in the indexes.
+
+        Args:
+            node_id: Node identifier
+            attributes: The node's full (merged) attribute dictionary
+        """
+        event_type, timestamp = _index_key(attributes)
+
+        with self._lock:
+            previous = self._indexed.get(node_id)
+            if previous == (event_type, timestamp):
+                return
+            if previous is not None:
+                self._unindex(node_id, *previous)
+
+            self._indexed[node_id] = (event_type, timestamp)
+            if event_type is not None:
+                self._by_type.setdefault(event_type, set()).add(node_id)
+            if timestamp is not None:
+                entry = (timestamp, str(node_id), node_id)
+                _insert_sorted(self._by_time, entry)
+                if event_type is not None:
+                    _insert_sorted(self._by_type_time.setdefault(event_type, []), entry)
+            elif event_type is not None:
+                self._by_type_untimed.setdefault(event_type, set()).add(node_id)
+
+    def remove_node(self, node_id: Any) -> None:
+        """Remove a node from the indexes."""
+        with self._lock:
+            previous = self._indexed.pop(node_id, None)
+            if previous is not None:
+                self._unindex(node_id, *previous)
+
+    def _unindex(self, node_id: Any, event_type: Optional[str], timestamp: Optional[str]) -> None:
+        """Remove index entries for a node (caller holds the lock)."""
+        if event_type is not None:
+            members = self._by_type.get(event_type)
+            if members is not None:
+                members.discard(node_id)
+                if not members:
+                    del self._by_type[event_type]
+        if timestamp is not None:
+            entry = (timestamp, str(node_id), node_id)
+            _remove_sorted(self._by_time, entry)
+            if event_type is not None and event_type in self._by_type_time:
+                _remove_sorted(self._by_type_time[event_type], entry)
+                if not self._by_type_time[event_type]:
+                    del self._by_type_time[event_type]
+        elif event_type is not None and event_type in self._by_type_untimed:
+            self._by_type_untimed[event_type].discard(node_id)
+            if not self._by_type_untimed[event_type]:
+                del self._by_type_untimed[event_type]
+
+    def rebuild(self, graph: Any) -> None:
+        """Rebuild all indexes from a graph."""
+        with self._lock:
+            self._indexed.clear()
+            self._by_type.clear()
+            self._by_time.clear()
+            self._by_type_time.clear()
+            self._by_type_untimed.clear()
+            # Nodes come in arbitrary order: append everything, then sort once
+            for node_id, attributes in list(graph.nodes(data=True)):
+                event_type, timestamp = self._indexed[node_id] = _index_key(attributes)
+                if event_type is not None:
+                    self._by_type.setdefault(event_type, set()).add(node_id)
+                if timestamp is not None:
+                    entry = (timestamp, str(node_id), node_id)
+                    self._by_time.append(entry)
+                    if event_type is not None:
+                        self._by_type_time.setdefault(event_type, []).append(entry)
+                elif event_type is not None:
+                    self._by_type_untimed.setdefault(event_type, set()).add(node_id)
+            self._by_time.sort()
+            for entries in self._by_type_time.values():
+                entries.sort()
+
+    def by_event_type(self, event_type: str) -> Set[Any]:
+        """Get the ids of all nodes with an event type."""
+        with self._lock:
+            return set(self._by_type.get(event_type, ()))
+
+    def _time_entries(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        event_type: Optional[str]
+    ) -> Iterator[TimeEntry]:
+        """Iterate a sorted time index over a range (caller holds the lock)."""
+        entries = self._by_time if event_type is None else self._by_type_time.get(event_type, [])
+        lo = 0 if since is None else bisect.bisect_left(entries, (since,))
+        hi = len(entries) if until is None else bisect.bisect_left(entries, (until,))
+        return itertools.islice(entries, lo, hi)
+
+    def _time_range(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        event_types: Optional[Iterable[str]],
+        limit: Optional[int]
+    ) -> List[Any]:
+        """time_range (caller holds the lock)."""
+        if not event_types:
+            entries: Iterable[TimeEntry] = self._time_entries(since, until, None)
+        else:
+            entries = heapq.merge(*(
+                self._time_entries(since, until, event_type)
+                for event_type in set(event_types)
+            ))
+        return [entry[2] for entry in itertools.islice(entries, limit)]
+
+    def time_range(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Get node ids with since <= timestamp < until, oldest first.
+
+        Args:
+            since: Inclusive lower bound (normalized ISO-8601 UTC), or None
+            until: Exclusive upper bound (normalized ISO-8601 UTC), or None
+            event_types: Restrict to these event types
+            limit: Maximum number of ids to return
+
+        Returns:
+            Matching node ids in timestamp order
+        """
+        with self._lock:
+            return self._time_range(since, until, event_types, limit)
+
+    def candidates(
+        self,
+        event_types: Optional[Iterable[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[List[Any]]:
+        """
+        Get the node ids that can match a filter, oldest first.
+
+        Nodes of the event types that have no timestamp come last (ordered
+        by id), so with a limit the oldest matching nodes are returned.
+
+        Args:
+            event_types: Restrict to these event types
+            since: Inclusive lower timestamp bound, or None
+            until: Exclusive upper timestamp bound, or None
+            limit: Maximum number of ids to return
+
+        Returns:
+            Candidate node ids, or None if no filter is given
+        """
+        if since is None and until is None and not event_types:
+            return None
+        with self._lock:
+            ids = self._time_range(since, until, event_types, limit)
+            if since is not None or until is not None:
+                return ids
+            remaining = None if limit is None else limit - len(ids)
+            if remaining is None or remaining > 0:
+                untimed = itertools.chain.from_iterable(
+                    self._by_type_untimed.get(event_type, ()) for event_type in set(event_types)
+                )
+                ids.extend(sorted(untimed, key=str)[:remaining])
+            return ids
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            return {
+                'indexed_nodes': len(self._indexed),
+                'timestamped_nodes': len(self._by_time),
+                'event_types': {t: len(ids) for t, ids in self._by_type.items()},
+                'oldest_timestamp': self._by_time[0][0] if self._by_time else None,
+                'newest_timestamp': self._by_time[-1][0] if self._by_time else None
+            }
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Query
+ScrollVerse Genesis Protocol - Filtered Graph Listing
+
+This module implements the filtering, attribute projection and cursor
+pagination behind the /admin/graph endpoint. Pages are selected by keyset
+(node id, then (source, target) for edges) without sorting or copying the
+whole graph, and results are produced lazily so they can be streamed.
+"""
+
+import base64
+import heapq
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Upper bound on the page size a client may request
+MAX_PAGE_SIZE = 10000
+
+# Cursor phases
+PHASE_NODES = 'n'
+PHASE_EDGES = 'e'
+
+
+def encode_cursor(phase: str, key: Any) -> str:
+    """Encode a pagination position as an opaque cursor token."""
+    raw = json.dumps({'p': phase, 'k': key}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(token: str) -> Tuple[str, Any]:
+    """
+    Decode a cursor token.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        phase, key = data['p'], data['k']
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if phase == PHASE_NODES and isinstance(key, str):
+        return phase, key
+    if phase == PHASE_EDGES and isinstance(key, list) and len(key) == 2:
+        return phase, (str(key[0]), str(key[1]))
+    raise ValueError('Invalid cursor')
+
+
+def _normalize_timestamp(value: str) -> str:
+    """
+    Normalize an ISO-8601 timestamp to the UTC form used by graph nodes.
+
+    Raises:
+        ValueError: If the value is not an ISO-8601 timestamp
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+class GraphQuery:
+    """
+    Parsed /admin/graph query parameters.
+
+    Args:
+        event_types: Only include nodes with one of these event types
+        since: Only include nodes with timestamp >= since (ISO-8601)
+        until: Only include nodes with timestamp < until (ISO-8601)
+        fields: Attribute names to return (None returns all attributes)
+        limit: Page size (None returns everything in one response)
+        cursor: Cursor returned by the previous page
+    """
+
+    def __init__(
+        self,
+        event_types: Optional[Iterable[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ):
+        self.event_types = set(event_types) if event_types else None
+        self.since = _normalize_timestamp(since) if since else None
+        self.until = _normalize_timestamp(until) if until else None
+        self.fields = list(fields) if fields else None
+        self.limit = limit
+        self.phase, self.after = decode_cursor(cursor) if cursor else (PHASE_NODES, '')
+
+    @classmethod
+    def from_args(cls, args: Any) -> 'GraphQuery':
+        """
+        Build a query from request arguments.
+
+        Raises:
+            ValueError: If an argument is invalid
+        """
+        limit = args.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValueError('limit must be an integer')
+            if limit < 1:
+                raise ValueError('limit must be positive')
+            limit = min(limit, MAX_PAGE_SIZE)
+
+        event_types = [
+            t for value in args.getlist('event_type') for t in value.split(',') if t
+        ]
+        fields = [f for f in (args.get('fields') or '').split(',') if f]
+
+        return cls(
+            event_types=event_types,
+            since=args.get('since'),
+            until=args.get('until'),
+            fields=fields,
+            limit=limit,
+            cursor=args.get('cursor')
+        )
+
+    @property
+    def filtered(self) -> bool:
+        """Whether any node filter is active."""
+        return bool(self.event_types or self.since or self.until)
+
+    def matches(self, attributes: Dict[str, Any]) -> bool:
+        """Check if node attributes pass the filters."""
+        if self.event_types is not None and attributes.get('event_type') not in self.event_types:
+            return False
+        if self.since or self.until:
+            timestamp = attributes.get('timestamp')
+            if not isinstance(timestamp, str):
+                return False
+            if self.since and timestamp < self.since:
+                return False
+            if self.until and timestamp >= self.until:
+                return False
+        return True
+
+    def project(self, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the field projection to an attribute dictionary."""
+        if self.fields is None:
+            return dict(attributes)
+        return {k: attributes[k] for k in self.fields if k in attributes}
+
+
+class GraphPage:
+    """
+    One page of a graph listing.
+
+    Node ids and edge pairs are selected up front (cheap references);
+    attribute dictionaries are only built while iterating.
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        query: GraphQuery,
+        node_ids: Iterable[Any],
+        edge_pairs: Iterable[Tuple[Any, Any]],
+        next_cursor: Optional[str]
+    ):
+        self._graph = graph
+        self._query = query
+        self._node_ids = node_ids
+        self._edge_pairs = edge_pairs
+        self.next_cursor = next_cursor
+
+    def iter_nodes(self) -> Iterator[Dict[str, Any]]:
+        """Yield projected node dictionaries."""
+        nodes = self._graph.nodes
+        for node_id in self._node_ids:
+            if node_id in nodes:
+                yield {'id': node_id, **self._query.project(nodes[node_id])}
+
+    def iter_edges(self) -> Iterator[Dict[str, Any]]:
+        """Yield projected edge dictionaries."""
+        graph = self._graph
+        for u, v in self._edge_pairs:
+            if graph.has_edge(u, v):
+                yield {'source': u, 'target': v, **self._query.project(graph.edges[u, v])}
+
+
+def _edge_visible(graph: Any, query: GraphQuery, u: Any, v: Any) -> bool:
+    """Edges are returned for the subgraph induced by the matching nodes."""
+    if not query.filtered:
+        return True
+    return query.matches(graph.nodes[u]) and query.matches(graph.nodes[v])
+
+
+def _iter_matching(graph: Any, query: GraphQuery, candidates: Optional[Iterable[Any]]) -> Iterator[Any]:
+    """Yield ids of nodes that pass the filters."""
+    if candidates is None:
+        for node_id, attrs in graph.nodes(data=True):
+            if query.matches(attrs):
+                yield node_id
+        return
+
+    nodes = graph.nodes
+    for node_id in candidates:
+        if node_id in nodes and query.matches(nodes[node_id]):
+            yield node_id
+
+
+def select_page(
+    graph: Any,
+    query: GraphQuery,
+    candidates: Optional[Iterable[Any]] = None
+) -> GraphPage:
+    """
+    Select the nodes and edges for one page of a graph listing.
+
+    Without a limit every matching node and edge is returned in graph
+    order. With a limit, nodes are paged by id and then edges by
+    (source, target); the page never holds more than limit keys.
+
+    Args:
+        graph: NetworkX-compatible graph
+        query: Parsed query
+        candidates: Node ids that can match the filters (for example from
+            a secondary index); None scans every node
+
+    Returns:
+        The selected page
+    """
+    if query.limit is None:
+        # Keys only, so the graph may change while the page is streamed
+        node_ids = list(_iter_matching(graph, query, candidates))
+        edge_pairs = [
+            (u, v) for u, v in graph.edges() if _edge_visible(graph, query, u, v)
+        ]
+        return GraphPage(graph, query, node_ids, edge_pairs, None)
+
+    limit = query.limit
+    node_ids: List[Any] = []
+    if query.phase == PHASE_NODES:
+        after = query.after
+        node_ids = heapq.nsmallest(
+            limit + 1,
+            (n for n in _iter_matching(graph, query, candidates) if str(n) > after),
+            key=str
+        )
+        if len(node_ids) > limit:
+            node_ids = node_ids[:limit]
+            return GraphPage(
+                graph, query, node_ids, [],
+                encode_cursor(PHASE_NODES, str(node_ids[-1]))
+            )
+        edge_after = ('', '')
+    else:
+        edge_after = query.after
+
+    remaining = limit - len(node_ids)
+    if remaining == 0:
+        # Page filled exactly by nodes - edges start on the next page
+        return GraphPage(graph, query, node_ids, [], encode_cursor(PHASE_EDGES, ['', '']))
+
+    edge_pairs = heapq.nsmallest(
+        remaining + 1,
+        (
+            (u, v) for u, v in graph.edges()
+            if (str(u), str(v)) > edge_after and _edge_visible(graph, query, u, v)
+        ),
+        key=lambda pair: (str(pair[0]), str(pair[1]))
+    )
+
+    next_cursor = None
+    if len(edge_pairs) > remaining:
+        edge_pairs = edge_pairs[:remaining]
+        last = edge_pairs[-1]
+        next_cursor = encode_cursor(PHASE_EDGES, [str(last[0]), str(last[1])])
+    return GraphPage(graph, query, node_ids, edge_pairs, next_cursor)
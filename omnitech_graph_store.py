@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Compact Graph Store
+ScrollVerse Genesis Protocol - Array-Backed Graph Backend
+
+This module provides an alternative to networkx.DiGraph for the in-memory
+graph. Node ids are interned and mapped to integer slots, edges are kept
+in parallel arrays (COO) with a CSR index over the compacted part, and
+attributes are stored column by column instead of one dict per node and
+per edge.
+
+New edges are appended to an unsorted tail; once the tail and the
+tombstones left by removals grow past a fraction of the graph, the store
+is compacted: dead slots are dropped, edges are sorted by (source,
+target) and the CSR offsets are rebuilt.
+
+Only the part of the DiGraph API the server uses is implemented:
+add_node, add_edge, remove_node, has_node, has_edge, successors,
+predecessors, in_degree, out_degree, out_edges, in_edges, nodes / edges
+views (call, lookup, membership, iteration), number_of_nodes,
+number_of_edges and clear. Attribute dictionaries returned by
+nodes[n] and edges[u, v] are copies; update them through add_node and
+add_edge.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+
+BACKEND_NETWORKX = 'networkx'
+BACKEND_COMPACT = 'compact'
+
+# Attribute strings up to this length are interned (event types, repos, ...)
+INTERN_MAX_LENGTH = 64
+
+# Placeholder for "attribute not set" in a column
+_ABSENT = object()
+
+
+def _intern(value: Any) -> Any:
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _set_column(columns: Dict[str, List[Any]], slot: int, attributes: Dict[str, Any]) -> None:
+    """Store attributes of one slot in their columns."""
+    for key, value in attributes.items():
+        column = columns.get(key)
+        if column is None:
+            column = columns[key] = []
+        if len(column) <= slot:
+            column.extend([_ABSENT] * (slot + 1 - len(column)))
+        column[slot] = _intern(value)
+
+
+def _get_columns(columns: Dict[str, List[Any]], slot: int) -> Dict[str, Any]:
+    """Collect the attributes of one slot."""
+    return {
+        key: column[slot]
+        for key, column in columns.items()
+        if slot < len(column) and column[slot] is not _ABSENT
+    }
+
+
+def _clear_columns(columns: Dict[str, List[Any]], slot: int) -> None:
+    """Release the attribute values of a dead slot."""
+    for column in columns.values():
+        if slot < len(column):
+            column[slot] = _ABSENT
+
+
+def _remap_columns(columns: Dict[str, List[Any]], slots: List[int]) -> Dict[str, List[Any]]:
+    """Reorder columns to the given live slots (empty columns are dropped)."""
+    remapped = {}
+    for key, column in columns.items():
+        size = len(column)
+        values = [column[s] if s < size else _ABSENT for s in slots]
+        while values and values[-1] is _ABSENT:
+            values.pop()
+        if values:
+            remapped[key] = values
+    return remapped
+
+
+class NodeView:
+    """graph.nodes: call for iteration, index for attributes."""
+
+    def __init__(self, graph: 'CompactDiGraph'):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        ids, columns = self._graph._ids, self._graph._node_columns
+        for slot in range(len(ids)):
+            node_id = ids[slot]
+            if node_id is None:
+                continue
+            yield (node_id, _get_columns(columns, slot)) if data else node_id
+
+    def __getitem__(self, node_id: Any) -> Dict[str, Any]:
+        return _get_columns(self._graph._node_columns, self._graph._index[node_id])
+
+    def __contains__(self, node_id: Any) -> bool:
+        return node_id in self._graph._index
+
+    def __iter__(self) -> Iterator[Any]:
+        return self()
+
+    def __len__(self) -> int:
+        return len(self._graph._index)
+
+
+class EdgeView:
+    """graph.edges: call for iteration, index by (u, v) for attributes."""
+
+    def __init__(self, graph: 'CompactDiGraph'):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Iterator[Tuple[Any, ...]]:
+        graph = self._graph
+        ids, src, dst, alive = graph._ids, graph._src, graph._dst, graph._edge_alive
+        columns = graph._edge_columns
+        for e in range(len(src)):
+            if alive[e]:
+                if data:
+                    yield ids[src[e]], ids[dst[e]], _get_columns(columns, e)
+                else:
+                    yield ids[src[e]], ids[dst[e]]
+
+    def __getitem__(self, edge: Tuple[Any, Any]) -> Dict[str, Any]:
+        slot = self._graph._edge_slot(*edge)
+        if slot is None:
+            raise KeyError(edge)
+        return _get_columns(self._graph._edge_columns, slot)
+
+    def __contains__(self, edge: Tuple[Any, Any]) -> bool:
+        return self._graph.has_edge(*edge)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return self()
+
+    def __len__(self) -> int:
+        return self._graph._edge_count
+
+
+class CompactDiGraph:
+    """
+    Directed graph with array-backed adjacency and columnar attributes.
+
+    Args:
+        compact_ratio: Compact once tail edges plus tombstones exceed this
+            fraction of the live nodes and edges
+        min_garbage: Tail edges plus tombstones always tolerated
+    """
+
+    def __init__(self, compact_ratio: float = 0.25, min_garbage: int = 4096):
+        self.compact_ratio = compact_ratio
+        self.min_garbage = min_garbage
+        self.nodes = NodeView(self)
+        self.edges = EdgeView(self)
+        self.compactions = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        # slot -> node id (None once removed) and node id -> slot
+        self._ids: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self._node_columns: Dict[str, List[Any]] = {}
+        # Edge slots: parallel source / target arrays
+        self._src = array('q')
+        self._dst = array('q')
+        self._edge_alive = bytearray()
+        self._edge_columns: Dict[str, List[Any]] = {}
+        self._edge_count = 0
+        # CSR index over the compacted edges [0, _base_edges), which are
+        # sorted by (source, target): out-edges of slot s are
+        # [_offsets[s], _offsets[s + 1]); _rev_edges lists the same slots
+        # sorted by (target, source) with _rev_offsets per target
+        self._base_edges = 0
+        self._offsets = array('q', [0])
+        self._rev_offsets = array('q', [0])
+        self._rev_edges = array('q')
+        # Tail edges appended since the last compaction
+        self._tail: Dict[Tuple[int, int], int] = {}
+        self._tail_out: Dict[int, List[int]] = {}
+        self._tail_in: Dict[int, List[int]] = {}
+        self._dead_nodes = 0
+        self._dead_edges = 0
+
+    # Lookups
+
+    def _edge_slot(self, u: Any, v: Any) -> Optional[int]:
+        s, d = self._index.get(u), self._index.get(v)
+        if s is None or d is None:
+            return None
+        if s < len(self._offsets) - 1:
+            lo, hi = self._offsets[s], self._offsets[s + 1]
+            i = bisect_left(self._dst, d, lo, hi)
+            if i < hi and self._dst[i] == d and self._edge_alive[i]:
+                return i
+        return self._tail.get((s, d))
+
+    def _out_slots(self, s: int) -> List[int]:
+        alive = self._edge_alive
+        slots = []
+        if s < len(self._offsets) - 1:
+            slots = [e for e in range(self._offsets[s], self._offsets[s + 1]) if alive[e]]
+        return slots + self._tail_out.get(s, [])
+
+    def _in_slots(self, d: int) -> List[int]:
+        alive = self._edge_alive
+        slots = []
+        if d < len(self._rev_offsets) - 1:
+            slots = [
+                e for e in self._rev_edges[self._rev_offsets[d]:self._rev_offsets[d + 1]] if alive[e]
+            ]
+        return slots + self._tail_in.get(d, [])
+
+    def _slot(self, node_id: Any) -> int:
+        try:
+            return self._index[node_id]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {node_id} is not in the digraph.")
+
+    def __contains__(self, node_id: Any) -> bool:
+        return node_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.nodes()
+
+    def has_node(self, node_id: Any) -> bool:
+        return node_id in self._index
+
+    def has_edge(self, u: Any, v: Any) -> bool:
+        return self._edge_slot(u, v) is not None
+
+    def successors(self, node_id: Any) -> Iterator[Any]:
+        ids, dst = self._ids, self._dst
+        return iter([ids[dst[e]] for e in self._out_slots(self._slot(node_id))])
+
+    def predecessors(self, node_id: Any) -> Iterator[Any]:
+        ids, src = self._ids, self._src
+        return iter([ids[src[e]] for e in self._in_slots(self._slot(node_id))])
+
+    def out_degree(self, node_id: Any) -> int:
+        return len(self._out_slots(self._slot(node_id)))
+
+    def in_degree(self, node_id: Any) -> int:
+        return len(self._in_slots(self._slot(node_id)))
+
+    def out_edges(self, nbunch: Iterable[Any]) -> List[Tuple[Any, Any]]:
+        ids, dst = self._ids, self._dst
+        return [
+            (node_id, ids[dst[e]])
+            for node_id in nbunch if node_id in self._index
+            for e in self._out_slots(self._index[node_id])
+        ]
+
+    def in_edges(self, nbunch: Iterable[Any]) -> List[Tuple[Any, Any]]:
+        ids, src = self._ids, self._src
+        return [
+            (ids[src[e]], node_id)
+            for node_id in nbunch if node_id in self._index
+            for e in self._in_slots(self._index[node_id])
+        ]
+
+    def number_of_nodes(self) -> int:
+        return len(self._index)
+
+    def number_of_edges(self) -> int:
+        return self._edge_count
+
+    # Mutations
+
+    def add_node(self, node_id: Any, **attributes: Any) -> None:
+        """Add a node or merge attributes into an existing one."""
+        slot = self._index.get(node_id)
+        if slot is None:
+            node_id = _intern(node_id)
+            slot = self._index[node_id] = len(self._ids)
+            self._ids.append(node_id)
+        if attributes:
+            _set_column(self._node_columns, slot, attributes)
+
+    def add_edge(self, u: Any, v: Any, **attributes: Any) -> None:
+        """Add an edge (and missing endpoints) or merge its attributes."""
+        for node_id in (u, v):
+            if node_id not in self._index:
+                self.add_node(node_id)
+        slot = self._edge_slot(u, v)
+        if slot is None:
+            s, d = self._index[u], self._index[v]
+            slot = len(self._src)
+            self._src.append(s)
+            self._dst.append(d)
+            self._edge_alive.append(1)
+            self._tail[(s, d)] = slot
+            self._tail_out.setdefault(s, []).append(slot)
+            self._tail_in.setdefault(d, []).append(slot)
+            self._edge_count += 1
+        if attributes:
+            _set_column(self._edge_columns, slot, attributes)
+        self._maybe_compact()
+
+    def _kill_edge(self, e: int) -> None:
+        self._edge_alive[e] = 0
+        _clear_columns(self._edge_columns, e)
+        if e >= self._base_edges:
+            s, d = self._src[e], self._dst[e]
+            del self._tail[(s, d)]
+            self._tail_out[s].remove(e)
+            self._tail_in[d].remove(e)
+        self._edge_count -= 1
+        self._dead_edges += 1
+
+    def remove_node(self, node_id: Any) -> None:
+        """Remove a node and its edges."""
+        slot = self._slot(node_id)
+        for e in set(self._out_slots(slot) + self._in_slots(slot)):
+            self._kill_edge(e)
+        self._tail_out.pop(slot, None)
+        self._tail_in.pop(slot, None)
+        del self._index[node_id]
+        self._ids[slot] = None
+        _clear_columns(self._node_columns, slot)
+        self._dead_nodes += 1
+        self._maybe_compact()
+
+    def remove_edge(self, u: Any, v: Any) -> None:
+        slot = self._edge_slot(u, v)
+        if slot is None:
+            raise nx.NetworkXError(f"The edge {u}-{v} not in graph.")
+        self._kill_edge(slot)
+        self._maybe_compact()
+
+    # Compaction
+
+    def _maybe_compact(self) -> None:
+        garbage = len(self._tail) + self._dead_edges + self._dead_nodes
+        if garbage > max(self.min_garbage, self.compact_ratio * (len(self._index) + self._edge_count)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop dead slots, sort edges and rebuild the CSR index."""
+        live_nodes = [slot for slot, node_id in enumerate(self._ids) if node_id is not None]
+        remap = array('q', [-1]) * len(self._ids)
+        for new, old in enumerate(live_nodes):
+            remap[old] = new
+        src, dst, alive = self._src, self._dst, self._edge_alive
+        live_edges = sorted(
+            (e for e in range(len(src)) if alive[e]),
+            key=lambda e: (remap[src[e]], remap[dst[e]])
+        )
+        n, m = len(live_nodes), len(live_edges)
+
+        ids = [self._ids[slot] for slot in live_nodes]
+        new_src = array('q', (remap[src[e]] for e in live_edges))
+        new_dst = array('q', (remap[dst[e]] for e in live_edges))
+
+        offsets = array('q', [0]) * (n + 1)
+        for s in new_src:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        rev_edges = array('q', sorted(range(m), key=lambda e: (new_dst[e], new_src[e])))
+        rev_offsets = array('q', [0]) * (n + 1)
+        for d in new_dst:
+            rev_offsets[d + 1] += 1
+        for i in range(n):
+            rev_offsets[i + 1] += rev_offsets[i]
+
+        self._node_columns = _remap_columns(self._node_columns, live_nodes)
+        self._edge_columns = _remap_columns(self._edge_columns, live_edges)
+        self._ids = ids
+        self._index = {node_id: slot for slot, node_id in enumerate(ids)}
+        self._src, self._dst = new_src, new_dst
+        self._edge_alive = bytearray(b'\x01') * m
+        self._edge_count = m
+        self._base_edges = m
+        self._offsets, self._rev_offsets, self._rev_edges = offsets, rev_offsets, rev_edges
+        self._tail, self._tail_out, self._tail_in = {}, {}, {}
+        self._dead_nodes = self._dead_edges = 0
+        self.compactions += 1
+
+    # Conversion
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Copy the graph into a networkx.DiGraph."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graph: Any, **kwargs: Any) -> 'CompactDiGraph':
+        """Build a compacted store from a networkx graph."""
+        store = cls(**kwargs)
+        for node_id, attributes in graph.nodes(data=True):
+            store.add_node(node_id, **attributes)
+        # Compact once at the end rather than while the tail grows
+        min_garbage = store.min_garbage
+        store.min_garbage = float('inf')
+        for u, v, attributes in graph.edges(data=True):
+            store.add_edge(u, v, **attributes)
+        store.min_garbage = min_garbage
+        store.compact()
+        return store
+
+
+def create_graph(backend: Optional[str] = None) -> Any:
+    """
+    Create the in-memory graph for a backend name.
+
+    Args:
+        backend: 'networkx' (default) or 'compact'
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or BACKEND_NETWORKX).lower()
+    if backend == BACKEND_NETWORKX:
+        return nx.DiGraph()
+    if backend == BACKEND_COMPACT:
+        return CompactDiGraph()
+    raise ValueError(f'Unknown graph backend: {backend}')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Sync
+ScrollVerse Genesis Protocol - Versioned Graph State
+
+This module versions the in-memory graph. Every mutation is assigned a
+monotonically increasing revision and kept in a bounded ring buffer, so a
+reconnecting subscriber can replay only the deltas it missed instead of
+downloading the full graph again.
+"""
+
+import itertools
+import threading
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Delta actions
+ACTION_NODE_ADDED = 'node_added'
+ACTION_EDGE_ADDED = 'edge_added'
+ACTION_NODE_REMOVED = 'node_removed'
+
+
+class GraphChangeLog:
+    """
+    Revision counter plus a bounded ring buffer of graph deltas.
+
+    Deltas are idempotent (add node / add edge merge attributes, remove node
+    ignores missing nodes), so replaying a delta the subscriber already has
+    is harmless.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize the change log.
+
+        Args:
+            capacity: Maximum number of deltas kept for replay
+        """
+        self._lock = threading.Lock()
+        self._deltas: Deque[Dict[str, Any]] = deque(maxlen=max(1, capacity))
+        self._revision = 0
+        # Revisions below this cannot be served from the buffer
+        self._floor = 0
+        # Identifies this log instance; revisions from another epoch are meaningless
+        self.epoch = uuid.uuid4().hex
+
+    @property
+    def revision(self) -> int:
+        """Current (latest) revision."""
+        return self._revision
+
+    def record(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assign the next revision to a delta and store it.
+
+        Args:
+            delta: Delta dictionary (must include 'action')
+
+        Returns:
+            The stored delta including its 'revision'
+        """
+        with self._lock:
+            self._revision += 1
+            stored = {**delta, 'revision': self._revision}
+            if len(self._deltas) == self._deltas.maxlen:
+                self._floor = self._deltas[0]['revision']
+            self._deltas.append(stored)
+            return stored
+
+    def record_node(self, node_id: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a node mutation."""
+        return self.record({
+            'action': ACTION_NODE_ADDED,
+            'node_id': node_id,
+            'attributes': attributes
+        })
+
+    def record_edge(self, source: str, target: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """Record an edge mutation."""
+        return self.record({
+            'action': ACTION_EDGE_ADDED,
+            'source': source,
+            'target': target,
+            'attributes': attributes
+        })
+
+    def record_node_removed(self, node_id: str) -> Dict[str, Any]:
+        """Record a node removal (its edges are removed with it)."""
+        return self.record({
+            'action': ACTION_NODE_REMOVED,
+            'node_id': node_id
+        })
+
+    def invalidate(self) -> None:
+        """
+        Drop all buffered deltas and advance the revision.
+
+        Used when the graph changes outside the log (for example after
+        hydration) so every existing subscriber falls back to a snapshot.
+        """
+        with self._lock:
+            self._revision += 1
+            self._floor = self._revision
+            self._deltas.clear()
+
+    def since(self, revision: int, epoch: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the deltas after a revision.
+
+        Args:
+            revision: Last revision the subscriber has applied
+            epoch: Epoch the revision belongs to (None skips the check)
+
+        Returns:
+            Deltas newer than revision (oldest first), or None if the
+            subscriber must fall back to a full snapshot
+        """
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return None
+            if revision > self._revision or revision < self._floor:
+                return None
+            if not self._deltas:
+                return []
+            skip = revision - self._deltas[0]['revision'] + 1
+            return list(itertools.islice(self._deltas, max(0, skip), None))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get change log statistics."""
+        with self._lock:
+            return {
+                'epoch': self.epoch,
+                'revision': self._revision,
+                'buffered': len(self._deltas),
+                'capacity': self._deltas.maxlen,
+                'oldest_replayable': self._floor
+            }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Hydration
+ScrollVerse Genesis Protocol - Warm-Start Graph Loading
+
+This module rebuilds the in-memory graph from Neo4j on startup. Nodes and
+edges are streamed page by page straight into the graph, and a readiness
+state lets the server hold back graph reads until the load has finished.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hydration modes
+MODE_OFF = 'off'
+MODE_BACKGROUND = 'background'
+MODE_BLOCKING = 'blocking'
+
+# Hydration status values
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_READY = 'ready'
+STATUS_FAILED = 'failed'
+
+ProgressCallback = Callable[[int, int], None]
+CompleteCallback = Callable[['HydrationState'], None]
+
+
+class HydrationState:
+    """
+    Tracks progress of a graph hydration and gates readiness on it.
+    """
+
+    def __init__(self):
+        """Initialize an empty (pending) hydration state."""
+        self._ready = threading.Event()
+        self.status = STATUS_PENDING
+        self.nodes_loaded = 0
+        self.edges_loaded = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    def mark_ready(self) -> None:
+        """Mark the graph as ready without loading anything."""
+        self.status = STATUS_READY
+        self._ready.set()
+
+    def is_ready(self) -> bool:
+        """Check if hydration has finished (successfully or not)."""
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for hydration to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if hydration has finished
+        """
+        return self._ready.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the hydration state as a dictionary."""
+        return {
+            'status': self.status,
+            'nodes_loaded': self.nodes_loaded,
+            'edges_loaded': self.edges_loaded,
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+def hydrate_graph(
+    graph: Any,
+    persistence: Any,
+    page_size: int = 5000,
+    progress: Optional[ProgressCallback] = None,
+    state: Optional[HydrationState] = None,
+    on_complete: Optional[CompleteCallback] = None
+) -> HydrationState:
+    """
+    Stream persisted nodes and edges into an in-memory graph.
+
+    Attributes already present in memory win over persisted ones, so
+    mutations that arrive while hydration is running are not overwritten.
+
+    Args:
+        graph: NetworkX-compatible graph to load into
+        persistence: OmnitechPersistence providing iter_nodes/iter_edges
+        page_size: Number of records fetched per page
+        progress: Called with (nodes_loaded, edges_loaded) after each page
+        state: Hydration state to update (a new one is created if omitted)
+        on_complete: Called with the final state once hydration has finished
+
+    Returns:
+        The final hydration state
+    """
+    state = state or HydrationState()
+    state.status = STATUS_RUNNING
+    state.started_at = datetime.now(timezone.utc).isoformat()
+    started = time.monotonic()
+
+    try:
+        for node in persistence.iter_nodes(page_size=page_size):
+            node_id = node.pop('id')
+            if graph.has_node(node_id):
+                node.update(graph.nodes[node_id])
+            graph.add_node(node_id, **node)
+            state.nodes_loaded += 1
+            if progress and state.nodes_loaded % page_size == 0:
+                progress(state.nodes_loaded, state.edges_loaded)
+
+        for edge in persistence.iter_edges(page_size=page_size):
+            source = edge.pop('source')
+            target = edge.pop('target')
+            if graph.has_edge(source, target):
+                edge.update(graph.edges[source, target])
+            graph.add_edge(source, target, **edge)
+            state.edges_loaded += 1
+            if progress and state.edges_loaded % page_size == 0:
+                progress(state.nodes_loaded, state.edges_loaded)
+
+        state.status = STATUS_READY
+        logger.info(
+            f"Graph hydrated with {state.nodes_loaded} nodes and "
+            f"{state.edges_loaded} edges in {time.monotonic() - started:.2f}s"
+        )
+    except Exception as e:
+        state.status = STATUS_FAILED
+        state.error = str(e)
+        logger.error(f"Graph hydration failed: {e}")
+    finally:
+        state.finished_at = datetime.now(timezone.utc).isoformat()
+        if progress:
+            progress(state.nodes_loaded, state.edges_loaded)
+        state._ready.set()
+        if on_complete:
+            on_complete(state)
+
+    return state
+
+
+def start_hydration(
+    graph: Any,
+    persistence: Any,
+    mode: str,
+    state: HydrationState,
+    page_size: int = 5000,
+    progress: Optional[ProgressCallback] = None,
+    on_complete: Optional[CompleteCallback] = None
+) -> Optional[threading.Thread]:
+    """
+    Start hydration according to the configured mode.
+
+    Args:
+        graph: NetworkX-compatible graph to load into
+        persistence: OmnitechPersistence (or None if not configured)
+        mode: One of 'off', 'background' or 'blocking'
+        state: Hydration state to update
+        page_size: Number of records fetched per page
+        progress: Optional progress callback
+        on_complete: Optional completion callback
+
+    Returns:
+        The background thread for 'background' mode, otherwise None
+    """
+    if mode == MODE_OFF or persistence is None:
+        state.mark_ready()
+        return None
+
+    if mode == MODE_BLOCKING:
+        hydrate_graph(graph, persistence, page_size, progress, state, on_complete)
+        return None
+
+    if mode != MODE_BACKGROUND:
+        logger.warning(f"Unknown hydration mode '{mode}' - using background")
+
+    thread = threading.Thread(
+        target=hydrate_graph,
+        args=(graph, persistence, page_size, progress, state, on_complete),
+        name='omnitech-hydration',
+        daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Webhook Payload
+ScrollVerse Genesis Protocol - Lazy Payload Parsing
+
+This module wraps a raw webhook body. The JSON is parsed at most once, and
+only when something asks for it, using orjson when it is installed. The
+few fields the graph indexes (repository, ref, sender, action) are
+extracted from the parsed document without copying it.
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def loads(raw: Buffer) -> Any:
+    """
+    Parse JSON from bytes with the fastest available parser.
+
+    Raises:
+        ValueError: If the input is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+
+def _get_path(data: Any, *path: str) -> Optional[str]:
+    """Follow nested keys and return the value if it is a string."""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data if isinstance(data, str) else None
+
+
+class WebhookPayload:
+    """
+    A webhook body that is parsed on first access.
+
+    Args:
+        raw: Raw request body
+        event_type: X-GitHub-Event header value
+    """
+
+    def __init__(self, raw: Buffer, event_type: str = 'unknown'):
+        self.raw = raw
+        self.event_type = event_type
+        self._data: Any = None
+        self._parsed = False
+
+    @property
+    def parsed(self) -> bool:
+        """Whether the body has been parsed."""
+        return self._parsed
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """
+        The parsed JSON document (an empty dict for an empty body).
+
+        Raises:
+            ValueError: If the body is not a JSON object
+        """
+        if not self._parsed:
+            data = loads(self.raw) if self.raw else {}
+            if not isinstance(data, dict):
+                raise ValueError('Webhook payload must be a JSON object')
+            self._data = data
+            self._parsed = True
+        return self._data
+
+    def summary(self) -> Dict[str, str]:
+        """
+        Extract the indexed fields: repo, ref, sender and action.
+
+        Returns:
+            The fields present in the payload (missing ones are omitted)
+        """
+        data = self.data
+        fields = {
+            'repo': _get_path(data, 'repository', 'full_name'),
+            'ref': _get_path(data, 'ref'),
+            'sender': _get_path(data, 'sender', 'login'),
+            'action': _get_path(data, 'action')
+        }
+        return {key: value for key, value in fields.items() if value is not None}
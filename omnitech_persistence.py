@@ -7,14 +7,361 @@ This module provides Neo4j persistence for the OmniTech1 integration,
 allowing the in-memory NetworkX graph to be persisted to Neo4j.
 """
 
+import contextlib
 import logging
-from typing import Dict, Any, Optional, List
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Callable, Sequence, Tuple, Union
 
 from neo4j import GraphDatabase
-from neo4j.exceptions import ServiceUnavailable, AuthError
+from neo4j.exceptions import ServiceUnavailable, AuthError, SessionExpired, TransientError
+
+from omnitech_circuit import CircuitBreaker
+from omnitech_codec import JSON_SUFFIX, KEY_SEPARATOR, decode_properties, encode_attributes
 
 logger = logging.getLogger(__name__)
 
+# Default number of rows written per bulk transaction
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Default number of records fetched per page when streaming
+DEFAULT_PAGE_SIZE = 5000
+
+# Errors after which a transaction function is retried
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+class CircuitOpenError(ServiceUnavailable):
+    """Raised instead of contacting Neo4j while the circuit is open."""
+
+
+# Property names that may be interpolated into Cypher
+_PROPERTY_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _merge_increments(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combine counter increments that target the same node."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        target = merged.setdefault(row['id'], {'id': row['id'], 'attributes': {}, 'counts': {}})
+        target['attributes'].update(row.get('attributes', {}))
+        for key, amount in row['counts'].items():
+            target['counts'][key] = target['counts'].get(key, 0) + amount
+    return list(merged.values())
+
+
+def _merge_records(records: Iterable[Dict[str, Any]], key: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Combine node or edge dictionaries with the same key; later attributes win."""
+    merged: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for record in records:
+        target = merged.setdefault(tuple(record[name] for name in key), {})
+        target.update(record)
+    return list(merged.values())
+
+
+# Counter increments: merge (and lock) the nodes, then set the new values
+_MERGE_COUNTER_NODES = """
+UNWIND $rows AS row
+MERGE (n:OmniNode {id: row.id})
+SET n += row.attributes
+RETURN n.id AS id, properties(n) AS props
+"""
+
+_SET_COUNTERS = """
+UNWIND $rows AS row
+MATCH (n:OmniNode {id: row.id})
+SET n += row.counts, n.updated_at = timestamp()
+"""
+
+
+def _counter_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """UNWIND rows that merge the nodes of counter increments."""
+    return [{'id': row['id'], 'attributes': encode_attributes(row['attributes'])} for row in rows]
+
+
+def _counter_updates(rows: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add increments to the current values returned by _MERGE_COUNTER_NODES."""
+    current = {record['id']: record['props'] for record in records}
+    updates = []
+    for row in rows:
+        props = current.get(row['id'], {})
+        counts = {}
+        for key, amount in row['counts'].items():
+            existing = props.get(key)
+            if not isinstance(existing, (int, float)) or isinstance(existing, bool):
+                existing = 0
+            counts[key] = existing + amount
+        updates.append({'id': row['id'], 'counts': counts})
+    return updates
+
+
+def _increment_in_tx(tx: Any, rows: List[Dict[str, Any]]) -> int:
+    """
+    Add counter increments to nodes inside an open transaction.
+
+    Every node is merged and written first, so the transaction holds its
+    write lock before the current counter values are read; concurrent
+    incrementers therefore cannot lose updates.
+    """
+    records = tx.run(_MERGE_COUNTER_NODES, rows=_counter_rows(rows)).data()
+    updates = _counter_updates(rows, records)
+    tx.run(_SET_COUNTERS, rows=updates)
+    return len(updates)
+
+
+def _stale_keys(entity: str, attributes: str, roots: str) -> str:
+    """
+    Cypher list of the properties of entity left over from other encodings
+    of the written attributes (roots): 'attr', 'attr.*' and 'attr__json'
+    keys that the new encoding does not set.
+    """
+    return (
+        f"[key IN keys({entity}) WHERE NOT key IN keys({attributes}) AND any(root IN {roots} WHERE "
+        f"key = root OR key = root + '{JSON_SUFFIX}' OR key STARTS WITH root + '{KEY_SEPARATOR}')]"
+    )
+
+
+# Bulk upsert queries (one row per node / edge). Every write stamps
+# updated_at (epoch milliseconds) for the delta export. SET += only adds
+# properties, so the rows whose old encoding left other properties behind
+# are returned and cleared by _CLEAR_* in the same transaction.
+_UPSERT_NODES = """
+UNWIND $rows AS row
+MERGE (n:OmniNode {id: row.id})
+WITH n, row, """ + _stale_keys('n', 'row.attributes', 'row.roots') + """ AS stale
+SET n += row.attributes, n.updated_at = timestamp()
+RETURN count(n) AS written,
+       [item IN collect({id: row.id, stale: stale}) WHERE size(item.stale) > 0] AS stale
+"""
+
+_UPSERT_EDGES = """
+UNWIND $rows AS row
+MATCH (s:OmniNode {id: row.source})
+MATCH (t:OmniNode {id: row.target})
+MERGE (s)-[r:CONNECTED]->(t)
+WITH r, row, """ + _stale_keys('r', 'row.attributes', 'row.roots') + """ AS stale
+SET r += row.attributes, r.updated_at = timestamp()
+RETURN count(r) AS written,
+       [item IN collect({source: row.source, target: row.target, stale: stale})
+        WHERE size(item.stale) > 0] AS stale
+"""
+
+_CLEAR_NODE_PROPERTIES = """
+UNWIND $rows AS row
+MATCH (n:OmniNode {id: row.id})
+SET n += row.cleared
+"""
+
+_CLEAR_EDGE_PROPERTIES = """
+UNWIND $rows AS row
+MATCH (:OmniNode {id: row.source})-[r:CONNECTED]->(:OmniNode {id: row.target})
+SET r += row.cleared
+"""
+
+
+# Single-record, deletion, lookup and paging queries
+_SAVE_NODE = """
+MERGE (n:OmniNode {id: $node_id})
+WITH n, """ + _stale_keys('n', '$attributes', '$roots') + """ AS stale
+SET n += $attributes, n.updated_at = timestamp()
+RETURN stale
+"""
+
+_SAVE_EDGE = """
+MATCH (s:OmniNode {id: $source})
+MATCH (t:OmniNode {id: $target})
+MERGE (s)-[r:CONNECTED]->(t)
+WITH r, """ + _stale_keys('r', '$attributes', '$roots') + """ AS stale
+SET r += $attributes, r.updated_at = timestamp()
+RETURN stale
+"""
+
+_DELETE_NODES = """
+UNWIND $rows AS row
+MATCH (n:OmniNode {id: row.id})
+DETACH DELETE n
+RETURN count(*) AS written
+"""
+
+_COMPACT_NODES = """
+MATCH (n:OmniNode)
+WHERE n.timestamp < $cutoff AND n.id STARTS WITH $prefix
+WITH n LIMIT $limit
+WITH n, substring(n.timestamp, 0, 16) AS minute,
+     coalesce(n.event_type, 'unknown') AS event_type
+DETACH DELETE n
+RETURN minute, event_type, count(*) AS count
+"""
+
+_NODE_BY_DELIVERY = """
+MATCH (n:OmniNode {delivery_id: $delivery_id})
+RETURN n.id AS id LIMIT 1
+"""
+
+_ALL_NODES = "MATCH (n:OmniNode) RETURN n"
+
+_ALL_EDGES = """
+MATCH (s:OmniNode)-[r:CONNECTED]->(t:OmniNode)
+RETURN s.id as source, t.id as target, properties(r) as attrs
+"""
+
+_PAGE_NODES = """
+MATCH (n:OmniNode)
+WHERE n.id > $after
+RETURN n.id AS id, properties(n) AS props
+ORDER BY n.id
+LIMIT $limit
+"""
+
+_PAGE_EDGES = """
+MATCH (s:OmniNode)-[r:CONNECTED]->(t:OmniNode)
+WHERE s.id > $after_source
+   OR (s.id = $after_source AND t.id > $after_target)
+RETURN s.id AS source, t.id AS target, properties(r) AS attrs
+ORDER BY s.id, t.id
+LIMIT $limit
+"""
+
+# Delta export: keyset pages over (updated_at, id). The >= predicate is a
+# range seek on the omninode_updated_at / connected_updated_at indexes; the
+# OR only breaks ties. {props} is one of the _PROJECT_* expressions below.
+_NODES_SINCE = """
+MATCH (n:OmniNode)
+WHERE n.updated_at >= $after_updated_at
+  AND (n.updated_at > $after_updated_at OR n.id > $after_id)
+RETURN n.id AS id, n.updated_at AS updated_at, {props} AS props
+ORDER BY n.updated_at, n.id
+LIMIT $limit
+"""
+
+_EDGES_SINCE = """
+MATCH (s:OmniNode)-[r:CONNECTED]->(t:OmniNode)
+WHERE r.updated_at >= $after_updated_at
+  AND (r.updated_at > $after_updated_at
+       OR s.id > $after_source
+       OR (s.id = $after_source AND t.id > $after_target))
+RETURN s.id AS source, t.id AS target, r.updated_at AS updated_at, {props} AS attrs
+ORDER BY r.updated_at, s.id, t.id
+LIMIT $limit
+"""
+
+_PROJECT_ALL = 'properties({entity})'
+
+# Requested attributes, including their flattened and JSON-encoded keys
+_PROJECT_FIELDS = (
+    '[key IN keys({entity}) WHERE key IN $fields OR any(field IN $fields WHERE '
+    'key STARTS WITH field + $separator OR key = field + $json_suffix) | [key, {entity}[key]]]'
+)
+
+# Interpolated property name is validated against _PROPERTY_NAME
+_DELETE_EXPIRED = """
+MATCH (n:OmniNode)
+WHERE n.id STARTS WITH $prefix AND n.{time_property} < $cutoff
+DETACH DELETE n
+RETURN count(*) AS deleted
+"""
+
+_CLEAR_ALL = "MATCH (n:OmniNode) DETACH DELETE n"
+
+
+def _node_rows(nodes: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert node dictionaries to UNWIND rows (roots: the attribute names written)."""
+    rows = []
+    for node in nodes:
+        attributes = {k: v for k, v in node.items() if k != 'id'}
+        rows.append({
+            'id': node['id'],
+            'attributes': encode_attributes(attributes),
+            'roots': [str(key) for key in attributes]
+        })
+    return rows
+
+
+def _edge_rows(edges: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert edge dictionaries to UNWIND rows (roots: the attribute names written)."""
+    rows = []
+    for edge in edges:
+        attributes = {k: v for k, v in edge.items() if k not in ('source', 'target')}
+        rows.append({
+            'source': edge['source'],
+            'target': edge['target'],
+            'attributes': encode_attributes(attributes),
+            'roots': [str(key) for key in attributes]
+        })
+    return rows
+
+
+def _cleared_rows(stale: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows for _CLEAR_*: the stale keys of each record mapped to null (removes them)."""
+    return [
+        {**{k: v for k, v in item.items() if k != 'stale'}, 'cleared': dict.fromkeys(item['stale'])}
+        for item in stale
+    ]
+
+
+def _upsert_in_tx(tx: Any, query: str, clear_query: Optional[str], rows: List[Dict[str, Any]]) -> int:
+    """Run a bulk upsert and clear the stale properties it reports; returns rows written."""
+    record = tx.run(query, rows=rows).single()
+    if record is None:
+        return 0
+    stale = record.get('stale')
+    if stale and clear_query is not None:
+        tx.run(clear_query, rows=_cleared_rows(stale)).consume()
+    return record['written']
+
+
+def _delta_query(template: str, entity: str, properties: Optional[Iterable[str]]) -> Tuple[str, Dict[str, Any]]:
+    """Build a delta export query and its projection parameters."""
+    if properties is None:
+        return template.format(props=_PROJECT_ALL.format(entity=entity)), {}
+    params = {'fields': list(properties), 'separator': KEY_SEPARATOR, 'json_suffix': JSON_SUFFIX}
+    return template.format(props=_PROJECT_FIELDS.format(entity=entity)), params
+
+
+def _delta_properties(value: Any) -> Dict[str, Any]:
+    """Decode the projected properties of a delta record ([key, value] pairs or a map)."""
+    return decode_properties(dict(value))
+
+
+def _epoch_ms(value: Union[int, str]) -> int:
+    """Convert epoch milliseconds or an ISO-8601 time (UTC if naive) to epoch milliseconds."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid watermark: {value!r}")
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def _watermark(watermark: Optional[Union[int, str, Sequence[Any]]], size: int) -> List[Any]:
+    """
+    Normalize a watermark to [updated_at, id...] with size parts.
+
+    A time (ISO-8601 string or epoch milliseconds) starts at that time
+    (inclusive); a list is a cursor yielded by a previous export and
+    resumes after that record.
+
+    Raises:
+        ValueError: If the watermark is malformed
+    """
+    if watermark is None or watermark == '':
+        return [0] + [''] * (size - 1)
+    if isinstance(watermark, (int, str)):
+        return [_epoch_ms(watermark)] + [''] * (size - 1)
+    if len(watermark) != size:
+        raise ValueError(f"Invalid watermark: {watermark!r}")
+    return [_epoch_ms(watermark[0])] + [str(part) for part in watermark[1:]]
+
+
+def _chunked(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    """Yield successive chunks of rows."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
 
 class OmnitechPersistence:
     """
@@ -24,7 +371,22 @@ class OmnitechPersistence:
     enabling persistence of the in-memory NetworkX graph.
     """
 
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        max_pool_size: Optional[int] = None,
+        acquisition_timeout: Optional[float] = None,
+        connection_lifetime: Optional[float] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        health_interval: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 1.0,
+        max_reset_timeout: float = 60.0,
+        fail_fast: bool = True
+    ):
         """
         Initialize the Neo4j connection.
 
@@ -32,45 +394,262 @@ class OmnitechPersistence:
             uri: Neo4j connection URI (e.g., 'bolt://localhost:7687')
             user: Neo4j username
             password: Neo4j password
+            max_pool_size: Maximum pooled connections (driver default if None)
+            acquisition_timeout: Seconds to wait for a pooled connection
+                (driver default if None)
+            connection_lifetime: Seconds after which pooled connections are
+                replaced (driver default if None)
+            max_retries: Retries of a transaction after a transient error
+            retry_backoff: Seconds before the first retry (doubled each time)
+            health_interval: Seconds between background connectivity
+                probes (0 checks on every is_connected call instead)
+            failure_threshold: Consecutive failed transactions that open
+                the circuit
+            reset_timeout: Seconds before the first reconnect attempt once
+                the circuit is open (doubled after each failed attempt)
+            max_reset_timeout: Upper bound for the reconnect backoff
+            fail_fast: Raise if the first connection attempt fails; if
+                False the circuit opens and the connection is retried in
+                the background
+
+        Raises:
+            neo4j.exceptions.AuthError: If the credentials are rejected
+            neo4j.exceptions.ServiceUnavailable: If Neo4j is unreachable
+                and fail_fast is set
         """
         self._uri = uri
         self._user = user
         self._password = password
+        self._pool_config = {
+            key: value
+            for key, value in (
+                ('max_connection_pool_size', max_pool_size),
+                ('connection_acquisition_timeout', acquisition_timeout),
+                ('max_connection_lifetime', connection_lifetime)
+            )
+            if value is not None
+        }
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.health_interval = health_interval
         self._driver = None
+        self._healthy = False
+        self._checked_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._retries = 0
+        self.fail_fast = fail_fast
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, max_reset_timeout)
+        # Session opened by session() for the current thread
+        self._local = threading.local()
+        self._stop_probe = threading.Event()
+        self._probe_thread: Optional[threading.Thread] = None
         self._connect()
 
     def _connect(self) -> None:
         """Establish connection to Neo4j."""
         try:
-            self._driver = GraphDatabase.driver(
-                self._uri,
-                auth=(self._user, self._password)
+            self._open_driver()
+        except ServiceUnavailable:
+            if self.fail_fast:
+                raise
+            logger.warning("Neo4j unavailable - reconnecting in the background")
+            self.breaker.trip()
+        if self.health_interval > 0:
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop,
+                name='omnitech-neo4j-health',
+                daemon=True
             )
-            # Verify connectivity
-            self._driver.verify_connectivity()
-            logger.info(f"Connected to Neo4j at {self._uri}")
+            self._probe_thread.start()
+
+    def _open_driver(self) -> None:
+        """Create the driver and verify connectivity."""
+        driver = GraphDatabase.driver(
+            self._uri,
+            auth=(self._user, self._password),
+            # Retries are handled by _transact, with its own backoff
+            max_transaction_retry_time=0,
+            **self._pool_config
+        )
+        try:
+            driver.verify_connectivity()
         except (ServiceUnavailable, AuthError) as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
-            self._driver = None
+            self._set_health(False, e)
+            driver.close()
             raise
+        self._driver = driver
+        self._set_health(True)
+        self.breaker.record_success()
+        logger.info(f"Connected to Neo4j at {self._uri}")
 
-    def is_connected(self) -> bool:
-        """Check if the Neo4j connection is active."""
-        if self._driver is None:
+    def _set_health(self, healthy: bool, error: Optional[Exception] = None) -> None:
+        self._healthy = healthy
+        self._checked_at = time.time()
+        if error is not None:
+            self._last_error = str(error)
+
+    def _probe(self) -> bool:
+        """
+        Check connectivity with a round-trip (reconnecting if needed) and
+        update the health and circuit state.
+
+        While the circuit is open nothing is sent until the reconnect
+        backoff has passed; the probe is then the half-open trial.
+        """
+        if self._stop_probe.is_set() or not self.breaker.allow():
             return False
         try:
-            self._driver.verify_connectivity()
-            return True
-        except Exception:
+            if self._driver is None:
+                self._open_driver()
+            else:
+                self._driver.verify_connectivity()
+        except Exception as e:
+            if self._healthy:
+                logger.warning(f"Neo4j health probe failed: {e}")
+            self._set_health(False, e)
+            self.breaker.record_failure()
             return False
+        self._set_health(True)
+        self.breaker.record_success()
+        return True
+
+    def _probe_loop(self) -> None:
+        while not self._stop_probe.wait(self._probe_delay()):
+            self._probe()
+
+    def _probe_delay(self) -> float:
+        """Seconds until the next probe (sooner while reconnecting)."""
+        if self.breaker.closed:
+            return self.health_interval
+        retry_in = self.breaker.stats()['retry_in'] or 0.0
+        return min(self.health_interval, max(retry_in, 0.05))
+
+    def available(self) -> bool:
+        """Whether writes are currently sent to Neo4j (circuit closed)."""
+        return self._driver is not None and self.breaker.closed
+
+    def is_connected(self) -> bool:
+        """
+        Check if the Neo4j connection is active.
+
+        Answered from the cached health state, which the background probe
+        and every transaction keep current; without a probe interval the
+        connection is checked with a round-trip.
+        """
+        if self.health_interval <= 0:
+            return self._probe()
+        return self._driver is not None and self._healthy
+
+    def health(self) -> Dict[str, Any]:
+        """Get the cached health state."""
+        return {
+            'connected': self._driver is not None and self._healthy,
+            'checked_at': self._checked_at,
+            'last_error': self._last_error,
+            'retries': self._retries,
+            'circuit': self.breaker.stats(),
+            'pool': dict(self._pool_config)
+        }
 
     def close(self) -> None:
         """Close the Neo4j connection."""
+        self._stop_probe.set()
+        if self._probe_thread is not None:
+            self._probe_thread.join()
+            self._probe_thread = None
         if self._driver:
             self._driver.close()
             self._driver = None
+            self._set_health(False)
             logger.info("Neo4j connection closed")
 
+    @contextlib.contextmanager
+    def session(self) -> Iterator[Any]:
+        """
+        Share one session between the execute_write / execute_read calls
+        made by this thread inside the block.
+
+        Raises:
+            neo4j.exceptions.ServiceUnavailable: If there is no connection
+        """
+        current = getattr(self._local, 'session', None)
+        if current is not None:
+            yield current
+            return
+        if not self._driver:
+            raise ServiceUnavailable('No Neo4j connection')
+        with self._driver.session() as session:
+            self._local.session = session
+            try:
+                yield session
+            finally:
+                self._local.session = None
+
+    def _transact(self, write: bool, work: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """
+        Run a transaction function, retrying transient failures.
+
+        Calls fail immediately with CircuitOpenError while the circuit is
+        open; a call that gives up on a lost connection counts as one
+        failure towards opening it.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError('Neo4j circuit open - transaction not attempted')
+        attempt = 0
+        while True:
+            try:
+                with self.session() as session:
+                    execute = session.execute_write if write else session.execute_read
+                    result = execute(work, *args, **kwargs)
+                if not self._healthy:
+                    self._set_health(True)
+                self.breaker.record_success()
+                return result
+            except RETRYABLE_ERRORS as e:
+                lost = isinstance(e, (ServiceUnavailable, SessionExpired))
+                if lost:
+                    self._set_health(False, e)
+                # A half-open trial is not retried
+                if attempt >= self.max_retries or (lost and not self.breaker.closed):
+                    if lost:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                attempt += 1
+                self._retries += 1
+                logger.warning(f"Transient Neo4j error, retry {attempt}/{self.max_retries} in {delay:.2f}s: {e}")
+                time.sleep(delay)
+            except Exception:
+                # Neo4j answered - the query failed, not the connection
+                self.breaker.record_success()
+                raise
+
+    def execute_write(self, work: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run work(tx, *args, **kwargs) in a managed write transaction.
+
+        The transaction is committed when work returns and retried (with
+        exponential backoff) after transient errors and lost connections,
+        so work must not have side effects outside the transaction.
+
+        Returns:
+            The value returned by work
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            neo4j.exceptions.ServiceUnavailable: If there is no connection
+            Exception: The last error once the retries are exhausted, or
+                any non-transient error
+        """
+        return self._transact(True, work, args, kwargs)
+
+    def execute_read(self, work: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run work(tx, *args, **kwargs) in a managed read transaction (see execute_write)."""
+        return self._transact(False, work, args, kwargs)
+
     def save_node(self, node_id: str, attributes: Dict[str, Any]) -> bool:
         """
         Save a node to Neo4j.
@@ -87,21 +666,20 @@ class OmnitechPersistence:
             return False
 
         try:
-            with self._driver.session() as session:
-                # Sanitize attributes for Neo4j (convert complex types to strings)
-                safe_attrs = {
-                    k: str(v) if not isinstance(v, (str, int, float, bool)) else v
-                    for k, v in attributes.items()
-                }
-
-                query = """
-                MERGE (n:OmniNode {id: $node_id})
-                SET n += $attributes
-                RETURN n
-                """
-                session.run(query, node_id=node_id, attributes=safe_attrs)
-                logger.debug(f"Saved node: {node_id}")
-                return True
+            # Encode attributes as Neo4j property values
+            safe_attrs = encode_attributes(attributes)
+
+            roots = [str(key) for key in attributes]
+
+            def write(tx: Any) -> None:
+                record = tx.run(_SAVE_NODE, node_id=node_id, attributes=safe_attrs, roots=roots).single()
+                if record and record.get('stale'):
+                    rows = _cleared_rows([{'id': node_id, 'stale': record['stale']}])
+                    tx.run(_CLEAR_NODE_PROPERTIES, rows=rows).consume()
+
+            self.execute_write(write)
+            logger.debug(f"Saved node: {node_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save node {node_id}: {e}")
             return False
@@ -123,27 +701,308 @@ class OmnitechPersistence:
             return False
 
         try:
-            with self._driver.session() as session:
-                # Sanitize attributes for Neo4j
-                safe_attrs = {
-                    k: str(v) if not isinstance(v, (str, int, float, bool)) else v
-                    for k, v in attributes.items()
-                }
-
-                query = """
-                MATCH (s:OmniNode {id: $source})
-                MATCH (t:OmniNode {id: $target})
-                MERGE (s)-[r:CONNECTED]->(t)
-                SET r += $attributes
-                RETURN r
-                """
-                session.run(query, source=source, target=target, attributes=safe_attrs)
-                logger.debug(f"Saved edge: {source} -> {target}")
-                return True
+            # Encode attributes as Neo4j property values
+            safe_attrs = encode_attributes(attributes)
+
+            roots = [str(key) for key in attributes]
+
+            def write(tx: Any) -> None:
+                record = tx.run(_SAVE_EDGE, source=source, target=target, attributes=safe_attrs, roots=roots).single()
+                if record and record.get('stale'):
+                    rows = _cleared_rows([{'source': source, 'target': target, 'stale': record['stale']}])
+                    tx.run(_CLEAR_EDGE_PROPERTIES, rows=rows).consume()
+
+            self.execute_write(write)
+            logger.debug(f"Saved edge: {source} -> {target}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save edge {source} -> {target}: {e}")
             return False
 
+    def save_nodes_bulk(
+        self,
+        nodes: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        raise_errors: bool = False
+    ) -> List[int]:
+        """
+        Save many nodes to Neo4j using chunked UNWIND transactions.
+
+        Args:
+            nodes: Node dictionaries with 'id' and attributes
+                (the format returned by get_all_nodes)
+            chunk_size: Number of nodes written per transaction
+            raise_errors: Raise the first error (stopping at the failed
+                chunk) instead of reporting it as 0
+
+        Returns:
+            Number of nodes written by each chunk (0 for a failed chunk)
+        """
+        return self._run_bulk(
+            _UPSERT_NODES, _node_rows(nodes), chunk_size, 'nodes', raise_errors, _CLEAR_NODE_PROPERTIES
+        )
+
+    def save_edges_bulk(
+        self,
+        edges: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        raise_errors: bool = False
+    ) -> List[int]:
+        """
+        Save many edges to Neo4j using chunked UNWIND transactions.
+
+        Edges whose endpoints do not exist are skipped, as with save_edge.
+
+        Args:
+            edges: Edge dictionaries with 'source', 'target' and attributes
+                (the format returned by get_all_edges)
+            chunk_size: Number of edges written per transaction
+            raise_errors: Raise the first error (stopping at the failed
+                chunk) instead of reporting it as 0
+
+        Returns:
+            Number of edges written by each chunk (0 for a failed chunk)
+        """
+        return self._run_bulk(
+            _UPSERT_EDGES, _edge_rows(edges), chunk_size, 'edges', raise_errors, _CLEAR_EDGE_PROPERTIES
+        )
+
+    def save_subgraph(
+        self,
+        nodes: Iterable[Dict[str, Any]],
+        edges: Iterable[Dict[str, Any]],
+        raise_errors: bool = False
+    ) -> bool:
+        """
+        Save nodes and the edges between them in a single transaction.
+
+        Either the whole subgraph is written or (on failure) none of it.
+
+        Args:
+            nodes: Node dictionaries with 'id' and attributes
+            edges: Edge dictionaries with 'source', 'target' and attributes
+            raise_errors: Raise the error instead of returning False
+
+        Returns:
+            True if the transaction committed
+        """
+        node_rows = _node_rows(nodes)
+        edge_rows = _edge_rows(edges)
+        if not node_rows and not edge_rows:
+            return True
+
+        if not self._driver:
+            logger.warning(
+                f"No Neo4j connection - subgraph of {len(node_rows)} nodes and "
+                f"{len(edge_rows)} edges not persisted"
+            )
+            if raise_errors:
+                raise ServiceUnavailable('No Neo4j connection')
+            return False
+
+        def write(tx: Any) -> None:
+            if node_rows:
+                _upsert_in_tx(tx, _UPSERT_NODES, _CLEAR_NODE_PROPERTIES, node_rows)
+            if edge_rows:
+                _upsert_in_tx(tx, _UPSERT_EDGES, _CLEAR_EDGE_PROPERTIES, edge_rows)
+
+        try:
+            self.execute_write(write)
+            logger.debug(f"Saved subgraph of {len(node_rows)} nodes and {len(edge_rows)} edges")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save subgraph: {e}")
+            if raise_errors:
+                raise
+            return False
+
+    def delete_nodes_bulk(
+        self,
+        node_ids: Iterable[str],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        raise_errors: bool = False
+    ) -> List[int]:
+        """
+        Delete many nodes (and their relationships) from Neo4j.
+
+        Args:
+            node_ids: Ids of the nodes to delete
+            chunk_size: Number of nodes deleted per transaction
+            raise_errors: Raise the first error (stopping at the failed
+                chunk) instead of reporting it as 0
+
+        Returns:
+            Number of nodes deleted by each chunk (0 for a failed chunk)
+        """
+        rows = [{'id': node_id} for node_id in node_ids]
+        return self._run_bulk(_DELETE_NODES, rows, chunk_size, 'node deletions', raise_errors)
+
+    def increment_counters_bulk(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        raise_errors: bool = False
+    ) -> List[int]:
+        """
+        Add to counter properties of many nodes, creating them if needed.
+
+        Args:
+            rows: Dictionaries with 'id', 'attributes' (set as-is) and
+                'counts' (property name -> amount to add)
+            chunk_size: Number of nodes updated per transaction
+            raise_errors: Raise the first error (stopping at the failed
+                chunk) instead of reporting it as 0
+
+        Returns:
+            Number of nodes updated by each chunk (0 for a failed chunk)
+        """
+        merged = _merge_increments(rows)
+        if not merged:
+            return []
+
+        chunks = list(_chunked(merged, max(1, chunk_size)))
+        if not self._driver:
+            logger.warning(f"No Neo4j connection - {len(merged)} counter updates not persisted")
+            if raise_errors:
+                raise ServiceUnavailable('No Neo4j connection')
+            return [0] * len(chunks)
+
+        counts = []
+        try:
+            with self.session():
+                for chunk in chunks:
+                    try:
+                        counts.append(self.execute_write(_increment_in_tx, chunk))
+                    except Exception as e:
+                        logger.error(f"Failed to update {len(chunk)} counters: {e}")
+                        if raise_errors:
+                            raise
+                        counts.append(0)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Failed to update counters in bulk: {e}")
+            counts.extend([0] * (len(chunks) - len(counts)))
+        return counts
+
+    def compact_nodes(
+        self,
+        id_prefix: str,
+        cutoff: str,
+        rollup: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        batch_size: int = DEFAULT_BULK_CHUNK_SIZE
+    ) -> int:
+        """
+        Delete old nodes and roll their counts up into aggregate nodes.
+
+        Each batch deletes up to batch_size nodes whose id starts with
+        id_prefix and whose timestamp is before cutoff, groups them by
+        minute and event type, and applies the counter increments returned
+        by rollup - all in one transaction.
+
+        Args:
+            id_prefix: Only compact nodes whose id starts with this prefix
+            cutoff: ISO-8601 UTC timestamp; older nodes are compacted
+            rollup: Maps groups ({'minute', 'event_type', 'count'}) to
+                increment rows for increment_counters_bulk
+            batch_size: Maximum nodes compacted per transaction
+
+        Returns:
+            Total number of nodes compacted
+        """
+        if not self._driver:
+            return 0
+
+        query = _COMPACT_NODES
+        def compact_batch(tx: Any) -> int:
+            groups = tx.run(query, cutoff=cutoff, prefix=id_prefix, limit=batch_size).data()
+            if groups:
+                _increment_in_tx(tx, _merge_increments(rollup(groups)))
+            return sum(group['count'] for group in groups)
+
+        total = 0
+        try:
+            with self.session():
+                while True:
+                    compacted = self.execute_write(compact_batch)
+                    total += compacted
+                    if compacted < batch_size:
+                        break
+        except Exception as e:
+            logger.error(f"Failed to compact {id_prefix}* nodes: {e}")
+
+        if total:
+            logger.info(f"Compacted {total} {id_prefix}* nodes older than {cutoff}")
+        return total
+
+    def delete_expired_nodes(self, id_prefix: str, cutoff: str, time_property: str) -> int:
+        """
+        Delete nodes whose id starts with id_prefix and time_property < cutoff.
+
+        Returns:
+            Number of nodes deleted
+        """
+        if not self._driver:
+            return 0
+        if not _PROPERTY_NAME.match(time_property):
+            raise ValueError(f"Invalid property name: {time_property}")
+
+        query = _DELETE_EXPIRED.format(time_property=time_property)
+        try:
+            record = self.execute_write(lambda tx: tx.run(query, prefix=id_prefix, cutoff=cutoff).single())
+            return record['deleted'] if record else 0
+        except Exception as e:
+            logger.error(f"Failed to delete expired {id_prefix}* nodes: {e}")
+            return 0
+
+    def _run_bulk(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: int,
+        label: str,
+        raise_errors: bool = False,
+        clear_query: Optional[str] = None
+    ) -> List[int]:
+        """
+        Run an UNWIND query over rows, one explicit transaction per chunk.
+
+        A failed chunk is rolled back and reported as 0 without aborting
+        the remaining chunks (or, with raise_errors, its error is raised).
+        Stale properties reported by an upsert are cleared with clear_query
+        in the same transaction.
+        """
+        if not rows:
+            return []
+
+        chunks = list(_chunked(rows, max(1, chunk_size)))
+        if not self._driver:
+            logger.warning(f"No Neo4j connection - {len(rows)} {label} not persisted")
+            if raise_errors:
+                raise ServiceUnavailable('No Neo4j connection')
+            return [0] * len(chunks)
+
+        counts = []
+        try:
+            with self.session():
+                for chunk in chunks:
+                    try:
+                        # Commits when the function returns, rolls back if the chunk fails
+                        counts.append(self.execute_write(_upsert_in_tx, query, clear_query, chunk))
+                    except Exception as e:
+                        logger.error(f"Failed to save chunk of {len(chunk)} {label}: {e}")
+                        if raise_errors:
+                            raise
+                        counts.append(0)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Failed to save {label} in bulk: {e}")
+            counts.extend([0] * (len(chunks) - len(counts)))
+
+        logger.debug(f"Bulk saved {sum(counts)}/{len(rows)} {label}")
+        return counts
+
     def get_all_nodes(self) -> List[Dict[str, Any]]:
         """
         Retrieve all nodes from Neo4j.
@@ -155,18 +1014,35 @@ class OmnitechPersistence:
             return []
 
         try:
-            with self._driver.session() as session:
-                query = "MATCH (n:OmniNode) RETURN n"
-                result = session.run(query)
-                nodes = []
-                for record in result:
-                    node = dict(record['n'])
-                    nodes.append(node)
-                return nodes
+            query = _ALL_NODES
+            return self.execute_read(lambda tx: [decode_properties(dict(record['n'])) for record in tx.run(query)])
         except Exception as e:
             logger.error(f"Failed to get nodes: {e}")
             return []
 
+    def find_node_by_delivery(self, delivery_id: str) -> Optional[str]:
+        """
+        Find the node recorded for a webhook delivery.
+
+        Backed by the omninode_delivery_id_unique constraint when it exists.
+
+        Args:
+            delivery_id: X-GitHub-Delivery id
+
+        Returns:
+            The node id, or None if the delivery is unknown (or on error)
+        """
+        if not self._driver:
+            return None
+
+        try:
+            query = _NODE_BY_DELIVERY
+            record = self.execute_read(lambda tx: tx.run(query, delivery_id=delivery_id).single())
+            return record['id'] if record else None
+        except Exception as e:
+            logger.error(f"Failed to look up delivery {delivery_id}: {e}")
+            return None
+
     def get_all_edges(self) -> List[Dict[str, Any]]:
         """
         Retrieve all edges from Neo4j.
@@ -178,25 +1054,200 @@ class OmnitechPersistence:
             return []
 
         try:
-            with self._driver.session() as session:
-                query = """
-                MATCH (s:OmniNode)-[r:CONNECTED]->(t:OmniNode)
-                RETURN s.id as source, t.id as target, properties(r) as attrs
-                """
-                result = session.run(query)
-                edges = []
-                for record in result:
-                    edge = {
-                        'source': record['source'],
-                        'target': record['target'],
-                        **record['attrs']
-                    }
-                    edges.append(edge)
-                return edges
+            query = _ALL_EDGES
+            return self.execute_read(lambda tx: [
+                {'source': record['source'], 'target': record['target'], **decode_properties(record['attrs'])}
+                for record in tx.run(query)
+            ])
         except Exception as e:
             logger.error(f"Failed to get edges: {e}")
             return []
 
+    def iter_nodes(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all nodes from Neo4j in keyset-paginated pages.
+
+        Pages are ordered by node id and resume after the last id seen, so
+        only one page is held in memory at a time.
+
+        Args:
+            page_size: Number of nodes fetched per query
+
+        Yields:
+            Node dictionaries with 'id' and attributes
+        """
+        if not self._driver:
+            return
+
+        query = _PAGE_NODES
+        after = ''
+        while True:
+            try:
+                page = self.execute_read(lambda tx: tx.run(query, after=after, limit=page_size).data())
+            except Exception as e:
+                logger.error(f"Failed to page nodes after {after!r}: {e}")
+                raise
+
+            for record in page:
+                yield {**decode_properties(record['props']), 'id': record['id']}
+
+            if len(page) < page_size:
+                return
+            after = page[-1]['id']
+
+    def iter_edges(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all edges from Neo4j in keyset-paginated pages.
+
+        Pages are ordered by (source, target) and resume after the last
+        pair seen.
+
+        Args:
+            page_size: Number of edges fetched per query
+
+        Yields:
+            Edge dictionaries with 'source', 'target', and attributes
+        """
+        if not self._driver:
+            return
+
+        query = _PAGE_EDGES
+        after_source, after_target = '', ''
+        while True:
+            try:
+                page = self.execute_read(lambda tx: tx.run(
+                    query,
+                    after_source=after_source,
+                    after_target=after_target,
+                    limit=page_size
+                ).data())
+            except Exception as e:
+                logger.error(f"Failed to page edges after {after_source!r} -> {after_target!r}: {e}")
+                raise
+
+            for record in page:
+                attrs = decode_properties(record['attrs'])
+                yield {**attrs, 'source': record['source'], 'target': record['target']}
+
+            if len(page) < page_size:
+                return
+            after_source, after_target = page[-1]['source'], page[-1]['target']
+
+    def iter_nodes_since(
+        self,
+        watermark: Optional[Union[int, str, Sequence[Any]]] = None,
+        properties: Optional[Iterable[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Stream the nodes written (created or updated) at or after a watermark.
+
+        Every write stamps updated_at (Neo4j server time, epoch
+        milliseconds), so entity nodes and updated webhook nodes are
+        exported too. Nodes are read in (updated_at, id) order through the
+        omninode_updated_at index, one keyset page at a time. Deletions are
+        not exported. A write that commits after a later-stamped one can be
+        missed, so consumers polling while writers are active should resume
+        from a time slightly before their last cursor.
+
+        Args:
+            watermark: Time to start from (ISO-8601 or epoch milliseconds),
+                or the cursor of the last node a previous export yielded
+                (None for all)
+            properties: Attributes to return besides 'id' (None for all)
+            page_size: Number of nodes fetched per query
+
+        Yields:
+            (cursor, node) pairs; pass the last cursor back as watermark to
+            resume after that node
+
+        Raises:
+            ValueError: If the watermark is malformed
+        """
+        after_updated_at, after_id = _watermark(watermark, 2)
+        if not self._driver:
+            return
+
+        query, params = _delta_query(_NODES_SINCE, 'n', properties)
+        while True:
+            try:
+                page = self.execute_read(lambda tx: tx.run(
+                    query,
+                    params,
+                    after_updated_at=after_updated_at,
+                    after_id=after_id,
+                    limit=page_size
+                ).data())
+            except Exception as e:
+                logger.error(f"Failed to export nodes after {after_updated_at!r}/{after_id!r}: {e}")
+                raise
+
+            for record in page:
+                cursor = [record['updated_at'], record['id']]
+                yield cursor, {**_delta_properties(record['props']), 'id': record['id']}
+
+            if len(page) < page_size:
+                return
+            after_updated_at, after_id = page[-1]['updated_at'], page[-1]['id']
+
+    def iter_edges_since(
+        self,
+        watermark: Optional[Union[int, str, Sequence[Any]]] = None,
+        properties: Optional[Iterable[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Stream the edges written at or after a watermark.
+
+        Edges are read in (updated_at, source, target) order through the
+        connected_updated_at index. Nodes written together with an edge
+        are written before it, so exporting nodes and edges from the same
+        watermark yields those endpoints too. See iter_nodes_since.
+
+        Args:
+            watermark: Time to start from (ISO-8601 or epoch milliseconds),
+                or the cursor of the last edge a previous export yielded
+                (None for all)
+            properties: Attributes to return besides 'source' and 'target'
+                (None for all)
+            page_size: Number of edges fetched per query
+
+        Yields:
+            (cursor, edge) pairs; pass the last cursor back as watermark to
+            resume after that edge
+
+        Raises:
+            ValueError: If the watermark is malformed
+        """
+        after_updated_at, after_source, after_target = _watermark(watermark, 3)
+        if not self._driver:
+            return
+
+        query, params = _delta_query(_EDGES_SINCE, 'r', properties)
+        while True:
+            try:
+                page = self.execute_read(lambda tx: tx.run(
+                    query,
+                    params,
+                    after_updated_at=after_updated_at,
+                    after_source=after_source,
+                    after_target=after_target,
+                    limit=page_size
+                ).data())
+            except Exception as e:
+                logger.error(f"Failed to export edges after {after_updated_at!r}/{after_source!r}: {e}")
+                raise
+
+            for record in page:
+                cursor = [record['updated_at'], record['source'], record['target']]
+                attrs = _delta_properties(record['attrs'])
+                yield cursor, {**attrs, 'source': record['source'], 'target': record['target']}
+
+            if len(page) < page_size:
+                return
+            last = page[-1]
+            after_updated_at, after_source, after_target = last['updated_at'], last['source'], last['target']
+
     def clear_all(self) -> bool:
         """
         Clear all OmniNode data from Neo4j.
@@ -208,11 +1259,10 @@ class OmnitechPersistence:
             return False
 
         try:
-            with self._driver.session() as session:
-                query = "MATCH (n:OmniNode) DETACH DELETE n"
-                session.run(query)
-                logger.info("Cleared all OmniNode data")
-                return True
+            query = _CLEAR_ALL
+            self.execute_write(lambda tx: tx.run(query).consume())
+            logger.info("Cleared all OmniNode data")
+            return True
         except Exception as e:
             logger.error(f"Failed to clear data: {e}")
             return False
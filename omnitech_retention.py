@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Webhook Retention
+ScrollVerse Genesis Protocol - Time-Bucketed Compaction
+
+This module keeps the in-memory graph bounded under sustained webhook
+traffic. Webhook nodes older than a TTL (or beyond a node cap) are evicted
+and rolled up into per-minute and per-hour aggregate nodes that count
+events by event_type. The same rollup is used by the Neo4j compaction job.
+Entity nodes extracted from webhooks (commits, pull requests, users, ...)
+are evicted with them once no remaining webhook or event node links to
+them; repositories and aggregates are kept.
+"""
+
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Node id prefixes
+WEBHOOK_PREFIX = 'webhook_'
+AGGREGATE_PREFIX = 'agg_'
+
+# Aggregate buckets
+BUCKET_MINUTE = 'minute'
+BUCKET_HOUR = 'hour'
+
+# Counter property holding the total of all event types
+TOTAL_COUNTER = 'count_total'
+
+# Node kinds extracted per event, evicted once no live webhook or event
+# node points to them
+EVENT_KINDS = frozenset({'commit', 'pull_request', 'issue', 'workflow_run'})
+
+# Users are evicted once no live webhook or event node is linked to them
+USER_KIND = 'user'
+
+
+def is_webhook_node(node_id: Any) -> bool:
+    """Check if a node id belongs to a webhook event node."""
+    return isinstance(node_id, str) and node_id.startswith(WEBHOOK_PREFIX)
+
+
+def aggregate_id(bucket: str, key: str) -> str:
+    """Build the node id of an aggregate bucket (e.g. agg_minute_2026-01-01T00:05)."""
+    return f"{AGGREGATE_PREFIX}{bucket}_{key}"
+
+
+def counter_name(event_type: Any) -> str:
+    """Property name of the counter for an event type."""
+    return 'count_' + re.sub(r'[^A-Za-z0-9_]', '_', str(event_type or 'unknown'))
+
+
+def rollup(groups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turn per-minute event counts into aggregate counter increments.
+
+    Args:
+        groups: Dictionaries with 'minute' (YYYY-MM-DDTHH:MM), 'event_type'
+            and 'count'
+
+    Returns:
+        Increment rows ({'id', 'attributes', 'counts'}) for the minute and
+        hour aggregates of every group
+    """
+    rows = []
+    for group in groups:
+        minute = group['minute']
+        hour = minute[:13]
+        counts = {TOTAL_COUNTER: group['count'], counter_name(group['event_type']): group['count']}
+        rows.append({
+            'id': aggregate_id(BUCKET_MINUTE, minute),
+            'attributes': {
+                'kind': 'aggregate',
+                'bucket': BUCKET_MINUTE,
+                'bucket_start': f"{minute}:00+00:00"
+            },
+            'counts': counts
+        })
+        rows.append({
+            'id': aggregate_id(BUCKET_HOUR, hour),
+            'attributes': {
+                'kind': 'aggregate',
+                'bucket': BUCKET_HOUR,
+                'bucket_start': f"{hour}:00:00+00:00"
+            },
+            'counts': dict(counts)
+        })
+    return rows
+
+
+def _kind(graph: Any, node_id: Any) -> Any:
+    return graph.nodes[node_id].get('kind')
+
+
+def _is_event(graph: Any, node_id: Any, seen: set) -> bool:
+    """Whether node_id is a webhook or per-event node that is not being evicted."""
+    return node_id not in seen and (is_webhook_node(node_id) or _kind(graph, node_id) in EVENT_KINDS)
+
+
+def _orphans(graph: Any, node_id: Any, seen: set) -> List[Any]:
+    """
+    Find the entity nodes left unreferenced once node_id is evicted.
+
+    A per-event node is orphaned when none of its predecessors is a live
+    webhook or per-event node (links between them point from the webhook
+    towards the entity); a user when no live webhook or per-event node is
+    linked to it in either direction. Orphans are added to seen, and their
+    own neighbours are checked in turn.
+    """
+    orphans = []
+    pending = list(graph.successors(node_id)) + list(graph.predecessors(node_id))
+    while pending:
+        candidate = pending.pop()
+        if candidate in seen:
+            continue
+        kind = _kind(graph, candidate)
+        if kind in EVENT_KINDS:
+            anchors = graph.predecessors(candidate)
+        elif kind == USER_KIND:
+            anchors = list(graph.predecessors(candidate)) + list(graph.successors(candidate))
+        else:
+            continue
+        if any(_is_event(graph, anchor, seen) for anchor in anchors):
+            continue
+        seen.add(candidate)
+        orphans.append(candidate)
+        pending.extend(graph.successors(candidate))
+        pending.extend(graph.predecessors(candidate))
+    return orphans
+
+
+class RetentionPlan:
+    """
+    The result of one retention pass.
+
+    Attributes:
+        evicted: Webhook node ids to remove, and the entity nodes orphaned
+            by their removal
+        increments: Aggregate counter increments for the evicted nodes
+        expired_aggregates: Minute aggregate ids past their own TTL
+    """
+
+    def __init__(self, evicted: List[Any], increments: List[Dict[str, Any]], expired_aggregates: List[str]):
+        self.evicted = evicted
+        self.increments = increments
+        self.expired_aggregates = expired_aggregates
+
+
+class RetentionManager:
+    """
+    Plans eviction of webhook nodes by TTL and node cap.
+
+    Args:
+        ttl: Seconds a webhook node is kept in memory (0 disables the TTL)
+        max_nodes: Maximum graph size before the oldest webhook nodes are
+            evicted (0 disables the cap)
+        minute_aggregate_ttl: Seconds a per-minute aggregate is kept
+            (hourly aggregates are kept indefinitely)
+    """
+
+    def __init__(self, ttl: float = 0, max_nodes: int = 0, minute_aggregate_ttl: float = 86400):
+        self.ttl = ttl
+        self.max_nodes = max_nodes
+        self.minute_aggregate_ttl = minute_aggregate_ttl
+        # minute aggregate id -> bucket_start, oldest first
+        self._minute_aggregates: 'OrderedDict[str, str]' = OrderedDict()
+        self.runs = 0
+        self.evicted_total = 0
+        self.last_run: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any retention limit is configured."""
+        return self.ttl > 0 or self.max_nodes > 0
+
+    def cutoff(self, now: datetime) -> Optional[str]:
+        """ISO timestamp before which webhook nodes expire (None without a TTL)."""
+        if self.ttl <= 0:
+            return None
+        return (now - timedelta(seconds=self.ttl)).isoformat()
+
+    def track_aggregates(self, graph: Any) -> None:
+        """Rebuild the list of minute aggregates from a graph (after hydration)."""
+        found = [
+            (attrs.get('bucket_start', ''), node_id)
+            for node_id, attrs in graph.nodes(data=True)
+            if attrs.get('kind') == 'aggregate' and attrs.get('bucket') == BUCKET_MINUTE
+        ]
+        self._minute_aggregates = OrderedDict((node_id, start) for start, node_id in sorted(found))
+
+    def observe(self, node_id: Any, attributes: Dict[str, Any]) -> None:
+        """Track a minute aggregate written outside plan() (e.g. by another worker)."""
+        if attributes.get('kind') != 'aggregate' or attributes.get('bucket') != BUCKET_MINUTE:
+            return
+        if node_id in self._minute_aggregates:
+            return
+        start = attributes.get('bucket_start', '')
+        newest = next(reversed(self._minute_aggregates.values()), '')
+        self._minute_aggregates[node_id] = start
+        if start < newest:
+            # Keep oldest-first order for expiry
+            self._minute_aggregates = OrderedDict(
+                sorted(self._minute_aggregates.items(), key=lambda item: item[1])
+            )
+
+    def plan(self, graph: Any, index: Any, now: Optional[datetime] = None) -> RetentionPlan:
+        """
+        Select webhook nodes to evict and the aggregate increments for them.
+
+        Args:
+            graph: NetworkX-compatible graph
+            index: GraphIndex over the graph
+            now: Current time (defaults to now in UTC)
+
+        Returns:
+            The retention plan (nothing is modified; pass the plan to
+            commit() once it has been applied)
+        """
+        now = now or datetime.now(timezone.utc)
+        evicted: List[Any] = []
+        webhooks: List[Any] = []
+        seen = set()
+
+        def evict(node_id: Any) -> int:
+            webhooks.append(node_id)
+            evicted.append(node_id)
+            seen.add(node_id)
+            orphans = _orphans(graph, node_id, seen)
+            evicted.extend(orphans)
+            return 1 + len(orphans)
+
+        cutoff = self.cutoff(now)
+        if cutoff is not None:
+            for node_id in index.time_range(until=cutoff):
+                if is_webhook_node(node_id):
+                    evict(node_id)
+
+        if self.max_nodes > 0:
+            excess = graph.number_of_nodes() - len(evicted) - self.max_nodes
+            if excess > 0:
+                for node_id in index.time_range():
+                    if excess <= 0:
+                        break
+                    if is_webhook_node(node_id) and node_id not in seen:
+                        excess -= evict(node_id)
+
+        groups: Dict[tuple, int] = {}
+        for node_id in webhooks:
+            attrs = graph.nodes[node_id]
+            key = (attrs['timestamp'][:16], attrs.get('event_type'))
+            groups[key] = groups.get(key, 0) + 1
+        increments = rollup(
+            {'minute': minute, 'event_type': event_type, 'count': count}
+            for (minute, event_type), count in groups.items()
+        )
+
+        # Tracked minute aggregates are oldest first; the ones this plan
+        # creates are checked separately
+        expired = []
+        aggregate_cutoff = (now - timedelta(seconds=self.minute_aggregate_ttl)).isoformat()
+        for node_id, bucket_start in self._minute_aggregates.items():
+            if bucket_start >= aggregate_cutoff:
+                break
+            expired.append(node_id)
+        for row in increments:
+            attributes = row['attributes']
+            if (attributes['bucket'] == BUCKET_MINUTE and row['id'] not in self._minute_aggregates
+                    and attributes['bucket_start'] < aggregate_cutoff):
+                expired.append(row['id'])
+
+        return RetentionPlan(evicted, increments, expired)
+
+    def commit(self, plan: RetentionPlan, now: Optional[datetime] = None) -> None:
+        """
+        Record an applied plan: track the minute aggregates it created,
+        forget the ones it expired and update the counters.
+
+        Args:
+            plan: Plan returned by plan() and applied to the graph
+            now: Time the plan was made for (defaults to now in UTC)
+        """
+        now = now or datetime.now(timezone.utc)
+        for row in plan.increments:
+            if row['attributes']['bucket'] == BUCKET_MINUTE:
+                self._minute_aggregates.setdefault(row['id'], row['attributes']['bucket_start'])
+        for node_id in plan.expired_aggregates:
+            self._minute_aggregates.pop(node_id, None)
+
+        self.runs += 1
+        self.evicted_total += len(plan.evicted)
+        self.last_run = now.isoformat()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get retention configuration and counters."""
+        return {
+            'enabled': self.enabled,
+            'ttl': self.ttl,
+            'max_nodes': self.max_nodes,
+            'minute_aggregate_ttl': self.minute_aggregate_ttl,
+            'minute_aggregates': len(self._minute_aggregates),
+            'runs': self.runs,
+            'evicted_total': self.evicted_total,
+            'last_run': self.last_run
+        }
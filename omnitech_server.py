@@ -12,19 +12,44 @@ including:
 """
 
 import os
+import json
+import time
+import atexit
 import hmac
-import hashlib
 import logging
 import functools
-from datetime import datetime, timezone
-from typing import Optional, Tuple, Any
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, Any, Callable, Dict, List
 
 import jwt
-import networkx as nx
-from flask import Flask, request, jsonify, render_template, abort
+from flask import Flask, Response, request, jsonify, render_template, abort, stream_with_context
 from flask_socketio import SocketIO, emit
 
 from omnitech_persistence import OmnitechPersistence
+from omnitech_write_queue import SpillBuffer, WriteBehindQueue
+from omnitech_hydration import HydrationState, start_hydration
+from omnitech_graph_sync import GraphChangeLog, ACTION_NODE_ADDED, ACTION_EDGE_ADDED, ACTION_NODE_REMOVED
+from omnitech_graph_query import GraphQuery, MAX_PAGE_SIZE, select_page
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_store import create_graph
+from omnitech_wal import WriteAheadLog
+from omnitech_analytics import GraphAnalytics
+from omnitech_ids import IdGenerator
+from omnitech_dedup import DeliveryCache
+from omnitech_cluster import MutationBus, create_broker
+from omnitech_emitter import DIRECT_ROOM, EmitCoalescer
+from omnitech_subscriptions import SubscriptionFilter
+from omnitech_snapshot import (
+    ENCODING_JSON, available_encodings, encode_snapshot, is_compressed, serialize, to_columnar,
+    negotiate as negotiate_encoding
+)
+from omnitech_signature import PayloadTooLargeError, WebhookVerifier
+from omnitech_auth import AdminAuthConfig, parse_keyset
+from omnitech_payload import WebhookPayload
+from omnitech_extractors import GraphBatch, extract as extract_graph
+from omnitech_retention import RetentionManager, WEBHOOK_PREFIX, AGGREGATE_PREFIX, BUCKET_MINUTE, rollup
 
 # Configure logging
 logging.basicConfig(
@@ -36,17 +61,25 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', os.urandom(32).hex())
+# Largest accepted request body (GitHub caps webhook payloads at 25 MB)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('OMNITECH_MAX_CONTENT_LENGTH', 25 * 2**20))
 
 # Initialize Socket.IO
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 
-# Initialize in-memory graph
-omni_graph = nx.DiGraph()
+# Initialize in-memory graph (networkx.DiGraph or the compact array-backed store)
+omni_graph = create_graph(os.environ.get('OMNITECH_GRAPH_BACKEND'))
 
 # Initialize persistence layer (lazy connection)
 persistence: Optional[OmnitechPersistence] = None
 
 
+def _optional_env(name: str, cast: Callable[[str], Any]) -> Any:
+    """Read an optional numeric environment variable (None if unset)."""
+    value = os.environ.get(name)
+    return cast(value) if value else None
+
+
 def get_persistence() -> Optional[OmnitechPersistence]:
     """Get or create the persistence layer."""
     global persistence
@@ -57,13 +90,177 @@ def get_persistence() -> Optional[OmnitechPersistence]:
 
         if neo4j_uri and neo4j_user and neo4j_password:
             try:
-                persistence = OmnitechPersistence(neo4j_uri, neo4j_user, neo4j_password)
+                persistence = OmnitechPersistence(
+                    neo4j_uri,
+                    neo4j_user,
+                    neo4j_password,
+                    max_pool_size=_optional_env('OMNITECH_NEO4J_POOL_SIZE', int),
+                    acquisition_timeout=_optional_env('OMNITECH_NEO4J_ACQUISITION_TIMEOUT', float),
+                    connection_lifetime=_optional_env('OMNITECH_NEO4J_CONNECTION_LIFETIME', float),
+                    max_retries=int(os.environ.get('OMNITECH_NEO4J_MAX_RETRIES', 3)),
+                    retry_backoff=float(os.environ.get('OMNITECH_NEO4J_RETRY_BACKOFF', 0.1)),
+                    health_interval=float(os.environ.get('OMNITECH_NEO4J_HEALTH_INTERVAL', 10)),
+                    failure_threshold=int(os.environ.get('OMNITECH_NEO4J_FAILURE_THRESHOLD', 5)),
+                    reset_timeout=float(os.environ.get('OMNITECH_NEO4J_RESET_TIMEOUT', 1)),
+                    max_reset_timeout=float(os.environ.get('OMNITECH_NEO4J_MAX_RESET_TIMEOUT', 60)),
+                    # An outage at boot opens the circuit instead of disabling persistence
+                    fail_fast=False
+                )
                 logger.info("Neo4j persistence layer initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize Neo4j persistence: {e}")
     return persistence
 
 
+# Durable buffer for writes made while the Neo4j circuit is open
+write_spill = None
+if os.environ.get('OMNITECH_WRITE_SPILL_PATH'):
+    write_spill = SpillBuffer(
+        os.environ['OMNITECH_WRITE_SPILL_PATH'],
+        max_bytes=int(os.environ.get('OMNITECH_WRITE_SPILL_MAX_BYTES', 256 * 2**20))
+    )
+
+# Initialize write-behind queue (flushes to Neo4j off the request path)
+write_queue = WriteBehindQueue(
+    get_persistence,
+    max_size=int(os.environ.get('OMNITECH_WRITE_QUEUE_SIZE', 10000)),
+    flush_interval=float(os.environ.get('OMNITECH_WRITE_FLUSH_INTERVAL', 0.5)),
+    batch_size=int(os.environ.get('OMNITECH_WRITE_BATCH_SIZE', 500)),
+    spill=write_spill
+)
+atexit.register(write_queue.stop)
+
+# Versioned graph state (revision counter + replayable delta buffer)
+graph_changes = GraphChangeLog(capacity=int(os.environ.get('OMNITECH_DELTA_BUFFER_SIZE', 10000)))
+
+# Secondary indexes over node attributes (event_type, timestamp)
+graph_index = GraphIndex()
+
+# Incrementally maintained analytics (PageRank etc. refresh in a worker pool)
+analytics = GraphAnalytics(lambda: omni_graph, max_workers=int(os.environ.get('OMNITECH_ANALYTICS_WORKERS', 1)))
+
+# Time-ordered node ids (OMNITECH_WORKER_ID distinguishes workers)
+node_ids = IdGenerator()
+
+# Recently processed deliveries, so GitHub retries are not recorded twice
+deliveries = DeliveryCache(
+    capacity=int(os.environ.get('OMNITECH_DEDUP_CAPACITY', 10000)),
+    ttl=float(os.environ.get('OMNITECH_DEDUP_TTL', 86400))
+)
+
+# Webhook retention (evicts old webhook nodes into time-bucketed aggregates)
+retention = RetentionManager(
+    ttl=float(os.environ.get('OMNITECH_RETENTION_TTL', 0)),
+    max_nodes=int(os.environ.get('OMNITECH_RETENTION_MAX_NODES', 0)),
+    minute_aggregate_ttl=float(os.environ.get('OMNITECH_RETENTION_MINUTE_AGGREGATE_TTL', 86400))
+)
+
+# Fan-out of graph changes between workers (OMNITECH_MESSAGE_QUEUE)
+cluster = MutationBus(create_broker(os.environ.get('OMNITECH_MESSAGE_QUEUE')))
+
+# Coalesced graph broadcasts (OMNITECH_EMIT_INTERVAL=0 emits every event immediately)
+emitter = EmitCoalescer(
+    socketio,
+    lambda: graph_changes,
+    lambda: omni_graph,
+    interval=float(os.environ.get('OMNITECH_EMIT_INTERVAL', 0.1)),
+    max_lag=int(os.environ.get('OMNITECH_EMIT_MAX_LAG', 5000))
+)
+
+# Local write-ahead log and snapshots (OMNITECH_WAL_DIR, recovery without Neo4j)
+wal = WriteAheadLog(
+    lambda: omni_graph,
+    directory=os.environ.get('OMNITECH_WAL_DIR'),
+    fsync=os.environ.get('OMNITECH_WAL_FSYNC', 'interval'),
+    fsync_interval=float(os.environ.get('OMNITECH_WAL_FSYNC_INTERVAL', 1.0)),
+    snapshot_bytes=int(os.environ.get('OMNITECH_WAL_SNAPSHOT_BYTES', 64 * 2**20))
+)
+atexit.register(wal.close)
+
+# Warm-start hydration state (graph reads wait on this)
+hydration = HydrationState()
+
+
+def init_hydration() -> None:
+    """Load persisted graph state according to OMNITECH_HYDRATION_MODE."""
+    mode = os.environ.get('OMNITECH_HYDRATION_MODE', 'off').lower()
+    persist = get_persistence() if mode != 'off' else None
+
+    if wal.enabled:
+        # Local recovery runs first; Neo4j hydration then fills in the rest
+        wal.recover(omni_graph)
+        graph_index.rebuild(omni_graph)
+        analytics.rebuild(omni_graph)
+        retention.track_aggregates(omni_graph)
+
+    def log_progress(nodes_loaded: int, edges_loaded: int) -> None:
+        logger.info(f"Hydrating graph: {nodes_loaded} nodes, {edges_loaded} edges loaded")
+
+    def on_complete(state: HydrationState) -> None:
+        # Hydrated records bypass the mutation path - reindex and force snapshots
+        graph_index.rebuild(omni_graph)
+        analytics.rebuild(omni_graph)
+        retention.track_aggregates(omni_graph)
+        graph_changes.invalidate()
+        socketio.emit('graph_ready', state.to_dict())
+
+    start_hydration(
+        omni_graph,
+        persist,
+        mode,
+        hydration,
+        page_size=int(os.environ.get('OMNITECH_HYDRATION_PAGE_SIZE', 5000)),
+        progress=log_progress,
+        on_complete=on_complete
+    )
+
+
+def graph_ready() -> bool:
+    """Wait up to OMNITECH_READINESS_TIMEOUT seconds for hydration to finish."""
+    return hydration.wait(float(os.environ.get('OMNITECH_READINESS_TIMEOUT', 0)))
+
+
+def require_graph_ready(f):
+    """
+    Decorator that holds back graph reads until hydration has finished.
+
+    Responds with 503 if the graph is still loading after the readiness
+    timeout.
+    """
+    @functools.wraps(f)
+    def decorated(*args, **kwargs):
+        if not graph_ready():
+            return jsonify({
+                'error': 'Graph hydration in progress',
+                'hydration': hydration.to_dict()
+            }), 503
+        return f(*args, **kwargs)
+
+    return decorated
+
+
+@functools.lru_cache(maxsize=4)
+def _webhook_verifier(secret: str, previous_secret: Optional[str]) -> WebhookVerifier:
+    """Build (once per secret pair) the verifier with precomputed HMAC keys."""
+    return WebhookVerifier([secret, previous_secret])
+
+
+def get_webhook_verifier() -> Optional[WebhookVerifier]:
+    """
+    Get the verifier for the configured webhook secrets.
+
+    GITHUB_WEBHOOK_SECRET_PREVIOUS is also accepted while a rotated secret
+    is rolled out to GitHub.
+
+    Returns:
+        The verifier, or None if GITHUB_WEBHOOK_SECRET is not set
+    """
+    secret = os.environ.get('GITHUB_WEBHOOK_SECRET')
+    if not secret:
+        return None
+    return _webhook_verifier(secret, os.environ.get('GITHUB_WEBHOOK_SECRET_PREVIOUS'))
+
+
 def verify_webhook_signature(payload: bytes, signature_header: str) -> bool:
     """
     Verify GitHub webhook signature using HMAC SHA-256.
@@ -75,31 +272,55 @@ def verify_webhook_signature(payload: bytes, signature_header: str) -> bool:
     Returns:
         True if signature is valid, False otherwise
     """
-    secret = os.environ.get('GITHUB_WEBHOOK_SECRET')
+    verifier = get_webhook_verifier()
 
-    if not secret:
+    if verifier is None:
         logger.warning("GITHUB_WEBHOOK_SECRET not set - accepting payload without verification")
         return True
 
-    if not signature_header:
-        logger.warning("No X-Hub-Signature-256 header present")
-        return False
+    # Compares raw digests in constant time
+    return verifier.verify(payload, signature_header)
+
 
-    if not signature_header.startswith('sha256='):
-        logger.warning("Invalid signature format - must start with 'sha256='")
-        return False
+def read_verified_webhook() -> Tuple[bool, Any]:
+    """
+    Read the webhook request body and verify its signature in one pass.
+
+    Returns:
+        (signature valid, raw body)
+
+    Raises:
+        PayloadTooLargeError: If the body exceeds MAX_CONTENT_LENGTH
+    """
+    verifier = get_webhook_verifier()
+
+    if verifier is None:
+        logger.warning("GITHUB_WEBHOOK_SECRET not set - accepting payload without verification")
+        return True, request.get_data()
 
-    expected_signature = signature_header[7:]  # Remove 'sha256=' prefix
+    return verifier.read_verified(
+        request.stream,
+        request.headers.get('X-Hub-Signature-256', ''),
+        request.content_length,
+        max_length=app.config['MAX_CONTENT_LENGTH']
+    )
 
-    # Compute HMAC SHA-256
-    computed_signature = hmac.new(
-        secret.encode('utf-8'),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
 
-    # Use constant-time comparison to prevent timing attacks
-    return hmac.compare_digest(computed_signature, expected_signature)
+@functools.lru_cache(maxsize=4)
+def _admin_auth_config(admin_token: Optional[str], jwt_secret: Optional[str], jwt_keys: Optional[str]) -> AdminAuthConfig:
+    """Build (once per configuration) the admin auth settings and token cache."""
+    return AdminAuthConfig(admin_token, jwt_secret, jwt_keys)
+
+
+def get_admin_auth() -> AdminAuthConfig:
+    """Get the admin auth settings for the current environment."""
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    jwt_secret = os.environ.get('JWT_SECRET')
+    return _admin_auth_config(admin_token, jwt_secret, os.environ.get('JWT_KEYS'))
+
+
+# A malformed JWT_KEYS fails the boot (requests would only log and skip it)
+parse_keyset(os.environ.get('JWT_KEYS'))
 
 
 def require_admin_auth(f):
@@ -108,33 +329,34 @@ def require_admin_auth(f):
 
     Supports two authentication methods:
     1. Token-based: X-Admin-Token header matches ADMIN_TOKEN env var
-    2. JWT-based: Authorization Bearer token signed with JWT_SECRET
+    2. JWT-based: Authorization Bearer token signed with JWT_SECRET, or
+       with the JWT_KEYS entry named by its kid header
 
-    If neither ADMIN_TOKEN nor JWT_SECRET is set, endpoints are unprotected.
+    Verified JWTs are cached until they expire. If neither method is
+    configured, endpoints are unprotected.
     """
     @functools.wraps(f)
     def decorated(*args, **kwargs):
-        admin_token = os.environ.get('ADMIN_TOKEN')
-        jwt_secret = os.environ.get('JWT_SECRET')
+        auth = get_admin_auth()
 
         # If no auth configured, allow access with warning
-        if not admin_token and not jwt_secret:
+        if not auth.enabled:
             logger.warning("Admin authentication not configured - endpoint unprotected")
             return f(*args, **kwargs)
 
         # Try token-based auth first
         request_token = request.headers.get('X-Admin-Token')
-        if admin_token and request_token:
-            if hmac.compare_digest(request_token, admin_token):
+        if auth.admin_token and request_token:
+            if hmac.compare_digest(request_token, auth.admin_token):
                 return f(*args, **kwargs)
 
         # Try JWT auth
         auth_header = request.headers.get('Authorization')
-        if jwt_secret and auth_header:
+        if auth.jwt.enabled and auth_header:
             if auth_header.startswith('Bearer '):
                 token = auth_header[7:]
                 try:
-                    jwt.decode(token, jwt_secret, algorithms=['HS256'])
+                    auth.jwt.verify(token)
                     return f(*args, **kwargs)
                 except jwt.InvalidTokenError as e:
                     logger.warning(f"Invalid JWT token: {e}")
@@ -144,10 +366,285 @@ def require_admin_auth(f):
     return decorated
 
 
+# ============================================================================
+# Graph Mutations
+# ============================================================================
+
+def apply_node_mutation(node_id: str, attributes: Dict[str, Any], persist: bool = True) -> Dict[str, Any]:
+    """
+    Add or update a node in the graph and queue it for persistence.
+
+    Args:
+        node_id: Node identifier
+        attributes: Attributes to merge into the node
+        persist: Queue the write (False for changes replayed from another
+            worker, which persists them itself)
+
+    Returns:
+        The recorded delta (including its revision)
+    """
+    omni_graph.add_node(node_id, **attributes)
+    graph_index.index_node(node_id, omni_graph.nodes[node_id])
+    analytics.add_node(node_id)
+    retention.observe(node_id, omni_graph.nodes[node_id])
+    wal.record_node(node_id, attributes)
+    if persist:
+        write_queue.enqueue_node(node_id, attributes)
+    return graph_changes.record_node(node_id, attributes)
+
+
+def apply_edge_mutation(source: str, target: str, attributes: Dict[str, Any], persist: bool = True) -> Dict[str, Any]:
+    """
+    Add or update an edge in the graph and queue it for persistence.
+
+    Returns:
+        The recorded delta (including its revision)
+    """
+    new_nodes = [n for n in (source, target) if n not in omni_graph]
+    new_edge = not omni_graph.has_edge(source, target)
+    omni_graph.add_edge(source, target, **attributes)
+    for node_id in new_nodes:
+        graph_index.index_node(node_id, omni_graph.nodes[node_id])
+        analytics.add_node(node_id)
+    if new_edge:
+        analytics.add_edge(source, target)
+    wal.record_edge(source, target, attributes)
+    if persist:
+        write_queue.enqueue_edge(source, target, attributes)
+    return graph_changes.record_edge(source, target, attributes)
+
+
+def apply_batch_mutation(batch: GraphBatch) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of nodes and edges and queue it as one transaction.
+
+    Returns:
+        The recorded deltas (nodes first, then edges)
+    """
+    deltas = [
+        apply_node_mutation(node_id, attributes, persist=False)
+        for node_id, attributes in batch.nodes.items()
+    ]
+    deltas.extend(
+        apply_edge_mutation(source, target, attributes, persist=False)
+        for (source, target), attributes in batch.edges.items()
+    )
+    write_queue.enqueue_subgraph(batch.node_rows(), batch.edge_rows())
+    return deltas
+
+
+def apply_counter_mutation(node_id: str, attributes: Dict[str, Any], counts: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Add to counter attributes of a node (created if missing).
+
+    Persistence receives the increments; subscribers receive the resulting
+    absolute values.
+
+    Returns:
+        The recorded delta (including its revision)
+    """
+    current = omni_graph.nodes[node_id] if node_id in omni_graph else {}
+    merged = dict(attributes)
+    for key, amount in counts.items():
+        merged[key] = current.get(key, 0) + amount
+    omni_graph.add_node(node_id, **merged)
+    graph_index.index_node(node_id, omni_graph.nodes[node_id])
+    analytics.add_node(node_id)
+    wal.record_node(node_id, merged)
+    write_queue.enqueue_increment(node_id, attributes, counts)
+    return graph_changes.record_node(node_id, merged)
+
+
+def remove_node_mutation(node_id: str, persist: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Remove a node (and its edges) from the graph and from persistence.
+
+    Returns:
+        The recorded delta, or None if the node does not exist
+    """
+    if node_id not in omni_graph:
+        return None
+    successors, predecessors = list(omni_graph.successors(node_id)), list(omni_graph.predecessors(node_id))
+    omni_graph.remove_node(node_id)
+    graph_index.remove_node(node_id)
+    analytics.remove_node(node_id, successors, predecessors)
+    wal.record_removed(node_id)
+    if persist:
+        write_queue.enqueue_delete(node_id)
+    return graph_changes.record_node_removed(node_id)
+
+
+def notify_clients(event: str, data: Dict[str, Any], deltas: List[Dict[str, Any]]) -> None:
+    """
+    Emit a graph change to the Socket.IO clients of this worker.
+
+    With coalescing enabled the event is queued for the next
+    'graph_updated_batch' of subscribed clients, and still sent on its own
+    to the clients that never subscribed. Otherwise every client gets it
+    directly. Sent directly, 'graph_delta' carries all deltas; other events
+    carry their payload plus the revision and delta of the first mutation,
+    and all deltas when there are several.
+    """
+    if not deltas:
+        return
+    room = None
+    if emitter.enabled:
+        emitter.submit(event, data)
+        if not emitter.direct_clients:
+            return
+        room = DIRECT_ROOM
+    if event == 'graph_delta':
+        payload = {
+            'epoch': graph_changes.epoch,
+            'from_revision': deltas[0]['revision'] - 1,
+            'revision': deltas[-1]['revision'],
+            'deltas': deltas
+        }
+    else:
+        payload = {**data, 'revision': deltas[-1]['revision'], 'delta': deltas[0]}
+        if len(deltas) > 1:
+            payload['deltas'] = deltas
+    socketio.emit(event, payload, to=room)
+
+
+def broadcast(event: str, data: Dict[str, Any], deltas: List[Dict[str, Any]]) -> None:
+    """Notify local clients of a change and publish it to the other workers."""
+    notify_clients(event, data, deltas)
+    if deltas:
+        cluster.publish(event, data, deltas)
+
+
+def replay_delta(delta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Apply a delta published by another worker (without persisting it)."""
+    action = delta.get('action')
+    if action == ACTION_NODE_ADDED:
+        return apply_node_mutation(delta['node_id'], delta.get('attributes', {}), persist=False)
+    if action == ACTION_EDGE_ADDED:
+        return apply_edge_mutation(delta['source'], delta['target'], delta.get('attributes', {}), persist=False)
+    if action == ACTION_NODE_REMOVED:
+        return remove_node_mutation(delta['node_id'], persist=False)
+    logger.warning(f"Ignoring unknown cluster delta action: {action}")
+    return None
+
+
+def apply_cluster_change(message: Dict[str, Any]) -> None:
+    """Replay a change from another worker and notify this worker's clients."""
+    deltas = [d for d in map(replay_delta, message.get('deltas', [])) if d is not None]
+    data = message.get('data', {})
+    notify_clients(message.get('event', 'graph_delta'), data, deltas)
+
+    # Remember webhook deliveries handled elsewhere, so retries are caught here
+    if message.get('event') == 'webhook_received' and deltas:
+        delivery_id = deltas[0].get('attributes', {}).get('delivery_id')
+        if delivery_id:
+            deliveries.remember(delivery_id, {
+                'status': 'success',
+                'event_type': data.get('event_type'),
+                'node_id': data.get('node_id')
+            })
+
+
+def run_retention(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Evict expired webhook nodes into aggregates and compact Neo4j.
+
+    The Neo4j job uses the TTL plus OMNITECH_RETENTION_GRACE seconds, so
+    nodes evicted in memory are deleted through the write-behind queue
+    before the job could count them a second time.
+
+    Returns:
+        Counts of evicted nodes, updated aggregates and compacted records
+    """
+    now = now or datetime.now(timezone.utc)
+    plan = retention.plan(omni_graph, graph_index, now)
+
+    deltas = []
+    for row in plan.increments:
+        deltas.append(apply_counter_mutation(row['id'], row['attributes'], row['counts']))
+    for node_id in plan.evicted + plan.expired_aggregates:
+        delta = remove_node_mutation(node_id)
+        if delta:
+            deltas.append(delta)
+    retention.commit(plan, now)
+
+    broadcast('graph_delta', {}, deltas)
+
+    compacted = 0
+    persist = get_persistence()
+    if persist and retention.ttl > 0:
+        grace = timedelta(seconds=float(os.environ.get('OMNITECH_RETENTION_GRACE', 300)))
+        compacted = persist.compact_nodes(WEBHOOK_PREFIX, retention.cutoff(now - grace), rollup)
+        persist.delete_expired_nodes(
+            f"{AGGREGATE_PREFIX}{BUCKET_MINUTE}_",
+            (now - timedelta(seconds=retention.minute_aggregate_ttl)).isoformat(),
+            'bucket_start'
+        )
+
+    return {
+        'evicted': len(plan.evicted),
+        'aggregates_updated': len(plan.increments),
+        'aggregates_expired': len(plan.expired_aggregates),
+        'persisted_compacted': compacted
+    }
+
+
+def start_retention() -> Optional[threading.Thread]:
+    """Run retention every OMNITECH_RETENTION_INTERVAL seconds if enabled."""
+    if not retention.enabled:
+        return None
+
+    interval = float(os.environ.get('OMNITECH_RETENTION_INTERVAL', 60))
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            # Only one worker (the lease holder) runs retention
+            if not cluster.acquire_lease('retention', interval * 3):
+                continue
+            try:
+                stats = run_retention()
+                if stats['evicted']:
+                    logger.info(f"Retention evicted {stats['evicted']} webhook nodes")
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}")
+
+    thread = threading.Thread(target=loop, name='omnitech-retention', daemon=True)
+    thread.start()
+    return thread
+
+
 # ============================================================================
 # Webhook Endpoints
 # ============================================================================
 
+def find_delivery(delivery_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the response of a delivery another worker already persisted.
+
+    Only consulted with OMNITECH_DEDUP_NEO4J=true, after the delivery was
+    claimed in the local cache. This is a blocking Neo4j round-trip on the
+    request path for every new delivery, and it only sees flushed writes: a
+    retry that reaches this worker while the original is still queued on
+    another worker is not found and is processed again.
+
+    Returns:
+        The original response, or None if the delivery is new
+    """
+    if os.environ.get('OMNITECH_DEDUP_NEO4J', 'false').lower() != 'true':
+        return None
+    persist = get_persistence()
+    node_id = persist.find_node_by_delivery(delivery_id) if persist else None
+    if node_id is None:
+        return None
+    response = {
+        'status': 'success',
+        'event_type': request.headers.get('X-GitHub-Event', 'unknown'),
+        'node_id': node_id
+    }
+    deliveries.remember(delivery_id, response)
+    return response
+
+
 @app.route('/webhook', methods=['POST'])
 def handle_webhook():
     """
@@ -156,44 +653,75 @@ def handle_webhook():
     Verifies X-Hub-Signature-256 HMAC SHA-256 signature when
     GITHUB_WEBHOOK_SECRET is configured. Logs warning if not configured.
     """
-    payload = request.get_data()
-    signature = request.headers.get('X-Hub-Signature-256', '')
+    try:
+        valid, payload = read_verified_webhook()
+    except PayloadTooLargeError as e:
+        logger.warning(f"Rejected webhook: {e}")
+        return jsonify({'error': 'Payload too large'}), 413
 
-    if not verify_webhook_signature(payload, signature):
+    if not valid:
         logger.warning("Webhook signature verification failed")
         return jsonify({'error': 'Invalid signature'}), 403
 
-    # Parse and process webhook
+    # Process webhook
+    event_type = request.headers.get('X-GitHub-Event', 'unknown')
+    delivery_id = request.headers.get('X-GitHub-Delivery')
+    claimed = False
     try:
-        data = request.get_json() or {}
-        event_type = request.headers.get('X-GitHub-Event', 'unknown')
+        if delivery_id:
+            # Claim the delivery before processing it, so a retry arriving
+            # meanwhile is not processed twice; the claim is released below
+            # unless the delivery is remembered as processed
+            claimed, duplicate = deliveries.claim(delivery_id)
+            if claimed:
+                duplicate = find_delivery(delivery_id)
+            elif duplicate is None:
+                logger.info(f"Delivery {delivery_id} is already being processed")
+                return jsonify({'error': 'Delivery is being processed', 'duplicate': True}), 409
+            if duplicate is not None:
+                logger.info(f"Ignoring redelivered webhook {delivery_id}")
+                return jsonify({**duplicate, 'duplicate': True}), 200
 
         logger.info(f"Received webhook event: {event_type}")
 
-        # Add node to graph for tracking
-        node_id = f"webhook_{datetime.now(timezone.utc).isoformat()}"
-        omni_graph.add_node(node_id, event_type=event_type, timestamp=datetime.now(timezone.utc).isoformat())
-
-        # Persist to Neo4j if available
-        persist = get_persistence()
-        if persist:
-            persist.save_node(node_id, {'event_type': event_type, 'timestamp': datetime.now(timezone.utc).isoformat()})
+        # Every webhook node records its repo and sender, so each new
+        # delivery is parsed, once; redeliveries are answered above unparsed
+        webhook = WebhookPayload(payload, event_type)
+        try:
+            summary = webhook.summary()
+        except ValueError as e:
+            logger.warning(f"Invalid webhook payload: {e}")
+            return jsonify({'error': 'Invalid JSON payload'}), 400
+
+        # Node recording the delivery
+        timestamp = datetime.now(timezone.utc).isoformat()
+        node_id = node_ids.next_id(WEBHOOK_PREFIX)
+        attributes = {'event_type': event_type, 'timestamp': timestamp, **summary}
+        if delivery_id:
+            # Idempotency key of the delivery (stable across GitHub retries)
+            attributes['delivery_id'] = delivery_id
+
+        # The webhook node plus repos, users, commits, ... in one mutation
+        deltas = apply_batch_mutation(extract_graph(webhook, node_id, attributes))
 
         # Emit real-time update
-        socketio.emit('webhook_received', {
-            'event_type': event_type,
-            'node_id': node_id
-        })
+        broadcast('webhook_received', {'event_type': event_type, 'node_id': node_id}, deltas)
 
-        return jsonify({
+        response = {
             'status': 'success',
             'event_type': event_type,
             'node_id': node_id
-        }), 200
+        }
+        if delivery_id:
+            deliveries.remember(delivery_id, response)
+        return jsonify(response), 200
 
     except Exception as e:
         logger.error(f"Error processing webhook: {e}")
         return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        if claimed:
+            deliveries.release(delivery_id)
 
 
 # ============================================================================
@@ -202,22 +730,188 @@ def handle_webhook():
 
 @app.route('/admin/graph', methods=['GET'])
 @require_admin_auth
+@require_graph_ready
 def get_graph():
-    """Get the current graph state."""
-    nodes = [
-        {'id': n, **omni_graph.nodes[n]}
-        for n in omni_graph.nodes()
-    ]
-    edges = [
-        {'source': u, 'target': v, **omni_graph.edges[u, v]}
-        for u, v in omni_graph.edges()
-    ]
-    return jsonify({
-        'nodes': nodes,
-        'edges': edges,
+    """
+    Get the current graph state.
+
+    Query parameters:
+        event_type: Only nodes with this event type (repeatable or comma-separated)
+        since / until: Only nodes with since <= timestamp < until (ISO-8601)
+        fields: Comma-separated attributes to return
+        limit / cursor: Page size and the next_cursor of the previous page
+        format: 'ndjson' to stream one JSON object per line, or a compact
+            snapshot encoding ('columnar', 'columnar+zlib', ...; zlib is
+            sent as Content-Encoding: deflate)
+    """
+    try:
+        query = GraphQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    candidates = graph_index.candidates(query.event_types, query.since, query.until)
+    page = select_page(omni_graph, query, candidates)
+
+    wants_ndjson = (
+        request.args.get('format') == 'ndjson' or
+        request.accept_mimetypes.best == 'application/x-ndjson'
+    )
+    if wants_ndjson:
+        def generate():
+            for node in page.iter_nodes():
+                yield json.dumps({'type': 'node', **node}, default=str) + '\n'
+            for edge in page.iter_edges():
+                yield json.dumps({'type': 'edge', **edge}, default=str) + '\n'
+            yield json.dumps({
+                'type': 'meta',
+                'node_count': omni_graph.number_of_nodes(),
+                'edge_count': omni_graph.number_of_edges(),
+                'next_cursor': page.next_cursor
+            }) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    # An unescaped '+' in a query string arrives as a space
+    encoding = request.args.get('format', ENCODING_JSON).replace(' ', '+')
+    if encoding.startswith('columnar'):
+        if encoding not in available_encodings():
+            return jsonify({'error': f'Unsupported format: {encoding}'}), 400
+        meta = {
+            'node_count': omni_graph.number_of_nodes(),
+            'edge_count': omni_graph.number_of_edges()
+        }
+        if query.limit is not None:
+            meta['next_cursor'] = page.next_cursor
+        response = Response(
+            serialize(to_columnar(page.iter_nodes(), page.iter_edges(), **meta), encoding),
+            mimetype='application/x-msgpack' if 'msgpack' in encoding else 'application/json'
+        )
+        if is_compressed(encoding):
+            response.headers['Content-Encoding'] = 'deflate'
+        return response
+
+    body = {
+        'nodes': list(page.iter_nodes()),
+        'edges': list(page.iter_edges()),
         'node_count': omni_graph.number_of_nodes(),
         'edge_count': omni_graph.number_of_edges()
-    })
+    }
+    if query.limit is not None:
+        body['next_cursor'] = page.next_cursor
+    return jsonify(body)
+
+
+@app.route('/admin/graph/query', methods=['GET'])
+@require_admin_auth
+@require_graph_ready
+def query_graph():
+    """
+    Query nodes through the secondary indexes.
+
+    Query parameters:
+        event_type: Only nodes with this event type (repeatable or comma-separated)
+        since / until: Only nodes with since <= timestamp < until (ISO-8601)
+        fields: Comma-separated attributes to return
+        limit: Maximum number of nodes to return
+
+    Results are ordered oldest first (nodes without a timestamp last).
+    """
+    try:
+        query = GraphQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not query.filtered:
+        return jsonify({'error': 'event_type, since or until required'}), 400
+
+    candidates = graph_index.candidates(query.event_types, query.since, query.until, query.limit)
+    nodes = []
+    for node_id in candidates:
+        if query.limit is not None and len(nodes) >= query.limit:
+            break
+        if node_id in omni_graph:
+            nodes.append({'id': node_id, **query.project(omni_graph.nodes[node_id])})
+
+    return jsonify({'nodes': nodes, 'count': len(nodes)})
+
+
+@app.route('/admin/graph/index', methods=['GET'])
+@require_admin_auth
+def graph_index_stats():
+    """Get secondary index statistics."""
+    return jsonify(graph_index.stats())
+
+
+def analytics_limit() -> int:
+    """
+    Read the 'limit' query parameter of an analytics endpoint.
+
+    Raises:
+        ValueError: If it is not a positive integer
+    """
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+@app.route('/admin/analytics/degree', methods=['GET'])
+@require_admin_auth
+@require_graph_ready
+def analytics_degree():
+    """Top nodes by degree centrality (limit: number of nodes)."""
+    try:
+        limit = analytics_limit()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'version': analytics.version, 'nodes': analytics.degree_centrality(limit)})
+
+
+@app.route('/admin/analytics/hubs', methods=['GET'])
+@require_admin_auth
+@require_graph_ready
+def analytics_hubs():
+    """Top-k nodes by number of edges (limit: k)."""
+    try:
+        limit = analytics_limit()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'version': analytics.version, 'nodes': analytics.hubs(limit)})
+
+
+@app.route('/admin/analytics/components', methods=['GET'])
+@require_admin_auth
+@require_graph_ready
+def analytics_components():
+    """Weakly connected components, largest first (limit: number listed)."""
+    try:
+        limit = analytics_limit()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(analytics.components(limit))
+
+
+@app.route('/admin/analytics/pagerank', methods=['GET'])
+@require_admin_auth
+@require_graph_ready
+def analytics_pagerank():
+    """
+    Top nodes by PageRank (limit: number of nodes).
+
+    Served from the last computation; 'stale' is true while a newer graph
+    version is being ranked in the background.
+    """
+    try:
+        limit = analytics_limit()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        return jsonify(analytics.pagerank(limit, timeout=float(os.environ.get('OMNITECH_ANALYTICS_TIMEOUT', 30))))
+    except FutureTimeoutError:
+        return jsonify({'error': 'PageRank computation in progress'}), 503
 
 
 @app.route('/admin/graph/node', methods=['POST'])
@@ -231,14 +925,9 @@ def add_node():
     if not node_id:
         return jsonify({'error': 'Node ID required'}), 400
 
-    omni_graph.add_node(node_id, **attributes)
-
-    # Persist to Neo4j if available
-    persist = get_persistence()
-    if persist:
-        persist.save_node(node_id, attributes)
+    delta = apply_node_mutation(node_id, attributes)
 
-    socketio.emit('graph_updated', {'action': 'node_added', 'node_id': node_id})
+    broadcast('graph_updated', {'action': 'node_added', 'node_id': node_id}, [delta])
 
     return jsonify({'status': 'success', 'node_id': node_id}), 201
 
@@ -255,18 +944,20 @@ def add_edge():
     if not source or not target:
         return jsonify({'error': 'Source and target required'}), 400
 
-    omni_graph.add_edge(source, target, **attributes)
-
-    # Persist to Neo4j if available
-    persist = get_persistence()
-    if persist:
-        persist.save_edge(source, target, attributes)
+    delta = apply_edge_mutation(source, target, attributes)
 
-    socketio.emit('graph_updated', {'action': 'edge_added', 'source': source, 'target': target})
+    broadcast('graph_updated', {'action': 'edge_added', 'source': source, 'target': target}, [delta])
 
     return jsonify({'status': 'success', 'source': source, 'target': target}), 201
 
 
+@app.route('/admin/retention/run', methods=['POST'])
+@require_admin_auth
+def trigger_retention():
+    """Run a retention pass immediately."""
+    return jsonify({'status': 'success', **run_retention()})
+
+
 @app.route('/admin/status', methods=['GET'])
 @require_admin_auth
 def admin_status():
@@ -277,6 +968,17 @@ def admin_status():
         'graph_nodes': omni_graph.number_of_nodes(),
         'graph_edges': omni_graph.number_of_edges(),
         'neo4j_connected': persist is not None and persist.is_connected(),
+        'neo4j': persist.health() if persist is not None else None,
+        'write_queue': write_queue.metrics(),
+        'hydration': hydration.to_dict(),
+        'graph_sync': graph_changes.stats(),
+        'retention': retention.stats(),
+        'dedup': deliveries.stats(),
+        'cluster': cluster.stats(),
+        'emitter': emitter.stats(),
+        'analytics': analytics.stats(),
+        'wal': wal.stats(),
+        'admin_auth': get_admin_auth().jwt.stats(),
         'timestamp': datetime.now(timezone.utc).isoformat()
     })
 
@@ -303,6 +1005,18 @@ def health():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now(timezone.utc).isoformat()})
 
 
+@app.route('/ready')
+def ready():
+    """Readiness check endpoint (503 until graph hydration has finished)."""
+    status_code = 200 if hydration.is_ready() else 503
+    return jsonify({
+        'ready': hydration.is_ready(),
+        'hydration': hydration.to_dict(),
+        'graph_sync': graph_changes.stats(),
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    }), status_code
+
+
 # ============================================================================
 # Socket.IO Events
 # ============================================================================
@@ -311,6 +1025,8 @@ def health():
 def handle_connect():
     """Handle client connection."""
     logger.info(f"Client connected: {request.sid}")
+    if emitter.enabled:
+        emitter.connect(request.sid)
     emit('connected', {'status': 'connected', 'sid': request.sid})
 
 
@@ -318,15 +1034,94 @@ def handle_connect():
 def handle_disconnect():
     """Handle client disconnection."""
     logger.info(f"Client disconnected: {request.sid}")
+    emitter.leave(request.sid)
+
+
+@socketio.on('graph_ack')
+def handle_graph_ack(data=None):
+    """Record the revision a client has applied from 'graph_updated_batch'."""
+    try:
+        emitter.ack(request.sid, int((data or {}).get('revision')))
+    except (AttributeError, TypeError, ValueError):
+        pass
 
 
 @socketio.on('subscribe_graph')
-def handle_subscribe():
-    """Subscribe client to graph updates."""
-    emit('graph_state', {
-        'nodes': [{'id': n, **omni_graph.nodes[n]} for n in omni_graph.nodes()],
-        'edges': [{'source': u, 'target': v} for u, v in omni_graph.edges()]
-    })
+def handle_subscribe(data=None):
+    """
+    Subscribe client to graph updates.
+
+    Clients that already hold graph state send {'since_revision', 'epoch'}
+    and receive only the deltas they missed as 'graph_delta'. New clients,
+    and clients whose revision has rolled out of the delta buffer, receive
+    a full 'graph_state' snapshot. Either way the client then joins the
+    coalesced broadcast at the revision it was sent.
+
+    An optional 'filter' ({'event_types', 'prefixes', 'root', 'depth'})
+    limits the snapshot, the deltas and the broadcast to part of the graph.
+    Filtered payloads are marked 'filtered' since their revisions have gaps.
+
+    An optional 'encoding' (list of accepted snapshot encodings, most
+    preferred first) selects a compact snapshot: the 'graph_state' then
+    carries 'encoding' and 'snapshot' instead of 'nodes' and 'edges'.
+    """
+    if not graph_ready():
+        emit('graph_loading', hydration.to_dict())
+        return
+
+    data = data if isinstance(data, dict) else {}
+    try:
+        subscription = SubscriptionFilter.from_request(data.get('filter'))
+    except ValueError as e:
+        emit('subscription_error', {'error': str(e)})
+        return
+
+    since_revision = data.get('since_revision')
+    if since_revision is not None:
+        try:
+            deltas = graph_changes.since(int(since_revision), data.get('epoch'))
+        except (TypeError, ValueError):
+            deltas = None
+        if deltas is not None:
+            revision = deltas[-1]['revision'] if deltas else int(since_revision)
+            payload = {
+                'epoch': graph_changes.epoch,
+                'from_revision': int(since_revision),
+                'revision': revision,
+                'deltas': deltas
+            }
+            if subscription is not None:
+                payload['deltas'], _ = subscription.select(omni_graph, deltas, [])
+                payload['filtered'] = True
+            emit('graph_delta', payload)
+            if emitter.enabled:
+                emitter.join(request.sid, revision, subscription)
+            return
+
+    # Capture the revision first: deltas racing with the snapshot are
+    # idempotent, so the client may safely replay them
+    revision = graph_changes.revision
+    if subscription is not None:
+        nodes, edges = subscription.snapshot(omni_graph)
+    else:
+        nodes = [{'id': n, **omni_graph.nodes[n]} for n in omni_graph.nodes()]
+        edges = [{'source': u, 'target': v} for u, v in omni_graph.edges()]
+    payload = {'epoch': graph_changes.epoch, 'revision': revision}
+    encoding = negotiate_encoding(data.get('encoding'))
+    if encoding == ENCODING_JSON:
+        payload.update(nodes=nodes, edges=edges)
+    else:
+        payload.update(encoding=encoding, snapshot=encode_snapshot(nodes, edges, encoding))
+    emit('graph_state', payload)
+    if emitter.enabled:
+        emitter.join(request.sid, revision, subscription)
+
+
+init_hydration()
+# Peer changes missed while the bus was disconnected are not replayed: force
+# dashboards back to a snapshot
+cluster.start(apply_cluster_change, on_resync=graph_changes.invalidate)
+start_retention()
 
 
 # ============================================================================
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Webhook Signature Verifier
+ScrollVerse Genesis Protocol - HMAC Verification
+
+This module verifies GitHub X-Hub-Signature-256 headers. A verifier keeps
+keyed HMAC templates for the current (and optionally previous) secret, so
+a request only copies a prepared hash state instead of re-deriving the
+key. Bodies can be verified while they are read from the request stream
+into a single buffer, which is then parsed in place. The buffer grows as
+bytes arrive (never by what the Content-Length header claims), and a
+request with a malformed signature header is rejected unread.
+"""
+
+import hashlib
+import hmac
+import logging
+from typing import Any, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_PREFIX = 'sha256='
+
+# Bytes read from the request stream per chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised when a request body exceeds the configured maximum length."""
+
+
+def parse_signature(signature_header: str) -> Optional[bytes]:
+    """
+    Decode an X-Hub-Signature-256 header to raw digest bytes.
+
+    Returns:
+        The 32-byte digest, or None if the header is missing or malformed
+    """
+    if not signature_header:
+        logger.warning("No X-Hub-Signature-256 header present")
+        return None
+
+    if not signature_header.startswith(SIGNATURE_PREFIX):
+        logger.warning("Invalid signature format - must start with 'sha256='")
+        return None
+
+    try:
+        digest = bytes.fromhex(signature_header[len(SIGNATURE_PREFIX):])
+    except ValueError:
+        return None
+    return digest if len(digest) == hashlib.sha256().digest_size else None
+
+
+class WebhookVerifier:
+    """
+    HMAC SHA-256 verifier for one or more webhook secrets.
+
+    Secrets are tried in order, so during a rotation pass the new secret
+    first and the previous one second.
+
+    Args:
+        secrets: Webhook secrets (empty values are ignored)
+    """
+
+    def __init__(self, secrets: Iterable[Optional[str]]):
+        self._templates = [
+            hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+            for secret in secrets if secret
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any secret is configured."""
+        return bool(self._templates)
+
+    def _matches(self, expected: bytes, body: Buffer, first: Any = None) -> bool:
+        """Compare the body digest for every key (first: precomputed current-key hash)."""
+        for i, template in enumerate(self._templates):
+            if i == 0 and first is not None:
+                digest = first.digest()
+            else:
+                mac = template.copy()
+                mac.update(body)
+                digest = mac.digest()
+            if hmac.compare_digest(digest, expected):
+                return True
+        return False
+
+    def verify(self, payload: Buffer, signature_header: str) -> bool:
+        """
+        Verify a complete payload.
+
+        Args:
+            payload: Raw request body
+            signature_header: X-Hub-Signature-256 header value
+
+        Returns:
+            True if the signature matches one of the secrets
+        """
+        expected = parse_signature(signature_header)
+        if expected is None:
+            return False
+        return self._matches(expected, payload)
+
+    def read_verified(
+        self,
+        stream: Any,
+        signature_header: str,
+        content_length: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_length: Optional[int] = None
+    ) -> Tuple[bool, bytearray]:
+        """
+        Read a request body from a stream and verify it in one pass.
+
+        The body is read into one buffer and the current key's hash is
+        updated from memoryview slices of it, so no chunk is copied a
+        second time. The buffer starts at one chunk and is grown as data
+        arrives. Without a usable signature header nothing is read.
+
+        Args:
+            stream: Readable binary stream (supports readinto or read)
+            signature_header: X-Hub-Signature-256 header value
+            content_length: Body length if known
+            chunk_size: Bytes read per chunk
+            max_length: Maximum body length (None for no limit)
+
+        Returns:
+            (signature valid, body buffer - empty if the header was unusable)
+
+        Raises:
+            PayloadTooLargeError: If the body is longer than max_length
+        """
+        expected = parse_signature(signature_header)
+        if expected is None or not self._templates:
+            return False, bytearray()
+        if max_length is not None and content_length is not None and content_length > max_length:
+            raise PayloadTooLargeError(f'Payload of {content_length} bytes exceeds {max_length}')
+        mac = self._templates[0].copy()
+        limit = content_length if content_length is not None else max_length
+
+        readinto = getattr(stream, 'readinto', None)
+        if readinto is not None:
+            body = bytearray(chunk_size if limit is None else min(limit, chunk_size))
+            size = 0
+            while limit is None or size < limit:
+                if size == len(body):
+                    # Double the buffer, but never past what may still arrive
+                    grow = len(body) or chunk_size
+                    body.extend(bytes(grow if limit is None else min(grow, limit - size)))
+                end = min(len(body), size + chunk_size)
+                with memoryview(body) as view, view[size:end] as window:
+                    count = readinto(window)
+                    if not count:
+                        break
+                    mac.update(window[:count])
+                size += count
+            del body[size:]
+            if content_length is None and limit is not None and size == limit and stream.read(1):
+                raise PayloadTooLargeError(f'Payload exceeds {max_length} bytes')
+        else:
+            body = bytearray()
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                mac.update(chunk)
+                body += chunk
+                if max_length is not None and len(body) > max_length:
+                    raise PayloadTooLargeError(f'Payload exceeds {max_length} bytes')
+
+        return self._matches(expected, body, first=mac), body
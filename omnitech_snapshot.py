@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Snapshot Encoding
+ScrollVerse Genesis Protocol - Compact Graph Transport
+
+This module encodes graph snapshots for large dashboards. The columnar
+layout stores every node id and attribute key once in a string table,
+refers to them by index, and keeps each attribute as one array aligned
+with the node (or edge) list. Documents can be serialized as JSON or
+MessagePack and compressed with zlib.
+
+Encodings (negotiated by the client, JSON stays the default):
+    json                    Plain node/edge dictionaries
+    columnar                Columnar document
+    columnar+zlib           Columnar JSON, zlib compressed
+    columnar+msgpack        Columnar MessagePack (needs msgpack)
+    columnar+msgpack+zlib   Columnar MessagePack, zlib compressed
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+ENCODING_JSON = 'json'
+ENCODING_COLUMNAR = 'columnar'
+
+ENCODINGS = (
+    ENCODING_JSON,
+    ENCODING_COLUMNAR,
+    'columnar+zlib',
+    'columnar+msgpack',
+    'columnar+msgpack+zlib'
+)
+
+# zlib level (snapshots are highly repetitive, so higher levels gain little)
+COMPRESSION_LEVEL = 6
+
+
+def available_encodings() -> List[str]:
+    """Encodings supported by this installation."""
+    return [e for e in ENCODINGS if msgpack is not None or 'msgpack' not in e]
+
+
+def negotiate(accepted: Union[None, str, Iterable[str]]) -> str:
+    """
+    Pick the encoding for a client.
+
+    Args:
+        accepted: Encodings the client accepts, most preferred first
+            (list or comma separated string)
+
+    Returns:
+        The first supported encoding, or 'json'
+    """
+    if isinstance(accepted, str):
+        accepted = accepted.split(',')
+    available = available_encodings()
+    for encoding in accepted or []:
+        if isinstance(encoding, str) and encoding.strip() in available:
+            return encoding.strip()
+    return ENCODING_JSON
+
+
+def is_compressed(encoding: str) -> bool:
+    """Whether an encoding is zlib compressed."""
+    return encoding.endswith('+zlib')
+
+
+class _StringTable:
+    """Interns strings and hands out their indexes."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        value = str(value)
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _columns(rows: List[Dict[str, Any]], strings: _StringTable, skip: Tuple[str, ...]) -> List[List[Any]]:
+    """Turn attribute dictionaries into [key index, values] columns."""
+    columns: Dict[str, List[Any]] = {}
+    for i, row in enumerate(rows):
+        for key, value in row.items():
+            if key in skip:
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * len(rows)
+            column[i] = value
+    return [[strings(key), values] for key, values in columns.items()]
+
+
+def to_columnar(
+    nodes: Iterable[Dict[str, Any]],
+    edges: Iterable[Dict[str, Any]],
+    **meta: Any
+) -> Dict[str, Any]:
+    """
+    Build a columnar snapshot document.
+
+    Args:
+        nodes: Node dictionaries ('id' plus attributes)
+        edges: Edge dictionaries ('source', 'target' plus attributes)
+        **meta: Extra top-level fields (revision, counts, cursor, ...)
+
+    Returns:
+        {'strings', 'nodes': {'ids', 'columns'},
+         'edges': {'sources', 'targets', 'columns'}, **meta}
+    """
+    nodes = list(nodes)
+    edges = list(edges)
+    strings = _StringTable()
+    document = {
+        'nodes': {
+            'ids': [strings(node['id']) for node in nodes],
+            'columns': _columns(nodes, strings, ('id',))
+        },
+        'edges': {
+            'sources': [strings(edge['source']) for edge in edges],
+            'targets': [strings(edge['target']) for edge in edges],
+            'columns': _columns(edges, strings, ('source', 'target'))
+        },
+        **meta
+    }
+    document['strings'] = strings.strings
+    return document
+
+
+def _rows(rows: List[Dict[str, Any]], columns: List[List[Any]], strings: List[str]) -> List[Dict[str, Any]]:
+    """Fill attribute dictionaries from columns (missing values are skipped)."""
+    for key_index, values in columns:
+        key = strings[key_index]
+        for row, value in zip(rows, values):
+            if value is not None:
+                row[key] = value
+    return rows
+
+
+def from_columnar(document: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Expand a columnar document back into node and edge dictionaries.
+
+    Returns:
+        (nodes, edges)
+    """
+    strings = document['strings']
+    nodes, edges = document['nodes'], document['edges']
+    node_rows = _rows([{'id': strings[i]} for i in nodes['ids']], nodes['columns'], strings)
+    edge_rows = _rows(
+        [{'source': strings[s], 'target': strings[t]} for s, t in zip(edges['sources'], edges['targets'])],
+        edges['columns'],
+        strings
+    )
+    return node_rows, edge_rows
+
+
+def serialize(document: Any, encoding: str) -> bytes:
+    """
+    Serialize (and compress) a document.
+
+    Raises:
+        ValueError: If the encoding is not available
+    """
+    if encoding not in available_encodings():
+        raise ValueError(f'Unsupported encoding: {encoding}')
+    if 'msgpack' in encoding:
+        data = msgpack.packb(document, default=str)
+    else:
+        data = json.dumps(document, separators=(',', ':'), default=str).encode('utf-8')
+    if is_compressed(encoding):
+        data = zlib.compress(data, COMPRESSION_LEVEL)
+    return data
+
+
+def deserialize(data: bytes, encoding: str) -> Any:
+    """Reverse serialize()."""
+    if is_compressed(encoding):
+        data = zlib.decompress(data)
+    if 'msgpack' in encoding:
+        if msgpack is None:
+            raise ValueError(f'Unsupported encoding: {encoding}')
+        return msgpack.unpackb(data)
+    return json.loads(data)
+
+
+def encode_snapshot(
+    nodes: Iterable[Dict[str, Any]],
+    edges: Iterable[Dict[str, Any]],
+    encoding: str
+) -> Optional[Union[Dict[str, Any], bytes]]:
+    """
+    Encode a snapshot for Socket.IO.
+
+    Returns:
+        None for 'json' (the caller sends plain lists), the columnar
+        document for 'columnar', or the serialized bytes otherwise
+    """
+    if encoding == ENCODING_JSON:
+        return None
+    document = to_columnar(nodes, edges)
+    if encoding == ENCODING_COLUMNAR:
+        return document
+    return serialize(document, encoding)
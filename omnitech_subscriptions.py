@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Subscriptions
+ScrollVerse Genesis Protocol - Filtered Live Updates
+
+This module describes which part of the graph a dashboard follows. A
+subscription filter selects nodes by event type, node id prefix and/or the
+neighborhood of a root node; edges are included when either endpoint is
+selected. Clients with the same filter share a Socket.IO room, so each
+broadcast is filtered once per room rather than once per client.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from omnitech_graph_sync import ACTION_NODE_REMOVED
+
+# Room of clients that follow the whole graph
+FULL_GRAPH_ROOM = 'graph'
+
+# Upper bound on the neighborhood depth a client may request
+MAX_DEPTH = 3
+
+
+def _string_list(value: Any, name: str) -> List[str]:
+    """
+    Accept a list of strings or a comma separated string.
+
+    Raises:
+        ValueError: If the value has another type
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f'{name} must be a list of strings')
+    return sorted({v for v in value if v})
+
+
+class SubscriptionFilter:
+    """
+    Selection of the graph a client subscribes to.
+
+    All given criteria must hold for a node to be selected.
+
+    Args:
+        event_types: Only nodes with one of these event types
+        prefixes: Only nodes whose id starts with one of these prefixes
+        root: Only nodes within depth hops of this node (in either direction)
+        depth: Neighborhood radius around root
+    """
+
+    def __init__(
+        self,
+        event_types: Optional[Iterable[str]] = None,
+        prefixes: Optional[Iterable[str]] = None,
+        root: Optional[str] = None,
+        depth: int = 1
+    ):
+        self.event_types = frozenset(event_types) if event_types else None
+        self.prefixes = tuple(sorted(prefixes)) if prefixes else None
+        self.root = root
+        self.depth = depth
+        self.key = json.dumps({
+            'event_types': sorted(self.event_types or []),
+            'prefixes': list(self.prefixes or []),
+            'root': root,
+            'depth': depth if root else None
+        }, sort_keys=True, separators=(',', ':'))
+        self.room = f"{FULL_GRAPH_ROOM}:{hashlib.sha1(self.key.encode('utf-8')).hexdigest()[:16]}"
+
+    @classmethod
+    def from_request(cls, data: Any) -> Optional['SubscriptionFilter']:
+        """
+        Build a filter from a subscribe_graph 'filter' object.
+
+        Returns:
+            The filter, or None if the client follows the whole graph
+
+        Raises:
+            ValueError: If the filter is invalid
+        """
+        if data is None:
+            return None
+        if not isinstance(data, dict):
+            raise ValueError('filter must be an object')
+
+        event_types = _string_list(data.get('event_types'), 'event_types')
+        prefixes = _string_list(data.get('prefixes'), 'prefixes')
+        root = data.get('root')
+        if root is not None and (not isinstance(root, str) or not root):
+            raise ValueError('root must be a node id')
+        try:
+            depth = int(data.get('depth', 1))
+        except (TypeError, ValueError):
+            raise ValueError('depth must be an integer')
+        if not 0 <= depth <= MAX_DEPTH:
+            raise ValueError(f'depth must be between 0 and {MAX_DEPTH}')
+
+        if not (event_types or prefixes or root):
+            return None
+        return cls(event_types=event_types, prefixes=prefixes, root=root, depth=depth)
+
+    def scope(self, graph: Any) -> Optional[Set[Any]]:
+        """
+        Get the neighborhood of the root node.
+
+        Returns:
+            Node ids within depth hops of root, or None without a root
+        """
+        if self.root is None:
+            return None
+        if self.root not in graph:
+            return set()
+        seen = {self.root}
+        frontier = [self.root]
+        for _ in range(self.depth):
+            next_frontier = []
+            for node_id in frontier:
+                for neighbor in (*graph.successors(node_id), *graph.predecessors(node_id)):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return seen
+
+    def _prefix_matches(self, node_id: Any) -> bool:
+        return self.prefixes is None or str(node_id).startswith(self.prefixes)
+
+    def node_matches(self, graph: Any, node_id: Any, scope: Optional[Set[Any]]) -> bool:
+        """Check if a node of the graph is selected."""
+        if not self._prefix_matches(node_id):
+            return False
+        if scope is not None and node_id not in scope:
+            return False
+        if self.event_types is not None:
+            attributes = graph.nodes[node_id] if node_id in graph else {}
+            return attributes.get('event_type') in self.event_types
+        return True
+
+    def delta_matches(self, graph: Any, delta: Dict[str, Any], scope: Optional[Set[Any]]) -> bool:
+        """Check if a delta concerns the selected part of the graph."""
+        if delta.get('action') == ACTION_NODE_REMOVED:
+            # The node is gone, so only its id can be checked; removing a
+            # node the client does not hold is a no-op
+            return self._prefix_matches(delta['node_id'])
+        if 'node_id' in delta:
+            return self.node_matches(graph, delta['node_id'], scope)
+        return (self.node_matches(graph, delta['source'], scope)
+                or self.node_matches(graph, delta['target'], scope))
+
+    def select(
+        self,
+        graph: Any,
+        deltas: List[Dict[str, Any]],
+        events: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Filter a broadcast.
+
+        Events are kept when the node (or an edge endpoint) they announce
+        is touched by one of the selected deltas.
+
+        Returns:
+            (selected deltas, selected events)
+        """
+        scope = self.scope(graph)
+        selected = [delta for delta in deltas if self.delta_matches(graph, delta, scope)]
+        touched = set()
+        for delta in selected:
+            touched.update(delta[k] for k in ('node_id', 'source', 'target') if k in delta)
+        kept = [
+            event for event in events
+            if any(event.get(k) in touched for k in ('node_id', 'source', 'target'))
+        ]
+        return selected, kept
+
+    def snapshot(self, graph: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get the selected part of the graph.
+
+        Returns:
+            (nodes, edges) in the graph_state format
+        """
+        scope = self.scope(graph)
+        candidates = scope if scope is not None else graph.nodes()
+        selected = {n for n in candidates if self.node_matches(graph, n, scope)}
+        pairs = set(graph.out_edges(selected)).union(graph.in_edges(selected))
+        edges = [{'source': u, 'target': v} for u, v in pairs]
+        node_ids = selected.union(e['source'] for e in edges).union(e['target'] for e in edges)
+        nodes = [{'id': n, **graph.nodes[n]} for n in node_ids]
+        return nodes, edges
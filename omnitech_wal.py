@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Write-Ahead Log
+ScrollVerse Genesis Protocol - Local Graph Durability
+
+This module keeps the in-memory graph recoverable from local disk, with or
+without Neo4j. Every mutation is appended to a log segment as a framed,
+checksummed record; once the log has grown past a size threshold the
+graph is written to a compressed columnar snapshot and the segments it
+covers are deleted (log compaction). On startup the newest snapshot is
+memory-mapped and loaded, and only the records appended after it are
+replayed, so restart time is bounded by the snapshot size rather than
+by the length of the history.
+
+Records are idempotent (attributes are stored as absolute values), so a
+snapshot taken while writes continue may already contain some of the
+records replayed on top of it.
+
+Directory layout:
+    wal-<first sequence number>.log        Log segments
+    snapshot-<sequence number>.bin         Graph as of that record
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from omnitech_snapshot import deserialize, from_columnar, serialize, to_columnar
+
+logger = logging.getLogger(__name__)
+
+# fsync policies
+FSYNC_ALWAYS = 'always'
+FSYNC_INTERVAL = 'interval'
+FSYNC_NEVER = 'never'
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+# Record operations
+OP_NODE = 'n'
+OP_EDGE = 'e'
+OP_REMOVE = 'r'
+
+SNAPSHOT_MAGIC = b'OMNISNP1'
+SNAPSHOT_ENCODING = 'columnar+zlib'
+
+# Record frame: payload length, crc32 of the payload
+_FRAME = struct.Struct('<II')
+# Snapshot header: magic, sequence number, crc32 of the body
+_SNAPSHOT_HEADER = struct.Struct('<8sQI')
+
+_SEGMENT_NAME = re.compile(r'^wal-(\d{20})\.log$')
+_SNAPSHOT_NAME = re.compile(r'^snapshot-(\d{20})\.bin$')
+
+
+def _segment_name(seq: int) -> str:
+    return f'wal-{seq:020d}.log'
+
+
+def _snapshot_name(seq: int) -> str:
+    return f'snapshot-{seq:020d}.bin'
+
+
+def encode_record(record: List[Any]) -> bytes:
+    """Frame a record as length, crc32 and JSON payload."""
+    payload = json.dumps(record, separators=(',', ':'), default=str).encode('utf-8')
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_segment(path: str) -> Iterator[List[Any]]:
+    """
+    Read the records of a log segment (memory-mapped).
+
+    Reading stops at the first incomplete or corrupt record, which is
+    where a crash in the middle of a write leaves the segment.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            offset = 0
+            while offset + _FRAME.size <= size:
+                length, checksum = _FRAME.unpack_from(view, offset)
+                start = offset + _FRAME.size
+                payload = view[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    logger.warning(f"WAL segment {path} truncated at byte {offset}")
+                    return
+                yield json.loads(payload)
+                offset = start + length
+
+
+def read_snapshot(path: str) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Load a snapshot file (memory-mapped).
+
+    Returns:
+        (sequence number, nodes, edges)
+
+    Raises:
+        ValueError: If the file is not a valid snapshot
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if len(view) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f'Truncated snapshot: {path}')
+        magic, seq, checksum = _SNAPSHOT_HEADER.unpack_from(view, 0)
+        body = memoryview(view)[_SNAPSHOT_HEADER.size:]
+        try:
+            if magic != SNAPSHOT_MAGIC or zlib.crc32(body) != checksum:
+                raise ValueError(f'Corrupt snapshot: {path}')
+            document = deserialize(body, SNAPSHOT_ENCODING)
+        finally:
+            body.release()
+    nodes, edges = from_columnar(document)
+    return seq, nodes, edges
+
+
+def apply_record(graph: Any, record: List[Any]) -> None:
+    """Replay one log record onto a graph."""
+    op = record[0]
+    if op == OP_NODE:
+        graph.add_node(record[1], **record[2])
+    elif op == OP_EDGE:
+        graph.add_edge(record[1], record[2], **record[3])
+    elif op == OP_REMOVE:
+        if record[1] in graph:
+            graph.remove_node(record[1])
+    else:
+        raise ValueError(f'Unknown WAL operation: {op}')
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make renames and deletions in a directory durable."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory handles
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    Append-only mutation log with periodic snapshots.
+
+    Without a directory the log is disabled and every method is a no-op.
+    With one, recover() must run before the first record is appended.
+
+    Args:
+        graph_getter: Returns the graph snapshots are taken from
+        directory: Directory for segments and snapshots (None disables)
+        fsync: 'always' (fsync every record), 'interval' (at most once per
+            fsync_interval, on the next write) or 'never' (leave it to the
+            OS). Records are flushed to the OS after every write in all
+            modes, so only a machine crash can lose acknowledged writes.
+        fsync_interval: Seconds between fsyncs for the 'interval' policy
+        snapshot_bytes: Log bytes written since the last snapshot that
+            trigger a new one (0 disables automatic snapshots)
+        clock: Monotonic clock
+
+    Raises:
+        ValueError: If the fsync policy is unknown
+    """
+
+    def __init__(
+        self,
+        graph_getter: Callable[[], Any],
+        directory: Optional[str] = None,
+        fsync: str = FSYNC_INTERVAL,
+        fsync_interval: float = 1.0,
+        snapshot_bytes: int = 64 * 2**20,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        fsync = (fsync or FSYNC_INTERVAL).lower()
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'Unknown fsync policy: {fsync}')
+        self._graph_getter = graph_getter
+        self.directory = directory
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_bytes = snapshot_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = None
+        # Sequence number of the next record and first record of the open segment
+        self._seq = 0
+        self._segment_start = 0
+        self._last_sync = clock()
+        self._bytes_since_snapshot = 0
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.records = 0
+        self.snapshots = 0
+        self.last_snapshot_seq: Optional[int] = None
+        self.last_snapshot_ms = 0.0
+        self.recovered_nodes = 0
+        self.recovered_records = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a log directory is configured."""
+        return bool(self.directory)
+
+    def _files(self, pattern: re.Pattern) -> List[Tuple[int, str]]:
+        """(sequence number, path) of matching files, oldest first."""
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    # Recovery
+
+    def recover(self, graph: Any) -> Dict[str, Any]:
+        """
+        Load the newest snapshot and replay the log into a graph, then open
+        a new segment for appends.
+
+        Returns:
+            Recovery statistics
+        """
+        if not self.enabled:
+            return {}
+        started = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+
+        seq = 0
+        for _, path in reversed(self._files(_SNAPSHOT_NAME)):
+            try:
+                seq, nodes, edges = read_snapshot(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Skipping unreadable snapshot {path}: {e}")
+                continue
+            for node in nodes:
+                node_id = node.pop('id')
+                graph.add_node(node_id, **node)
+            for edge in edges:
+                graph.add_edge(edge.pop('source'), edge.pop('target'), **edge)
+            self.recovered_nodes = len(nodes)
+            self.last_snapshot_seq = seq
+            break
+
+        replayed = replayed_bytes = 0
+        for start, path in self._files(_SEGMENT_NAME):
+            if start > seq:
+                logger.error(f"WAL gap before {path} (expected record {seq}) - stopping replay")
+                break
+            for i, record in enumerate(read_segment(path)):
+                if start + i < seq:
+                    continue
+                apply_record(graph, record)
+                seq += 1
+                replayed += 1
+            replayed_bytes += os.path.getsize(path)
+
+        with self._lock:
+            self._seq = seq
+            self._open_segment()
+            # Long replays are folded into a snapshot once writes resume
+            self._bytes_since_snapshot = replayed_bytes
+        self.recovered_records = replayed
+        logger.info(
+            f"Recovered graph from {self.directory}: snapshot with {self.recovered_nodes} nodes, "
+            f"{replayed} log records replayed in {time.monotonic() - started:.2f}s"
+        )
+        return self.stats()
+
+    # Appending
+
+    def _open_segment(self) -> None:
+        """Start a new segment at the current sequence number (lock held)."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        path = os.path.join(self.directory, _segment_name(self._seq))
+        # A leftover segment with this name may only hold a torn record
+        if os.path.exists(path) and next(read_segment(path), None) is not None:
+            raise RuntimeError(f'{path} holds records that have not been recovered')
+        self._file = open(path, 'wb')
+        self._segment_start = self._seq
+        _fsync_directory(self.directory)
+
+    def _append(self, record: List[Any]) -> None:
+        if not self.enabled:
+            return
+        data = encode_record(record)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._open_segment()
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync == FSYNC_ALWAYS or (
+                self.fsync == FSYNC_INTERVAL and self._clock() - self._last_sync >= self.fsync_interval
+            ):
+                os.fsync(self._file.fileno())
+                self._last_sync = self._clock()
+            self._seq += 1
+            self.records += 1
+            self._bytes_since_snapshot += len(data)
+            due = 0 < self.snapshot_bytes <= self._bytes_since_snapshot
+        if due:
+            self.snapshot()
+
+    def record_node(self, node_id: str, attributes: Dict[str, Any]) -> None:
+        """Log a node added or updated with attributes."""
+        self._append([OP_NODE, node_id, attributes])
+
+    def record_edge(self, source: str, target: str, attributes: Dict[str, Any]) -> None:
+        """Log an edge added or updated with attributes."""
+        self._append([OP_EDGE, source, target, attributes])
+
+    def record_removed(self, node_id: str) -> None:
+        """Log a node removal."""
+        self._append([OP_REMOVE, node_id])
+
+    def sync(self) -> None:
+        """Flush and fsync the open segment."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._last_sync = self._clock()
+
+    # Snapshots and compaction
+
+    def snapshot(self, wait: bool = False) -> Optional[threading.Thread]:
+        """
+        Write a snapshot in the background (unless one is running).
+
+        Args:
+            wait: Block until the snapshot has been written
+
+        Returns:
+            The snapshot thread, or None if the log is disabled
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            thread = self._snapshot_thread
+            if thread is None or not thread.is_alive():
+                thread = self._snapshot_thread = threading.Thread(
+                    target=self._write_snapshot,
+                    name='omnitech-wal-snapshot',
+                    daemon=True
+                )
+                # Stop re-triggering while this one runs
+                self._bytes_since_snapshot = 0
+                thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    def _copy_graph(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Copy nodes and edges (retried if the graph changes while copied)."""
+        graph = self._graph_getter()
+        while True:
+            try:
+                nodes = [{'id': n, **attrs} for n, attrs in graph.nodes(data=True)]
+                edges = [{'source': u, 'target': v, **attrs} for u, v, attrs in graph.edges(data=True)]
+                return nodes, edges
+            except RuntimeError:
+                continue
+
+    def _write_snapshot(self) -> None:
+        started = time.monotonic()
+        try:
+            with self._lock:
+                # Records from here on go to a new segment and are replayed
+                # on top of the snapshot
+                seq = self._seq
+                if self._file is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                self._open_segment()
+            nodes, edges = self._copy_graph()
+            body = serialize(to_columnar(nodes, edges), SNAPSHOT_ENCODING)
+
+            path = os.path.join(self.directory, _snapshot_name(seq))
+            with open(path + '.tmp', 'wb') as f:
+                f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, seq, zlib.crc32(body)))
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+            _fsync_directory(self.directory)
+            self._compact(seq)
+        except Exception as e:
+            logger.error(f"WAL snapshot failed: {e}")
+            return
+        self.snapshots += 1
+        self.last_snapshot_seq = seq
+        self.last_snapshot_ms = (time.monotonic() - started) * 1000
+        logger.info(f"Graph snapshot at record {seq}: {len(nodes)} nodes in {self.last_snapshot_ms:.0f}ms")
+
+    def _compact(self, seq: int) -> None:
+        """Delete snapshots and segments covered by the snapshot at seq."""
+        for snapshot_seq, path in self._files(_SNAPSHOT_NAME):
+            if snapshot_seq < seq:
+                os.remove(path)
+        for start, path in self._files(_SEGMENT_NAME):
+            if start < seq:
+                os.remove(path)
+        _fsync_directory(self.directory)
+
+    def close(self) -> None:
+        """Wait for a running snapshot and close the open segment."""
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get log and snapshot statistics."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'fsync': self.fsync,
+                'sequence': self._seq,
+                'segment_start': self._segment_start,
+                'records': self.records,
+                'bytes_since_snapshot': self._bytes_since_snapshot,
+                'snapshots': self.snapshots,
+                'last_snapshot_seq': self.last_snapshot_seq,
+                'last_snapshot_ms': round(self.last_snapshot_ms, 3),
+                'recovered_nodes': self.recovered_nodes,
+                'recovered_records': self.recovered_records
+            }
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Write-Behind Persistence Queue
+ScrollVerse Genesis Protocol - Asynchronous Graph Persistence
+
+This module decouples request handling from Neo4j latency. Graph mutations
+are recorded in a bounded in-memory queue and written to the persistence
+layer by a background flusher, either every flush interval or as soon as a
+full batch is waiting. While the persistence layer reports itself
+unavailable (circuit open), or when a write fails to reach it, batches can
+be spilled to a local file and are replayed, in order, once it recovers.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from omnitech_persistence import RETRYABLE_ERRORS
+from omnitech_wal import encode_record, read_segment
+
+logger = logging.getLogger(__name__)
+
+# Queued operation kinds
+OP_NODE = 'node'
+OP_EDGE = 'edge'
+OP_INCREMENT = 'increment'
+OP_DELETE = 'delete'
+OP_SUBGRAPH = 'subgraph'
+
+
+class SpillBuffer:
+    """
+    Append-only file of queued operations waiting for persistence.
+
+    Operations are framed and checksummed like write-ahead log records and
+    fsynced on every append, so they survive a restart of the server.
+
+    Args:
+        path: File to spill to
+        max_bytes: Size beyond which further spills are dropped (0 for no limit)
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.dropped = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.pending = sum(1 for _ in read_segment(path)) if os.path.exists(path) else 0
+        self._size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def append(self, ops: List[Tuple[str, tuple]]) -> bool:
+        """
+        Durably append operations.
+
+        Returns:
+            False if they were dropped because the buffer is full
+        """
+        data = b''.join(encode_record([kind, list(args)]) for kind, args in ops)
+        with self._lock:
+            if self.max_bytes and self._size + len(data) > self.max_bytes:
+                self.dropped += len(ops)
+                logger.warning(f"Spill buffer full - {len(ops)} mutations dropped")
+                return False
+            with open(self.path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._size += len(data)
+            self.pending += len(ops)
+        return True
+
+    def read(self) -> List[Tuple[str, tuple]]:
+        """Read all spilled operations, oldest first."""
+        with self._lock:
+            if not self.pending:
+                return []
+            return [(kind, tuple(args)) for kind, args in read_segment(self.path)]
+
+    def replace(self, ops: List[Tuple[str, tuple]]) -> None:
+        """Atomically replace the spilled operations (the ones not yet replayed)."""
+        data = b''.join(encode_record([kind, list(args)]) for kind, args in ops)
+        with self._lock:
+            with open(self.path + '.tmp', 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self.path + '.tmp', self.path)
+            self._size = len(data)
+            self.pending = len(ops)
+
+
+class WriteBehindQueue:
+    """
+    Bounded write-behind queue for graph persistence.
+
+    Mutations are accepted without blocking the caller. When the queue is
+    full the mutation is dropped and counted, so a slow or unavailable Neo4j
+    never stalls the request path.
+    """
+
+    def __init__(
+        self,
+        persistence_getter: Callable[[], Any],
+        max_size: int = 10000,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        spill: Optional[SpillBuffer] = None
+    ):
+        """
+        Initialize the write-behind queue.
+
+        Args:
+            persistence_getter: Callable returning the persistence layer (or None)
+            max_size: Maximum number of pending mutations
+            flush_interval: Seconds between background flushes
+            batch_size: Maximum number of mutations written per batch
+            spill: Buffer for batches written while the persistence layer
+                is unavailable (without one they are counted as failed)
+        """
+        self._persistence_getter = persistence_getter
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._batch_size = max(1, batch_size)
+        self._spill = spill
+
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._metrics_lock = threading.Lock()
+        self._enqueued = 0
+        self._flushed = 0
+        self._failed = 0
+        self._dropped = 0
+        self._discarded = 0
+        self._batches = 0
+        self._high_watermark = 0
+        self._last_flush_ms = 0.0
+        self._spilled = 0
+        self._replayed = 0
+
+        if spill is not None and spill.pending:
+            # Replay what a previous run spilled once persistence is back
+            self._ensure_started()
+
+    def enqueue_node(self, node_id: str, attributes: Dict[str, Any]) -> bool:
+        """
+        Queue a node for persistence.
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        return self._enqueue((OP_NODE, (node_id, dict(attributes))))
+
+    def enqueue_edge(self, source: str, target: str, attributes: Dict[str, Any]) -> bool:
+        """
+        Queue an edge for persistence.
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        return self._enqueue((OP_EDGE, (source, target, dict(attributes))))
+
+    def enqueue_subgraph(self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> bool:
+        """
+        Queue nodes and edges that must be written in one transaction.
+
+        Args:
+            nodes: Node dictionaries with 'id' and attributes
+            edges: Edge dictionaries with 'source', 'target' and attributes
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        return self._enqueue((OP_SUBGRAPH, (list(nodes), list(edges))))
+
+    def enqueue_increment(self, node_id: str, attributes: Dict[str, Any], counts: Dict[str, int]) -> bool:
+        """
+        Queue counter increments for a node (created if missing).
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        return self._enqueue((OP_INCREMENT, (node_id, dict(attributes), dict(counts))))
+
+    def enqueue_delete(self, node_id: str) -> bool:
+        """
+        Queue a node (and its relationships) for deletion.
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        return self._enqueue((OP_DELETE, (node_id,)))
+
+    def _enqueue(self, op: Tuple[str, tuple]) -> bool:
+        """Add an operation to the queue without blocking."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            with self._metrics_lock:
+                self._dropped += 1
+            logger.warning("Write-behind queue full - mutation dropped")
+            return False
+
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            self._enqueued += 1
+            if depth > self._high_watermark:
+                self._high_watermark = depth
+
+        if depth >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def _ensure_started(self) -> None:
+        """Start the background flusher on first use."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='omnitech-write-behind',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background flusher loop."""
+        while not self._stopping.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+    def _drain(self) -> List[Tuple[str, tuple]]:
+        """Take up to one batch of operations off the queue."""
+        batch = []
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> int:
+        """
+        Write all pending mutations to the persistence layer.
+
+        Returns:
+            Number of mutations successfully persisted
+        """
+        written = 0
+        with self._flush_lock:
+            written += self._replay_spill()
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                written += self._write_batch(batch)
+        return written
+
+    @staticmethod
+    def _available(persist: Any) -> bool:
+        """Whether the persistence layer accepts writes (circuit closed)."""
+        available = getattr(persist, 'available', None)
+        return available is None or available()
+
+    def _replay_spill(self) -> int:
+        """
+        Write spilled operations, oldest first, while persistence is available.
+
+        Replay stops at the first run that fails to reach Neo4j; it and
+        everything after it stay in the spill for the next flush.
+        """
+        persist = self._persistence_getter()
+        if self._spill is None or not self._spill.pending or persist is None:
+            return 0
+        ops = self._spill.read()
+        written = 0
+        for start in range(0, len(ops), self._batch_size):
+            if not self._available(persist):
+                self._spill.replace(ops[start:])
+                return written
+            chunk = ops[start:start + self._batch_size]
+            ok, consumed = self._write_ops(persist, chunk, stop_on_error=True)
+            written += ok
+            with self._metrics_lock:
+                self._replayed += ok
+            if consumed < len(chunk):
+                self._spill.replace(ops[start + consumed:])
+                return written
+        self._spill.replace([])
+        logger.info(f"Replayed {len(ops)} spilled mutations")
+        return written
+
+    def _spill_ops(self, ops: List[Tuple[str, tuple]]) -> None:
+        """Append operations to the spill (counted as failed if it is full)."""
+        if self._spill.append(ops):
+            with self._metrics_lock:
+                self._spilled += len(ops)
+        else:
+            with self._metrics_lock:
+                self._failed += len(ops)
+
+    def _write_batch(self, batch: List[Tuple[str, tuple]]) -> int:
+        """
+        Write one batch of operations, or spill it while the persistence
+        layer is unavailable (or older spilled operations are still
+        waiting, to keep the write order). Operations from the first run
+        that fails to reach Neo4j onwards are spilled as well.
+        """
+        persist = self._persistence_getter()
+        if persist is None:
+            with self._metrics_lock:
+                self._discarded += len(batch)
+            return 0
+        if self._spill is not None and (self._spill.pending or not self._available(persist)):
+            self._spill_ops(batch)
+            return 0
+        ok, consumed = self._write_ops(persist, batch, stop_on_error=self._spill is not None)
+        if consumed < len(batch):
+            self._spill_ops(batch[consumed:])
+        return ok
+
+    def _write_ops(
+        self,
+        persist: Any,
+        batch: List[Tuple[str, tuple]],
+        stop_on_error: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Write one batch of operations using the bulk persistence API.
+
+        Operations are written in enqueue order: consecutive operations of
+        the same kind are coalesced into one bulk call, and a new call
+        starts whenever the kind changes. A node deleted and re-added
+        within one batch therefore ends up present, and an edge queued
+        after its endpoint was deleted is written after the deletion.
+
+        A run rejected by Neo4j (e.g. a constraint violation) is counted
+        as failed; a rejected run of subgraphs is retried one subgraph at a
+        time, so only the offending webhooks fail. A run that did not reach Neo4j (connection lost,
+        transient errors exhausted, circuit open) is counted as failed too,
+        unless stop_on_error is set: then the batch stops there.
+
+        Returns:
+            (operations persisted, operations consumed) - the operations
+            after the consumed ones were not attempted
+        """
+        started = time.monotonic()
+        ok = 0
+        consumed = 0
+        for kind, run in groupby(batch, key=lambda op: op[0]):
+            args = [op[1] for op in run]
+            try:
+                ok += self._write_run(persist, kind, args)
+            except RETRYABLE_ERRORS as e:
+                logger.error(f"Write-behind {kind} write failed: {e}")
+                if stop_on_error:
+                    break
+            except Exception as e:
+                logger.error(f"Write-behind {kind} write failed: {e}")
+            consumed += len(args)
+
+        with self._metrics_lock:
+            self._flushed += ok
+            self._failed += consumed - ok
+            self._batches += 1
+            self._last_flush_ms = (time.monotonic() - started) * 1000
+        return ok, consumed
+
+    @staticmethod
+    def _write_run(persist: Any, kind: str, args: List[tuple]) -> int:
+        """Write a run of operations of one kind; returns how many were persisted."""
+        if kind == OP_NODE:
+            nodes = [{**attributes, 'id': node_id} for node_id, attributes in args]
+            return sum(persist.save_nodes_bulk(nodes, raise_errors=True))
+        if kind == OP_EDGE:
+            edges = [{**attributes, 'source': source, 'target': target} for source, target, attributes in args]
+            return sum(persist.save_edges_bulk(edges, raise_errors=True))
+        if kind == OP_INCREMENT:
+            rows = [
+                {'id': node_id, 'attributes': attributes, 'counts': counts}
+                for node_id, attributes, counts in args
+            ]
+            # Increments to one node are merged, so count queued ops. A run
+            # never exceeds batch_size rows, so (with the default chunk
+            # size) it commits in one transaction and a retry cannot
+            # apply part of it twice.
+            return len(rows) if all(persist.increment_counters_bulk(rows, raise_errors=True)) else 0
+        if kind == OP_SUBGRAPH:
+            # Consecutive subgraphs are written in one transaction
+            nodes = [node for subgraph_nodes, _ in args for node in subgraph_nodes]
+            edges = [edge for _, subgraph_edges in args for edge in subgraph_edges]
+            try:
+                return len(args) if persist.save_subgraph(nodes, edges, raise_errors=True) else 0
+            except RETRYABLE_ERRORS:
+                raise
+            except Exception as e:
+                if len(args) == 1:
+                    raise
+                logger.warning(f"Write-behind subgraph run rejected ({e}), writing its {len(args)} subgraphs one by one")
+            # Only the rejected subgraphs fail. Subgraph writes are merges, so
+            # if the connection drops here the run can safely be replayed.
+            ok = 0
+            for subgraph_nodes, subgraph_edges in args:
+                try:
+                    ok += bool(persist.save_subgraph(subgraph_nodes, subgraph_edges, raise_errors=True))
+                except RETRYABLE_ERRORS:
+                    raise
+                except Exception as e:
+                    logger.error(f"Write-behind subgraph write failed: {e}")
+            return ok
+        persist.delete_nodes_bulk([node_id for node_id, in args], raise_errors=True)
+        # Deleting an already-absent node is not a failure
+        return len(args)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background flusher and write any remaining mutations."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get queue backpressure metrics.
+
+        Returns:
+            Dictionary with queue depth, counters and last flush latency
+        """
+        with self._metrics_lock:
+            return {
+                'depth': self._queue.qsize(),
+                'max_size': self._max_size,
+                'high_watermark': self._high_watermark,
+                'enqueued': self._enqueued,
+                'flushed': self._flushed,
+                'failed': self._failed,
+                'dropped': self._dropped,
+                'discarded': self._discarded,
+                'batches': self._batches,
+                'last_flush_ms': round(self._last_flush_ms, 3),
+                'flush_interval': self._flush_interval,
+                'batch_size': self._batch_size,
+                'spilled': self._spilled,
+                'replayed': self._replayed,
+                'spill_pending': self._spill.pending if self._spill is not None else 0,
+                'spill_dropped': self._spill.dropped if self._spill is not None else 0
+            }
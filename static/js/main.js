@@ -12,10 +12,26 @@
         connected: false,
         nodes: [],
         edges: [],
+        nodeIndex: new Map(),
+        edgeIndex: new Map(),
+        revision: null,
+        epoch: null,
+        filter: readFilter(),
         webhookCount: 0,
         events: []
     };
 
+    // Optional subscription filter from the page URL, e.g.
+    // ?event_types=push,issues&prefixes=repo:&root=repo:owner/name&depth=2
+    function readFilter() {
+        const params = new URLSearchParams(window.location.search);
+        const filter = {};
+        for (const key of ['event_types', 'prefixes', 'root', 'depth']) {
+            if (params.has(key)) filter[key] = params.get(key);
+        }
+        return Object.keys(filter).length ? filter : null;
+    }
+
     // Initialize Socket.IO connection
     function initSocket() {
         try {
@@ -31,7 +47,13 @@
             state.socket.on('connected', handleServerConnected);
             state.socket.on('webhook_received', handleWebhookReceived);
             state.socket.on('graph_updated', handleGraphUpdated);
+            state.socket.on('graph_updated_batch', handleGraphUpdatedBatch);
+            state.socket.on('graph_resync', handleGraphResync);
+            state.socket.on('subscription_error', handleSubscriptionError);
             state.socket.on('graph_state', handleGraphState);
+            state.socket.on('graph_delta', handleGraphDelta);
+            state.socket.on('graph_loading', handleGraphLoading);
+            state.socket.on('graph_ready', handleGraphReady);
             state.socket.on('connect_error', handleConnectError);
 
         } catch (error) {
@@ -44,7 +66,23 @@
     function handleConnect() {
         console.log('Socket connected');
         updateConnectionStatus(true);
-        state.socket.emit('subscribe_graph');
+        subscribeGraph();
+    }
+
+    // Compact snapshot encodings we can decode, most preferred first
+    const SNAPSHOT_ENCODINGS = typeof DecompressionStream === 'function'
+        ? ['columnar+zlib', 'columnar']
+        : ['columnar'];
+
+    // Ask for the deltas since our revision (or a snapshot if we have none)
+    function subscribeGraph() {
+        const request = { encoding: SNAPSHOT_ENCODINGS };
+        if (state.filter) request.filter = state.filter;
+        if (state.revision !== null) {
+            request.since_revision = state.revision;
+            request.epoch = state.epoch;
+        }
+        state.socket.emit('subscribe_graph', request);
     }
 
     function handleDisconnect() {
@@ -65,27 +103,195 @@
     // Event handlers
     function handleWebhookReceived(data) {
         console.log('Webhook received:', data);
+        if (data.delta) applyDeltas(data.deltas || [data.delta]);
+        recordWebhook(data);
+        updateLastUpdate();
+    }
+
+    function recordWebhook(data) {
         state.webhookCount++;
         updateWebhookCount();
         addEvent(data.event_type, `Webhook: ${data.node_id}`);
-        updateLastUpdate();
     }
 
     function handleGraphUpdated(data) {
         console.log('Graph updated:', data);
-        state.socket.emit('subscribe_graph'); // Request fresh state
+        if (data.delta) {
+            applyDeltas(data.deltas || [data.delta]);
+        } else {
+            subscribeGraph();
+        }
+        recordGraphUpdate(data);
+        updateLastUpdate();
+    }
+
+    function recordGraphUpdate(data) {
         addEvent('graph', `${data.action}: ${data.node_id || `${data.source} -> ${data.target}`}`);
+    }
+
+    // One coalesced broadcast: all deltas since the last batch plus the events behind them
+    function handleGraphUpdatedBatch(data) {
+        applyDeltas(data.deltas, data.filtered);
+        if (data.filtered) advanceRevision(data.revision);
+        for (const event of data.events) {
+            if (event.event === 'webhook_received') {
+                recordWebhook(event);
+            } else if (event.event === 'graph_updated') {
+                recordGraphUpdate(event);
+            }
+        }
         updateLastUpdate();
+        if (state.revision !== null) {
+            state.socket.emit('graph_ack', { revision: state.revision });
+        }
+    }
+
+    // The server dropped us from the broadcast (lagging or reset): reload a snapshot
+    function handleGraphResync(data) {
+        console.log('Graph resync requested:', data);
+        state.revision = null;
+        subscribeGraph();
     }
 
     function handleGraphState(data) {
         console.log('Graph state received:', data);
-        state.nodes = data.nodes || [];
-        state.edges = data.edges || [];
+        if (!data.encoding) {
+            loadGraphState(data, data.nodes || [], data.edges || []);
+            return;
+        }
+        // Deltas arriving while the snapshot decodes are dropped; the gap
+        // they leave is caught up through subscribe_graph
+        state.revision = null;
+        decodeSnapshot(data)
+            .then(({ nodes, edges }) => loadGraphState(data, nodes, edges))
+            .catch(error => console.error('Failed to decode graph snapshot:', error));
+    }
+
+    async function decodeSnapshot(data) {
+        let document = data.snapshot;
+        if (data.encoding === 'columnar+zlib') {
+            const stream = new Blob([data.snapshot]).stream()
+                .pipeThrough(new DecompressionStream('deflate'));
+            document = JSON.parse(await new Response(stream).text());
+        }
+        return fromColumnar(document);
+    }
+
+    // Expand a columnar snapshot (string table + attribute columns)
+    function fromColumnar(document) {
+        const strings = document.strings;
+        const fill = (rows, columns) => {
+            for (const [keyIndex, values] of columns) {
+                const key = strings[keyIndex];
+                values.forEach((value, i) => {
+                    if (value !== null) rows[i][key] = value;
+                });
+            }
+            return rows;
+        };
+        const nodes = fill(document.nodes.ids.map(i => ({ id: strings[i] })), document.nodes.columns);
+        const edges = fill(
+            document.edges.sources.map((s, i) => ({ source: strings[s], target: strings[document.edges.targets[i]] })),
+            document.edges.columns
+        );
+        return { nodes, edges };
+    }
+
+    function loadGraphState(data, nodes, edges) {
+        state.nodes = nodes;
+        state.edges = edges;
+        state.nodeIndex = new Map(state.nodes.map(node => [node.id, node]));
+        state.edgeIndex = new Map(state.edges.map(edge => [`${edge.source}\u0000${edge.target}`, edge]));
+        state.revision = data.revision === undefined ? null : data.revision;
+        state.epoch = data.epoch || null;
         updateGraphStats();
         renderGraph();
     }
 
+    function handleGraphDelta(data) {
+        console.log(`Graph delta received: ${data.deltas.length} changes`);
+        applyDeltas(data.deltas, data.filtered);
+        if (data.filtered) advanceRevision(data.revision);
+    }
+
+    // Apply revisioned deltas in order; re-sync on a gap. Filtered
+    // subscriptions only receive matching deltas, so gaps are expected.
+    function applyDeltas(deltas, filtered) {
+        if (state.revision === null) return;
+
+        let changed = false;
+        for (const delta of deltas) {
+            if (delta.revision <= state.revision) continue;
+            if (!filtered && delta.revision !== state.revision + 1) {
+                subscribeGraph();
+                break;
+            }
+            if (delta.action === 'node_added') {
+                upsertNode(delta.node_id, delta.attributes);
+            } else if (delta.action === 'edge_added') {
+                upsertNode(delta.source, {});
+                upsertNode(delta.target, {});
+                const key = `${delta.source}\u0000${delta.target}`;
+                if (!state.edgeIndex.has(key)) {
+                    const edge = { source: delta.source, target: delta.target };
+                    state.edgeIndex.set(key, edge);
+                    state.edges.push(edge);
+                }
+            } else if (delta.action === 'node_removed') {
+                removeNode(delta.node_id);
+            }
+            state.revision = delta.revision;
+            changed = true;
+        }
+
+        if (changed) {
+            updateGraphStats();
+            renderGraph();
+        }
+    }
+
+    function advanceRevision(revision) {
+        if (state.revision !== null && revision > state.revision) {
+            state.revision = revision;
+        }
+    }
+
+    function removeNode(id) {
+        if (!state.nodeIndex.delete(id)) return;
+        state.nodes = state.nodes.filter(node => node.id !== id);
+        state.edges = state.edges.filter(edge => {
+            if (edge.source !== id && edge.target !== id) return true;
+            state.edgeIndex.delete(`${edge.source}\u0000${edge.target}`);
+            return false;
+        });
+    }
+
+    function upsertNode(id, attributes) {
+        const existing = state.nodeIndex.get(id);
+        if (existing) {
+            Object.assign(existing, attributes);
+            return;
+        }
+        const node = { id: id, ...attributes };
+        state.nodeIndex.set(id, node);
+        state.nodes.push(node);
+    }
+
+    function handleSubscriptionError(data) {
+        console.error('Graph subscription rejected:', data.error);
+        addEvent('system', `Subscription rejected: ${data.error}`);
+    }
+
+    function handleGraphLoading(data) {
+        console.log('Graph hydration in progress:', data);
+        addEvent('system', `Loading graph: ${data.nodes_loaded} nodes, ${data.edges_loaded} edges`);
+    }
+
+    function handleGraphReady(data) {
+        console.log('Graph hydration finished:', data);
+        subscribeGraph();
+    }
+
     // UI update functions
     function updateConnectionStatus(connected) {
         state.connected = connected;
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Shared Test Fixtures
+ScrollVerse Genesis Protocol - Test Support
+"""
+
+import os
+
+import pytest
+
+# Server tests assert on individual emits; coalescing is covered in test_emitter.py
+os.environ.setdefault('OMNITECH_EMIT_INTERVAL', '0')
+
+import omnitech_persistence
+from omnitech_persistence import OmnitechPersistence
+from tests.neo4j_stub import StubDriver
+
+
+@pytest.fixture
+def stub_driver():
+    """Stand-in Neo4j driver that records queries."""
+    return StubDriver()
+
+
+@pytest.fixture
+def stub_persistence(stub_driver, monkeypatch):
+    """OmnitechPersistence connected to the stand-in driver."""
+    monkeypatch.setattr(
+        omnitech_persistence.GraphDatabase, 'driver',
+        lambda *args, **kwargs: stub_driver
+    )
+    persist = OmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub')
+    yield persist
+    persist.close()
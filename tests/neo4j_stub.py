@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Neo4j Stand-in Driver
+ScrollVerse Genesis Protocol - Test Support
+
+A minimal in-process stand-in for the neo4j driver. It records every query
+that is run and answers with records produced by a configurable responder,
+so persistence code can be tested without a Neo4j server.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StubResult:
+    """Stand-in for neo4j.Result."""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._records = list(records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self) -> Optional[Dict[str, Any]]:
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return list(self._records)
+
+    def consume(self) -> None:
+        return None
+
+
+class StubTransaction:
+    """Stand-in for neo4j.Transaction (commits on clean context exit)."""
+
+    def __init__(self, driver: 'StubDriver'):
+        self._driver = driver
+        self.committed = False
+        self.rolled_back = False
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> StubResult:
+        return self._driver._run(query, {**(parameters or {}), **kwargs})
+
+    def commit(self) -> None:
+        self.committed = True
+        self._driver.commits += 1
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+        self._driver.rollbacks += 1
+
+    def close(self) -> None:
+        if not self.committed and not self.rolled_back:
+            self.rollback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+class StubSession:
+    """Stand-in for neo4j.Session."""
+
+    def __init__(self, driver: 'StubDriver'):
+        self._driver = driver
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> StubResult:
+        return self._driver._run(query, {**(parameters or {}), **kwargs})
+
+    def begin_transaction(self) -> StubTransaction:
+        return StubTransaction(self._driver)
+
+    def execute_write(self, work: Callable, *args, **kwargs) -> Any:
+        with self.begin_transaction() as tx:
+            return work(tx, *args, **kwargs)
+
+    def execute_read(self, work: Callable, *args, **kwargs) -> Any:
+        with self.begin_transaction() as tx:
+            return work(tx, *args, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class StubDriver:
+    """
+    Stand-in for neo4j.Driver.
+
+    Args:
+        responder: Callable (query, params) -> list of record dicts.
+            It may raise to simulate a failing query.
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]] = None):
+        self.responder = responder or (lambda query, params: [])
+        self.queries: List[tuple] = []
+        self.sessions = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.connectivity_checks = 0
+        self.closed = False
+
+    def _run(self, query: str, params: Dict[str, Any]) -> StubResult:
+        self.queries.append((query, params))
+        return StubResult(self.responder(query, params))
+
+    def session(self, **kwargs) -> StubSession:
+        self.sessions += 1
+        return StubSession(self)
+
+    def verify_connectivity(self) -> None:
+        self.connectivity_checks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class AsyncStubResult(StubResult):
+    """Stand-in for neo4j.AsyncResult."""
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self._records:
+            yield record
+
+    async def single(self) -> Optional[Dict[str, Any]]:
+        return StubResult.single(self)
+
+    async def data(self) -> List[Dict[str, Any]]:
+        return StubResult.data(self)
+
+    async def consume(self) -> None:
+        return None
+
+
+class AsyncStubTransaction(StubTransaction):
+    """Stand-in for neo4j.AsyncManagedTransaction."""
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncStubResult:
+        return await self._driver._run_async(query, {**(parameters or {}), **kwargs})
+
+
+class AsyncStubSession:
+    """Stand-in for neo4j.AsyncSession."""
+
+    def __init__(self, driver: 'AsyncStubDriver'):
+        self._driver = driver
+
+    async def _execute(self, work: Callable, *args, **kwargs) -> Any:
+        tx = AsyncStubTransaction(self._driver)
+        try:
+            result = await work(tx, *args, **kwargs)
+        except BaseException:
+            tx.rollback()
+            raise
+        tx.commit()
+        return result
+
+    async def execute_write(self, work: Callable, *args, **kwargs) -> Any:
+        return await self._execute(work, *args, **kwargs)
+
+    async def execute_read(self, work: Callable, *args, **kwargs) -> Any:
+        return await self._execute(work, *args, **kwargs)
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncStubDriver(StubDriver):
+    """
+    Stand-in for neo4j.AsyncDriver.
+
+    Every query yields to the event loop once, so concurrent transactions
+    interleave; in_flight / max_in_flight count the queries running at once.
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]] = None):
+        super().__init__(responder)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _run_async(self, query: str, params: Dict[str, Any]) -> AsyncStubResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            self.queries.append((query, params))
+            return AsyncStubResult(self.responder(query, params))
+        finally:
+            self.in_flight -= 1
+
+    def session(self, **kwargs) -> AsyncStubSession:
+        self.sessions += 1
+        return AsyncStubSession(self)
+
+    async def verify_connectivity(self) -> None:
+        StubDriver.verify_connectivity(self)
+
+    async def close(self) -> None:
+        StubDriver.close(self)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Analytics Tests
+ScrollVerse Genesis Protocol - Analytics Tests
+
+Tests for the incrementally maintained metrics, the stale-while-revalidate
+PageRank cache and the /admin/analytics endpoints.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_analytics import GraphAnalytics, pagerank
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+
+
+def build(graph, edges):
+    """Apply edges to a graph and an analytics instance tracking it."""
+    analytics = GraphAnalytics(lambda: graph)
+    for u, v in edges:
+        for node in (u, v):
+            graph.add_node(node)
+            analytics.add_node(node)
+        if not graph.has_edge(u, v):
+            graph.add_edge(u, v)
+            analytics.add_edge(u, v)
+    return analytics
+
+
+def wait(analytics, name):
+    """Wait for a background refresh to finish."""
+    analytics._refreshing[name].result(5)
+
+
+class TestPageRank:
+    """Tests for the pagerank function."""
+
+    def test_cycle_is_uniform(self):
+        """Test that a cycle ranks every node equally."""
+        scores = pagerank(['a', 'b', 'c'], [('a', 'b'), ('b', 'c'), ('c', 'a')])
+
+        assert all(abs(score - 1 / 3) < 1e-6 for score in scores.values())
+
+    def test_sink_ranks_highest(self):
+        """Test that links concentrate rank (dangling rank is redistributed)."""
+        scores = pagerank(['a', 'b', 'hub'], [('a', 'hub'), ('b', 'hub')])
+
+        assert max(scores, key=scores.get) == 'hub'
+        assert abs(sum(scores.values()) - 1) < 1e-9
+
+
+class TestGraphAnalytics:
+    """Tests for the GraphAnalytics class."""
+
+    def test_hubs_and_centrality(self):
+        """Test degree counters maintained from mutations."""
+        analytics = build(nx.DiGraph(), [('a', 'hub'), ('b', 'hub'), ('hub', 'c')])
+
+        hub = analytics.hubs(1)[0]
+        assert hub == {'id': 'hub', 'degree': 3, 'in_degree': 2, 'out_degree': 1}
+        assert analytics.degree_centrality(1)[0]['centrality'] == 1.0
+
+    def test_matches_networkx_degree_centrality(self):
+        """Test that centrality agrees with networkx."""
+        graph = nx.DiGraph()
+        analytics = build(graph, [('a', 'b'), ('b', 'c'), ('c', 'a'), ('a', 'd'), ('a', 'b')])
+        expected = nx.degree_centrality(graph)
+
+        for row in analytics.degree_centrality(10):
+            assert row['centrality'] == pytest.approx(expected[row['id']])
+
+    def test_hubs_track_mutations(self):
+        """Test that the degree buckets follow edges, self-loops and removals."""
+        graph = nx.DiGraph()
+        analytics = build(graph, [('a', 'hub'), ('b', 'hub'), ('c', 'hub'), ('hub', 'hub'), ('c', 'd')])
+        for node in ('hub', 'c'):
+            successors, predecessors = list(graph.successors(node)), list(graph.predecessors(node))
+            graph.remove_node(node)
+            analytics.remove_node(node, successors, predecessors)
+        analytics.add_node('e')
+        for target in ('a', 'b'):
+            graph.add_edge('e', target)
+            analytics.add_edge('e', target)
+
+        hubs = [(hub['id'], hub['degree']) for hub in analytics.hubs(10)]
+        assert hubs == [('e', 2), ('a', 1), ('b', 1), ('d', 0)]
+        assert analytics.hubs(2) == analytics.hubs(10)[:2]
+
+    def test_components_merge_incrementally(self):
+        """Test that edges join components."""
+        analytics = build(nx.DiGraph(), [('a', 'b'), ('c', 'd')])
+        assert analytics.components()['count'] == 2
+
+        analytics.add_edge('b', 'c')
+        result = analytics.components()
+
+        assert result['count'] == 1
+        assert result['components'][0]['size'] == 4
+        assert result['stale'] is False
+
+    def test_removal_rebuilds_components(self):
+        """Test that a removal splitting a component is rebuilt in the background."""
+        graph = nx.DiGraph()
+        analytics = build(graph, [('a', 'b'), ('b', 'c')])
+        successors, predecessors = list(graph.successors('b')), list(graph.predecessors('b'))
+        graph.remove_node('b')
+        analytics.remove_node('b', successors, predecessors)
+
+        assert analytics.components()['stale'] is True
+        wait(analytics, 'components')
+
+        result = analytics.components()
+        assert result['stale'] is False
+        assert result['count'] == 2
+        assert analytics.hubs(5)[0]['degree'] == 0
+
+    def test_pagerank_stale_while_revalidate(self):
+        """Test that changes are served stale until the refresh completes."""
+        graph = nx.DiGraph()
+        analytics = build(graph, [('a', 'hub'), ('b', 'hub')])
+
+        first = analytics.pagerank(1)
+        assert first['scores'][0]['id'] == 'hub'
+        assert first['stale'] is False
+
+        graph.add_edge('hub', 'z')
+        analytics.add_node('z')
+        analytics.add_edge('hub', 'z')
+        assert analytics.pagerank(1)['stale'] is True
+
+        wait(analytics, 'pagerank')
+        fresh = analytics.pagerank(1)
+        assert fresh['stale'] is False
+        assert fresh['scores'][0]['id'] == 'z'
+
+    def test_refresh_offloaded_under_eventlet(self, monkeypatch):
+        """Test that PageRank runs in eventlet's OS thread pool once threading is patched."""
+        from eventlet import patcher, tpool
+
+        offloaded = []
+        monkeypatch.setattr(patcher, 'is_monkey_patched', lambda module: module == 'thread')
+        monkeypatch.setattr(tpool, 'execute', lambda fn, *args: offloaded.append(fn) or fn(*args))
+        analytics = build(nx.DiGraph(), [('a', 'hub')])
+
+        assert analytics.pagerank(1)['scores'][0]['id'] == 'hub'
+        assert offloaded == [pagerank]
+
+    def test_rebuild(self):
+        """Test recomputation from a hydrated graph."""
+        graph = nx.DiGraph([('a', 'b'), ('c', 'b')])
+        analytics = GraphAnalytics(lambda: graph)
+        analytics.rebuild(graph)
+
+        assert analytics.hubs(1)[0]['id'] == 'b'
+        assert analytics.components()['count'] == 1
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client on a fresh graph with admin auth disabled."""
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    monkeypatch.delenv('JWT_SECRET', raising=False)
+    monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+    monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+    monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+    monkeypatch.setattr(omnitech_server, 'analytics', GraphAnalytics(lambda: omnitech_server.omni_graph))
+    with omnitech_server.app.test_client() as client:
+        yield client
+
+
+class TestAnalyticsEndpoints:
+    """Tests for the /admin/analytics endpoints."""
+
+    def test_mutations_feed_analytics(self, client):
+        """Test that the mutation path keeps the metrics current."""
+        for source in ('a', 'b', 'c'):
+            omnitech_server.apply_edge_mutation(source, 'hub', {}, persist=False)
+        omnitech_server.apply_edge_mutation('a', 'hub', {}, persist=False)
+        omnitech_server.remove_node_mutation('c', persist=False)
+
+        hubs = client.get('/admin/analytics/hubs?limit=1').get_json()['nodes']
+        assert hubs == [{'id': 'hub', 'degree': 2, 'in_degree': 2, 'out_degree': 0}]
+        assert client.get('/admin/analytics/degree?limit=1').get_json()['nodes'][0]['centrality'] == 1.0
+        assert client.get('/admin/analytics/components').get_json()['count'] >= 1
+
+    def test_pagerank(self, client):
+        """Test the PageRank endpoint."""
+        omnitech_server.apply_edge_mutation('a', 'hub', {}, persist=False)
+
+        body = client.get('/admin/analytics/pagerank?limit=1').get_json()
+
+        assert body['scores'][0]['id'] == 'hub'
+
+    def test_invalid_limit(self, client):
+        """Test limit validation."""
+        assert client.get('/admin/analytics/hubs?limit=0').status_code == 400
+        assert client.get('/admin/analytics/pagerank?limit=x').status_code == 400
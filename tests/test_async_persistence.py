@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Async Persistence Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests for AsyncOmnitechPersistence on the asyncio stand-in driver:
+method parity with the sync adapter, pipelined bulk writes, retries and
+the circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable, TransientError
+
+import omnitech_async_persistence
+from omnitech_async_persistence import AsyncOmnitechPersistence
+from omnitech_persistence import CircuitOpenError
+from tests.neo4j_stub import AsyncStubDriver
+from tests.test_persistence_delta import T0, respond as delta_respond
+
+
+@pytest.fixture
+def run_async(monkeypatch):
+    """Run a coroutine against an adapter connected to a stand-in driver."""
+
+    def runner(test, driver=None, **kwargs):
+        driver = driver or AsyncStubDriver()
+        monkeypatch.setattr(
+            omnitech_async_persistence.AsyncGraphDatabase, 'driver',
+            lambda *args, **config: driver
+        )
+
+        async def main():
+            kwargs.setdefault('health_interval', 0)
+            async with AsyncOmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub', **kwargs) as persist:
+                return await test(persist, driver)
+
+        return asyncio.run(main())
+
+    return runner
+
+
+def written(query, params):
+    """Responder that reports every UNWIND row as written."""
+    return [{'written': len(params['rows'])}] if 'rows' in params else []
+
+
+class TestMethods:
+    """Tests for the single-record and read methods."""
+
+    def test_save_node_and_edge(self, run_async):
+        """Test that attributes are encoded and each write commits."""
+        async def test(persist, driver):
+            assert await persist.save_node('a', {'tags': ['x'], 'size': 1}) is True
+            assert await persist.save_edge('a', 'b', {'relation': 'about'}) is True
+            return driver
+
+        driver = run_async(test)
+        assert driver.queries[0][1] == {
+            'node_id': 'a', 'attributes': {'tags': ['x'], 'size': 1}, 'roots': ['tags', 'size']
+        }
+        assert driver.queries[1][1]['source'] == 'a'
+        assert driver.commits == 2
+
+    def test_reads(self, run_async):
+        """Test get_all_nodes, get_all_edges and find_node_by_delivery."""
+        def respond(query, params):
+            if 'delivery_id' in params:
+                return [{'id': 'webhook_1'}]
+            if 'RETURN n' in query:
+                return [{'n': {'id': 'a', 'kind': 'repo'}}]
+            return [{'source': 'a', 'target': 'b', 'attrs': {'relation': 'about'}}]
+
+        async def test(persist, driver):
+            return (
+                await persist.get_all_nodes(),
+                await persist.get_all_edges(),
+                await persist.find_node_by_delivery('d-1')
+            )
+
+        nodes, edges, node_id = run_async(test, AsyncStubDriver(respond))
+        assert nodes == [{'id': 'a', 'kind': 'repo'}]
+        assert edges == [{'source': 'a', 'target': 'b', 'relation': 'about'}]
+        assert node_id == 'webhook_1'
+
+    def test_iter_nodes_pages(self, run_async):
+        """Test keyset pagination in the async generator."""
+        ids = [f'n{i}' for i in range(5)]
+
+        def respond(query, params):
+            after = [i for i in ids if i > params['after']]
+            return [{'id': i, 'props': {'id': i}} for i in after[:params['limit']]]
+
+        async def test(persist, driver):
+            return [node['id'] async for node in persist.iter_nodes(page_size=2)]
+
+        assert run_async(test, AsyncStubDriver(respond)) == ids
+
+    def test_nodes_since(self, run_async):
+        """Test the delta export generator against the sync adapter's fixture."""
+        async def test(persist, driver):
+            return [cursor async for cursor, _ in persist.iter_nodes_since('2024-01-01T00:00:02')]
+
+        assert run_async(test, AsyncStubDriver(delta_respond)) == [[T0 + 2000, 'webhook_c'], [T0 + 3000, 'repo:omni']]
+
+    def test_no_connection(self):
+        """Test that an unconnected adapter degrades like the sync one."""
+        async def test():
+            persist = AsyncOmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub')
+            return (
+                await persist.save_node('a', {}),
+                await persist.save_nodes_bulk([{'id': 'a'}, {'id': 'b'}], chunk_size=1),
+                [node async for node in persist.iter_nodes()]
+            )
+
+        assert asyncio.run(test()) == (False, [0, 0], [])
+
+
+class TestPipelinedBulk:
+    """Tests for concurrent bulk writes."""
+
+    def test_chunks_run_concurrently(self, run_async):
+        """Test that chunks overlap up to the concurrency limit and keep order."""
+        nodes = [{'id': f'n{i}'} for i in range(25)]
+
+        async def test(persist, driver):
+            return await persist.save_nodes_bulk(nodes, chunk_size=2)
+
+        driver = AsyncStubDriver(written)
+        counts = run_async(test, driver, concurrency=4)
+        assert counts == [2] * 12 + [1]
+        assert driver.max_in_flight == 4
+        assert driver.sessions == 13
+
+    def test_failed_chunk_isolated(self, run_async):
+        """Test that one failing chunk reports 0 without affecting the rest."""
+        def respond(query, params):
+            if params['rows'][0]['id'] == 'n2':
+                raise ValueError('constraint violation')
+            return written(query, params)
+
+        async def test(persist, driver):
+            return await persist.save_nodes_bulk([{'id': f'n{i}'} for i in range(6)], chunk_size=2)
+
+        driver = AsyncStubDriver(respond)
+        assert run_async(test, driver) == [2, 0, 2]
+        assert driver.rollbacks == 1
+
+    def test_duplicate_ids_merged_before_chunking(self, run_async):
+        """Test that repeated nodes and edges are written once, with the last attributes."""
+        async def test(persist, driver):
+            await persist.save_nodes_bulk([
+                {'id': 'a', 'kind': 'repo', 'stars': 1},
+                {'id': 'b'},
+                {'id': 'a', 'stars': 2}
+            ], chunk_size=1)
+            await persist.save_edges_bulk([
+                {'source': 'a', 'target': 'b', 'weight': 1},
+                {'source': 'a', 'target': 'b', 'weight': 2}
+            ])
+
+        driver = AsyncStubDriver(written)
+        run_async(test, driver)
+        node_rows = [row for _, params in driver.queries[:2] for row in params['rows']]
+        assert sorted((row['id'], row['attributes']) for row in node_rows) == [
+            ('a', {'kind': 'repo', 'stars': 2}), ('b', {})
+        ]
+        assert driver.queries[2][1]['rows'][0]['attributes'] == {'weight': 2}
+        assert len(driver.queries) == 3
+
+    def test_increment_counters(self, run_async):
+        """Test that increments are merged and added to current values."""
+        def respond(query, params):
+            if 'RETURN n.id' in query:
+                return [{'id': row['id'], 'props': {'count': 10}} for row in params['rows']]
+            return []
+
+        async def test(persist, driver):
+            return await persist.increment_counters_bulk([
+                {'id': 'm', 'attributes': {}, 'counts': {'count': 1}},
+                {'id': 'm', 'attributes': {}, 'counts': {'count': 2}}
+            ])
+
+        driver = AsyncStubDriver(respond)
+        assert run_async(test, driver) == [1]
+        assert driver.queries[-1][1]['rows'] == [{'id': 'm', 'counts': {'count': 13}}]
+
+
+class TestResilience:
+    """Tests for retries and the circuit breaker."""
+
+    def test_transient_error_retried(self, run_async):
+        """Test that a transient failure is retried and then succeeds."""
+        calls = []
+
+        def respond(query, params):
+            calls.append(query)
+            if len(calls) == 1:
+                raise TransientError('deadlock')
+            return []
+
+        async def test(persist, driver):
+            return await persist.save_node('a', {}), persist.health()['retries']
+
+        assert run_async(test, AsyncStubDriver(respond), retry_backoff=0) == (True, 1)
+
+    def test_circuit_opens_and_fails_fast(self, run_async):
+        """Test that lost connections open the circuit and later calls are refused."""
+        def respond(query, params):
+            raise ServiceUnavailable('connection reset')
+
+        async def test(persist, driver):
+            assert await persist.save_node('a', {}) is False
+            assert not persist.available()
+            sent = len(driver.queries)
+            with pytest.raises(CircuitOpenError):
+                await persist.execute_write(lambda tx: None)
+            return sent, len(driver.queries)
+
+        sent, after = run_async(test, AsyncStubDriver(respond), max_retries=0, failure_threshold=1, reset_timeout=60)
+        assert sent == after
+
+    def test_boot_outage_reconnects(self, monkeypatch):
+        """Test that without fail_fast the background probe reconnects."""
+        driver = AsyncStubDriver()
+        attempts = []
+
+        async def verify():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ServiceUnavailable('connection refused')
+
+        driver.verify_connectivity = verify
+        monkeypatch.setattr(
+            omnitech_async_persistence.AsyncGraphDatabase, 'driver',
+            lambda *args, **config: driver
+        )
+
+        async def test():
+            persist = AsyncOmnitechPersistence(
+                'bolt://stub:7687', 'neo4j', 'stub',
+                fail_fast=False, reset_timeout=0.01, health_interval=0.01
+            )
+            await persist.connect()
+            assert not persist.available()
+            for _ in range(100):
+                if persist.available():
+                    break
+                await asyncio.sleep(0.01)
+            connected = await persist.is_connected()
+            await persist.close()
+            return connected
+
+        assert asyncio.run(test()) is True
+        assert len(attempts) >= 2
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Admin Authentication Tests
+ScrollVerse Genesis Protocol - Security Tests
+
+Tests for the JWT key set and verified-token cache.
+"""
+
+import time
+
+import jwt
+import pytest
+
+import omnitech_auth
+from omnitech_auth import JWTVerifier, parse_keyset
+from omnitech_server import app
+
+
+class FakeClock:
+    """Manually advanced Unix clock."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count signature checks made by the verifier."""
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(omnitech_auth.jwt, 'decode', counting_decode)
+    return calls
+
+
+class TestJWTVerifier:
+    """Tests for the JWTVerifier class."""
+
+    def test_repeated_token_skips_signature_check(self, decode_calls):
+        """Test that a verified token is served from the cache."""
+        verifier = JWTVerifier('k' * 32)
+        token = jwt.encode({'user': 'admin'}, 'k' * 32, algorithm='HS256')
+
+        assert verifier.verify(token) is True
+        assert verifier.verify(token) is True
+        assert len(decode_calls) == 1
+        assert verifier.stats()['hits'] == 1
+
+    def test_cache_honors_exp(self, decode_calls):
+        """Test that a cached token is only trusted until its exp."""
+        clock = FakeClock(time.time())
+        verifier = JWTVerifier('k' * 32, clock=clock)
+        token = jwt.encode({'exp': int(clock.now) + 60}, 'k' * 32, algorithm='HS256')
+        verifier.verify(token)
+        verifier.verify(token)
+        assert len(decode_calls) == 1
+
+        clock.now += 61
+        verifier.verify(token)
+        assert len(decode_calls) == 2
+
+    def test_expired_token_rejected(self):
+        """Test that expired tokens are not accepted."""
+        verifier = JWTVerifier('k' * 32)
+        token = jwt.encode({'exp': int(time.time()) - 10}, 'k' * 32, algorithm='HS256')
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            verifier.verify(token)
+
+    def test_key_selected_by_kid(self):
+        """Test that tokens are verified with the key named by their kid."""
+        verifier = JWTVerifier(keys={'2026-01': 'a' * 32, '2026-02': 'b' * 32})
+        token = jwt.encode({}, 'b' * 32, algorithm='HS256', headers={'kid': '2026-02'})
+        wrong = jwt.encode({}, 'a' * 32, algorithm='HS256', headers={'kid': '2026-02'})
+        unknown = jwt.encode({}, 'a' * 32, algorithm='HS256', headers={'kid': 'old'})
+
+        assert verifier.verify(token) is True
+        with pytest.raises(jwt.InvalidSignatureError):
+            verifier.verify(wrong)
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(unknown)
+
+    def test_unknown_kid_uses_default_key(self):
+        """Test that a kid not in the key set falls back to the default key."""
+        verifier = JWTVerifier('s' * 32, keys={'2026-01': 'a' * 32})
+        token = jwt.encode({}, 's' * 32, algorithm='HS256', headers={'kid': 'issuer-default'})
+
+        assert verifier.verify(token) is True
+        assert JWTVerifier('s' * 32).verify(token) is True
+
+    def test_parse_keyset(self):
+        """Test the JWT_KEYS format."""
+        assert parse_keyset('a:one, b:two') == {'a': 'one', 'b': 'two'}
+        assert parse_keyset(None) == {}
+        with pytest.raises(ValueError):
+            parse_keyset('missing-key')
+        assert parse_keyset('missing-key, b:two', strict=False) == {'b': 'two'}
+
+
+class TestAdminKeySet:
+    """Tests for JWT_KEYS on admin endpoints."""
+
+    def test_kid_token_accepted_and_cached(self, monkeypatch, decode_calls):
+        """Test that admin endpoints accept key-set tokens and cache them."""
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setenv('JWT_KEYS', 'current:' + 'c' * 32)
+        token = jwt.encode({'user': 'admin'}, 'c' * 32, algorithm='HS256', headers={'kid': 'current'})
+        app.config['TESTING'] = True
+
+        with app.test_client() as client:
+            for _ in range(3):
+                response = client.get('/admin/status', headers={'Authorization': f'Bearer {token}'})
+                assert response.status_code == 200
+            assert client.get('/admin/status').status_code == 401
+
+        assert len(decode_calls) == 1
+
+    def test_malformed_keyset_ignored_per_request(self, monkeypatch):
+        """Test that a bad JWT_KEYS entry does not break admin token auth."""
+        monkeypatch.setenv('ADMIN_TOKEN', 'admin-token')
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setenv('JWT_KEYS', 'missing-key')
+        app.config['TESTING'] = True
+
+        with app.test_client() as client:
+            response = client.get('/admin/status', headers={'X-Admin-Token': 'admin-token'})
+
+        assert response.status_code == 200
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Circuit Breaker Tests
+ScrollVerse Genesis Protocol - Failure Isolation Tests
+
+Tests for the closed / open / half-open transitions and the reconnect
+backoff.
+"""
+
+from omnitech_circuit import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only an unbroken run of failures opens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=Clock())
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert breaker.allow() is False
+        assert breaker.stats()['rejected'] == 1
+
+    def test_half_open_single_trial(self):
+        """Test that one trial call is let through after the timeout."""
+        clock = Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=2, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 2
+        assert breaker.allow() is True
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        assert breaker.allow() is True
+
+    def test_failed_trial_doubles_backoff(self):
+        """Test exponential backoff up to the maximum."""
+        clock = Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1, max_reset_timeout=3, clock=clock)
+        breaker.trip()
+
+        for expected in (2, 3, 3):
+            clock.now += breaker.stats()['reset_timeout']
+            assert breaker.allow() is True
+            breaker.record_failure()
+            assert breaker.stats()['reset_timeout'] == expected
+
+        clock.now += 2.9
+        assert breaker.allow() is False
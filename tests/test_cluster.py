@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Cluster Bus Tests
+ScrollVerse Genesis Protocol - Multi-Worker Tests
+
+Tests for the graph change fan-out between workers, using the in-process
+broker as the message queue.
+"""
+
+import time
+from types import SimpleNamespace
+
+import networkx as nx
+import pytest
+
+import omnitech_cluster
+import omnitech_server
+from omnitech_cluster import LocalBroker, MutationBus, create_broker
+from omnitech_dedup import DeliveryCache
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+
+
+class TestMutationBus:
+    """Tests for the MutationBus class."""
+
+    def test_changes_reach_other_workers_only(self):
+        """Test that a worker does not receive its own changes."""
+        broker = LocalBroker()
+        a, b = MutationBus(broker, 'a'), MutationBus(broker, 'b')
+        received_a, received_b = [], []
+        a.start(received_a.append)
+        b.start(received_b.append)
+
+        a.publish('graph_updated', {'node_id': 'n1'}, [
+            {'action': 'node_added', 'node_id': 'n1', 'attributes': {}, 'revision': 7}
+        ])
+
+        assert received_a == []
+        assert received_b[0]['deltas'] == [{'action': 'node_added', 'node_id': 'n1', 'attributes': {}}]
+        assert b.stats()['received'] == 1
+
+    def test_failing_handler_is_counted(self):
+        """Test that a handler error does not propagate to the publisher."""
+        broker = LocalBroker()
+        a, b = MutationBus(broker, 'a'), MutationBus(broker, 'b')
+
+        def fail(message):
+            raise RuntimeError('boom')
+
+        b.start(fail)
+        a.publish('graph_delta', {}, [])
+
+        assert b.stats()['failed'] == 1
+
+    def test_lease_has_one_holder(self):
+        """Test that only one worker holds a lease until it expires."""
+        broker = LocalBroker()
+        a, b = MutationBus(broker, 'a'), MutationBus(broker, 'b')
+
+        assert a.acquire_lease('retention', 60) is True
+        assert b.acquire_lease('retention', 60) is False
+        assert a.acquire_lease('retention', 60) is True
+
+    def test_create_broker(self, monkeypatch):
+        """Test broker selection by URL."""
+        assert isinstance(create_broker(None), LocalBroker)
+        assert isinstance(create_broker('local://'), LocalBroker)
+        with pytest.raises(ValueError):
+            create_broker('amqp://queue')
+        monkeypatch.setattr(omnitech_cluster, 'redis', None)
+        with pytest.raises(RuntimeError):
+            create_broker('redis://localhost:6379/0')
+
+
+class FakePubSub:
+    """Redis pub/sub stand-in whose first connection drops."""
+
+    def __init__(self, client):
+        self.client = client
+        self.closed = False
+
+    def subscribe(self, channel):
+        self.client.subscriptions.append(channel)
+
+    def listen(self):
+        if len(self.client.subscriptions) == 1:
+            raise ConnectionError('connection reset by peer')
+        yield {'data': b'{"origin": "peer", "event": "graph_delta", "deltas": []}'}
+        while not self.closed:
+            time.sleep(0.01)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Redis client stand-in handing out FakePubSub instances."""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.pubsubs = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        self.pubsubs.append(FakePubSub(self))
+        return self.pubsubs[-1]
+
+    def close(self):
+        pass
+
+
+class TestRedisReconnect:
+    """Tests for the Redis listener surviving a lost connection."""
+
+    def test_resubscribes_and_resyncs(self, monkeypatch):
+        """Test that a dropped subscription is re-established and reported."""
+        client = FakeRedis()
+        monkeypatch.setattr(omnitech_cluster, 'redis', SimpleNamespace(
+            Redis=SimpleNamespace(from_url=lambda url: client)
+        ))
+        monkeypatch.setattr(omnitech_cluster, 'RECONNECT_BACKOFF', 0.01)
+        bus = MutationBus(create_broker('redis://stub:6379/0'), 'local')
+        received, resyncs = [], []
+        bus.start(received.append, on_resync=lambda: resyncs.append(1))
+
+        for _ in range(200):
+            if received:
+                break
+            time.sleep(0.01)
+        bus._broker.close()
+
+        assert client.subscriptions == [omnitech_cluster.CHANNEL] * 2
+        assert client.pubsubs[0].closed is True
+        assert received[0]['event'] == 'graph_delta'
+        assert resyncs == [1]
+        assert bus.stats()['resyncs'] == 1
+
+
+class TestServerFanOut:
+    """Tests for graph changes shared between server workers."""
+
+    @pytest.fixture
+    def peer(self, monkeypatch):
+        """A second worker attached to the server through a local broker."""
+        broker = LocalBroker()
+        monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+        monkeypatch.setattr(omnitech_server, 'deliveries', DeliveryCache())
+        monkeypatch.setattr(omnitech_server, 'cluster', MutationBus(broker, 'server'))
+        omnitech_server.cluster.start(omnitech_server.apply_cluster_change)
+        omnitech_server.app.config['TESTING'] = True
+
+        peer = MutationBus(broker, 'peer')
+        peer.received_messages = []
+        peer.start(peer.received_messages.append)
+        return peer
+
+    def test_local_webhook_published(self, peer):
+        """Test that a webhook handled here is published to other workers."""
+        with omnitech_server.app.test_client() as client:
+            response = client.post('/webhook', json={}, headers={'X-GitHub-Event': 'push'})
+
+        message = peer.received_messages[0]
+        assert message['event'] == 'webhook_received'
+        assert message['deltas'][0]['node_id'] == response.get_json()['node_id']
+        assert 'revision' not in message['deltas'][0]
+
+    def test_remote_change_applied_with_local_revision(self, peer):
+        """Test that remote changes update the graph and notify local clients."""
+        enqueued = omnitech_server.write_queue.metrics()['enqueued']
+        socket_client = omnitech_server.socketio.test_client(omnitech_server.app)
+        socket_client.get_received()
+        omnitech_server.graph_changes.record_node('local', {})
+
+        peer.publish('graph_updated', {'action': 'edge_added', 'source': 'a', 'target': 'b'}, [
+            {'action': 'edge_added', 'source': 'a', 'target': 'b', 'attributes': {}, 'revision': 50}
+        ])
+
+        assert omnitech_server.omni_graph.has_edge('a', 'b')
+        updates = [m['args'][0] for m in socket_client.get_received() if m['name'] == 'graph_updated']
+        assert updates[0]['revision'] == 2
+        assert updates[0]['source'] == 'a'
+        # The originating worker persists the change
+        assert omnitech_server.write_queue.metrics()['enqueued'] == enqueued
+        socket_client.disconnect()
+
+    def test_remote_removal(self, peer):
+        """Test that node removals are replayed."""
+        omnitech_server.apply_node_mutation('old', {}, persist=False)
+
+        peer.publish('graph_delta', {}, [{'action': 'node_removed', 'node_id': 'old'}])
+
+        assert 'old' not in omnitech_server.omni_graph
+
+    def test_remote_delivery_deduplicated(self, peer):
+        """Test that a retry of a delivery handled by another worker is ignored."""
+        peer.publish('webhook_received', {'event_type': 'push', 'node_id': 'webhook_X'}, [{
+            'action': 'node_added', 'node_id': 'webhook_X',
+            'attributes': {'event_type': 'push', 'delivery_id': 'd-1'}
+        }])
+
+        with omnitech_server.app.test_client() as client:
+            response = client.post(
+                '/webhook', json={},
+                headers={'X-GitHub-Event': 'push', 'X-GitHub-Delivery': 'd-1'}
+            )
+
+        assert response.get_json()['node_id'] == 'webhook_X'
+        assert response.get_json()['duplicate'] is True
+        assert omnitech_server.omni_graph.number_of_nodes() == 1
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Attribute Codec Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests that graph attributes map to storable Neo4j property values and
+decode back to the original values.
+"""
+
+from datetime import date, datetime, timezone
+
+from neo4j.time import DateTime
+
+from omnitech_codec import decode_properties, encode_attributes
+
+
+class TestEncode:
+    """Tests for encode_attributes."""
+
+    def test_native_values(self):
+        """Test that primitives, homogeneous lists and datetimes are kept native."""
+        when = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+        attrs = {'name': 'x', 'size': 3, 'ratio': 0.5, 'ok': True,
+                 'tags': ('a', 'b'), 'empty': [], 'at': when, 'day': date(2024, 1, 1)}
+
+        encoded = encode_attributes(attrs)
+
+        assert encoded == {**attrs, 'tags': ['a', 'b']}
+
+    def test_nested_dicts_flattened(self):
+        """Test that nested dictionaries become dotted property keys."""
+        encoded = encode_attributes({'repo': {'name': 'omni', 'owner': {'login': 'dev'}}})
+
+        assert encoded == {'repo.name': 'omni', 'repo.owner.login': 'dev'}
+
+    def test_json_fallback(self):
+        """Test that values Neo4j cannot store natively become compact JSON."""
+        encoded = encode_attributes({
+            'mixed': [1, 'a'],
+            'commits': [{'id': 1}],
+            'missing': None,
+            'huge': 2 ** 70,
+            'odd': {'a.b': 1},
+            'meta': {'labels': [1, 2.5]}
+        })
+
+        assert encoded == {
+            'mixed__json': '[1,"a"]',
+            'commits__json': '[{"id":1}]',
+            'missing__json': 'null',
+            'huge__json': str(2 ** 70),
+            'odd__json': '{"a.b":1}',
+            'meta.labels__json': '[1,2.5]'
+        }
+
+
+class TestDecode:
+    """Tests for decode_properties."""
+
+    def test_round_trip(self):
+        """Test that decoding reverses encoding."""
+        attrs = {
+            'name': 'x',
+            'tags': ['a', 'b'],
+            'repo': {'name': 'omni', 'owner': {'login': 'dev'}, 'topics': [1, 'a']},
+            'commits': [{'id': 1}],
+            'missing': None
+        }
+
+        assert decode_properties(encode_attributes(attrs)) == attrs
+
+    def test_driver_temporals(self):
+        """Test that neo4j.time values come back as Python datetimes."""
+        stored = DateTime(2024, 1, 1, 12, 30, 0, tzinfo=timezone.utc)
+
+        decoded = decode_properties({'at': stored, 'history': [stored]})
+
+        expected = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+        assert decoded == {'at': expected, 'history': [expected]}
+
+    def test_legacy_and_clashing_keys(self):
+        """Test that repr strings pass through and a scalar wins over a nested key."""
+        decoded = decode_properties({'repo.name': 'omni', 'repo': 'legacy', 'tags': "['x']"})
+
+        assert decoded == {'repo': 'legacy', 'repo.name': 'omni', 'tags': "['x']"}
+
+
+class TestPersistence:
+    """Tests for the codec in OmnitechPersistence."""
+
+    def test_nodes_written_and_read_typed(self, stub_persistence, stub_driver):
+        """Test that save_node encodes and iter_nodes decodes attributes."""
+        stub_persistence.save_node('a', {'repo': {'name': 'omni'}, 'labels': None})
+        stored = stub_driver.queries[0][1]['attributes']
+        stub_driver.responder = lambda query, params: [{'id': 'a', 'props': {'id': 'a', **stored}}]
+
+        assert stored == {'repo.name': 'omni', 'labels__json': 'null'}
+        assert list(stub_persistence.iter_nodes()) == [{'id': 'a', 'repo': {'name': 'omni'}, 'labels': None}]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Delivery Deduplication Tests
+ScrollVerse Genesis Protocol - Idempotency Tests
+
+Tests for the delivery-id dedup cache and idempotent webhook ingestion.
+"""
+
+import networkx as nx
+import pytest
+
+import neo4j_init
+import omnitech_server
+from omnitech_dedup import DeliveryCache
+from omnitech_graph_index import GraphIndex
+from tests.neo4j_stub import StubDriver
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeliveryCache:
+    """Tests for the DeliveryCache class."""
+
+    def test_remember_and_get(self):
+        """Test that a remembered delivery is returned and counted as a hit."""
+        cache = DeliveryCache()
+        assert cache.get('d1') is None
+        cache.remember('d1', {'node_id': 'n1'})
+
+        assert cache.get('d1') == {'node_id': 'n1'}
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_least_recently_used_evicted(self):
+        """Test that the cache stays within capacity."""
+        cache = DeliveryCache(capacity=2)
+        cache.remember('a', {})
+        cache.remember('b', {})
+        cache.get('a')
+        cache.remember('c', {})
+
+        assert cache.get('b') is None
+        assert cache.get('a') == {}
+        assert cache.stats()['size'] == 2
+
+    def test_entries_expire(self):
+        """Test that deliveries are forgotten after the TTL."""
+        clock = FakeClock()
+        cache = DeliveryCache(ttl=10, clock=clock)
+        cache.remember('a', {})
+        clock.now = 10
+
+        assert cache.get('a') is None
+        assert cache.stats()['size'] == 0
+
+    def test_claim_is_exclusive(self):
+        """Test that a claimed delivery is neither reclaimed nor reported as processed."""
+        cache = DeliveryCache()
+
+        assert cache.claim('a') == (True, None)
+        assert cache.claim('a') == (False, None)
+        assert cache.get('a') is None
+        assert cache.stats()['pending'] == 1
+
+        cache.remember('a', {'node_id': 'n1'})
+        assert cache.claim('a') == (False, {'node_id': 'n1'})
+        assert cache.stats()['pending'] == 0
+
+    def test_release_only_drops_claims(self):
+        """Test that release frees a claim but keeps a processed delivery."""
+        cache = DeliveryCache()
+        cache.claim('a')
+        cache.release('a')
+        assert cache.claim('a') == (True, None)
+
+        cache.remember('b', {})
+        cache.release('b')
+        assert cache.get('b') == {}
+
+
+class TestIdempotentWebhook:
+    """Tests for redelivered webhooks."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Test client with an empty graph, cache and no webhook secret."""
+        monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+        monkeypatch.delenv('OMNITECH_DEDUP_NEO4J', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        monkeypatch.setattr(omnitech_server, 'deliveries', DeliveryCache())
+        omnitech_server.app.config['TESTING'] = True
+        with omnitech_server.app.test_client() as client:
+            yield client
+
+    def post(self, client, delivery_id):
+        """Send a push webhook with a delivery id."""
+        return client.post(
+            '/webhook', json={},
+            headers={'X-GitHub-Event': 'push', 'X-GitHub-Delivery': delivery_id}
+        )
+
+    def test_retry_returns_cached_response(self, client):
+        """Test that a retry gets the original node id and adds nothing."""
+        first = self.post(client, 'abc').get_json()
+        socket_client = omnitech_server.socketio.test_client(omnitech_server.app)
+        socket_client.get_received()
+        revision = omnitech_server.graph_changes.revision
+
+        retry = self.post(client, 'abc')
+
+        assert retry.status_code == 200
+        assert retry.get_json()['node_id'] == first['node_id']
+        assert retry.get_json()['duplicate'] is True
+        assert omnitech_server.omni_graph.number_of_nodes() == 1
+        assert omnitech_server.graph_changes.revision == revision
+        assert socket_client.get_received() == []
+        socket_client.disconnect()
+
+    def test_distinct_deliveries_recorded(self, client):
+        """Test that different delivery ids create different nodes."""
+        self.post(client, 'a')
+        self.post(client, 'b')
+
+        assert omnitech_server.omni_graph.number_of_nodes() == 2
+
+    def test_retry_during_processing_rejected(self, client):
+        """Test that a retry of an in-flight delivery is not processed again."""
+        omnitech_server.deliveries.claim('busy')
+
+        response = self.post(client, 'busy')
+
+        assert response.status_code == 409
+        assert response.get_json()['duplicate'] is True
+        assert omnitech_server.omni_graph.number_of_nodes() == 0
+
+    def test_failed_delivery_released(self, client):
+        """Test that a delivery that failed processing can be retried."""
+        response = client.post(
+            '/webhook', data='{not json', content_type='application/json',
+            headers={'X-GitHub-Event': 'push', 'X-GitHub-Delivery': 'bad'}
+        )
+        assert response.status_code == 400
+        assert omnitech_server.deliveries.stats()['pending'] == 0
+
+        assert self.post(client, 'bad').status_code == 200
+        assert omnitech_server.omni_graph.number_of_nodes() == 1
+
+    def test_neo4j_lookup_on_cache_miss(self, client, monkeypatch, stub_persistence, stub_driver):
+        """Test that deliveries recorded by another worker are found in Neo4j."""
+        monkeypatch.setenv('OMNITECH_DEDUP_NEO4J', 'true')
+        monkeypatch.setattr(omnitech_server, 'get_persistence', lambda: stub_persistence)
+        stub_driver.responder = lambda query, params: (
+            [{'id': 'webhook_OTHER'}] if params.get('delivery_id') == 'seen' else []
+        )
+
+        response = self.post(client, 'seen')
+
+        assert response.get_json()['node_id'] == 'webhook_OTHER'
+        assert omnitech_server.omni_graph.number_of_nodes() == 0
+
+
+class TestDeliveryConstraint:
+    """Tests for the optional Neo4j delivery_id constraint."""
+
+    def run_init(self, monkeypatch, **kwargs):
+        """Run init_neo4j against the stand-in driver and return its queries."""
+        driver = StubDriver()
+        monkeypatch.setattr(neo4j_init.GraphDatabase, 'driver', lambda *args, **kw: driver)
+        assert neo4j_init.init_neo4j('bolt://stub:7687', 'neo4j', 'stub', **kwargs) is True
+        return ' '.join(query for query, _ in driver.queries)
+
+    def test_constraint_optional(self, monkeypatch):
+        """Test that the constraint is only created when requested."""
+        assert 'omninode_delivery_id_unique' not in self.run_init(monkeypatch)
+        assert 'omninode_delivery_id_unique' in self.run_init(monkeypatch, delivery_constraint=True)
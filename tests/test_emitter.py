@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Emit Coalescer Tests
+ScrollVerse Genesis Protocol - Broadcast Batching Tests
+
+Tests for coalesced graph broadcasts, client acknowledgements and the
+drop-to-snapshot path for lagging clients.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_emitter import EmitCoalescer
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+
+
+@pytest.fixture
+def emitter(monkeypatch):
+    """Coalescing emitter on a fresh graph (flushed explicitly by the tests)."""
+    changes = GraphChangeLog()
+    monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+    monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+    monkeypatch.setattr(omnitech_server, 'graph_changes', changes)
+    coalescer = EmitCoalescer(omnitech_server.socketio, lambda: omnitech_server.graph_changes,
+                              lambda: omnitech_server.omni_graph, interval=3600, max_lag=2)
+    monkeypatch.setattr(omnitech_server, 'emitter', coalescer)
+    return coalescer
+
+
+@pytest.fixture
+def subscriber(emitter):
+    """Socket.IO client subscribed to the graph."""
+    client = omnitech_server.socketio.test_client(omnitech_server.app)
+    client.emit('subscribe_graph')
+    client.get_received()
+    yield client
+    client.disconnect()
+
+
+def received(client, name):
+    """Get the payloads of one event type received by a test client."""
+    return [msg['args'][0] for msg in client.get_received() if msg['name'] == name]
+
+
+def add_node(node_id):
+    """Apply and announce a node mutation."""
+    delta = omnitech_server.apply_node_mutation(node_id, {}, persist=False)
+    omnitech_server.notify_clients('graph_updated', {'action': 'node_added', 'node_id': node_id}, [delta])
+
+
+class TestEmitCoalescer:
+    """Tests for the EmitCoalescer class."""
+
+    def test_events_coalesced_into_one_batch(self, emitter, subscriber):
+        """Test that several mutations produce a single batch."""
+        add_node('a')
+        add_node('b')
+        assert received(subscriber, 'graph_updated') == []
+
+        emitter.flush()
+
+        batches = received(subscriber, 'graph_updated_batch')
+        assert len(batches) == 1
+        assert batches[0]['from_revision'] == 0
+        assert batches[0]['revision'] == 2
+        assert [d['node_id'] for d in batches[0]['deltas']] == ['a', 'b']
+        assert [e['node_id'] for e in batches[0]['events']] == ['a', 'b']
+
+    def test_batches_continue_from_last_revision(self, emitter, subscriber):
+        """Test that consecutive batches cover adjacent revision ranges."""
+        add_node('a')
+        emitter.flush()
+        add_node('b')
+        emitter.flush()
+
+        batches = received(subscriber, 'graph_updated_batch')
+        assert [(b['from_revision'], b['revision']) for b in batches] == [(0, 1), (1, 2)]
+
+    def test_nothing_to_send(self, emitter, subscriber):
+        """Test that an idle tick emits nothing."""
+        assert emitter.flush() is None
+        assert received(subscriber, 'graph_updated_batch') == []
+
+    def test_unsubscribed_clients_not_sent_batches(self, emitter):
+        """Test that only subscribed clients receive batches."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.get_received()
+
+        add_node('a')
+        emitter.flush()
+
+        assert received(client, 'graph_updated_batch') == []
+        client.disconnect()
+
+    def test_unsubscribed_clients_sent_each_event(self, emitter, subscriber):
+        """Test that clients that never subscribed still get per-event emits."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.get_received()
+
+        add_node('a')
+
+        events = received(client, 'graph_updated')
+        assert [(e['node_id'], e['revision']) for e in events] == [('a', 1)]
+        assert received(subscriber, 'graph_updated') == []
+        assert emitter.stats()['direct_clients'] == 1
+        client.disconnect()
+        assert emitter.stats()['direct_clients'] == 0
+
+    def test_subscribing_stops_direct_events(self, emitter):
+        """Test that a client joining the broadcast no longer gets events twice."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.emit('subscribe_graph')
+        client.get_received()
+
+        add_node('a')
+        emitter.flush()
+
+        assert received(client, 'graph_updated') == []
+        assert emitter.stats()['direct_clients'] == 0
+        client.disconnect()
+
+    def test_lagging_client_dropped_to_snapshot(self, emitter, subscriber):
+        """Test that a client that does not acknowledge is resynced."""
+        for node_id in 'abc':
+            add_node(node_id)
+        emitter.flush()
+
+        assert received(subscriber, 'graph_resync') == [{'reason': 'lagging'}]
+        assert emitter.stats()['subscribers'] == 0
+        assert emitter.stats()['dropped_clients'] == 1
+
+        add_node('d')
+        emitter.flush()
+        assert received(subscriber, 'graph_updated_batch') == []
+
+    def test_acknowledging_client_kept(self, emitter, subscriber):
+        """Test that acknowledged revisions keep a client subscribed."""
+        add_node('a')
+        add_node('b')
+        emitter.flush()
+        subscriber.emit('graph_ack', {'revision': 2})
+        add_node('c')
+        add_node('d')
+        emitter.flush()
+
+        assert received(subscriber, 'graph_resync') == []
+        assert emitter.stats()['subscribers'] == 1
+
+    def test_reset_log_resyncs_subscribers(self, emitter, subscriber):
+        """Test that an invalidated change log sends every subscriber to a snapshot."""
+        add_node('a')
+        omnitech_server.graph_changes.invalidate()
+
+        emitter.flush()
+
+        assert received(subscriber, 'graph_resync') == [{'reason': 'reset'}]
+
+    def test_disconnect_forgets_client(self, emitter):
+        """Test that disconnected clients are no longer tracked."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.emit('subscribe_graph')
+        assert emitter.stats()['subscribers'] == 1
+
+        client.disconnect()
+        assert emitter.stats()['subscribers'] == 0
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Event Extractor Tests
+ScrollVerse Genesis Protocol - Ingestion Tests
+
+Tests for the per-event extractors and batched graph mutations.
+"""
+
+import json
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_extractors import EXTRACTORS, GraphBatch, extract, register
+from omnitech_graph_index import GraphIndex
+from omnitech_payload import WebhookPayload
+
+REPO = {'full_name': 'octo/repo'}
+SENDER = {'login': 'octocat'}
+
+
+def build(event_type, body):
+    """Extract the batch for a payload."""
+    payload = WebhookPayload(json.dumps(body).encode(), event_type)
+    attributes = {'event_type': event_type, **payload.summary()}
+    return extract(payload, 'webhook_1', attributes)
+
+
+class TestExtractors:
+    """Tests for the extractor registry."""
+
+    def test_push(self):
+        """Test that commits are linked to the repository and their authors."""
+        batch = build('push', {
+            'ref': 'refs/heads/main', 'repository': REPO, 'sender': SENDER,
+            'commits': [
+                {'id': 'abc', 'message': 'Fix bug\n\nDetails', 'author': {'username': 'dev'}},
+                {'id': 'def', 'message': 'Docs', 'author': {'name': 'No Login'}}
+            ]
+        })
+
+        assert batch.nodes['commit:abc']['message'] == 'Fix bug'
+        assert batch.edges[('commit:abc', 'repo:octo/repo')]['relation'] == 'belongs_to'
+        assert ('user:dev', 'commit:abc') in batch.edges
+        assert ('webhook_1', 'user:octocat') in batch.edges
+        assert not any(source == 'commit:def' and target.startswith('user:') for source, target in batch.edges)
+
+    def test_pull_request(self):
+        """Test the pull request node and its head commit."""
+        batch = build('pull_request', {
+            'action': 'opened', 'number': 7, 'repository': REPO, 'sender': SENDER,
+            'pull_request': {
+                'number': 7, 'title': 'Add feature', 'state': 'open',
+                'user': {'login': 'dev'}, 'head': {'ref': 'feature', 'sha': 'abc'}
+            }
+        })
+
+        assert batch.nodes['pr:octo/repo#7']['head_ref'] == 'feature'
+        assert ('pr:octo/repo#7', 'commit:abc') in batch.edges
+        assert ('user:dev', 'pr:octo/repo#7') in batch.edges
+
+    def test_issue_and_workflow_run(self):
+        """Test the issues and workflow_run extractors."""
+        issue = build('issues', {
+            'action': 'labeled', 'repository': REPO,
+            'issue': {'number': 3, 'title': 'Bug', 'labels': [{'name': 'bug'}]}
+        })
+        run = build('workflow_run', {
+            'action': 'completed', 'repository': REPO,
+            'workflow_run': {'id': 99, 'name': 'CI', 'conclusion': 'success', 'head_sha': 'abc'}
+        })
+
+        assert issue.nodes['issue:octo/repo#3']['labels'] == ['bug']
+        assert run.nodes['workflow_run:99']['conclusion'] == 'success'
+        assert ('workflow_run:99', 'commit:abc') in run.edges
+
+    def test_unregistered_event_links_repository(self):
+        """Test that other events are still linked to repository and sender."""
+        batch = build('star', {'repository': REPO, 'sender': SENDER})
+
+        assert set(batch.nodes) == {'webhook_1', 'repo:octo/repo', 'user:octocat'}
+
+    def test_register_custom_extractor(self, monkeypatch):
+        """Test that new event types can be registered."""
+        monkeypatch.setattr('omnitech_extractors.EXTRACTORS', dict(EXTRACTORS))
+
+        @register('release')
+        def extract_release(payload, webhook_node_id, batch):
+            batch.add_node('release:v1', kind='release')
+
+        assert 'release:v1' in build('release', {'repository': REPO}).nodes
+
+
+class TestSubgraphPersistence:
+    """Tests for writing a batch in one transaction."""
+
+    def test_save_subgraph_single_transaction(self, stub_persistence, stub_driver):
+        """Test that nodes and edges are written in one transaction."""
+        batch = GraphBatch()
+        batch.add_node('a', kind='x')
+        batch.add_node('b')
+        batch.add_edge('a', 'b', relation='r')
+
+        assert stub_persistence.save_subgraph(batch.node_rows(), batch.edge_rows()) is True
+        assert stub_driver.commits == 1
+        assert len(stub_driver.queries) == 2
+
+    def test_failed_subgraph_rolled_back(self, stub_persistence, stub_driver):
+        """Test that a failing edge write rolls back the nodes too."""
+        def fail_edges(query, params):
+            if 'CONNECTED' in query:
+                raise RuntimeError('constraint')
+            return []
+
+        stub_driver.responder = fail_edges
+        assert stub_persistence.save_subgraph([{'id': 'a'}], [{'source': 'a', 'target': 'a'}]) is False
+        assert stub_driver.commits == 0
+        assert stub_driver.rollbacks == 1
+
+
+class TestWebhookGraph:
+    """Tests for extracted structure in the server graph."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Test client with an empty graph and no webhook secret."""
+        monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        omnitech_server.app.config['TESTING'] = True
+        with omnitech_server.app.test_client() as client:
+            yield client
+
+    def test_push_becomes_one_batched_mutation(self, client):
+        """Test that a push adds its entities with a single queued write."""
+        enqueued = omnitech_server.write_queue.metrics()['enqueued']
+        socket_client = omnitech_server.socketio.test_client(omnitech_server.app)
+        socket_client.get_received()
+
+        response = client.post('/webhook', headers={'X-GitHub-Event': 'push'}, json={
+            'ref': 'refs/heads/main', 'repository': REPO, 'sender': SENDER,
+            'commits': [{'id': f'c{i}', 'author': {'username': 'dev'}} for i in range(20)]
+        })
+
+        graph = omnitech_server.omni_graph
+        node_id = response.get_json()['node_id']
+        assert graph.has_edge(node_id, 'repo:octo/repo')
+        assert graph.in_degree('repo:octo/repo') == 21
+        assert omnitech_server.write_queue.metrics()['enqueued'] == enqueued + 1
+
+        message = [m['args'][0] for m in socket_client.get_received() if m['name'] == 'webhook_received'][0]
+        assert message['delta']['node_id'] == node_id
+        assert len(message['deltas']) == len(graph) + graph.number_of_edges()
+        socket_client.disconnect()
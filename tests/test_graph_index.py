@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Index Tests
+ScrollVerse Genesis Protocol - Secondary Index Tests
+
+Tests for the event_type and timestamp indexes and the admin query
+endpoint.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_graph_index import GraphIndex
+
+
+def ts(minute):
+    """Timestamp for a minute of 2026-01-01."""
+    return f'2026-01-01T00:{minute:02d}:00+00:00'
+
+
+@pytest.fixture
+def index():
+    """Index over a few push and issues nodes."""
+    idx = GraphIndex()
+    for minute in range(6):
+        event_type = 'push' if minute % 2 == 0 else 'issues'
+        idx.index_node(f'n{minute}', {'event_type': event_type, 'timestamp': ts(minute)})
+    return idx
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fresh graph and index installed on the server."""
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    monkeypatch.delenv('JWT_SECRET', raising=False)
+    monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+    monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+    omnitech_server.app.config['TESTING'] = True
+    with omnitech_server.app.test_client() as client:
+        yield client
+
+
+class TestGraphIndex:
+    """Tests for the GraphIndex class."""
+
+    def test_equality_lookup(self, index):
+        """Test the event_type hash index."""
+        assert index.by_event_type('push') == {'n0', 'n2', 'n4'}
+        assert index.by_event_type('missing') == set()
+
+    def test_time_range(self, index):
+        """Test that time ranges are half-open and ordered."""
+        assert index.time_range(ts(1), ts(4)) == ['n1', 'n2', 'n3']
+        assert index.time_range(ts(1), ts(4), event_types=['push']) == ['n2']
+        assert index.time_range(since=ts(3), limit=2) == ['n3', 'n4']
+
+    def test_multiple_event_types_merged_in_time_order(self, index):
+        """Test that per-type ranges are merged chronologically."""
+        assert index.time_range(ts(0), ts(4), event_types=['issues', 'push']) == ['n0', 'n1', 'n2', 'n3']
+
+    def test_update_moves_node(self, index):
+        """Test that re-indexing a node replaces its old entries."""
+        index.index_node('n0', {'event_type': 'issues', 'timestamp': ts(9)})
+
+        assert 'n0' not in index.by_event_type('push')
+        assert index.time_range(since=ts(6)) == ['n0']
+        assert index.time_range(until=ts(1)) == []
+
+    def test_out_of_order_insert(self, index):
+        """Test that a late timestamp is inserted in place, not appended."""
+        index.index_node('late', {'event_type': 'push', 'timestamp': ts(2)})
+
+        assert index.time_range(ts(2), ts(3)) == ['late', 'n2']
+        assert index.time_range(event_types=['push']) == ['n0', 'late', 'n2', 'n4']
+
+    def test_remove_node(self, index):
+        """Test that removed nodes leave every index."""
+        index.remove_node('n1')
+
+        assert index.by_event_type('issues') == {'n3', 'n5'}
+        assert 'n1' not in index.time_range()
+        assert index.stats()['indexed_nodes'] == 5
+
+    def test_rebuild(self):
+        """Test rebuilding from a graph."""
+        g = nx.DiGraph()
+        g.add_node('c', event_type='push', timestamp=ts(2))
+        g.add_node('a', event_type='push', timestamp=ts(1))
+        g.add_node('b')
+        idx = GraphIndex()
+        idx.rebuild(g)
+
+        assert idx.stats()['indexed_nodes'] == 3
+        assert sorted(idx.candidates(event_types=['push'])) == ['a', 'c']
+        assert idx.time_range(event_types=['push']) == ['a', 'c']
+        assert idx.candidates() is None
+
+    def test_event_type_candidates_oldest_first(self):
+        """Test that event-type candidates follow timestamps, untimed nodes last."""
+        idx = GraphIndex()
+        idx.index_node('late', {'event_type': 'push', 'timestamp': ts(5)})
+        idx.index_node('untimed', {'event_type': 'push'})
+        idx.index_node('early', {'event_type': 'push', 'timestamp': ts(1)})
+        idx.index_node('issue', {'event_type': 'issues', 'timestamp': ts(3)})
+
+        assert idx.candidates(event_types=['push']) == ['early', 'late', 'untimed']
+        assert idx.candidates(event_types=['push', 'issues'], limit=2) == ['early', 'issue']
+        assert idx.candidates(event_types=['push'], limit=3) == ['early', 'late', 'untimed']
+
+        idx.index_node('untimed', {'event_type': 'push', 'timestamp': ts(0)})
+        idx.remove_node('late')
+        assert idx.candidates(event_types=['push']) == ['untimed', 'early']
+
+
+class TestQueryEndpoint:
+    """Tests for /admin/graph/query."""
+
+    def test_mutations_are_indexed(self, server):
+        """Test that nodes added through the API are queryable."""
+        for minute in range(3):
+            server.post('/admin/graph/node', json={
+                'id': f'n{minute}',
+                'attributes': {'event_type': 'push', 'timestamp': ts(minute)}
+            })
+        server.post('/admin/graph/edge', json={'source': 'n0', 'target': 'orphan'})
+
+        data = server.get(
+            '/admin/graph/query',
+            query_string={'event_type': 'push', 'since': ts(1)}
+        ).get_json()
+
+        assert [n['id'] for n in data['nodes']] == ['n1', 'n2']
+        assert server.get('/admin/graph/index').get_json()['indexed_nodes'] == 4
+
+    def test_event_type_limit_returns_oldest(self, server):
+        """Test that limit with only an event type returns the oldest nodes."""
+        for minute in (4, 2, 0, 3, 1):
+            server.post('/admin/graph/node', json={
+                'id': f'n{minute}',
+                'attributes': {'event_type': 'push', 'timestamp': ts(minute)}
+            })
+
+        data = server.get(
+            '/admin/graph/query',
+            query_string={'event_type': 'push', 'limit': 2}
+        ).get_json()
+
+        assert [n['id'] for n in data['nodes']] == ['n0', 'n1']
+
+    def test_filter_required(self, server):
+        """Test that an unfiltered query is rejected."""
+        assert server.get('/admin/graph/query').status_code == 400
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Query Tests
+ScrollVerse Genesis Protocol - Admin API Tests
+
+Tests for pagination, filtering, projection and NDJSON streaming on
+/admin/graph.
+"""
+
+import json
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_query import GraphQuery, select_page
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """Small graph installed as the server graph."""
+    g = nx.DiGraph()
+    for i in range(6):
+        g.add_node(
+            f'n{i}',
+            event_type='push' if i % 2 == 0 else 'issues',
+            timestamp=f'2026-01-01T00:0{i}:00+00:00',
+            payload_size=i * 100
+        )
+    for i in range(5):
+        g.add_edge(f'n{i}', f'n{i + 1}', weight=i)
+    index = GraphIndex()
+    index.rebuild(g)
+    monkeypatch.setattr(omnitech_server, 'omni_graph', g)
+    monkeypatch.setattr(omnitech_server, 'graph_index', index)
+    return g
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with admin auth disabled."""
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    monkeypatch.delenv('JWT_SECRET', raising=False)
+    omnitech_server.app.config['TESTING'] = True
+    with omnitech_server.app.test_client() as client:
+        yield client
+
+
+class TestSelectPage:
+    """Tests for select_page."""
+
+    def test_pages_cover_graph_exactly_once(self, graph):
+        """Test that walking the cursor visits every node and edge once."""
+        nodes, edges, cursor = [], [], None
+        while True:
+            page = select_page(graph, GraphQuery(limit=4, cursor=cursor))
+            nodes.extend(n['id'] for n in page.iter_nodes())
+            edges.extend((e['source'], e['target']) for e in page.iter_edges())
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert sorted(nodes) == sorted(graph.nodes)
+        assert sorted(edges) == sorted(graph.edges)
+
+    def test_filter_returns_induced_subgraph(self, graph):
+        """Test that edges are limited to those between matching nodes."""
+        graph.add_edge('n0', 'n2')
+        page = select_page(graph, GraphQuery(event_types=['push']))
+
+        assert [n['id'] for n in page.iter_nodes()] == ['n0', 'n2', 'n4']
+        assert [(e['source'], e['target']) for e in page.iter_edges()] == [('n0', 'n2')]
+
+    def test_time_range(self, graph):
+        """Test that since is inclusive and until is exclusive."""
+        query = GraphQuery(since='2026-01-01T00:01:00Z', until='2026-01-01T00:03:00+00:00')
+        page = select_page(graph, query)
+
+        assert [n['id'] for n in page.iter_nodes()] == ['n1', 'n2']
+
+    def test_projection(self, graph):
+        """Test that only requested fields are returned."""
+        page = select_page(graph, GraphQuery(fields=['event_type']))
+
+        assert next(page.iter_nodes()) == {'id': 'n0', 'event_type': 'push'}
+        assert next(page.iter_edges()) == {'source': 'n0', 'target': 'n1'}
+
+
+class TestGraphEndpoint:
+    """Tests for the /admin/graph endpoint."""
+
+    def test_legacy_response_unchanged(self, client, graph):
+        """Test that a request without parameters returns the full graph."""
+        data = client.get('/admin/graph').get_json()
+
+        assert len(data['nodes']) == 6
+        assert len(data['edges']) == 5
+        assert data['node_count'] == 6
+        assert 'next_cursor' not in data
+
+    def test_paginated_response(self, client, graph):
+        """Test that a limited request returns a cursor."""
+        data = client.get('/admin/graph?limit=2&event_type=push&fields=timestamp').get_json()
+
+        assert data['nodes'] == [
+            {'id': 'n0', 'timestamp': '2026-01-01T00:00:00+00:00'},
+            {'id': 'n2', 'timestamp': '2026-01-01T00:02:00+00:00'}
+        ]
+        next_page = client.get(
+            f"/admin/graph?limit=2&event_type=push&cursor={data['next_cursor']}"
+        ).get_json()
+        assert [n['id'] for n in next_page['nodes']] == ['n4']
+
+    def test_invalid_parameters(self, client, graph):
+        """Test that malformed parameters are rejected."""
+        assert client.get('/admin/graph?limit=zero').status_code == 400
+        assert client.get('/admin/graph?cursor=garbage').status_code == 400
+        assert client.get('/admin/graph?since=yesterday').status_code == 400
+
+    def test_ndjson_stream(self, client, graph):
+        """Test that NDJSON responses stream one record per line."""
+        response = client.get('/admin/graph?format=ndjson&event_type=issues')
+
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [line['type'] for line in lines] == ['node', 'node', 'node', 'meta']
+        assert lines[-1]['node_count'] == 6
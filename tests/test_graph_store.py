@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Compact Graph Store Tests
+ScrollVerse Genesis Protocol - Graph Backend Tests
+
+Tests that CompactDiGraph behaves like networkx.DiGraph for the operations
+the server relies on, across compactions and conversions.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_analytics import GraphAnalytics
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_store import CompactDiGraph, create_graph
+from omnitech_graph_sync import GraphChangeLog
+
+
+def populate(graph):
+    """Apply the same mutations to any graph backend."""
+    graph.add_node('a', kind='webhook', size=1)
+    graph.add_node('a', size=2)
+    graph.add_edge('a', 'b', relation='about')
+    graph.add_edge('c', 'b')
+    graph.add_edge('b', 'd', weight=3)
+    graph.add_edge('a', 'b', seen=True)
+    graph.add_edge('d', 'a')
+    graph.remove_node('c')
+    return graph
+
+
+def same(compact, reference):
+    """Assert that two graphs hold the same nodes, edges and attributes."""
+    assert dict(compact.nodes(data=True)) == dict(reference.nodes(data=True))
+    assert {(u, v): d for u, v, d in compact.edges(data=True)} == \
+        {(u, v): d for u, v, d in reference.edges(data=True)}
+    assert compact.number_of_nodes() == reference.number_of_nodes()
+    assert compact.number_of_edges() == reference.number_of_edges()
+    for node in reference.nodes():
+        assert sorted(compact.successors(node)) == sorted(reference.successors(node))
+        assert sorted(compact.predecessors(node)) == sorted(reference.predecessors(node))
+        assert compact.in_degree(node) == reference.in_degree(node)
+        assert compact.out_degree(node) == reference.out_degree(node)
+
+
+class TestCompactDiGraph:
+    """Tests for the CompactDiGraph class."""
+
+    def test_matches_digraph(self):
+        """Test parity with networkx after adds, merges and removals."""
+        compact, reference = populate(CompactDiGraph()), populate(nx.DiGraph())
+
+        same(compact, reference)
+        assert compact.nodes['a'] == {'kind': 'webhook', 'size': 2}
+        assert compact.edges['a', 'b'] == {'relation': 'about', 'seen': True}
+        assert compact.has_edge('d', 'a') and not compact.has_edge('a', 'd')
+        assert 'c' not in compact and not compact.has_node('c')
+
+    def test_compaction_preserves_graph(self):
+        """Test that compacting (repeatedly) keeps data and lookups intact."""
+        compact = CompactDiGraph(compact_ratio=0, min_garbage=2)
+        reference = nx.DiGraph()
+        for graph in (compact, reference):
+            for i in range(20):
+                graph.add_edge(f'n{i}', f'n{(i * 7) % 20}', i=i)
+            graph.remove_node('n3')
+            graph.remove_edge('n4', 'n8')
+            graph.add_edge('n3', 'n4', back=True)
+
+        assert compact.compactions > 1
+        same(compact, reference)
+        assert compact.edges['n3', 'n4'] == {'back': True}
+
+    def test_edge_lookup_across_base_and_tail(self):
+        """Test edges added after a compaction next to compacted ones."""
+        compact = CompactDiGraph.from_networkx(nx.DiGraph([('a', 'b'), ('a', 'c')]))
+        compact.add_edge('a', 'd')
+
+        assert sorted(compact.successors('a')) == ['b', 'c', 'd']
+        assert compact.out_edges(['a', 'missing']) == [('a', 'b'), ('a', 'c'), ('a', 'd')]
+        assert compact.in_edges(['d']) == [('a', 'd')]
+
+    def test_missing_node_errors(self):
+        """Test the networkx errors for unknown nodes and edges."""
+        compact = CompactDiGraph()
+
+        with pytest.raises(nx.NetworkXError):
+            compact.remove_node('x')
+        with pytest.raises(nx.NetworkXError):
+            compact.remove_edge('x', 'y')
+        with pytest.raises(KeyError):
+            compact.edges['x', 'y']
+
+    def test_networkx_round_trip(self):
+        """Test conversion to and from networkx."""
+        reference = populate(nx.DiGraph())
+        compact = CompactDiGraph.from_networkx(reference)
+
+        same(compact, reference)
+        same(compact.to_networkx(), reference)
+
+    def test_create_graph(self):
+        """Test backend selection by name."""
+        assert isinstance(create_graph(None), nx.DiGraph)
+        assert isinstance(create_graph('Compact'), CompactDiGraph)
+        with pytest.raises(ValueError):
+            create_graph('bogus')
+
+
+class TestServerBackend:
+    """Tests for the server mutation path on the compact backend."""
+
+    def test_mutations(self, monkeypatch):
+        """Test node, edge, counter and removal mutations."""
+        graph = CompactDiGraph()
+        monkeypatch.setattr(omnitech_server, 'omni_graph', graph)
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+        monkeypatch.setattr(omnitech_server, 'analytics', GraphAnalytics(lambda: graph))
+
+        omnitech_server.apply_edge_mutation('a', 'hub', {'relation': 'about'}, persist=False)
+        omnitech_server.apply_edge_mutation('b', 'hub', {}, persist=False)
+        omnitech_server.remove_node_mutation('a', persist=False)
+
+        assert list(graph.predecessors('hub')) == ['b']
+        hubs = {hub['id']: hub for hub in omnitech_server.analytics.hubs(2)}
+        assert hubs['hub'] == {'id': 'hub', 'degree': 1, 'in_degree': 1, 'out_degree': 0}
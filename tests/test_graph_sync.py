@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Sync Tests
+ScrollVerse Genesis Protocol - Delta Sync Tests
+
+Tests for graph revisions, the delta ring buffer and incremental
+Socket.IO subscriptions.
+"""
+
+import pytest
+
+import omnitech_server
+from omnitech_graph_sync import GraphChangeLog
+
+
+@pytest.fixture
+def changes(monkeypatch):
+    """Fresh change log installed on the server."""
+    log = GraphChangeLog(capacity=3)
+    monkeypatch.setattr(omnitech_server, 'graph_changes', log)
+    return log
+
+
+@pytest.fixture
+def sio_client():
+    """Socket.IO test client."""
+    client = omnitech_server.socketio.test_client(omnitech_server.app)
+    client.get_received()
+    yield client
+    client.disconnect()
+
+
+def received(client, name):
+    """Get the payloads of one event type received by a test client."""
+    return [msg['args'][0] for msg in client.get_received() if msg['name'] == name]
+
+
+class TestGraphChangeLog:
+    """Tests for the GraphChangeLog class."""
+
+    def test_revisions_increase(self):
+        """Test that every recorded delta gets the next revision."""
+        log = GraphChangeLog()
+        assert log.record_node('a', {})['revision'] == 1
+        assert log.record_edge('a', 'b', {})['revision'] == 2
+        assert log.revision == 2
+
+    def test_since_returns_missing_deltas(self):
+        """Test that only deltas after the given revision are replayed."""
+        log = GraphChangeLog()
+        for node_id in 'abc':
+            log.record_node(node_id, {})
+
+        assert [d['node_id'] for d in log.since(1)] == ['b', 'c']
+        assert log.since(3) == []
+
+    def test_rolled_over_buffer_requires_snapshot(self):
+        """Test that evicted revisions fall back to a snapshot."""
+        log = GraphChangeLog(capacity=2)
+        for node_id in 'abcd':
+            log.record_node(node_id, {})
+
+        assert log.since(1) is None
+        assert [d['node_id'] for d in log.since(2)] == ['c', 'd']
+
+    def test_foreign_epoch_or_future_revision(self):
+        """Test that revisions from another epoch or the future are rejected."""
+        log = GraphChangeLog()
+        log.record_node('a', {})
+
+        assert log.since(0, epoch='other') is None
+        assert log.since(5) is None
+
+    def test_invalidate_forces_snapshot(self):
+        """Test that invalidate drops replayable history."""
+        log = GraphChangeLog()
+        log.record_node('a', {})
+        log.invalidate()
+
+        assert log.since(1) is None
+        assert log.since(log.revision) == []
+
+
+class TestSubscribeGraph:
+    """Tests for incremental subscribe_graph."""
+
+    def test_subscribe_without_revision_gets_snapshot(self, changes, sio_client):
+        """Test that a new subscriber receives a full snapshot."""
+        sio_client.emit('subscribe_graph')
+
+        [state] = received(sio_client, 'graph_state')
+        assert state['epoch'] == changes.epoch
+        assert state['revision'] == changes.revision
+
+    def test_subscribe_since_revision_gets_deltas(self, changes, sio_client):
+        """Test that a reconnecting subscriber receives only missing deltas."""
+        changes.record_node('sync_a', {})
+        changes.record_node('sync_b', {'k': 1})
+
+        sio_client.emit('subscribe_graph', {'since_revision': 1, 'epoch': changes.epoch})
+
+        [delta] = received(sio_client, 'graph_delta')
+        assert delta['revision'] == 2
+        assert delta['deltas'] == [
+            {'action': 'node_added', 'node_id': 'sync_b', 'attributes': {'k': 1}, 'revision': 2}
+        ]
+
+    def test_subscribe_after_rollover_gets_snapshot(self, changes, sio_client):
+        """Test that a subscriber behind the buffer receives a snapshot."""
+        for i in range(5):
+            changes.record_node(f'sync_{i}', {})
+
+        sio_client.emit('subscribe_graph', {'since_revision': 0, 'epoch': changes.epoch})
+
+        names = [msg['name'] for msg in sio_client.get_received()]
+        assert names == ['graph_state']
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Hydration Tests
+ScrollVerse Genesis Protocol - Warm-Start Tests
+
+Tests for keyset-paginated streaming and startup graph hydration.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_hydration import HydrationState, hydrate_graph, STATUS_FAILED, STATUS_READY
+
+
+NODES = [{'id': f'n{i:03d}', 'event_type': 'push'} for i in range(25)]
+EDGES = [{'source': f'n{i:03d}', 'target': f'n{i + 1:03d}', 'weight': i} for i in range(24)]
+
+
+def paging_responder(query, params):
+    """Serve NODES/EDGES by keyset the way Neo4j would."""
+    limit = params['limit']
+    if 'after_source' in params:
+        key = (params['after_source'], params['after_target'])
+        page = [e for e in EDGES if (e['source'], e['target']) > key][:limit]
+        return [
+            {'source': e['source'], 'target': e['target'], 'attrs': {'weight': e['weight']}}
+            for e in page
+        ]
+    page = [n for n in NODES if n['id'] > params['after']][:limit]
+    return [{'id': n['id'], 'props': dict(n)} for n in page]
+
+
+class FakePersistence:
+    """Stand-in persistence exposing the streaming API."""
+
+    def __init__(self, nodes, edges, fail=False):
+        self.nodes = nodes
+        self.edges = edges
+        self.fail = fail
+
+    def iter_nodes(self, page_size):
+        for node in self.nodes:
+            yield dict(node)
+        if self.fail:
+            raise RuntimeError('connection reset')
+
+    def iter_edges(self, page_size):
+        for edge in self.edges:
+            yield dict(edge)
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app."""
+    omnitech_server.app.config['TESTING'] = True
+    with omnitech_server.app.test_client() as client:
+        yield client
+
+
+class TestStreamingPaging:
+    """Tests for iter_nodes and iter_edges."""
+
+    def test_iter_nodes_pages_by_id(self, stub_persistence, stub_driver):
+        """Test that nodes are fetched page by page after the last id."""
+        stub_driver.responder = paging_responder
+
+        nodes = list(stub_persistence.iter_nodes(page_size=10))
+
+        assert [n['id'] for n in nodes] == [n['id'] for n in NODES]
+        assert [q[1]['after'] for q in stub_driver.queries] == ['', 'n009', 'n019']
+
+    def test_iter_edges_pages_by_pair(self, stub_persistence, stub_driver):
+        """Test that edges resume after the last (source, target) pair."""
+        stub_driver.responder = paging_responder
+
+        edges = list(stub_persistence.iter_edges(page_size=10))
+
+        assert edges == EDGES
+        assert len(stub_driver.queries) == 3
+        assert stub_driver.queries[1][1]['after_source'] == 'n009'
+
+
+class TestHydrateGraph:
+    """Tests for hydrate_graph."""
+
+    def test_graph_matches_persisted_state(self):
+        """Test that hydration loads every node and edge."""
+        graph = nx.DiGraph()
+        progress = []
+
+        state = hydrate_graph(
+            graph, FakePersistence(NODES, EDGES), page_size=10,
+            progress=lambda n, e: progress.append((n, e))
+        )
+
+        assert state.status == STATUS_READY
+        assert state.is_ready()
+        assert graph.number_of_nodes() == 25
+        assert graph.number_of_edges() == 24
+        assert graph.edges['n000', 'n001']['weight'] == 0
+        assert progress[-1] == (25, 24)
+
+    def test_in_memory_attributes_win(self):
+        """Test that live mutations are not overwritten by persisted state."""
+        graph = nx.DiGraph()
+        graph.add_node('n000', event_type='issues')
+
+        hydrate_graph(graph, FakePersistence(NODES, []))
+
+        assert graph.nodes['n000']['event_type'] == 'issues'
+
+    def test_failure_still_releases_gate(self):
+        """Test that a failed hydration reports the error and unblocks readers."""
+        state = hydrate_graph(nx.DiGraph(), FakePersistence(NODES, [], fail=True))
+
+        assert state.status == STATUS_FAILED
+        assert 'connection reset' in state.error
+        assert state.is_ready()
+
+
+class TestReadinessGate:
+    """Tests for the server readiness gate."""
+
+    def test_ready_endpoint(self, client):
+        """Test that /ready reports ready when hydration is off."""
+        response = client.get('/ready')
+
+        assert response.status_code == 200
+        assert response.get_json()['ready'] is True
+
+    def test_graph_read_blocked_while_hydrating(self, client, monkeypatch):
+        """Test that graph reads return 503 until hydration finishes."""
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'hydration', HydrationState())
+
+        assert client.get('/ready').status_code == 503
+        assert client.get('/admin/graph').status_code == 503
+
+        omnitech_server.hydration.mark_ready()
+        assert client.get('/admin/graph').status_code == 200
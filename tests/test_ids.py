@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Node Identifier Tests
+ScrollVerse Genesis Protocol - Identifier Tests
+
+Tests for the sortable compact id generator and webhook node ids.
+"""
+
+import threading
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_graph_index import GraphIndex
+from omnitech_ids import (
+    ENCODED_LENGTH, EPOCH_MS, MAX_SEQUENCE, IdGenerator, decode_id, encode_id, split_id
+)
+
+
+class FrozenClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self):
+        return self.seconds
+
+
+class TestIdGenerator:
+    """Tests for the IdGenerator class."""
+
+    def test_encoding_round_trip(self):
+        """Test that encoded ids decode to the same value and keep their order."""
+        values = [0, 1, 31, 32, 2 ** 40, 2 ** 63 - 1]
+        encoded = [encode_id(v) for v in values]
+
+        assert [decode_id(e) for e in encoded] == values
+        assert encoded == sorted(encoded)
+        assert all(len(e) == ENCODED_LENGTH for e in encoded)
+
+    def test_invalid_encoding(self):
+        """Test that malformed ids are rejected."""
+        with pytest.raises(ValueError):
+            decode_id('not-an-id')
+
+    def test_same_millisecond_burst_is_unique_and_ordered(self):
+        """Test that ids within one millisecond use the sequence."""
+        gen = IdGenerator(worker_id=7, clock=FrozenClock(1800000000.0))
+        ids = [gen.next_int() for _ in range(MAX_SEQUENCE + 10)]
+
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+        millis, worker_id, sequence = split_id(ids[0])
+        assert (millis, worker_id, sequence) == (1800000000000, 7, 0)
+        # Sequence overflow borrows the next millisecond
+        assert split_id(ids[-1])[0] == 1800000000001
+
+    def test_clock_going_backwards(self):
+        """Test that ids keep increasing if the clock steps back."""
+        clock = FrozenClock(1800000000.0)
+        gen = IdGenerator(worker_id=1, clock=clock)
+        first = gen.next_int()
+        clock.seconds -= 5
+
+        assert gen.next_int() > first
+
+    def test_concurrent_ids_are_unique(self):
+        """Test uniqueness across threads."""
+        gen = IdGenerator(worker_id=0)
+        results = []
+
+        def worker():
+            results.extend(gen.next_id() for _ in range(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 4000
+
+    def test_worker_id_from_environment(self, monkeypatch):
+        """Test that OMNITECH_WORKER_ID sets the worker id."""
+        monkeypatch.setenv('OMNITECH_WORKER_ID', '42')
+        assert IdGenerator().worker_id == 42
+
+    @pytest.mark.parametrize('value', ['1024', '-1', '1025'])
+    def test_worker_id_out_of_range(self, monkeypatch, value):
+        """Test that an out-of-range OMNITECH_WORKER_ID fails instead of wrapping."""
+        monkeypatch.setenv('OMNITECH_WORKER_ID', value)
+        with pytest.raises(ValueError, match='OMNITECH_WORKER_ID'):
+            IdGenerator()
+
+    def test_epoch_start(self):
+        """Test that the custom epoch maps to id zero."""
+        gen = IdGenerator(worker_id=0, clock=FrozenClock(EPOCH_MS / 1000))
+        assert gen.next_id('webhook_') == 'webhook_' + '0' * ENCODED_LENGTH
+
+
+class TestWebhookNodeIds:
+    """Tests for node ids assigned to webhooks."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Test client with an empty graph and no webhook secret."""
+        monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        omnitech_server.app.config['TESTING'] = True
+        with omnitech_server.app.test_client() as client:
+            yield client
+
+    def test_burst_creates_distinct_nodes(self, client):
+        """Test that back-to-back deliveries never merge into one node."""
+        node_ids = []
+        for i in range(50):
+            response = client.post(
+                '/webhook', json={},
+                headers={'X-GitHub-Event': 'push', 'X-GitHub-Delivery': f'delivery-{i}'}
+            )
+            node_ids.append(response.get_json()['node_id'])
+
+        assert len(set(node_ids)) == 50
+        assert node_ids == sorted(node_ids)
+        graph = omnitech_server.omni_graph
+        assert graph.number_of_nodes() == 50
+        assert graph.nodes[node_ids[3]]['delivery_id'] == 'delivery-3'
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Webhook Payload Tests
+ScrollVerse Genesis Protocol - Ingestion Tests
+
+Tests for lazy webhook payload parsing and indexed field extraction.
+"""
+
+import json
+
+import networkx as nx
+import pytest
+
+import omnitech_payload
+import omnitech_server
+from omnitech_graph_index import GraphIndex
+from omnitech_payload import WebhookPayload
+
+PUSH = {
+    'ref': 'refs/heads/main',
+    'repository': {'full_name': 'octo/repo', 'id': 1},
+    'sender': {'login': 'octocat'},
+    'commits': [{'id': f'{i:040x}', 'message': 'change'} for i in range(200)]
+}
+
+
+class TestWebhookPayload:
+    """Tests for the WebhookPayload class."""
+
+    def test_parsed_on_first_access_only(self):
+        """Test that the body is parsed lazily and once."""
+        payload = WebhookPayload(bytearray(json.dumps(PUSH).encode()), 'push')
+        assert payload.parsed is False
+
+        data = payload.data
+        assert payload.parsed is True
+        assert payload.data is data
+
+    def test_summary_fields(self):
+        """Test extraction of repo, ref, sender and action."""
+        payload = WebhookPayload(json.dumps(PUSH).encode(), 'push')
+        assert payload.summary() == {'repo': 'octo/repo', 'ref': 'refs/heads/main', 'sender': 'octocat'}
+
+        issue = WebhookPayload(b'{"action": "opened", "repository": null}', 'issues')
+        assert issue.summary() == {'action': 'opened'}
+
+    def test_empty_body(self):
+        """Test that an empty body is an empty document."""
+        assert WebhookPayload(b'').summary() == {}
+
+    @pytest.mark.parametrize('raw', [b'{not json', b'[1, 2]'])
+    def test_invalid_body(self, raw):
+        """Test that non-object bodies raise ValueError."""
+        with pytest.raises(ValueError):
+            WebhookPayload(raw).data
+
+    def test_standard_library_fallback(self, monkeypatch):
+        """Test parsing without orjson installed."""
+        monkeypatch.setattr(omnitech_payload, 'orjson', None)
+        payload = WebhookPayload(memoryview(json.dumps(PUSH).encode()), 'push')
+
+        assert payload.summary()['repo'] == 'octo/repo'
+
+
+class TestWebhookIngestion:
+    """Tests for payload handling in the /webhook endpoint."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Test client with an empty graph and no webhook secret."""
+        monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        omnitech_server.app.config['TESTING'] = True
+        with omnitech_server.app.test_client() as client:
+            yield client
+
+    def test_indexed_fields_recorded(self, client):
+        """Test that the webhook node carries the extracted fields."""
+        response = client.post('/webhook', json=PUSH, headers={'X-GitHub-Event': 'push'})
+
+        node = omnitech_server.omni_graph.nodes[response.get_json()['node_id']]
+        assert node['repo'] == 'octo/repo'
+        assert node['sender'] == 'octocat'
+        assert 'commits' not in node
+
+    def test_invalid_json_rejected(self, client):
+        """Test that a malformed body is a client error."""
+        response = client.post(
+            '/webhook', data=b'{oops', content_type='application/json',
+            headers={'X-GitHub-Event': 'push'}
+        )
+
+        assert response.status_code == 400
+        assert omnitech_server.omni_graph.number_of_nodes() == 0
+
+    def test_redelivery_not_parsed(self, client, monkeypatch):
+        """Test that a redelivered webhook is answered without parsing its body."""
+        calls = []
+        loads = omnitech_payload.loads
+        monkeypatch.setattr(omnitech_payload, 'loads', lambda raw: calls.append(raw) or loads(raw))
+        headers = {'X-GitHub-Event': 'push', 'X-GitHub-Delivery': 'payload-redelivery'}
+
+        first = client.post('/webhook', json=PUSH, headers=headers)
+        second = client.post('/webhook', json=PUSH, headers=headers)
+
+        assert second.get_json()['duplicate'] is True
+        assert second.get_json()['node_id'] == first.get_json()['node_id']
+        assert len(calls) == 1
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Bulk Persistence Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests for the chunked UNWIND bulk-upsert API.
+"""
+
+import pytest
+
+from omnitech_codec import JSON_SUFFIX, KEY_SEPARATOR, decode_properties
+from omnitech_persistence import OmnitechPersistence
+
+
+def count_rows(query, params):
+    """Responder that reports every row in the chunk as written."""
+    return [{'written': len(params.get('rows', []))}]
+
+
+class TestBulkUpsert:
+    """Tests for save_nodes_bulk and save_edges_bulk."""
+
+    def test_nodes_written_in_chunks(self, stub_persistence, stub_driver):
+        """Test that nodes are split into one transaction per chunk."""
+        stub_driver.responder = count_rows
+        nodes = [{'id': f'n{i}', 'event_type': 'push'} for i in range(2500)]
+
+        counts = stub_persistence.save_nodes_bulk(nodes, chunk_size=1000)
+
+        assert counts == [1000, 1000, 500]
+        assert stub_driver.commits == 3
+        assert stub_driver.sessions == 1
+        query, params = stub_driver.queries[0]
+        assert 'UNWIND $rows AS row' in query
+        assert params['rows'][0] == {'id': 'n0', 'attributes': {'event_type': 'push'}, 'roots': ['event_type']}
+
+    def test_edges_written_in_chunks(self, stub_persistence, stub_driver):
+        """Test that edge rows carry endpoints and encoded attributes."""
+        stub_driver.responder = count_rows
+        edges = [{'source': 'a', 'target': 'b', 'tags': ['x']}]
+
+        counts = stub_persistence.save_edges_bulk(edges)
+
+        assert counts == [1]
+        _, params = stub_driver.queries[0]
+        assert params['rows'] == [
+            {'source': 'a', 'target': 'b', 'attributes': {'tags': ['x']}, 'roots': ['tags']}
+        ]
+
+    def test_failed_chunk_reports_zero(self, stub_persistence, stub_driver):
+        """Test that a failing chunk is rolled back without aborting the rest."""
+        def fail_second(query, params):
+            if params['rows'][0]['id'] == 'n2':
+                raise RuntimeError('deadlock')
+            return count_rows(query, params)
+
+        stub_driver.responder = fail_second
+        nodes = [{'id': f'n{i}'} for i in range(4)]
+
+        assert stub_persistence.save_nodes_bulk(nodes, chunk_size=2) == [2, 0]
+        assert stub_driver.rollbacks == 1
+
+    def test_raise_errors_stops_at_failed_chunk(self, stub_persistence, stub_driver):
+        """Test that raise_errors surfaces the first chunk error."""
+        def fail_second(query, params):
+            if params['rows'][0]['id'] == 'n2':
+                raise RuntimeError('deadlock')
+            return count_rows(query, params)
+
+        stub_driver.responder = fail_second
+        nodes = [{'id': f'n{i}'} for i in range(6)]
+
+        with pytest.raises(RuntimeError):
+            stub_persistence.save_nodes_bulk(nodes, chunk_size=2, raise_errors=True)
+        assert len(stub_driver.queries) == 2
+
+    def test_empty_input(self, stub_persistence, stub_driver):
+        """Test that an empty input does not open a session."""
+        assert stub_persistence.save_nodes_bulk([]) == []
+        assert stub_driver.sessions == 0
+
+    def test_no_connection(self):
+        """Test that bulk writes report zero counts without a driver."""
+        persist = OmnitechPersistence.__new__(OmnitechPersistence)
+        persist._driver = None
+
+        assert persist.save_nodes_bulk([{'id': 'a'}], chunk_size=1) == [0]
+
+
+class PropertyStore:
+    """Responder that applies node upserts to dicts the way Neo4j would."""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def __call__(self, query, params):
+        if 'row.cleared' in query:
+            for row in params['rows']:
+                node = self.nodes[row['id']]
+                for key in row['cleared']:
+                    node.pop(key, None)
+            return []
+        stale = []
+        for row in params['rows']:
+            node = self.nodes.setdefault(row['id'], {'id': row['id']})
+            keys = [
+                key for key in node
+                if key not in row['attributes'] and any(
+                    key == root or key == root + JSON_SUFFIX or key.startswith(root + KEY_SEPARATOR)
+                    for root in row['roots']
+                )
+            ]
+            node.update(row['attributes'])
+            if keys:
+                stale.append({'id': row['id'], 'stale': keys})
+        return [{'written': len(params['rows']), 'stale': stale}]
+
+
+class TestStaleEncodings:
+    """Tests that rewriting an attribute removes its previous encoding."""
+
+    def test_dict_rewritten_with_fewer_keys(self, stub_persistence, stub_driver):
+        """Test that flattened keys missing from the new value are removed."""
+        store = stub_driver.responder = PropertyStore()
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': {'x': 1, 'y': 2}, 'kind': 'repo'}])
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': {'x': 3}}])
+
+        assert decode_properties(store.nodes['a']) == {'id': 'a', 'meta': {'x': 3}, 'kind': 'repo'}
+        query, params = stub_driver.queries[-1]
+        assert 'row.cleared' in query
+        assert params['rows'] == [{'id': 'a', 'cleared': {'meta.y': None}}]
+        assert stub_driver.commits == 2
+
+    def test_shape_change_replaces_encoding(self, stub_persistence, stub_driver):
+        """Test that a dict rewritten as a list (and back) leaves one encoding."""
+        store = stub_driver.responder = PropertyStore()
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': {'x': 1}}])
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': [{'x': 1}]}])
+        assert decode_properties(store.nodes['a']) == {'id': 'a', 'meta': [{'x': 1}]}
+
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': 'flat'}])
+        assert store.nodes['a'] == {'id': 'a', 'meta': 'flat'}
+
+    def test_nothing_stale_skips_clear(self, stub_persistence, stub_driver):
+        """Test that an unchanged shape needs no second statement."""
+        stub_driver.responder = PropertyStore()
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': {'x': 1}}])
+        stub_persistence.save_nodes_bulk([{'id': 'a', 'meta': {'x': 2}}])
+
+        assert len(stub_driver.queries) == 2
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Delta Export Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests for iter_nodes_since / iter_edges_since: updated_at and id
+watermarks, resumable cursors and property projection.
+"""
+
+import sys
+
+import pytest
+
+# Epoch milliseconds of 2024-01-01T00:00:00Z
+T0 = 1704067200000
+
+NODES = [
+    {'id': 'webhook_b', 'updated_at': T0 + 1000, 'event_type': 'push', 'repo.name': 'omni'},
+    {'id': 'webhook_a', 'updated_at': T0 + 1000, 'event_type': 'star'},
+    {'id': 'webhook_c', 'updated_at': T0 + 2000, 'event_type': 'push', 'labels__json': 'null'},
+    # An entity node (no timestamp) updated after the webhooks
+    {'id': 'repo:omni', 'updated_at': T0 + 3000, 'kind': 'repository'},
+    {'id': 'legacy', 'event_type': 'push'},
+]
+
+EDGES = [
+    ('webhook_a', 'repo:omni', {'relation': 'about', 'updated_at': T0 + 1000}),
+    ('webhook_a', 'user:dev', {'relation': 'sent_by', 'updated_at': T0 + 1000}),
+    ('webhook_c', 'repo:omni', {'relation': 'about', 'updated_at': T0 + 2000}),
+]
+
+
+def project(props, params):
+    """Apply the projection the query would run server-side."""
+    fields = params.get('fields')
+    if fields is None:
+        return dict(props)
+    return [
+        [key, value] for key, value in props.items()
+        if key in fields or any(
+            key.startswith(field + params['separator']) or key == field + params['json_suffix']
+            for field in fields
+        )
+    ]
+
+
+def respond(query, params):
+    """Stand-in for the keyset delta queries over NODES and EDGES."""
+    if 'RETURN n.id AS id, n.updated_at' in query:
+        after = (params['after_updated_at'], params['after_id'])
+        rows = sorted(
+            (node['updated_at'], node['id'], node) for node in NODES
+            if 'updated_at' in node and (node['updated_at'], node['id']) > after
+        )
+        return [
+            {'id': node_id, 'updated_at': updated_at, 'props': project(node, params)}
+            for updated_at, node_id, node in rows[:params['limit']]
+        ]
+    after = (params['after_updated_at'], params['after_source'], params['after_target'])
+    rows = sorted(
+        (attrs['updated_at'], source, target, attrs) for source, target, attrs in EDGES
+        if (attrs['updated_at'], source, target) > after
+    )
+    return [
+        {'source': source, 'target': target, 'updated_at': updated_at, 'attrs': project(attrs, params)}
+        for updated_at, source, target, attrs in rows[:params['limit']]
+    ]
+
+
+class TestNodesSince:
+    """Tests for iter_nodes_since."""
+
+    def test_time_watermark(self, stub_persistence, stub_driver):
+        """Test that nodes written at or after the watermark are exported, entities included."""
+        stub_driver.responder = respond
+
+        exported = list(stub_persistence.iter_nodes_since('2024-01-01T00:00:01Z', page_size=2))
+
+        assert [node['id'] for _, node in exported] == ['webhook_a', 'webhook_b', 'webhook_c', 'repo:omni']
+        assert exported[-1][0] == [T0 + 3000, 'repo:omni']
+        assert exported[1][1]['repo'] == {'name': 'omni'}
+        assert 'updated_at' not in exported[1][1]
+        assert stub_driver.queries[0][1]['after_updated_at'] == T0 + 1000
+        assert len(stub_driver.queries) == 3
+
+    def test_updated_node_exported_again(self, stub_persistence, stub_driver, monkeypatch):
+        """Test that rewriting a node moves it past a consumer's cursor."""
+        stub_driver.responder = respond
+        cursor = list(stub_persistence.iter_nodes_since())[-1][0]
+        rewritten = {**NODES[1], 'updated_at': T0 + 4000, 'event_type': 'fork'}
+        monkeypatch.setattr(sys.modules[__name__], 'NODES', [NODES[0], rewritten, *NODES[2:]])
+
+        exported = [node for _, node in stub_persistence.iter_nodes_since(cursor)]
+
+        assert exported == [{'id': 'webhook_a', 'event_type': 'fork'}]
+
+    def test_cursor_resumes_after_record(self, stub_persistence, stub_driver):
+        """Test that a yielded cursor resumes after its node, across equal timestamps."""
+        stub_driver.responder = respond
+        cursor, _ = next(stub_persistence.iter_nodes_since())
+
+        resumed = [node['id'] for _, node in stub_persistence.iter_nodes_since(cursor)]
+
+        assert cursor == [T0 + 1000, 'webhook_a']
+        assert resumed == ['webhook_b', 'webhook_c', 'repo:omni']
+
+    def test_projection(self, stub_persistence, stub_driver):
+        """Test that only requested attributes (with encoded forms) are returned."""
+        stub_driver.responder = respond
+
+        nodes = [node for _, node in stub_persistence.iter_nodes_since(properties=['repo', 'labels'])]
+
+        assert nodes == [
+            {'id': 'webhook_a'},
+            {'id': 'webhook_b', 'repo': {'name': 'omni'}},
+            {'id': 'webhook_c', 'labels': None},
+            {'id': 'repo:omni'}
+        ]
+        assert stub_driver.queries[0][1]['fields'] == ['repo', 'labels']
+
+    def test_invalid_watermark(self, stub_persistence):
+        """Test that a cursor of the wrong shape is rejected."""
+        with pytest.raises(ValueError):
+            list(stub_persistence.iter_nodes_since(['2024-01-01T00:00:01']))
+
+
+class TestEdgesSince:
+    """Tests for iter_edges_since."""
+
+    def test_edges_follow_updated_at(self, stub_persistence, stub_driver):
+        """Test export order, cursors and resumption for edges."""
+        stub_driver.responder = respond
+
+        exported = list(stub_persistence.iter_edges_since(page_size=1))
+        cursor = exported[0][0]
+        resumed = [edge['target'] for _, edge in stub_persistence.iter_edges_since(cursor)]
+
+        assert [(e['source'], e['target']) for _, e in exported] == [
+            ('webhook_a', 'repo:omni'), ('webhook_a', 'user:dev'), ('webhook_c', 'repo:omni')
+        ]
+        assert cursor == [T0 + 1000, 'webhook_a', 'repo:omni']
+        assert resumed == ['user:dev', 'repo:omni']
+        assert exported[0][1]['relation'] == 'about'
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Persistence Connection Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests for pool configuration, managed transactions with retry and the
+cached health state.
+"""
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable, TransientError
+
+import omnitech_persistence
+from omnitech_circuit import STATE_CLOSED, STATE_OPEN
+from omnitech_persistence import CircuitOpenError, OmnitechPersistence
+from tests.neo4j_stub import StubDriver
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    """Build persistence layers on a stand-in driver, recording driver kwargs."""
+    created = []
+
+    def factory(driver=None, **kwargs):
+        driver = driver or StubDriver()
+
+        def make_driver(uri, **config):
+            driver.config = config
+            return driver
+
+        monkeypatch.setattr(omnitech_persistence.GraphDatabase, 'driver', make_driver)
+        persist = OmnitechPersistence('bolt://stub:7687', 'neo4j', 'stub', **kwargs)
+        created.append(persist)
+        return persist, driver
+
+    yield factory
+    for persist in created:
+        persist.close()
+
+
+def flaky(failures, error):
+    """Responder that raises error for the first failures queries."""
+    calls = []
+
+    def respond(query, params):
+        calls.append(query)
+        if len(calls) <= failures:
+            raise error
+        return [{'written': 1}]
+
+    return respond
+
+
+class TestPoolConfig:
+    """Tests for driver configuration."""
+
+    def test_pool_settings_passed_to_driver(self, connect):
+        """Test that only configured pool settings override driver defaults."""
+        _, driver = connect(max_pool_size=20, acquisition_timeout=5.0)
+
+        assert driver.config['max_connection_pool_size'] == 20
+        assert driver.config['connection_acquisition_timeout'] == 5.0
+        assert 'max_connection_lifetime' not in driver.config
+
+
+class TestManagedTransactions:
+    """Tests for execute_write / execute_read."""
+
+    def test_transient_error_retried(self, connect):
+        """Test that a transient failure is retried and then succeeds."""
+        persist, driver = connect(retry_backoff=0)
+        driver.responder = flaky(2, TransientError('deadlock'))
+
+        assert persist.save_node('a', {}) is True
+        assert driver.rollbacks == 2
+        assert driver.commits == 1
+        assert persist.health()['retries'] == 2
+
+    def test_retries_exhausted(self, connect):
+        """Test that the last error is raised once retries run out."""
+        persist, driver = connect(retry_backoff=0, max_retries=1)
+        driver.responder = flaky(5, ServiceUnavailable('down'))
+
+        with pytest.raises(ServiceUnavailable):
+            persist.execute_write(lambda tx: tx.run('RETURN 1').single())
+        assert len(driver.queries) == 2
+        assert persist.is_connected() is False
+
+    def test_other_errors_not_retried(self, connect):
+        """Test that non-transient errors fail immediately."""
+        persist, driver = connect(retry_backoff=0)
+        driver.responder = flaky(5, RuntimeError('syntax'))
+
+        assert persist.save_node('a', {}) is False
+        assert len(driver.queries) == 1
+
+    def test_session_shared_in_block(self, connect):
+        """Test that transactions inside session() reuse one session."""
+        persist, driver = connect()
+
+        with persist.session():
+            persist.execute_write(lambda tx: tx.run('CREATE ()').consume())
+            persist.execute_read(lambda tx: tx.run('MATCH (n) RETURN n').data())
+
+        assert driver.sessions == 1
+        assert driver.commits == 2
+
+
+class TestHealth:
+    """Tests for the cached health state."""
+
+    def test_is_connected_cached(self, connect):
+        """Test that status checks do not hit the server."""
+        persist, driver = connect(health_interval=60)
+        checks = driver.connectivity_checks
+
+        assert all(persist.is_connected() for _ in range(5))
+        assert driver.connectivity_checks == checks
+
+    def test_probe_updates_state(self, connect):
+        """Test that the probe marks the connection down and up again."""
+        persist, driver = connect(health_interval=60)
+
+        def unavailable():
+            raise ServiceUnavailable('down')
+
+        driver.verify_connectivity = unavailable
+        assert persist._probe() is False
+        assert persist.health()['last_error'] == 'down'
+
+        del driver.verify_connectivity
+        assert persist._probe() is True
+        assert persist.is_connected() is True
+
+    def test_live_check_without_probe(self, connect):
+        """Test the round-trip check when the probe is disabled."""
+        persist, driver = connect(health_interval=0)
+        checks = driver.connectivity_checks
+
+        persist.is_connected()
+
+        assert driver.connectivity_checks == checks + 1
+
+
+class TestCircuitBreaker:
+    """Tests for failing fast and reconnecting."""
+
+    def test_circuit_opens_and_fails_fast(self, connect):
+        """Test that calls stop reaching Neo4j once the circuit opens."""
+        persist, driver = connect(retry_backoff=0, max_retries=0, failure_threshold=2)
+        driver.responder = flaky(100, ServiceUnavailable('down'))
+
+        assert persist.save_node('a', {}) is False
+        assert persist.save_node('b', {}) is False
+        queries = len(driver.queries)
+
+        with pytest.raises(CircuitOpenError):
+            persist.execute_write(lambda tx: tx.run('RETURN 1').single())
+        assert persist.save_node('c', {}) is False
+        assert len(driver.queries) == queries
+        assert persist.available() is False
+        assert persist.health()['circuit']['state'] == STATE_OPEN
+
+    def test_boot_outage_reconnects(self, connect):
+        """Test that an unreachable Neo4j at startup is retried by the probe."""
+        driver = StubDriver()
+        attempts = []
+
+        def verify():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ServiceUnavailable('refused')
+
+        driver.verify_connectivity = verify
+        persist, _ = connect(driver, fail_fast=False, health_interval=60, reset_timeout=0)
+
+        assert persist.available() is False
+        assert persist.save_node('a', {}) is False
+
+        assert persist._probe() is True
+        assert persist.available() is True
+        assert persist.health()['circuit']['state'] == STATE_CLOSED
+        assert persist.save_node('a', {}) is True
+
+    def test_boot_outage_fail_fast(self, connect):
+        """Test that the default still raises on an unreachable Neo4j."""
+        driver = StubDriver()
+
+        def unavailable():
+            raise ServiceUnavailable('refused')
+
+        driver.verify_connectivity = unavailable
+        with pytest.raises(ServiceUnavailable):
+            connect(driver)
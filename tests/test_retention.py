@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Retention Tests
+ScrollVerse Genesis Protocol - Retention Tests
+
+Tests for webhook node eviction, time-bucketed aggregates and the Neo4j
+compaction job.
+"""
+
+from datetime import datetime, timezone
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+from omnitech_retention import RetentionManager, rollup
+
+NOW = datetime(2026, 1, 1, 1, 0, tzinfo=timezone.utc)
+
+
+def ts(minute):
+    """Timestamp for a minute of 2026-01-01 00:xx."""
+    return f'2026-01-01T00:{minute:02d}:30+00:00'
+
+
+def build(count):
+    """Graph with one webhook node per minute plus a non-webhook node."""
+    graph = nx.DiGraph()
+    graph.add_node('repo_main', kind='repository')
+    for minute in range(count):
+        event_type = 'push' if minute % 2 == 0 else 'issues'
+        graph.add_node(f'webhook_{minute}', event_type=event_type, timestamp=ts(minute))
+        graph.add_edge('repo_main', f'webhook_{minute}')
+    index = GraphIndex()
+    index.rebuild(graph)
+    return graph, index
+
+
+class TestRollup:
+    """Tests for the rollup function."""
+
+    def test_minute_and_hour_rows(self):
+        """Test that each group increments its minute and hour buckets."""
+        rows = rollup([{'minute': '2026-01-01T00:05', 'event_type': 'push', 'count': 3}])
+
+        assert rows == [
+            {
+                'id': 'agg_minute_2026-01-01T00:05',
+                'attributes': {
+                    'kind': 'aggregate', 'bucket': 'minute',
+                    'bucket_start': '2026-01-01T00:05:00+00:00'
+                },
+                'counts': {'count_total': 3, 'count_push': 3}
+            },
+            {
+                'id': 'agg_hour_2026-01-01T00',
+                'attributes': {
+                    'kind': 'aggregate', 'bucket': 'hour',
+                    'bucket_start': '2026-01-01T00:00:00+00:00'
+                },
+                'counts': {'count_total': 3, 'count_push': 3}
+            }
+        ]
+
+
+class TestRetentionManager:
+    """Tests for the RetentionManager class."""
+
+    def test_disabled_by_default(self):
+        """Test that no limits means retention is disabled."""
+        assert RetentionManager().enabled is False
+
+    def test_plan_by_ttl(self):
+        """Test that webhook nodes older than the TTL are evicted."""
+        graph, index = build(10)
+        manager = RetentionManager(ttl=3300)  # cutoff 00:05
+
+        plan = manager.plan(graph, index, NOW)
+
+        assert plan.evicted == [f'webhook_{m}' for m in range(5)]
+        hour = [row for row in plan.increments if row['id'] == 'agg_hour_2026-01-01T00']
+        assert sum(row['counts']['count_total'] for row in hour) == 5
+        assert sum(row['counts'].get('count_push', 0) for row in hour) == 3
+
+    def test_plan_by_node_cap(self):
+        """Test that the oldest webhook nodes are evicted above the cap."""
+        graph, index = build(10)
+        manager = RetentionManager(max_nodes=8)
+
+        plan = manager.plan(graph, index, NOW)
+
+        assert plan.evicted == ['webhook_0', 'webhook_1', 'webhook_2']
+        assert 'repo_main' not in plan.evicted
+
+    def test_minute_aggregates_expire(self):
+        """Test that minute aggregates past their TTL are scheduled for removal."""
+        graph, index = build(2)
+        manager = RetentionManager(ttl=60, minute_aggregate_ttl=1800)
+
+        plan = manager.plan(graph, index, NOW)
+
+        assert plan.expired_aggregates == [
+            'agg_minute_2026-01-01T00:00', 'agg_minute_2026-01-01T00:01'
+        ]
+        manager.commit(plan, NOW)
+        assert manager.stats()['minute_aggregates'] == 0
+
+    def test_plan_does_not_modify_state(self):
+        """Test that planning twice gives the same plan until it is committed."""
+        graph, index = build(10)
+        manager = RetentionManager(ttl=3300)
+        manager.observe('agg_minute_2025-12-31T00:00', {
+            'kind': 'aggregate', 'bucket': 'minute', 'bucket_start': '2025-12-31T00:00:00+00:00'
+        })
+
+        first = manager.plan(graph, index, NOW)
+        second = manager.plan(graph, index, NOW)
+        assert (second.evicted, second.increments, second.expired_aggregates) == (
+            first.evicted, first.increments, first.expired_aggregates
+        )
+        assert first.expired_aggregates == ['agg_minute_2025-12-31T00:00']
+        assert manager.stats()['runs'] == 0
+        assert manager.stats()['minute_aggregates'] == 1
+
+        manager.commit(first, NOW)
+        stats = manager.stats()
+        assert (stats['runs'], stats['evicted_total']) == (1, 5)
+        assert stats['minute_aggregates'] == 5
+
+
+def build_extracted():
+    """Two webhooks with the entity nodes the extractors link to them."""
+    graph = nx.DiGraph()
+    graph.add_node('repo:x', kind='repository')
+    graph.add_node('user:dev', kind='user')
+    for minute, commit in ((0, 'commit:a'), (1, 'commit:b')):
+        webhook = f'webhook_{minute}'
+        graph.add_node(webhook, event_type='push', timestamp=ts(minute))
+        graph.add_node(commit, kind='commit')
+        graph.add_edges_from([
+            (webhook, 'repo:x'), (webhook, 'user:dev'), (webhook, commit),
+            (commit, 'repo:x'), ('user:dev', commit)
+        ])
+    graph.add_node('pr:x#1', kind='pull_request')
+    graph.add_node('commit:head', kind='commit')
+    graph.add_edges_from([('webhook_1', 'pr:x#1'), ('pr:x#1', 'commit:head'), ('pr:x#1', 'repo:x')])
+    index = GraphIndex()
+    index.rebuild(graph)
+    return graph, index
+
+
+class TestEntityRetention:
+    """Tests for evicting extracted entity nodes with their webhooks."""
+
+    def test_orphaned_entities_evicted(self):
+        """Test that entities only the evicted webhook referenced go with it."""
+        graph, index = build_extracted()
+        plan = RetentionManager(ttl=3540).plan(graph, index, NOW)  # cutoff 00:01
+
+        assert sorted(plan.evicted) == ['commit:a', 'webhook_0']
+        assert plan.increments[0]['counts'] == {'count_total': 1, 'count_push': 1}
+
+    def test_cascade_and_node_cap(self):
+        """Test that entities count against the cap and are evicted transitively."""
+        graph, index = build_extracted()
+        plan = RetentionManager(max_nodes=2).plan(graph, index, NOW)
+
+        assert sorted(plan.evicted) == [
+            'commit:a', 'commit:b', 'commit:head', 'pr:x#1', 'user:dev', 'webhook_0', 'webhook_1'
+        ]
+        assert graph.number_of_nodes() - len(plan.evicted) == 1
+
+
+class TestPersistenceCompaction:
+    """Tests for the Neo4j counter and compaction queries."""
+
+    def test_increments_add_to_current_values(self, stub_persistence, stub_driver):
+        """Test that increments are merged and added to stored counters."""
+        def responder(query, params):
+            if 'properties(n)' in query:
+                return [{'id': row['id'], 'props': {'count_total': 4}} for row in params['rows']]
+            return []
+
+        stub_driver.responder = responder
+        counts = stub_persistence.increment_counters_bulk([
+            {'id': 'agg', 'attributes': {'kind': 'aggregate'}, 'counts': {'count_total': 1}},
+            {'id': 'agg', 'attributes': {}, 'counts': {'count_total': 2}}
+        ])
+
+        assert counts == [1]
+        _, params = stub_driver.queries[-1]
+        assert params['rows'] == [{'id': 'agg', 'counts': {'count_total': 7}}]
+        assert stub_driver.commits == 1
+
+    def test_compact_rolls_up_in_same_transaction(self, stub_persistence, stub_driver):
+        """Test that deleted nodes are rolled up before the transaction commits."""
+        def responder(query, params):
+            if 'DETACH DELETE' in query:
+                return [{'minute': '2026-01-01T00:05', 'event_type': 'push', 'count': 2}]
+            if 'properties(n)' in query:
+                return [{'id': row['id'], 'props': {}} for row in params['rows']]
+            return []
+
+        stub_driver.responder = responder
+        total = stub_persistence.compact_nodes('webhook_', ts(10), rollup, batch_size=10)
+
+        assert total == 2
+        assert stub_driver.commits == 1
+        _, params = stub_driver.queries[-1]
+        assert {row['id'] for row in params['rows']} == {
+            'agg_minute_2026-01-01T00:05', 'agg_hour_2026-01-01T00'
+        }
+
+    def test_expired_nodes_reject_bad_property(self, stub_persistence):
+        """Test that only plain property names reach the query."""
+        with pytest.raises(ValueError):
+            stub_persistence.delete_expired_nodes('agg_', ts(0), 'x} DETACH DELETE n //')
+
+
+class TestServerRetention:
+    """Tests for retention in the server."""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """Server with a small graph, retention by TTL and no persistence."""
+        graph, index = build(10)
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', graph)
+        monkeypatch.setattr(omnitech_server, 'graph_index', index)
+        monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+        monkeypatch.setattr(omnitech_server, 'retention', RetentionManager(ttl=3300))
+        monkeypatch.setattr(omnitech_server, 'get_persistence', lambda: None)
+        omnitech_server.app.config['TESTING'] = True
+        return graph
+
+    def test_run_retention_replaces_nodes_with_aggregates(self, server):
+        """Test that evicted nodes are removed and counted in aggregates."""
+        stats = omnitech_server.run_retention(NOW)
+
+        assert stats['evicted'] == 5
+        assert 'webhook_4' not in server
+        assert 'webhook_5' in server
+        assert server.nodes['agg_hour_2026-01-01T00']['count_total'] == 5
+        assert omnitech_server.graph_index.by_event_type('push') == {'webhook_6', 'webhook_8'}
+
+    def test_aggregates_accumulate_across_runs(self, server):
+        """Test that a second run adds to the existing aggregate counters."""
+        omnitech_server.run_retention(NOW)
+        omnitech_server.retention.ttl = 60
+        omnitech_server.run_retention(NOW)
+
+        assert server.nodes['agg_hour_2026-01-01T00']['count_total'] == 10
+
+    def test_removal_broadcast_as_delta(self, server):
+        """Test that subscribers receive one graph_delta with the removals."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.get_received()
+
+        omnitech_server.run_retention(NOW)
+
+        messages = [m for m in client.get_received() if m['name'] == 'graph_delta']
+        assert len(messages) == 1
+        actions = [d['action'] for d in messages[0]['args'][0]['deltas']]
+        assert actions.count('node_removed') == 5
+        client.disconnect()
+
+    def test_admin_endpoint(self, server):
+        """Test the manual retention trigger."""
+        with omnitech_server.app.test_client() as client:
+            response = client.post('/admin/retention/run')
+
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'success'
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Snapshot Encoding Tests
+ScrollVerse Genesis Protocol - Compact Transport Tests
+
+Tests for the columnar snapshot layout, encoding negotiation and the
+compact variants of graph_state and /admin/graph.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+import omnitech_snapshot
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+from omnitech_snapshot import deserialize, from_columnar, negotiate, serialize, to_columnar
+
+NODES = [
+    {'id': 'webhook_1', 'event_type': 'push', 'size': 10},
+    {'id': 'webhook_2', 'event_type': 'issues'},
+    {'id': 'repo:o/r', 'kind': 'repository'}
+]
+EDGES = [
+    {'source': 'webhook_1', 'target': 'repo:o/r', 'relation': 'about'},
+    {'source': 'webhook_2', 'target': 'repo:o/r'}
+]
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """Sample graph installed as the server graph."""
+    g = nx.DiGraph()
+    for node in NODES:
+        g.add_node(node['id'], **{k: v for k, v in node.items() if k != 'id'})
+    for edge in EDGES:
+        g.add_edge(edge['source'], edge['target'], **{k: v for k, v in edge.items() if k not in ('source', 'target')})
+    index = GraphIndex()
+    index.rebuild(g)
+    monkeypatch.setattr(omnitech_server, 'omni_graph', g)
+    monkeypatch.setattr(omnitech_server, 'graph_index', index)
+    monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+    return g
+
+
+class TestColumnar:
+    """Tests for the columnar layout."""
+
+    def test_round_trip(self):
+        """Test that nodes and edges survive encoding."""
+        nodes, edges = from_columnar(to_columnar(NODES, EDGES))
+
+        assert nodes == NODES
+        assert edges == EDGES
+
+    def test_strings_stored_once(self):
+        """Test that ids and keys are interned in the string table."""
+        document = to_columnar(NODES, EDGES, revision=4)
+
+        assert sorted(document['strings']) == sorted(set(document['strings']))
+        assert document['edges']['targets'] == [document['strings'].index('repo:o/r')] * 2
+        assert document['revision'] == 4
+
+    def test_compressed_round_trip(self):
+        """Test serialization with zlib."""
+        document = to_columnar(NODES, EDGES)
+        data = serialize(document, 'columnar+zlib')
+
+        assert deserialize(data, 'columnar+zlib') == document
+
+    def test_negotiation(self, monkeypatch):
+        """Test that the first supported encoding wins."""
+        monkeypatch.setattr(omnitech_snapshot, 'msgpack', None)
+
+        assert negotiate(['columnar+msgpack+zlib', 'columnar+zlib']) == 'columnar+zlib'
+        assert negotiate('bogus, columnar') == 'columnar'
+        assert negotiate(None) == 'json'
+        with pytest.raises(ValueError):
+            serialize({}, 'columnar+msgpack')
+
+
+class TestCompactSnapshots:
+    """Tests for compact graph_state and /admin/graph responses."""
+
+    def test_graph_state_default_json(self, graph):
+        """Test that clients without an encoding get plain lists."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.emit('subscribe_graph')
+        state = [m['args'][0] for m in client.get_received() if m['name'] == 'graph_state'][0]
+
+        assert 'encoding' not in state
+        assert len(state['nodes']) == 3
+        client.disconnect()
+
+    def test_graph_state_compressed(self, graph):
+        """Test a negotiated compressed columnar snapshot."""
+        client = omnitech_server.socketio.test_client(omnitech_server.app)
+        client.emit('subscribe_graph', {'encoding': ['columnar+zlib', 'json']})
+        state = [m['args'][0] for m in client.get_received() if m['name'] == 'graph_state'][0]
+
+        assert state['encoding'] == 'columnar+zlib'
+        nodes, edges = from_columnar(deserialize(state['snapshot'], state['encoding']))
+        assert {n['id'] for n in nodes} == {n['id'] for n in NODES}
+        assert len(edges) == 2
+        client.disconnect()
+
+    def test_admin_graph_columnar_deflate(self, graph, monkeypatch):
+        """Test /admin/graph?format=columnar+zlib."""
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        with omnitech_server.app.test_client() as client:
+            response = client.get('/admin/graph?format=columnar+zlib&limit=10')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'deflate'
+        document = deserialize(response.data, 'columnar+zlib')
+        nodes, edges = from_columnar(document)
+        assert document['node_count'] == 3
+        assert 'next_cursor' in document
+        assert sorted(n['id'] for n in nodes) == sorted(n['id'] for n in NODES)
+
+    def test_admin_graph_unsupported_format(self, graph, monkeypatch):
+        """Test that unavailable encodings are rejected."""
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        monkeypatch.delenv('JWT_SECRET', raising=False)
+        monkeypatch.setattr(omnitech_snapshot, 'msgpack', None)
+        with omnitech_server.app.test_client() as client:
+            response = client.get('/admin/graph?format=columnar+msgpack')
+
+        assert response.status_code == 400
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Graph Subscription Tests
+ScrollVerse Genesis Protocol - Filtered Live Update Tests
+
+Tests for subscription filters and the routing of coalesced broadcasts
+to filtered Socket.IO rooms.
+"""
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_emitter import EmitCoalescer
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+from omnitech_subscriptions import FULL_GRAPH_ROOM, SubscriptionFilter
+
+
+def sample_graph():
+    """webhook -> repo <- commit, plus an unrelated issue webhook."""
+    graph = nx.DiGraph()
+    graph.add_node('webhook_1', event_type='push')
+    graph.add_node('webhook_2', event_type='issues')
+    graph.add_node('repo:o/r', kind='repository')
+    graph.add_node('commit:abc', kind='commit')
+    graph.add_edge('webhook_1', 'repo:o/r')
+    graph.add_edge('commit:abc', 'repo:o/r')
+    return graph
+
+
+class TestSubscriptionFilter:
+    """Tests for the SubscriptionFilter class."""
+
+    def test_empty_filter_follows_everything(self):
+        """Test that no criteria means the full graph."""
+        assert SubscriptionFilter.from_request(None) is None
+        assert SubscriptionFilter.from_request({'event_types': []}) is None
+
+    @pytest.mark.parametrize('data', [
+        'push',
+        {'event_types': 5},
+        {'root': ''},
+        {'root': 'a', 'depth': 'x'},
+        {'root': 'a', 'depth': 9}
+    ])
+    def test_invalid_filter(self, data):
+        """Test that malformed filters are rejected."""
+        with pytest.raises(ValueError):
+            SubscriptionFilter.from_request(data)
+
+    def test_same_filter_same_room(self):
+        """Test that equivalent filters share a room."""
+        a = SubscriptionFilter.from_request({'event_types': 'push,issues'})
+        b = SubscriptionFilter.from_request({'event_types': ['issues', 'push']})
+        c = SubscriptionFilter.from_request({'event_types': ['push']})
+
+        assert a.room == b.room
+        assert a.room != c.room
+        assert a.room.startswith(FULL_GRAPH_ROOM + ':')
+
+    def test_event_type_selects_nodes_and_their_edges(self):
+        """Test event type filtering of deltas and events."""
+        graph = sample_graph()
+        subscription = SubscriptionFilter(event_types=['push'])
+        deltas = [
+            {'action': 'node_added', 'node_id': 'webhook_1', 'attributes': {}},
+            {'action': 'node_added', 'node_id': 'webhook_2', 'attributes': {}},
+            {'action': 'edge_added', 'source': 'webhook_1', 'target': 'repo:o/r', 'attributes': {}},
+            {'action': 'edge_added', 'source': 'commit:abc', 'target': 'repo:o/r', 'attributes': {}}
+        ]
+        events = [
+            {'event': 'webhook_received', 'node_id': 'webhook_1'},
+            {'event': 'webhook_received', 'node_id': 'webhook_2'}
+        ]
+
+        selected, kept = subscription.select(graph, deltas, events)
+
+        assert selected == [deltas[0], deltas[2]]
+        assert kept == [events[0]]
+
+    def test_prefix(self):
+        """Test node id prefix filtering."""
+        subscription = SubscriptionFilter(prefixes=['commit:'])
+        graph = sample_graph()
+
+        assert subscription.node_matches(graph, 'commit:abc', None)
+        assert not subscription.node_matches(graph, 'webhook_1', None)
+        assert subscription.delta_matches(graph, {'action': 'node_removed', 'node_id': 'commit:old'}, None)
+
+    def test_neighborhood(self):
+        """Test that the root neighborhood follows edges in both directions."""
+        graph = sample_graph()
+
+        assert SubscriptionFilter(root='repo:o/r', depth=1).scope(graph) == {'repo:o/r', 'webhook_1', 'commit:abc'}
+        assert SubscriptionFilter(root='commit:abc', depth=0).scope(graph) == {'commit:abc'}
+        assert SubscriptionFilter(root='missing').scope(graph) == set()
+
+    def test_snapshot(self):
+        """Test that snapshots hold the selected nodes and their edges."""
+        nodes, edges = SubscriptionFilter(prefixes=['commit:']).snapshot(sample_graph())
+
+        assert edges == [{'source': 'commit:abc', 'target': 'repo:o/r'}]
+        assert {n['id'] for n in nodes} == {'commit:abc', 'repo:o/r'}
+
+
+@pytest.fixture
+def emitter(monkeypatch):
+    """Coalescing emitter on a fresh graph (flushed explicitly by the tests)."""
+    monkeypatch.setattr(omnitech_server, 'omni_graph', nx.DiGraph())
+    monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+    monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+    coalescer = EmitCoalescer(omnitech_server.socketio, lambda: omnitech_server.graph_changes,
+                              lambda: omnitech_server.omni_graph, interval=3600, max_lag=2)
+    monkeypatch.setattr(omnitech_server, 'emitter', coalescer)
+    return coalescer
+
+
+def subscribe(data):
+    """Connect a Socket.IO test client and subscribe it."""
+    client = omnitech_server.socketio.test_client(omnitech_server.app)
+    client.emit('subscribe_graph', data)
+    return client
+
+
+def received(client, name):
+    """Get the payloads of one event type received by a test client."""
+    return [msg['args'][0] for msg in client.get_received() if msg['name'] == name]
+
+
+def add_webhook(node_id, event_type):
+    """Apply and announce a webhook node."""
+    delta = omnitech_server.apply_node_mutation(node_id, {'event_type': event_type}, persist=False)
+    omnitech_server.notify_clients('webhook_received', {'event_type': event_type, 'node_id': node_id}, [delta])
+
+
+class TestFilteredBroadcast:
+    """Tests for room-scoped graph subscriptions."""
+
+    def test_filtered_snapshot(self, emitter):
+        """Test that the initial state only holds the selected nodes."""
+        omnitech_server.apply_node_mutation('webhook_1', {'event_type': 'push'}, persist=False)
+        omnitech_server.apply_node_mutation('webhook_2', {'event_type': 'issues'}, persist=False)
+
+        client = subscribe({'filter': {'event_types': ['push']}})
+
+        state = received(client, 'graph_state')[0]
+        assert [n['id'] for n in state['nodes']] == ['webhook_1']
+        client.disconnect()
+
+    def test_batches_routed_by_filter(self, emitter):
+        """Test that each room only receives its matching changes."""
+        everything = subscribe(None)
+        pushes = subscribe({'filter': {'event_types': ['push']}})
+        issues = subscribe({'filter': {'event_types': ['issues']}})
+        for client in (everything, pushes, issues):
+            client.get_received()
+
+        add_webhook('webhook_1', 'push')
+        emitter.flush()
+
+        assert len(received(everything, 'graph_updated_batch')[0]['deltas']) == 1
+        batch = received(pushes, 'graph_updated_batch')[0]
+        assert batch['filtered'] is True
+        assert batch['events'][0]['node_id'] == 'webhook_1'
+        assert received(issues, 'graph_updated_batch') == []
+        assert emitter.stats()['rooms'] == 3
+        for client in (everything, pushes, issues):
+            client.disconnect()
+
+    def test_idle_filtered_client_not_lagging(self, emitter):
+        """Test that a client sent nothing is never dropped as lagging."""
+        issues = subscribe({'filter': {'event_types': ['issues']}})
+        for node_id in 'abcdef':
+            add_webhook(f"webhook_{node_id}", 'push')
+            emitter.flush()
+
+        assert received(issues, 'graph_resync') == []
+        assert emitter.stats()['subscribers'] == 1
+        issues.disconnect()
+
+    def test_resubscribe_moves_room(self, emitter):
+        """Test that changing the filter leaves the previous room."""
+        client = subscribe({'filter': {'event_types': ['issues']}})
+        client.emit('subscribe_graph', {'filter': {'event_types': ['push']}})
+        client.get_received()
+
+        add_webhook('webhook_1', 'issues')
+        emitter.flush()
+
+        assert received(client, 'graph_updated_batch') == []
+        assert emitter.stats()['rooms'] == 1
+        client.disconnect()
+
+    def test_invalid_filter_reported(self, emitter):
+        """Test that a malformed filter is answered with an error."""
+        client = subscribe({'filter': {'root': 'a', 'depth': 99}})
+
+        assert received(client, 'subscription_error')[0]['error'].startswith('depth')
+        assert emitter.stats()['subscribers'] == 0
+        client.disconnect()
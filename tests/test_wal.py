@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Write-Ahead Log Tests
+ScrollVerse Genesis Protocol - Local Durability Tests
+
+Tests for log replay, snapshots with log compaction, torn writes and the
+server mutation path recording into the log.
+"""
+
+import os
+
+import networkx as nx
+import pytest
+
+import omnitech_server
+from omnitech_analytics import GraphAnalytics
+from omnitech_graph_index import GraphIndex
+from omnitech_graph_sync import GraphChangeLog
+from omnitech_wal import WriteAheadLog
+
+
+def open_log(directory, graph, **kwargs):
+    """Recover a graph from a directory and return the log writing to it."""
+    wal = WriteAheadLog(lambda: graph, directory=str(directory), snapshot_bytes=0, **kwargs)
+    wal.recover(graph)
+    return wal
+
+
+def mutate(wal, graph):
+    """Apply and log a few mutations."""
+    changes = [
+        ('node', 'a', {'kind': 'webhook', 'size': 1}),
+        ('edge', 'a', 'b', {'relation': 'about'}),
+        ('node', 'a', {'size': 2}),
+        ('edge', 'c', 'b', {}),
+        ('remove', 'c')
+    ]
+    for change in changes:
+        if change[0] == 'node':
+            graph.add_node(change[1], **change[2])
+            wal.record_node(change[1], change[2])
+        elif change[0] == 'edge':
+            graph.add_edge(change[1], change[2], **change[3])
+            wal.record_edge(change[1], change[2], change[3])
+        else:
+            graph.remove_node(change[1])
+            wal.record_removed(change[1])
+
+
+def same(a, b):
+    """Assert that two graphs hold the same nodes, edges and attributes."""
+    assert dict(a.nodes(data=True)) == dict(b.nodes(data=True))
+    assert {(u, v): d for u, v, d in a.edges(data=True)} == {(u, v): d for u, v, d in b.edges(data=True)}
+
+
+def names(directory):
+    """Files in a log directory, sorted."""
+    return sorted(os.listdir(directory))
+
+
+class TestWriteAheadLog:
+    """Tests for the WriteAheadLog class."""
+
+    def test_replay(self, tmp_path):
+        """Test that a restart replays the log."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph, fsync='always')
+        mutate(wal, graph)
+        wal.close()
+
+        recovered = nx.DiGraph()
+        stats = open_log(tmp_path, recovered).stats()
+
+        same(recovered, graph)
+        assert stats['recovered_records'] == 5
+        assert stats['sequence'] == 5
+
+    def test_snapshot_compacts_log(self, tmp_path):
+        """Test that a snapshot replaces the segments it covers."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph)
+        mutate(wal, graph)
+        wal.snapshot(wait=True)
+        graph.add_node('d', late=True)
+        wal.record_node('d', {'late': True})
+        wal.close()
+
+        assert names(tmp_path) == [
+            'snapshot-00000000000000000005.bin',
+            'wal-00000000000000000005.log'
+        ]
+        recovered = nx.DiGraph()
+        stats = open_log(tmp_path, recovered).stats()
+        same(recovered, graph)
+        assert stats['recovered_nodes'] == 2
+        assert stats['recovered_records'] == 1
+
+    def test_automatic_snapshot(self, tmp_path):
+        """Test snapshots triggered by the log size."""
+        graph = nx.DiGraph()
+        wal = WriteAheadLog(lambda: graph, directory=str(tmp_path), snapshot_bytes=100)
+        wal.recover(graph)
+        for i in range(20):
+            graph.add_node(f'n{i}', i=i)
+            wal.record_node(f'n{i}', {'i': i})
+        wal.close()
+
+        assert wal.stats()['snapshots'] >= 1
+        recovered = nx.DiGraph()
+        open_log(tmp_path, recovered)
+        same(recovered, graph)
+
+    def test_torn_write(self, tmp_path):
+        """Test that replay stops at a partially written record."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph)
+        mutate(wal, graph)
+        wal.close()
+        with open(tmp_path / 'wal-00000000000000000000.log', 'ab') as f:
+            f.write(b'\x40\x00\x00\x00garbage')
+
+        recovered = nx.DiGraph()
+        wal = open_log(tmp_path, recovered)
+        same(recovered, graph)
+        recovered.add_node('e')
+        wal.record_node('e', {})
+        wal.close()
+
+        again = nx.DiGraph()
+        open_log(tmp_path, again)
+        same(again, recovered)
+
+    def test_corrupt_snapshot_is_skipped(self, tmp_path):
+        """Test that an unreadable snapshot is skipped rather than loaded."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph)
+        mutate(wal, graph)
+        wal.snapshot(wait=True)
+        wal.close()
+        path = tmp_path / 'snapshot-00000000000000000005.bin'
+        path.write_bytes(path.read_bytes()[:-4])
+
+        recovered = nx.DiGraph()
+        open_log(tmp_path, recovered)
+
+        assert recovered.number_of_nodes() == 0
+
+    def test_record_before_recover(self, tmp_path):
+        """Test that existing records are never overwritten."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph)
+        mutate(wal, graph)
+        wal.close()
+
+        with pytest.raises(RuntimeError):
+            WriteAheadLog(lambda: graph, directory=str(tmp_path)).record_removed('a')
+
+    def test_disabled_and_invalid_policy(self):
+        """Test the no-op mode and fsync policy validation."""
+        wal = WriteAheadLog(lambda: None)
+        wal.record_node('a', {})
+
+        assert wal.stats()['records'] == 0
+        with pytest.raises(ValueError):
+            WriteAheadLog(lambda: None, fsync='sometimes')
+
+
+class TestServerWal:
+    """Tests for the server mutation path writing to the log."""
+
+    def test_mutations_are_recovered(self, tmp_path, monkeypatch):
+        """Test that server mutations survive a restart."""
+        graph = nx.DiGraph()
+        wal = open_log(tmp_path, graph)
+        monkeypatch.setattr(omnitech_server, 'omni_graph', graph)
+        monkeypatch.setattr(omnitech_server, 'graph_index', GraphIndex())
+        monkeypatch.setattr(omnitech_server, 'graph_changes', GraphChangeLog())
+        monkeypatch.setattr(omnitech_server, 'analytics', GraphAnalytics(lambda: graph))
+        monkeypatch.setattr(omnitech_server, 'wal', wal)
+
+        omnitech_server.apply_node_mutation('a', {'kind': 'webhook'}, persist=False)
+        omnitech_server.apply_edge_mutation('a', 'hub', {'relation': 'about'}, persist=False)
+        omnitech_server.apply_edge_mutation('b', 'hub', {}, persist=False)
+        omnitech_server.remove_node_mutation('b', persist=False)
+        wal.close()
+
+        recovered = nx.DiGraph()
+        open_log(tmp_path, recovered)
+        same(recovered, graph)
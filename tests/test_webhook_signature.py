@@ -8,6 +8,7 @@ Tests for HMAC SHA-256 webhook signature verification.
 
 import hmac
 import hashlib
+import io
 import json
 import os
 import pytest
@@ -16,6 +17,7 @@ import pytest
 os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
 
 from omnitech_server import app, verify_webhook_signature
+from omnitech_signature import PayloadTooLargeError, WebhookVerifier
 
 
 @pytest.fixture
@@ -120,6 +122,99 @@ class TestVerifyWebhookSignature:
         assert verify_webhook_signature(payload, signature) is True
 
 
+class TestWebhookVerifier:
+    """Tests for the cached WebhookVerifier."""
+
+    def test_previous_secret_accepted_during_rotation(self):
+        """Test that the previous secret still verifies after a rotation."""
+        verifier = WebhookVerifier(['new-secret', 'old-secret'])
+        payload = b'{"event": "push"}'
+
+        assert verifier.verify(payload, compute_signature('new-secret', payload)) is True
+        assert verifier.verify(payload, compute_signature('old-secret', payload)) is True
+        assert verifier.verify(payload, compute_signature('other', payload)) is False
+
+    def test_non_hex_signature_rejected(self):
+        """Test that a malformed digest is rejected without raising."""
+        verifier = WebhookVerifier(['secret'])
+        assert verifier.verify(b'{}', 'sha256=zz') is False
+
+    def test_stream_read_in_chunks(self):
+        """Test that a streamed body is verified and returned intact."""
+        verifier = WebhookVerifier(['secret'])
+        payload = b'{"commits": [' + b'1,' * 50000 + b'1]}'
+        signature = compute_signature('secret', payload)
+
+        valid, body = verifier.read_verified(io.BytesIO(payload), signature, len(payload), chunk_size=4096)
+
+        assert valid is True
+        assert body == payload
+        assert json.loads(body)['commits'][-1] == 1
+
+    def test_stream_without_length(self):
+        """Test streams of unknown length with a rotated secret."""
+        verifier = WebhookVerifier(['new-secret', 'old-secret'])
+        payload = b'x' * 10000
+
+        valid, body = verifier.read_verified(
+            io.BytesIO(payload), compute_signature('old-secret', payload), chunk_size=1000
+        )
+
+        assert valid is True
+        assert body == payload
+
+    def test_malformed_header_not_read(self):
+        """Test that a request without a usable signature is rejected unread."""
+        stream = io.BytesIO(b'x' * 100)
+
+        valid, body = WebhookVerifier(['secret']).read_verified(stream, 'sha256=zz', 4_000_000_000)
+
+        assert (valid, body) == (False, bytearray())
+        assert stream.tell() == 0
+
+    def test_claimed_length_not_preallocated(self):
+        """Test that the buffer follows the bytes received, not Content-Length."""
+        payload = b'x' * 10000
+        signature = compute_signature('secret', payload)
+
+        valid, body = WebhookVerifier(['secret']).read_verified(
+            io.BytesIO(payload), signature, 4_000_000_000, chunk_size=1000, max_length=None
+        )
+
+        assert valid is True
+        assert body == payload
+
+    def test_max_length(self):
+        """Test that bodies over the limit are rejected, by header or by stream."""
+        verifier = WebhookVerifier(['secret'])
+        payload = b'x' * 10000
+        signature = compute_signature('secret', payload)
+
+        with pytest.raises(PayloadTooLargeError):
+            verifier.read_verified(io.BytesIO(payload), signature, 4_000_000_000, max_length=5000)
+        with pytest.raises(PayloadTooLargeError):
+            verifier.read_verified(io.BytesIO(payload), signature, chunk_size=1000, max_length=5000)
+        assert verifier.read_verified(io.BytesIO(payload), signature, max_length=10000)[0] is True
+
+    def test_rotation_from_environment(self, client, monkeypatch):
+        """Test the endpoint with GITHUB_WEBHOOK_SECRET_PREVIOUS."""
+        monkeypatch.setenv('GITHUB_WEBHOOK_SECRET', 'new-secret')
+        monkeypatch.setenv('GITHUB_WEBHOOK_SECRET_PREVIOUS', 'old-secret')
+        payload = json.dumps({'event': 'push'}).encode()
+
+        response = client.post(
+            '/webhook',
+            data=payload,
+            content_type='application/json',
+            headers={
+                'X-Hub-Signature-256': compute_signature('old-secret', payload),
+                'X-GitHub-Event': 'push'
+            }
+        )
+
+        assert response.status_code == 200
+
+
 class TestWebhookEndpoint:
     """Integration tests for the /webhook endpoint."""
 
@@ -195,6 +290,25 @@ class TestWebhookEndpoint:
         assert response.status_code == 403
 
 
+    def test_webhook_too_large(self, client, webhook_secret, monkeypatch):
+        """Test that a body over MAX_CONTENT_LENGTH is rejected with 413."""
+        monkeypatch.setenv('GITHUB_WEBHOOK_SECRET', webhook_secret)
+        monkeypatch.setitem(app.config, 'MAX_CONTENT_LENGTH', 100)
+        payload = json.dumps({'event': 'push', 'padding': 'x' * 200}).encode()
+
+        response = client.post(
+            '/webhook',
+            data=payload,
+            content_type='application/json',
+            headers={
+                'X-Hub-Signature-256': compute_signature(webhook_secret, payload),
+                'X-GitHub-Event': 'push'
+            }
+        )
+
+        assert response.status_code == 413
+
+
 class TestAdminAuthentication:
     """Tests for admin endpoint authentication."""
 
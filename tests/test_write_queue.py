@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+OmniTech1 Write-Behind Queue Tests
+ScrollVerse Genesis Protocol - Persistence Tests
+
+Tests for the bounded write-behind persistence queue.
+"""
+
+import time
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+
+from omnitech_write_queue import SpillBuffer, WriteBehindQueue
+
+
+class FakePersistence:
+    """In-memory stand-in for OmnitechPersistence."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def save_nodes_bulk(self, nodes, raise_errors=False):
+        self.calls.extend(('node', dict(n)) for n in nodes)
+        return [0 if self.fail else len(nodes)]
+
+    def save_edges_bulk(self, edges, raise_errors=False):
+        self.calls.extend(('edge', dict(e)) for e in edges)
+        return [0 if self.fail else len(edges)]
+
+    def increment_counters_bulk(self, rows, raise_errors=False):
+        self.calls.extend(('increment', dict(r)) for r in rows)
+        return [0 if self.fail else len(rows)]
+
+    def save_subgraph(self, nodes, edges, raise_errors=False):
+        self.calls.append(('subgraph', len(nodes), len(edges)))
+        return not self.fail
+
+    def delete_nodes_bulk(self, node_ids, raise_errors=False):
+        self.calls.extend(('delete', node_id) for node_id in node_ids)
+        return [len(node_ids)]
+
+
+class FlakyPersistence(FakePersistence):
+    """Fake persistence whose circuit can be opened, or whose edge writes lose the connection."""
+
+    def __init__(self):
+        super().__init__()
+        self.up = False
+        self.edges_fail = False
+
+    def available(self):
+        return self.up
+
+    def save_edges_bulk(self, edges, raise_errors=False):
+        if self.edges_fail:
+            raise ServiceUnavailable('connection reset')
+        return super().save_edges_bulk(edges, raise_errors)
+
+
+@pytest.fixture
+def persistence():
+    """Fake persistence layer."""
+    return FakePersistence()
+
+
+class TestWriteBehindQueue:
+    """Tests for the WriteBehindQueue class."""
+
+    def test_flush_keeps_enqueue_order(self, persistence):
+        """Test that a batch is written in enqueue order, one bulk call per run."""
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60)
+        wq.enqueue_node('a', {'x': 1})
+        wq.enqueue_node('b', {})
+        wq.enqueue_edge('a', 'b', {'w': 2})
+        wq.enqueue_increment('agg', {'kind': 'aggregate'}, {'count_total': 2})
+
+        assert wq.flush() == 4
+        assert persistence.calls == [
+            ('node', {'id': 'a', 'x': 1}),
+            ('node', {'id': 'b'}),
+            ('edge', {'source': 'a', 'target': 'b', 'w': 2}),
+            ('increment', {'id': 'agg', 'attributes': {'kind': 'aggregate'}, 'counts': {'count_total': 2}})
+        ]
+        assert wq.metrics()['batches'] == 1
+        wq.stop()
+
+    def test_delete_then_readd(self, persistence):
+        """Test that a node deleted and re-added in one batch is written last."""
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60)
+        wq.enqueue_node('a', {'v': 1})
+        wq.enqueue_delete('a')
+        wq.enqueue_node('a', {'v': 2})
+        wq.enqueue_edge('a', 'b', {})
+
+        assert wq.flush() == 4
+        assert persistence.calls == [
+            ('node', {'id': 'a', 'v': 1}),
+            ('delete', 'a'),
+            ('node', {'id': 'a', 'v': 2}),
+            ('edge', {'source': 'a', 'target': 'b'})
+        ]
+        wq.stop()
+
+    def test_consecutive_subgraphs_share_one_write(self, persistence):
+        """Test that consecutive subgraphs are written together, in order."""
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60)
+        wq.enqueue_subgraph([{'id': 'a'}, {'id': 'b'}], [{'source': 'a', 'target': 'b'}])
+        wq.enqueue_subgraph([{'id': 'd'}], [])
+        wq.enqueue_node('c', {})
+
+        assert wq.flush() == 3
+        assert persistence.calls == [('subgraph', 3, 1), ('node', {'id': 'c'})]
+        wq.stop()
+
+    def test_rejected_subgraph_fails_alone(self, persistence):
+        """Test that a constraint violation in a subgraph run only fails that subgraph."""
+        def save_subgraph(nodes, edges, raise_errors=False):
+            persistence.calls.append(('subgraph', [node['id'] for node in nodes]))
+            if any(node.get('delivery_id') == 'redelivered' for node in nodes):
+                raise ValueError('omninode_delivery_id_unique')
+            return True
+
+        persistence.save_subgraph = save_subgraph
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60)
+        for i in range(10):
+            wq.enqueue_subgraph([{'id': f'w{i}', 'delivery_id': 'redelivered' if i == 3 else f'd{i}'}], [])
+
+        assert wq.flush() == 9
+        assert persistence.calls[1:] == [('subgraph', [f'w{i}']) for i in range(10)]
+        assert wq.metrics()['failed'] == 1
+        wq.stop()
+
+    def test_full_queue_drops_and_counts(self, persistence):
+        """Test that enqueue never blocks when the queue is full."""
+        wq = WriteBehindQueue(lambda: persistence, max_size=2, flush_interval=60, batch_size=10)
+        assert wq.enqueue_node('a', {}) is True
+        assert wq.enqueue_node('b', {}) is True
+        assert wq.enqueue_node('c', {}) is False
+
+        metrics = wq.metrics()
+        assert metrics['dropped'] == 1
+        assert metrics['high_watermark'] == 2
+        wq.stop()
+
+    def test_batch_size_wakes_flusher(self, persistence):
+        """Test that a full batch is flushed before the interval elapses."""
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60, batch_size=2)
+        wq.enqueue_node('a', {})
+        wq.enqueue_node('b', {})
+
+        deadline = time.monotonic() + 2
+        while len(persistence.calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(persistence.calls) == 2
+        wq.stop()
+
+    def test_no_persistence_discards(self):
+        """Test that mutations are discarded when Neo4j is not configured."""
+        wq = WriteBehindQueue(lambda: None, flush_interval=60)
+        wq.enqueue_node('a', {})
+        wq.stop()
+
+        assert wq.metrics()['discarded'] == 1
+        assert wq.metrics()['depth'] == 0
+
+    def test_failed_writes_counted(self):
+        """Test that failed writes are reported in metrics."""
+        wq = WriteBehindQueue(lambda: FakePersistence(fail=True), flush_interval=60)
+        wq.enqueue_node('a', {})
+        wq.stop()
+
+        assert wq.metrics()['failed'] == 1
+        assert wq.metrics()['flushed'] == 0
+
+
+class TestSpillBuffer:
+    """Tests for spilling writes while persistence is unavailable."""
+
+    def test_spill_and_replay_in_order(self, tmp_path):
+        """Test that spilled batches are replayed before newer writes."""
+        persistence = FlakyPersistence()
+        wq = WriteBehindQueue(
+            lambda: persistence, flush_interval=60, spill=SpillBuffer(str(tmp_path / 'spill.log'))
+        )
+        wq.enqueue_node('a', {'x': 1})
+        wq.enqueue_increment('a', {}, {'count': 2})
+        assert wq.flush() == 0
+        assert persistence.calls == []
+        assert wq.metrics()['spill_pending'] == 2
+
+        persistence.up = True
+        wq.enqueue_node('b', {})
+        assert wq.flush() == 3
+        wq.stop()
+
+        assert [call[0] for call in persistence.calls] == ['node', 'increment', 'node']
+        assert persistence.calls[1][1]['counts'] == {'count': 2}
+        assert wq.metrics()['spill_pending'] == 0
+        assert wq.metrics()['replayed'] == 2
+
+    def test_spill_survives_restart(self, tmp_path):
+        """Test that a new queue replays what the previous one spilled."""
+        path = str(tmp_path / 'spill.log')
+        persistence = FlakyPersistence()
+        wq = WriteBehindQueue(lambda: persistence, flush_interval=60, spill=SpillBuffer(path))
+        wq.enqueue_edge('a', 'b', {'w': 1})
+        wq.stop()
+
+        persistence.up = True
+        restarted = WriteBehindQueue(lambda: persistence, flush_interval=60, spill=SpillBuffer(path))
+        restarted.stop()
+
+        assert persistence.calls == [('edge', {'w': 1, 'source': 'a', 'target': 'b'})]
+
+    def test_full_spill_drops(self, tmp_path):
+        """Test the spill size limit."""
+        spill = SpillBuffer(str(tmp_path / 'spill.log'), max_bytes=10)
+        wq = WriteBehindQueue(lambda: FlakyPersistence(), flush_interval=60, spill=spill)
+        wq.enqueue_node('a', {})
+        wq.stop()
+
+        assert wq.metrics()['spill_dropped'] == 1
+        assert wq.metrics()['failed'] == 1
+
+    def test_replay_stops_at_failed_run(self, tmp_path):
+        """Test that a failing replay keeps the failed run and everything after it."""
+        persistence = FlakyPersistence()
+        wq = WriteBehindQueue(
+            lambda: persistence, flush_interval=60, spill=SpillBuffer(str(tmp_path / 'spill.log'))
+        )
+        wq.enqueue_node('a', {})
+        wq.enqueue_edge('a', 'b', {})
+        wq.enqueue_node('c', {})
+        wq.flush()
+
+        persistence.up = True
+        persistence.edges_fail = True
+        assert wq.flush() == 1
+        metrics = wq.metrics()
+        assert (metrics['replayed'], metrics['spill_pending'], metrics['failed']) == (1, 2, 0)
+
+        persistence.edges_fail = False
+        assert wq.flush() == 2
+        wq.stop()
+        assert [call[0] for call in persistence.calls] == ['node', 'edge', 'node']
+        assert wq.metrics()['spill_pending'] == 0
+
+    def test_failed_write_spilled_while_circuit_closed(self, tmp_path):
+        """Test that a batch that loses the connection is spilled, not dropped."""
+        persistence = FlakyPersistence()
+        persistence.up = True
+        persistence.edges_fail = True
+        wq = WriteBehindQueue(
+            lambda: persistence, flush_interval=60, spill=SpillBuffer(str(tmp_path / 'spill.log'))
+        )
+        wq.enqueue_node('a', {})
+        wq.enqueue_edge('a', 'b', {})
+
+        assert wq.flush() == 1
+        metrics = wq.metrics()
+        assert (metrics['spilled'], metrics['spill_pending'], metrics['failed']) == (1, 1, 0)
+        wq.stop()